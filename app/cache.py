@@ -7,13 +7,52 @@ and provides utilities for cache management and invalidation.
 
 import json
 import logging
+import time
 from typing import Any, Dict, List, Optional, Union
 import redis.asyncio as redis
 from redis.asyncio import Redis, ConnectionPool
-from .config import settings
+from redis.asyncio.client import Pipeline
+from .config import settings, CacheKeys
+from .utils import metrics, tracing
+from .utils.serialization import dumps
 
 logger = logging.getLogger(__name__)
 
+# Content encodings cached responses may be stored in
+COMPRESSED_ENCODINGS = ("br", "gzip")
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline that records its round trip as a single ``pipeline`` command."""
+    
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            ended = time.perf_counter()
+            metrics.observe_redis("pipeline", ended - started)
+            tracing.record_span("cache", "pipeline", started, ended)
+
+
+class InstrumentedRedis(Redis):
+    """Redis client that records the latency of every command."""
+    
+    async def execute_command(self, *args, **options) -> Any:
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            ended = time.perf_counter()
+            command = str(args[0]).lower()
+            metrics.observe_redis(command, ended - started)
+            tracing.record_span("cache", f"{command} {args[1]}" if len(args) > 1 else command, started, ended)
+    
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
 
 class CacheManager:
     """Manages Redis cache operations and provides caching utilities."""
@@ -36,7 +75,7 @@ class CacheManager:
             )
             
             # Create Redis client
-            self.redis = Redis(connection_pool=self.pool)
+            self.redis = InstrumentedRedis(connection_pool=self.pool)
             
             # Test the connection
             await self.redis.ping()
@@ -67,6 +106,7 @@ class CacheManager:
         
         try:
             value = await self.redis.get(key)
+            metrics.record_cache_lookup(key, bool(value))
             if value:
                 return json.loads(value)
             return None
@@ -90,16 +130,49 @@ class CacheManager:
             return False
         
         try:
-            serialized_value = json.dumps(value, default=str)
-            if ttl:
-                await self.redis.setex(key, ttl, serialized_value)
-            else:
-                await self.redis.set(key, serialized_value)
+            serialized_value = dumps(value)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                if ttl:
+                    pipe.setex(key, ttl, serialized_value)
+                else:
+                    pipe.set(key, serialized_value)
+                # Compressed variants describe the previous value
+                pipe.delete(*self._compressed_keys(key))
+                await pipe.execute()
             return True
         except Exception as e:
             logger.error(f"Error setting cache key {key}: {e}")
             return False
     
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Set several values in one pipelined round trip.
+        
+        Args:
+            items: Map of cache key to value
+            ttl: Time to live in seconds, applied to every key
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.redis or not items:
+            return False
+        
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    serialized_value = dumps(value)
+                    if ttl:
+                        pipe.setex(key, ttl, serialized_value)
+                    else:
+                        pipe.set(key, serialized_value)
+                    pipe.delete(*self._compressed_keys(key))
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Error setting {len(items)} cache keys: {e}")
+            return False
+    
     async def delete(self, key: str) -> bool:
         """
         Delete a key from cache.
@@ -114,12 +187,78 @@ class CacheManager:
             return False
         
         try:
-            result = await self.redis.delete(key)
+            result = await self.redis.delete(key, *self._compressed_keys(key))
             return result > 0
         except Exception as e:
             logger.error(f"Error deleting cache key {key}: {e}")
             return False
     
+    @staticmethod
+    def _compressed_keys(key: str) -> List[str]:
+        """Keys of the compressed response variants stored for a cache key."""
+        return [CacheKeys.compressed(key, encoding) for encoding in COMPRESSED_ENCODINGS]
+    
+    async def get_compressed(self, key: str, encoding: str, digest: bytes) -> Optional[bytes]:
+        """
+        Get a compressed response variant stored for a cache key.
+        
+        Args:
+            key: Cache key of the plain value
+            encoding: Content encoding ("br" or "gzip")
+            digest: Digest of the plain body the variant must have been made from
+            
+        Returns:
+            Compressed response body or None if not stored or made from another body
+        """
+        if not self.redis:
+            return None
+        
+        try:
+            stored = await self.redis.get(CacheKeys.compressed(key, encoding))
+        except Exception as e:
+            logger.error(f"Error getting compressed variant of {key}: {e}")
+            return None
+        if stored is None or not stored.startswith(digest):
+            return None
+        return stored[len(digest):]
+    
+    async def set_compressed(self, key: str, encoding: str, body: bytes, digest: bytes) -> bool:
+        """
+        Store a compressed response variant alongside a cached value.
+        
+        The variant expires together with the plain value, and is not
+        stored at all if the plain value has already expired. It is stored
+        behind the digest of the plain body it was made from: a request
+        that read the value just before a refresh replaced it may store a
+        variant of the old value, and readers of the new value must not
+        serve it.
+        
+        Args:
+            key: Cache key of the plain value
+            encoding: Content encoding ("br" or "gzip")
+            body: Compressed response body
+            digest: Digest of the plain body that was compressed
+            
+        Returns:
+            True if stored, False otherwise
+        """
+        if not self.redis:
+            return False
+        
+        try:
+            ttl_ms = await self.redis.pttl(key)
+            if ttl_ms == -2:
+                return False
+            variant_key = CacheKeys.compressed(key, encoding)
+            if ttl_ms > 0:
+                await self.redis.set(variant_key, digest + body, px=ttl_ms)
+            else:
+                await self.redis.set(variant_key, digest + body)
+            return True
+        except Exception as e:
+            logger.error(f"Error storing compressed variant of {key}: {e}")
+            return False
+    
     async def exists(self, key: str) -> bool:
         """
         Check if a key exists in cache.
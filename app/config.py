@@ -58,9 +58,18 @@ class CacheConfig(BaseSettings):
 class VideoAPIConfig(BaseSettings):
     """Video API configuration settings."""
     
-    base_url: str = Field(default="http://10.0.20.6:5001", env="VIDEO_API_BASE_URL")
-    timeout: int = Field(default=30, env="VIDEO_API_TIMEOUT")
-    retry_attempts: int = Field(default=3, env="VIDEO_API_RETRY_ATTEMPTS")
+    model_config = {"env_prefix": "VIDEO_API_"}
+    
+    base_url: str = Field(default="http://10.0.20.6:5001")
+    timeout: int = Field(default=30)
+    connect_timeout: int = Field(default=5)
+    probe_timeout: int = Field(default=5)
+    retry_attempts: int = Field(default=3)
+    retry_backoff: float = Field(default=0.2)
+    max_connections: int = Field(default=50)
+    max_keepalive_connections: int = Field(default=20)
+    keepalive_expiry: int = Field(default=30)
+    per_host_concurrency: int = Field(default=20)
     
     @validator('base_url')
     def validate_base_url(cls, v):
@@ -90,10 +99,15 @@ class CacheTTLConfig(BaseSettings):
 class BackgroundTaskConfig(BaseSettings):
     """Background task configuration settings."""
     
-    poll_interval: int = Field(default=30, env="BACKGROUND_POLL_INTERVAL")
-    stats_refresh_interval: int = Field(default=300, env="BACKGROUND_STATS_REFRESH_INTERVAL")
-    cache_cleanup_interval: int = Field(default=3600, env="BACKGROUND_CACHE_CLEANUP_INTERVAL")
-    health_check_interval: int = Field(default=60, env="BACKGROUND_HEALTH_CHECK_INTERVAL")
+    model_config = {"env_prefix": "BACKGROUND_"}
+    
+    poll_interval: int = Field(default=30)
+    stats_refresh_interval: int = Field(default=300)
+    cache_cleanup_interval: int = Field(default=3600)
+    health_check_interval: int = Field(default=60)
+    leader_lease_ttl: int = Field(default=15)
+    idle_backoff_factor: int = Field(default=4)
+    max_skip_interval: int = Field(default=1800)
     
     @validator('*')
     def validate_intervals(cls, v):
@@ -102,6 +116,93 @@ class BackgroundTaskConfig(BaseSettings):
         return v
 
 
+class MediaIndexConfig(BaseSettings):
+    """Media availability index configuration settings."""
+    
+    model_config = {"env_prefix": "MEDIA_INDEX_"}
+    
+    enabled: bool = Field(default=True)
+    refresh_interval: int = Field(default=300)
+    reload_interval: int = Field(default=60)
+    window_hours: int = Field(default=48)
+    max_probes_per_refresh: int = Field(default=500)
+
+
+class MediaCacheConfig(BaseSettings):
+    """On-disk media proxy cache configuration settings."""
+    
+    model_config = {"env_prefix": "MEDIA_CACHE_"}
+    
+    # Read from MEDIA_CACHE_DIR rather than the prefixed field name
+    directory: str = Field(default="/tmp/frigate-media-cache", validation_alias="MEDIA_CACHE_DIR")
+    max_size_mb: int = Field(default=1024)
+    scan_interval: int = Field(default=60)
+    sprite_tile_width: int = Field(default=160)
+    sprite_tile_height: int = Field(default=120)
+    sprite_columns: int = Field(default=10)
+    sprite_max_ids: int = Field(default=100)
+    sprite_quality: int = Field(default=80)
+    
+    @validator('max_size_mb')
+    def validate_max_size(cls, v):
+        if v < 1:
+            raise ValueError('Media cache size must be at least 1 MB')
+        return v
+
+
+class CompressionConfig(BaseSettings):
+    """HTTP response compression configuration settings."""
+    
+    model_config = {"env_prefix": "COMPRESSION_"}
+    
+    enabled: bool = Field(default=True)
+    minimum_size: int = Field(default=1024)
+    gzip_level: int = Field(default=6)
+    brotli_quality: int = Field(default=4)
+    # Cached variants are compressed once per TTL, so they can afford more effort
+    cached_gzip_level: int = Field(default=9)
+    cached_brotli_quality: int = Field(default=9)
+
+
+class SlowQueryConfig(BaseSettings):
+    """Slow-query log configuration settings."""
+    
+    model_config = {"env_prefix": "SLOW_QUERY_"}
+    
+    threshold_ms: int = Field(default=500)
+    buffer_size: int = Field(default=200)
+    # EXPLAIN ANALYZE re-runs the query, so plan capture is off unless sampled
+    explain_sample_rate: float = Field(default=0.0)
+    explain_timeout_ms: int = Field(default=10000)
+    
+    @validator('explain_sample_rate')
+    def validate_sample_rate(cls, v):
+        if not 0 <= v <= 1:
+            raise ValueError('Explain sample rate must be between 0 and 1')
+        return v
+
+
+class LoopMonitorConfig(BaseSettings):
+    """Event-loop lag monitor configuration settings."""
+    
+    model_config = {"env_prefix": "LOOP_MONITOR_"}
+    
+    enabled: bool = Field(default=True)
+    interval: float = Field(default=0.25)
+    stall_threshold_ms: int = Field(default=100)
+    history_size: int = Field(default=100)
+
+
+class ProfilingConfig(BaseSettings):
+    """On-demand profiling endpoint configuration settings."""
+    
+    model_config = {"env_prefix": "PROFILING_"}
+    
+    enabled: bool = Field(default=False)
+    max_duration: int = Field(default=60)
+    tracemalloc_frames: int = Field(default=10)
+
+
 class BusinessLogicConfig(BaseSettings):
     """Business logic configuration settings."""
     
@@ -182,6 +283,12 @@ class Settings(BaseSettings):
     # Feature configurations
     cache_ttl: CacheTTLConfig = Field(default_factory=CacheTTLConfig)
     background_tasks: BackgroundTaskConfig = Field(default_factory=BackgroundTaskConfig)
+    media_index: MediaIndexConfig = Field(default_factory=MediaIndexConfig)
+    media_cache: MediaCacheConfig = Field(default_factory=MediaCacheConfig)
+    compression: CompressionConfig = Field(default_factory=CompressionConfig)
+    slow_queries: SlowQueryConfig = Field(default_factory=SlowQueryConfig)
+    loop_monitor: LoopMonitorConfig = Field(default_factory=LoopMonitorConfig)
+    profiling: ProfilingConfig = Field(default_factory=ProfilingConfig)
     business_logic: BusinessLogicConfig = Field(default_factory=BusinessLogicConfig)
     security: SecurityConfig = Field(default_factory=SecurityConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
@@ -211,6 +318,22 @@ class Settings(BaseSettings):
     
     # WebSocket configuration
     websocket_poll_interval: int = Field(default=5, env="WEBSOCKET_POLL_INTERVAL")
+    websocket_replay_buffer_size: int = Field(default=1000, env="WEBSOCKET_REPLAY_BUFFER_SIZE")
+    
+    # Incremental violation polling (/api/violations/live?since=) configuration
+    violation_tail_size: int = Field(default=1000, env="VIOLATION_TAIL_SIZE")
+    violation_tail_refresh_interval: float = Field(default=2.0, env="VIOLATION_TAIL_REFRESH_INTERVAL")
+    
+    # Server-Sent Events configuration
+    sse_heartbeat_interval: int = Field(default=15, env="SSE_HEARTBEAT_INTERVAL")
+    sse_retry_ms: int = Field(default=3000, env="SSE_RETRY_MS")
+    sse_queue_size: int = Field(default=256, env="SSE_QUEUE_SIZE")
+    
+    # Prometheus metrics (/metrics) configuration
+    metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
+    
+    # Server-Timing header and ?debug=timing breakdown
+    server_timing_enabled: bool = Field(default=True, env="SERVER_TIMING_ENABLED")
     
     @validator('cameras')
     def validate_cameras(cls, v):
@@ -267,6 +390,11 @@ class Settings(BaseSettings):
         """Get thumbnail window for backward compatibility."""
         return 5  # 5 seconds window for thumbnail matching
     
+    @property
+    def cache_ttl_dashboard_overview(self) -> int:
+        """Get cache TTL for the dashboard overview."""
+        return 300  # 5 minutes
+    
     @property
     def cache_ttl_employee_violations(self) -> int:
         """Get cache TTL for employee violations."""
@@ -421,14 +549,19 @@ class CacheKeys:
         return f"employees:{employee_name}:activity:{hours}"
     
     @staticmethod
-    def camera_summary() -> str:
-        """Generate cache key for camera summary."""
-        return "cameras:summary"
+    def camera_summary(camera_name: str) -> str:
+        """Generate cache key for one camera's summary."""
+        return f"cameras:{camera_name}:summary"
     
     @staticmethod
-    def camera_activity(camera_name: str, hours: int = 24) -> str:
+    def camera_summaries() -> str:
+        """Generate cache key for the summaries of all cameras."""
+        return "cameras:summary:all"
+    
+    @staticmethod
+    def camera_activity(camera_name: str, hours: int = 24, limit: int = 100) -> str:
         """Generate cache key for camera activity."""
-        return f"cameras:{camera_name}:activity:{hours}"
+        return f"cameras:{camera_name}:activity:{hours}:{limit}"
     
     @staticmethod
     def camera_violations(camera_name: str, limit: int = 100, hours: int = 24) -> str:
@@ -439,6 +572,26 @@ class CacheKeys:
     def camera_status(camera_name: str) -> str:
         """Generate cache key for camera status."""
         return f"cameras:{camera_name}:status"
+    
+    @staticmethod
+    def dashboard_overview() -> str:
+        """Generate cache key for the dashboard overview."""
+        return "dashboard:overview"
+    
+    @staticmethod
+    def media_index(part: str) -> str:
+        """Generate cache key for a part of the media availability index."""
+        return f"media:index:{part}"
+    
+    @staticmethod
+    def background_leader() -> str:
+        """Generate cache key for the background task leader lease."""
+        return "background:leader"
+    
+    @staticmethod
+    def compressed(key: str, encoding: str) -> str:
+        """Generate cache key for a compressed response variant of a cached value."""
+        return f"{key}:enc:{encoding}"
 
 
 # Create global settings instance
@@ -7,20 +7,41 @@ connection pooling, and provides utilities for executing queries.
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Union
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 import asyncpg
 from asyncpg import Pool, Connection
 from .config import settings
+from .utils import metrics, tracing
+from .utils.serialization import dumps_text, loads
+from .utils.loop_monitor import LatencyWindow
+from .utils.slow_queries import SlowQueryLog
 
 logger = logging.getLogger(__name__)
 
 
+def _query_name() -> str:
+    """Name of the function that called a DatabaseManager query method (metric label)."""
+    code = sys._getframe(2).f_code
+    return getattr(code, "co_qualname", code.co_name)
+
+
 class DatabaseManager:
     """Manages PostgreSQL connection pool and provides query utilities."""
     
     def __init__(self):
         self.pool: Optional[Pool] = None
         self._connection_lock = asyncio.Lock()
+        self.pool_waits = LatencyWindow()
+        self.pool_waiting = 0
+        self.slow_queries = SlowQueryLog(
+            threshold_ms=settings.slow_queries.threshold_ms,
+            size=settings.slow_queries.buffer_size,
+            explain_sample_rate=settings.slow_queries.explain_sample_rate,
+            explain_timeout_ms=settings.slow_queries.explain_timeout_ms
+        )
     
     async def initialize(self) -> None:
         """Initialize the database connection pool."""
@@ -38,9 +59,11 @@ class DatabaseManager:
                 server_settings={
                     'application_name': 'frigate_dashboard_middleware',
                     'timezone': settings.timezone
-                }
+                },
+                init=self._init_connection
             )
             logger.info("Database connection pool initialized successfully")
+            metrics.track_pool(self)
             
             # Test the connection
             async with self.pool.acquire() as conn:
@@ -51,6 +74,30 @@ class DatabaseManager:
             logger.error(f"Failed to initialize database connection pool: {e}")
             raise
     
+    @staticmethod
+    async def _init_connection(conn: Connection) -> None:
+        """
+        Register type codecs on every new pool connection.
+        
+        json/jsonb columns are decoded into Python objects and numeric into
+        float by the driver, so queries can select ``data->'zones'`` and use
+        the result directly instead of parsing or converting each row.
+        """
+        for json_type in ('json', 'jsonb'):
+            await conn.set_type_codec(
+                json_type,
+                encoder=dumps_text,
+                decoder=loads,
+                schema='pg_catalog'
+            )
+        await conn.set_type_codec(
+            'numeric',
+            encoder=str,
+            decoder=float,
+            schema='pg_catalog',
+            format='text'
+        )
+    
     async def close(self) -> None:
         """Close the database connection pool."""
         if self.pool:
@@ -74,6 +121,61 @@ class DatabaseManager:
             logger.error(f"Database error during {operation}: {error}")
             raise
     
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[Connection]:
+        """Acquire a pool connection, recording the wait."""
+        started = time.perf_counter()
+        acquired = False
+        self.pool_waiting += 1
+        try:
+            async with self.pool.acquire() as conn:
+                acquired = True
+                self.pool_waiting -= 1
+                waited = time.perf_counter() - started
+                self.pool_waits.add(waited)
+                metrics.observe_pool_wait(waited)
+                metrics.sample_pools()
+                yield conn
+        finally:
+            if not acquired:
+                self.pool_waiting -= 1
+            metrics.sample_pools()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool usage and acquire wait statistics.
+        
+        Returns:
+            Pool size, idle and in-use connections, waiting acquires and wait percentiles
+        """
+        size = self.pool.get_size() if self.pool else 0
+        idle = self.pool.get_idle_size() if self.pool else 0
+        return {
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "max_size": self.pool.get_max_size() if self.pool else 0,
+            "waiting": self.pool_waiting,
+            "acquire_wait": self.pool_waits.get_stats()
+        }
+    
+    def _observe(
+        self,
+        name: str,
+        operation: str,
+        query: str,
+        args: tuple,
+        started: float,
+        rows: Optional[int] = None,
+        failed: bool = False
+    ) -> None:
+        """Record a finished query in the metrics, request trace and slow-query log."""
+        ended = time.perf_counter()
+        seconds = ended - started
+        tracing.record_span("db", name, started, ended)
+        metrics.observe_query(name, operation, seconds, rows=rows, failed=failed)
+        self.slow_queries.record(name, operation, query, args, seconds, rows=rows, failed=failed, pool=self.pool)
+    
     async def execute(self, query: str, *args) -> str:
         """
         Execute a query that doesn't return results.
@@ -88,10 +190,15 @@ class DatabaseManager:
         if not self.pool:
             raise RuntimeError("Database pool not initialized")
         
+        name = _query_name()
+        started = time.perf_counter()
         try:
-            async with self.pool.acquire() as conn:
-                return await conn.execute(query, *args)
+            async with self._acquire() as conn:
+                result = await conn.execute(query, *args)
+            self._observe(name, "execute", query, args, started)
+            return result
         except Exception as e:
+            self._observe(name, "execute", query, args, started, failed=True)
             await self._handle_connection_error(e, "execute")
             raise
     
@@ -109,11 +216,15 @@ class DatabaseManager:
         if not self.pool:
             raise RuntimeError("Database pool not initialized")
         
+        name = _query_name()
+        started = time.perf_counter()
         try:
-            async with self.pool.acquire() as conn:
+            async with self._acquire() as conn:
                 row = await conn.fetchrow(query, *args)
-                return dict(row) if row else None
+            self._observe(name, "fetch_one", query, args, started, rows=1 if row else 0)
+            return dict(row) if row else None
         except Exception as e:
+            self._observe(name, "fetch_one", query, args, started, failed=True)
             await self._handle_connection_error(e, "fetch_one")
             raise
     
@@ -131,11 +242,15 @@ class DatabaseManager:
         if not self.pool:
             raise RuntimeError("Database pool not initialized")
         
+        name = _query_name()
+        started = time.perf_counter()
         try:
-            async with self.pool.acquire() as conn:
+            async with self._acquire() as conn:
                 rows = await conn.fetch(query, *args)
-                return [dict(row) for row in rows]
+            self._observe(name, "fetch_all", query, args, started, rows=len(rows))
+            return [dict(row) for row in rows]
         except Exception as e:
+            self._observe(name, "fetch_all", query, args, started, failed=True)
             await self._handle_connection_error(e, "fetch_all")
             raise
     
@@ -154,9 +269,12 @@ class DatabaseManager:
         if not self.pool:
             raise RuntimeError("Database pool not initialized")
         
-        async with self.pool.acquire() as conn:
+        name = _query_name()
+        started = time.perf_counter()
+        async with self._acquire() as conn:
             rows = await conn.fetch(query, *args)
-            return [dict(row) for row in rows[:size]]
+        self._observe(name, "fetch_many", query, args, started, rows=len(rows))
+        return [dict(row) for row in rows[:size]]
     
     async def transaction(self):
         """
@@ -326,9 +444,7 @@ class QueryBuilder:
             rp.zones,
             COALESCE(nf.employee_name, 'Unknown') as employee_name,
             COALESCE(nf.confidence::float, 0.0) as confidence,
-            rs.thumb_path as thumbnail_url,
-            CONCAT('{settings.video_api_base_url}/clip/', rp.source_id) as video_url,
-            CONCAT('{settings.video_api_base_url}/snapshot/', rp.camera, '/', rp.source_id) as snapshot_url
+            rs.thumb_path as thumbnail_url
         FROM recent_phones rp
         LEFT JOIN nearby_faces nf USING (timestamp, camera)
         LEFT JOIN reviewsegment rs ON 
@@ -6,13 +6,17 @@ cache operations, and parameter validation following FastAPI best practices.
 """
 
 import logging
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import Generator, Iterable, Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from .database import DatabaseManager, get_database, db_manager
 from .cache import CacheManager, get_cache, cache_manager
 from .config import settings
+from .services.media_index import MEDIA_MODES
+from .utils.fields import FieldSet, parse_fields
+from .utils.media_urls import URL_FORMATS
+from .utils.pagination import Cursor, decode_cursor
 from .utils.errors import (
     validate_positive_integer,
     validate_hours_range,
@@ -138,6 +142,103 @@ def validate_hours_parameter(hours: int = 24) -> int:
         )
 
 
+def validate_media_mode_parameter(media: str = "all") -> str:
+    """
+    Validate media URL mode parameter.
+    
+    Args:
+        media: "all" to return every URL, "flag" to add availability flags,
+            "omit" to also drop URLs whose media has expired
+        
+    Returns:
+        Validated media mode
+        
+    Raises:
+        HTTPException: If mode is invalid
+    """
+    if media not in MEDIA_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Media mode must be one of: {', '.join(MEDIA_MODES)}"
+        )
+    
+    return media
+
+
+def validate_url_format_parameter(urls: str = "full") -> str:
+    """
+    Validate media URL format parameter.
+    
+    Args:
+        urls: "full" to spell out media URLs per row, "compact" to return
+            URL templates once and only IDs per row
+        
+    Returns:
+        Validated URL format
+        
+    Raises:
+        HTTPException: If format is invalid
+    """
+    if urls not in URL_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"URL format must be one of: {', '.join(URL_FORMATS)}"
+        )
+    
+    return urls
+
+
+def fields_parameter(allowed: Iterable[str]):
+    """
+    Build a dependency validating a sparse fieldset parameter.
+    
+    Args:
+        allowed: Field names the endpoint returns
+        
+    Returns:
+        Dependency resolving to the requested field set (None for all fields)
+    """
+    allowed = tuple(allowed)
+    
+    def validate_fields_parameter(
+        fields: Optional[str] = Query(None, description=f"Comma-separated subset of: {', '.join(allowed)}")
+    ) -> FieldSet:
+        try:
+            return parse_fields(fields, allowed)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(e)
+            )
+    
+    return Depends(validate_fields_parameter)
+
+
+def validate_cursor_parameter(cursor: Optional[str] = None) -> Optional[Cursor]:
+    """
+    Validate pagination cursor parameter.
+    
+    Args:
+        cursor: Opaque cursor token from a previous page's next_cursor
+        
+    Returns:
+        Decoded cursor, or None for the first page
+        
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+    
+    try:
+        return decode_cursor(cursor)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.message
+        )
+
+
 def validate_employee_name_parameter(employee_name: str) -> str:
     """
     Validate employee name parameter with guard clauses.
@@ -265,6 +366,9 @@ CacheDep = Depends(get_cache_manager)
 CameraDep = Depends(validate_camera_parameter)
 LimitDep = Depends(validate_limit_parameter)
 HoursDep = Depends(validate_hours_parameter)
+MediaModeDep = Depends(validate_media_mode_parameter)
+CursorDep = Depends(validate_cursor_parameter)
+UrlFormatDep = Depends(validate_url_format_parameter)
 EmployeeNameDep = Depends(validate_employee_name_parameter)
 QueryDep = Depends(validate_query_parameter)
 OptionalAuthDep = Depends(get_optional_auth)
@@ -6,10 +6,11 @@ middleware, CORS configuration, and lifespan management following
 FastAPI best practices from awesome-cursorrules.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
-from typing import Dict, Any
-from fastapi import FastAPI, Request, status
+from typing import Dict, Any, Optional
+from fastapi import FastAPI, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse, Response
@@ -21,7 +22,8 @@ import yaml
 from .config import settings
 from .database import db_manager
 from .cache import cache_manager
-from .routers import violations, employees, cameras, websocket, recent_media, zones, attendance, dashboard
+from .services.frigate_client import frigate_client
+from .routers import violations, employees, cameras, websocket, events, recent_media, media, zones, attendance, dashboard
 from .services.background import start_background_tasks, stop_background_tasks
 from .utils.response_formatter import create_error_json_response, create_json_response
 from .utils.errors import (
@@ -33,6 +35,10 @@ from .utils.errors import (
     handle_database_error,
     handle_cache_error
 )
+from .utils import metrics, tracing
+from .utils.loop_monitor import loop_monitor
+from .utils.serialization import FastJSONResponse
+from .utils.compression import CompressionMiddleware
 from .utils.time import timestamp_to_iso
 
 # Configure logging with improved settings
@@ -57,6 +63,10 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.app_name} v{settings.app_version}...")
     
     try:
+        # Start sampling event loop lag before anything can block it
+        if settings.loop_monitor.enabled:
+            loop_monitor.start()
+        
         # Initialize database connection pool with error handling
         await db_manager.initialize()
         logger.info("Database connection pool initialized successfully")
@@ -65,6 +75,10 @@ async def lifespan(app: FastAPI):
         await cache_manager.initialize()
         logger.info("Redis cache initialized successfully")
         
+        # Initialize pooled Frigate HTTP client
+        await frigate_client.initialize()
+        logger.info("Frigate HTTP client initialized successfully")
+        
         # Start background tasks with error handling
         await start_background_tasks()
         logger.info("Background tasks started successfully")
@@ -85,6 +99,10 @@ async def lifespan(app: FastAPI):
         await stop_background_tasks()
         logger.info("Background tasks stopped successfully")
         
+        # Close Frigate HTTP client
+        await frigate_client.close()
+        logger.info("Frigate HTTP client closed successfully")
+        
         # Close cache connections
         await cache_manager.close()
         logger.info("Cache connections closed successfully")
@@ -93,6 +111,8 @@ async def lifespan(app: FastAPI):
         await db_manager.close()
         logger.info("Database connections closed successfully")
         
+        await loop_monitor.stop()
+        
         logger.info("Application shutdown completed successfully")
         
     except Exception as e:
@@ -107,6 +127,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -119,6 +140,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses negotiated by Accept-Encoding
+if settings.compression.enabled:
+    app.add_middleware(CompressionMiddleware)
+
 # Add trusted host middleware with improved configuration
 app.add_middleware(
     TrustedHostMiddleware,
@@ -126,25 +151,52 @@ app.add_middleware(
 )
 
 
+def _route_template(request: Request) -> str:
+    """Path template of the matched route (a bounded metric label)."""
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
 # Request timing middleware with improved error handling
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     """
-    Add processing time to response headers with error handling.
+    Add processing time and Server-Timing breakdown to response headers with error handling.
+    
+    With ``?debug=timing`` a JSON response is replaced by a JSON breakdown
+    of the database, cache and Frigate calls made while handling the
+    request. Event streams and media files keep their body (draining it
+    would hang on a stream) and only get the Server-Timing header.
     
     Args:
         request: FastAPI request object
         call_next: Next middleware in chain
         
     Returns:
-        Response with timing header
+        Response with timing headers
     """
     start_time = time.time()
+    trace, token = tracing.start_trace()
     
     try:
         response = await call_next(request)
+        if (settings.server_timing_enabled and request.query_params.get("debug") == "timing"
+                and response.headers.get("content-type", "").startswith("application/json")):
+            # Let the endpoint finish producing its body before reporting
+            async for _ in response.body_iterator:
+                pass
+            total = time.perf_counter() - trace.started
+            response = FastJSONResponse(content={
+                "method": request.method,
+                "route": _route_template(request),
+                "status_code": response.status_code,
+                **trace.breakdown(total)
+            })
         process_time = time.time() - start_time
         response.headers["X-Process-Time"] = str(process_time)
+        if settings.server_timing_enabled:
+            response.headers["Server-Timing"] = trace.server_timing(time.perf_counter() - trace.started)
+        metrics.observe_request(request.method, _route_template(request), response.status_code, process_time)
         return response
     except Exception as e:
         logger.error(f"Error in request processing: {e}", exc_info=True)
@@ -155,7 +207,10 @@ async def add_process_time_header(request: Request, call_next):
             details={"processing_time": process_time}
         )
         error_response.headers["X-Process-Time"] = str(process_time)
+        metrics.observe_request(request.method, _route_template(request), error_response.status_code, process_time)
         return error_response
+    finally:
+        tracing.end_trace(token)
 
 
 # Global exception handlers with improved error handling
@@ -245,7 +300,9 @@ try:
     app.include_router(employees.router)
     app.include_router(cameras.router)
     app.include_router(websocket.router)
+    app.include_router(events.router)
     app.include_router(recent_media.router)
+    app.include_router(media.router)
     app.include_router(zones.router)
     app.include_router(attendance.router)
     app.include_router(dashboard.router)
@@ -288,7 +345,9 @@ async def root() -> JSONResponse:
                 "attendance": "/api/attendance/*",
                 "dashboard": "/api/dashboard/*",
                 "recent_media": "/api/recent-media/*",
-                "websocket": "/ws/*"
+                "media": "/api/media/*",
+                "websocket": "/ws/*",
+                "events": "/api/events/*"
             },
             "timestamp": timestamp_to_iso(time.time())
         }
@@ -467,6 +526,25 @@ async def cache_stats() -> JSONResponse:
         )
 
 
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    """
+    Expose request, database, cache, WebSocket and background task metrics.
+    
+    Returns:
+        Response in the Prometheus text exposition format
+    """
+    if not metrics.ENABLED:
+        return create_error_json_response(
+            message="Metrics are disabled",
+            status_code=status.HTTP_404_NOT_FOUND
+        )
+    
+    body, content_type = metrics.render()
+    return Response(content=body, headers={"Content-Type": content_type})
+
+
 # System status endpoint with improved error handling
 @app.get("/api/status", tags=["admin"])
 async def system_status() -> JSONResponse:
@@ -478,6 +556,7 @@ async def system_status() -> JSONResponse:
     """
     try:
         from .services.background import get_background_status
+        from .services.violation_tail import violation_tail
         from .utils.time import get_current_timestamp
         
         # Get background task status
@@ -493,6 +572,7 @@ async def system_status() -> JSONResponse:
             "database": {
                 "status": "healthy" if db_health else "unhealthy",
                 "pool_size": db_manager.pool.get_size() if db_manager.pool else 0,
+                "pool": db_manager.get_pool_stats(),
                 "host": settings.database.host,
                 "port": settings.database.port
             },
@@ -503,6 +583,8 @@ async def system_status() -> JSONResponse:
                 "port": settings.cache.port
             },
             "background_tasks": bg_status,
+            "violation_tail": violation_tail.get_stats(),
+            "event_loop": loop_monitor.get_stats(),
             "configuration": {
                 "app_name": settings.app_name,
                 "app_version": settings.app_version,
@@ -541,7 +623,7 @@ async def restart_background_task(task_name: str) -> JSONResponse:
         from .services.background import restart_background_task
         
         # Validate task name
-        valid_tasks = ["violation_polling", "stats_refresh", "cache_cleanup", "health_check"]
+        valid_tasks = ["violation_polling", "stats_refresh", "cache_cleanup", "health_check", "media_index"]
         if task_name not in valid_tasks:
             return create_error_json_response(
                 message=f"Invalid task name. Valid tasks: {', '.join(valid_tasks)}",
@@ -569,6 +651,172 @@ async def restart_background_task(task_name: str) -> JSONResponse:
         )
 
 
+# Admin endpoints for the slow-query log
+@app.get("/api/admin/slow-queries", tags=["admin"])
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Maximum number of entries to return")
+) -> JSONResponse:
+    """
+    Get the slowest recorded queries of this worker, with captured plans.
+    
+    Args:
+        limit: Maximum number of entries to return
+        
+    Returns:
+        JSONResponse with slow-query log statistics and entries
+    """
+    return create_json_response(
+        data={
+            "stats": db_manager.slow_queries.get_stats(),
+            "queries": db_manager.slow_queries.get_entries(limit)
+        },
+        message="Slow queries retrieved successfully"
+    )
+
+
+@app.delete("/api/admin/slow-queries", tags=["admin"])
+async def clear_slow_queries() -> JSONResponse:
+    """
+    Clear the slow-query log of this worker.
+    
+    Returns:
+        JSONResponse with operation result
+    """
+    db_manager.slow_queries.clear()
+    return create_json_response(
+        data={"cleared": True},
+        message="Slow-query log cleared"
+    )
+
+
+# On-demand profiling endpoints (PROFILING_ENABLED)
+def _profiling_disabled_response() -> JSONResponse:
+    return create_error_json_response(
+        message="Profiling is disabled",
+        status_code=status.HTTP_404_NOT_FOUND
+    )
+
+
+@app.get("/api/admin/profile/cpu", tags=["admin"])
+async def profile_cpu(
+    seconds: float = Query(10, gt=0, description="Seconds to sample for"),
+    interval_ms: float = Query(5, ge=1, le=1000, description="Milliseconds between samples"),
+    all_threads: bool = Query(False, description="Sample every thread, not only the event loop")
+) -> Response:
+    """
+    Run a sampling CPU profile of this worker.
+    
+    Args:
+        seconds: Seconds to sample for (capped at PROFILING_MAX_DURATION)
+        interval_ms: Milliseconds between samples
+        all_threads: Sample every thread, not only the event loop
+        
+    Returns:
+        Collapsed stacks (flamegraph.pl / speedscope input) as text
+    """
+    if not settings.profiling.enabled:
+        return _profiling_disabled_response()
+    
+    import threading
+    from .utils.profiling import ProfilerBusyError, cpu_profiler
+    
+    try:
+        profile = await asyncio.to_thread(
+            cpu_profiler.profile,
+            min(seconds, settings.profiling.max_duration),
+            interval_ms / 1000,
+            None if all_threads else threading.get_ident()
+        )
+    except ProfilerBusyError as e:
+        return create_error_json_response(
+            message=str(e),
+            status_code=status.HTTP_409_CONFLICT
+        )
+    
+    return Response(
+        content=profile["collapsed"],
+        media_type="text/plain",
+        headers={
+            "Content-Disposition": f"attachment; filename=cpu-profile-{int(time.time())}.folded",
+            "X-Profile-Samples": str(profile["samples"]),
+            "X-Profile-Duration": str(profile["duration"])
+        }
+    )
+
+
+@app.post("/api/admin/profile/memory/start", tags=["admin"])
+async def start_memory_profile(
+    frames: Optional[int] = Query(None, ge=1, le=100, description="Stack frames kept per allocation")
+) -> JSONResponse:
+    """
+    Start tracing allocations and take the baseline snapshot.
+    
+    Returns:
+        JSONResponse with tracing status
+    """
+    if not settings.profiling.enabled:
+        return _profiling_disabled_response()
+    
+    from .utils.profiling import memory_profiler
+    
+    memory_profiler.start(frames or settings.profiling.tracemalloc_frames)
+    return create_json_response(
+        data=memory_profiler.get_status(),
+        message="Memory tracing started"
+    )
+
+
+@app.get("/api/admin/profile/memory", tags=["admin"])
+async def get_memory_profile(
+    limit: int = Query(25, ge=1, le=500, description="Allocation sites per list"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$", description="Group allocations by"),
+    reset: bool = Query(False, description="Use this snapshot as the new baseline")
+) -> JSONResponse:
+    """
+    Snapshot traced allocations and diff them against the baseline.
+    
+    Returns:
+        JSONResponse with top allocation sites and growth since the baseline
+    """
+    if not settings.profiling.enabled:
+        return _profiling_disabled_response()
+    
+    from .utils.profiling import memory_profiler
+    
+    try:
+        report = await asyncio.to_thread(memory_profiler.report, limit, group_by, reset)
+    except RuntimeError as e:
+        return create_error_json_response(
+            message=str(e),
+            status_code=status.HTTP_409_CONFLICT
+        )
+    
+    return create_json_response(
+        data=report,
+        message="Memory snapshot compared with baseline"
+    )
+
+
+@app.post("/api/admin/profile/memory/stop", tags=["admin"])
+async def stop_memory_profile() -> JSONResponse:
+    """
+    Stop tracing allocations and release the snapshots.
+    
+    Returns:
+        JSONResponse with tracing status
+    """
+    if not settings.profiling.enabled:
+        return _profiling_disabled_response()
+    
+    from .utils.profiling import memory_profiler
+    
+    memory_profiler.stop()
+    return create_json_response(
+        data=memory_profiler.get_status(),
+        message="Memory tracing stopped"
+    )
+
+
 # Documentation download endpoints with improved error handling
 @app.get("/docs/download/openapi.json", tags=["docs"])
 async def download_openapi_json() -> Response:
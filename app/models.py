@@ -65,6 +65,13 @@ class PaginationInfo(BaseModel):
     has_prev: bool = Field(..., description="Whether there is a previous page")
 
 
+class CursorPaginationInfo(BaseModel):
+    """Keyset (cursor) pagination information model."""
+    limit: int = Field(..., description="Items per page")
+    has_next: bool = Field(..., description="Whether there is a next page")
+    next_cursor: Optional[str] = Field(None, description="Cursor to pass to fetch the next page")
+
+
 # Violation Models
 class ViolationData(BaseModel):
     """Individual violation data model."""
@@ -85,6 +92,7 @@ class ViolationData(BaseModel):
 class LiveViolationsResponse(BaseResponse):
     """Response model for live violations endpoint."""
     data: List[ViolationData] = Field(..., description="List of recent violations")
+    pagination: Optional[CursorPaginationInfo] = Field(None, description="Pagination information")
 
 
 class HourlyTrendData(BaseModel):
@@ -146,6 +154,7 @@ class CameraSummaryResponse(BaseResponse):
 
 class CameraActivityData(BaseModel):
     """Camera activity data model."""
+    id: Optional[str] = Field(None, description="Timeline source ID")
     timestamp: float = Field(..., description="Activity timestamp")
     timestamp_iso: str = Field(..., description="ISO format timestamp")
     timestamp_readable: str = Field(..., description="Human readable timestamp")
@@ -159,7 +168,7 @@ class CameraActivityData(BaseModel):
 class CameraActivityResponse(BaseResponse):
     """Response model for camera activity endpoint."""
     data: List[CameraActivityData] = Field(..., description="List of camera activities")
-    pagination: Optional[PaginationInfo] = Field(None, description="Pagination information")
+    pagination: Optional[CursorPaginationInfo] = Field(None, description="Pagination information")
 
 
 # Dashboard Models
@@ -210,7 +219,10 @@ class WebSocketMessage(BaseModel):
     """WebSocket message model."""
     type: str = Field(..., description="Message type")
     data: Dict[str, Any] = Field(..., description="Message data")
-    timestamp: str = Field(..., description="Message timestamp")
+    timestamp: str = Field(
+        default_factory=lambda: str(datetime.now().timestamp()),
+        description="Message timestamp"
+    )
 
 
 class ViolationWebSocketMessage(WebSocketMessage):
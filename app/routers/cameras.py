@@ -11,7 +11,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from ..database import DatabaseManager
 from ..cache import CacheManager
-from ..dependencies import DatabaseDep, CacheDep, CameraDep, LimitDep, HoursDep
+from ..dependencies import DatabaseDep, CacheDep, CameraDep, LimitDep, HoursDep, CursorDep, UrlFormatDep, fields_parameter
 from ..config import settings
 from ..models import (
     CameraSummaryResponse,
@@ -22,6 +22,9 @@ from ..models import (
 from ..utils.response_formatter import create_json_response, create_error_json_response
 from ..services.queries import CameraQueries
 from ..utils.formatting import format_camera_summary, format_camera_activity_data, paginate_results
+from ..utils.pagination import Cursor, paginate_keyset
+from ..utils.media_urls import compact_media_urls, url_templates
+from ..utils.fields import FieldSet, fields_key, select_fields
 from ..config import CacheKeys, settings
 from ..utils.errors import ValidationError, NotFoundError, DatabaseError, CacheError
 
@@ -29,6 +32,21 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/cameras", tags=["cameras"])
 
+# Media linked from camera activity and violation rows
+CAMERA_ACTIVITY_MEDIA = ("snapshot",)
+LIVE_VIOLATION_MEDIA = ("snapshot",)
+
+# Fields of a camera list entry, and the 24h aggregate each one reads
+CAMERA_LIST_FIELDS = (
+    "name", "total_events_24h", "person_events_24h", "phone_events_24h", "last_activity", "status"
+)
+CAMERA_LIST_AGGREGATES = {
+    "total_events": "COUNT(*)",
+    "last_activity": "MAX(timestamp)",
+    "person_count": "COUNT(*) FILTER (WHERE data->>'label' = 'person')",
+    "phone_count": "COUNT(*) FILTER (WHERE data->>'label' = 'cell phone')"
+}
+
 
 @router.get(
     "/summary",
@@ -62,40 +80,27 @@ async def get_camera_summary(
     """
     try:
         # Generate cache key
-        cache_key = "cameras:summary:all"
+        cache_key = CacheKeys.camera_summaries()
         
         # Try to get from cache first
         cached_data = await cache.get(cache_key)
         if cached_data is not None:
             logger.debug(f"Cache hit for camera summary: {cache_key}")
-            return create_json_response(data=cached_data, message="Camera summaries retrieved from cache")
+            return create_json_response(data=cached_data, message="Camera summaries retrieved from cache", cache_key=cache_key)
         
-        # Query database for all cameras
+        # Query database for all cameras in one grouped pass
         logger.info("Fetching camera summaries for all cameras")
-        camera_summaries = []
-        
-        for camera in settings.CAMERAS:
-            try:
-                summary_data = await CameraQueries.get_camera_summary(db=db, camera=camera)
-                if summary_data:
-                    formatted_summary = format_camera_summary(summary_data)
-                    camera_summaries.append(formatted_summary)
-            except Exception as e:
-                logger.warning(f"Failed to get summary for camera {camera}: {e}")
-                # Add empty summary for failed camera
-                camera_summaries.append({
-                    "camera": camera,
-                    "active_people": 0,
-                    "total_detections": 0,
-                    "phone_violations": 0,
-                    "recording_status": "error",
-                    "last_activity": None,
-                    "last_activity_iso": None,
-                    "last_activity_relative": None
-                })
-        
-        # Cache the results
-        await cache.set(cache_key, camera_summaries, settings.cache_ttl_camera_summary)
+        summaries = await CameraQueries.get_camera_summaries(db=db, cameras=settings.CAMERAS)
+        camera_summaries = [format_camera_summary(summary) for summary in summaries]
+        
+        # Cache the results, plus each camera's own summary
+        await cache.set_many(
+            {
+                cache_key: camera_summaries,
+                **{CacheKeys.camera_summary(summary["camera"]): summary for summary in camera_summaries}
+            },
+            settings.cache_ttl_camera_summary
+        )
         logger.debug(f"Cached camera summaries: {cache_key}")
         
         return create_json_response(data=camera_summaries, message="Camera summaries retrieved successfully")
@@ -143,13 +148,13 @@ async def get_single_camera_summary(
     """
     try:
         # Generate cache key
-        cache_key = CacheKeys.camera_summary()
+        cache_key = CacheKeys.camera_summary(camera_name)
         
         # Try to get from cache first
         cached_data = await cache.get(cache_key)
         if cached_data is not None:
             logger.debug(f"Cache hit for camera summary: {cache_key}")
-            return create_json_response(data=[cached_data], message="Camera summary retrieved from cache")
+            return create_json_response(data=[cached_data], message="Camera summary retrieved from cache", cache_key=cache_key)
         
         # Query database
         logger.info(f"Fetching summary for camera: {camera_name}")
@@ -194,6 +199,8 @@ async def get_camera_activity(
     camera_name: str,
     hours: int = HoursDep,
     limit: int = LimitDep,
+    cursor: Optional[Cursor] = CursorDep,
+    urls: str = UrlFormatDep,
     db: DatabaseManager = DatabaseDep,
     cache: CacheManager = CacheDep
 ) -> dict:
@@ -207,10 +214,15 @@ async def get_camera_activity(
     - Confidence scores
     - Snapshot URLs
     
+    Results are paged newest first; pass the previous page's
+    pagination.next_cursor as cursor to fetch the next page.
+    
     Args:
         camera_name: Name of the camera
         hours: Hours to look back (1-168, default 24)
         limit: Maximum number of results (1-1000)
+        cursor: Cursor from the previous page (omit for the first page)
+        urls: Media URL format (full, or compact for url_templates plus IDs)
         db: Database manager dependency
         cache: Cache manager dependency
         
@@ -221,63 +233,60 @@ async def get_camera_activity(
         HTTPException: If database query fails or camera not found
     """
     try:
-        # Generate cache key
-        cache_key = CacheKeys.camera_activity(camera_name, hours)
+        # Only the first page is cached; deeper pages are cheap index seeks
+        cache_key = CacheKeys.camera_activity(camera_name, hours, limit) if cursor is None else None
         
         # Try to get from cache first
-        cached_data = await cache.get(cache_key)
-        if cached_data is not None:
-            logger.debug(f"Cache hit for camera activity: {cache_key}")
-            return create_json_response(data=cached_data, message="Camera activity retrieved from cache")
-        
-        # Query database
+        if cache_key is not None:
+            cached_data = await cache.get(cache_key)
+            if cached_data is not None:
+                logger.debug(f"Cache hit for camera activity: {cache_key}")
+                _, pagination = paginate_keyset(cached_data["activities"], limit, lookahead=False)
+                templates = None
+                if urls == "compact":
+                    cached_data["activities"], templates = compact_media_urls(cached_data["activities"], CAMERA_ACTIVITY_MEDIA)
+                return create_json_response(
+                    data=cached_data,
+                    message="Camera activity retrieved from cache",
+                    cache_key=cache_key if urls == "full" else None,
+                    pagination=pagination,
+                    url_templates=templates
+                )
+        
+        # Query database (one extra row tells whether another page exists)
         logger.info(f"Fetching activity for camera {camera_name}: hours={hours}, limit={limit}")
         raw_activity = await CameraQueries.get_camera_activity(
             db=db,
             camera=camera_name,
             hours=hours,
-            limit=limit
+            limit=limit + 1,
+            cursor=cursor
         )
+        page, pagination = paginate_keyset(raw_activity, limit)
         
         # Format the data
-        formatted_activity = format_camera_activity_data(raw_activity)
-        
-        # Add pagination info if needed
-        pagination_info = None
-        if len(formatted_activity) >= limit:
-            # Get total count for pagination
-            count_query = """
-            SELECT COUNT(*) as total
-            FROM timeline
-            WHERE camera = $1
-            AND timestamp > (EXTRACT(EPOCH FROM NOW()) - $2)
-            AND data->>'label' IN ('person', 'cell phone', 'face')
-            """
-            count_result = await db.fetch_one(count_query, camera_name, hours * 3600)
-            total_count = count_result['total'] if count_result else 0
-            
-            pagination_info = {
-                "page": 1,
-                "per_page": limit,
-                "total": total_count,
-                "pages": (total_count + limit - 1) // limit,
-                "has_next": total_count > limit,
-                "has_prev": False
-            }
+        formatted_activity = format_camera_activity_data(page, urls)
         
         # Prepare response data
         response_data = {
             "activities": formatted_activity,
             "camera": camera_name,
-            "time_period_hours": hours,
-            "pagination": pagination_info
+            "time_period_hours": hours
         }
         
-        # Cache the results
-        await cache.set(cache_key, response_data, settings.cache_ttl_camera_activity)
-        logger.debug(f"Cached camera activity: {cache_key}")
+        # Cache the results (full rows only; compact rows are stripped from them)
+        if cache_key is not None and urls == "full":
+            await cache.set(cache_key, response_data, settings.cache_ttl_camera_activity)
+            logger.debug(f"Cached camera activity: {cache_key}")
+        
+        templates = url_templates(CAMERA_ACTIVITY_MEDIA) if urls == "compact" else None
         
-        return create_json_response(data=response_data, message=f"Activity for camera {camera_name} retrieved successfully")
+        return create_json_response(
+            data=response_data,
+            message=f"Activity for camera {camera_name} retrieved successfully",
+            pagination=pagination,
+            url_templates=templates
+        )
         
     except HTTPException:
         raise
@@ -299,6 +308,7 @@ async def get_camera_violations(
     camera_name: str,
     hours: int = HoursDep,
     limit: int = LimitDep,
+    urls: str = UrlFormatDep,
     db: DatabaseManager = DatabaseDep,
     cache: CacheManager = CacheDep
 ) -> dict:
@@ -312,6 +322,7 @@ async def get_camera_violations(
         camera_name: Name of the camera
         hours: Hours to look back (1-168, default 24)
         limit: Maximum number of results (1-1000)
+        urls: Media URL format (full, or compact for url_templates plus IDs)
         db: Database manager dependency
         cache: Cache manager dependency
         
@@ -326,7 +337,15 @@ async def get_camera_violations(
         cached_data = await cache.get(cache_key)
         if cached_data is not None:
             logger.debug(f"Cache hit for camera violations: {cache_key}")
-            return create_json_response(data=cached_data, message="Camera violations retrieved from cache")
+            templates = None
+            if urls == "compact":
+                cached_data["violations"], templates = compact_media_urls(cached_data["violations"], LIVE_VIOLATION_MEDIA)
+            return create_json_response(
+                data=cached_data,
+                message="Camera violations retrieved from cache",
+                cache_key=cache_key if urls == "full" else None,
+                url_templates=templates
+            )
         
         # Query database for violations
         logger.info(f"Fetching violations for camera {camera_name}: hours={hours}, limit={limit}")
@@ -341,7 +360,7 @@ async def get_camera_violations(
         
         # Format the data
         from ..utils.formatting import format_violation_data
-        formatted_violations = [format_violation_data(violation) for violation in raw_violations]
+        formatted_violations = [format_violation_data(violation, urls) for violation in raw_violations]
         
         # Prepare response data
         response_data = {
@@ -351,11 +370,18 @@ async def get_camera_violations(
             "total_violations": len(formatted_violations)
         }
         
-        # Cache the results
-        await cache.set(cache_key, response_data, settings.cache_ttl_camera_activity)
-        logger.debug(f"Cached camera violations: {cache_key}")
+        # Cache the results (full rows only; compact rows are stripped from them)
+        if urls == "full":
+            await cache.set(cache_key, response_data, settings.cache_ttl_camera_activity)
+            logger.debug(f"Cached camera violations: {cache_key}")
         
-        return create_json_response(data=response_data, message=f"Violations for camera {camera_name} retrieved successfully")
+        templates = url_templates(LIVE_VIOLATION_MEDIA) if urls == "compact" else None
+        
+        return create_json_response(
+            data=response_data,
+            message=f"Violations for camera {camera_name} retrieved successfully",
+            url_templates=templates
+        )
         
     except HTTPException:
         raise
@@ -403,7 +429,7 @@ async def get_camera_status(
         cached_data = await cache.get(cache_key)
         if cached_data is not None:
             logger.debug(f"Cache hit for camera status: {cache_key}")
-            return create_json_response(data=cached_data, message="Camera status retrieved from cache")
+            return create_json_response(data=cached_data, message="Camera status retrieved from cache", cache_key=cache_key)
         
         # Query database for status information
         logger.info(f"Fetching status for camera: {camera_name}")
@@ -492,6 +518,7 @@ async def get_camera_status(
     description="Get list of all available cameras with basic information"
 )
 async def list_cameras(
+    fields: FieldSet = fields_parameter(CAMERA_LIST_FIELDS),
     db: DatabaseManager = DatabaseDep,
     cache: CacheManager = CacheDep
 ) -> dict:
@@ -499,9 +526,11 @@ async def list_cameras(
     Get list of all available cameras.
     
     This endpoint returns a list of all cameras with basic information
-    including their current status and last activity.
+    including their current status and last activity. With fields=...,
+    only the aggregates behind the requested fields are computed.
     
     Args:
+        fields: Optional sparse fieldset
         db: Database manager dependency
         cache: Cache manager dependency
         
@@ -512,52 +541,53 @@ async def list_cameras(
         # Generate cache key
         cache_key = "cameras:list"
         
-        # Try to get from cache first
+        # Try to get from cache first; the full list serves any subset
         cached_data = await cache.get(cache_key)
         if cached_data is not None:
             logger.debug(f"Cache hit for camera list: {cache_key}")
-            return create_json_response(data=cached_data, message="Camera list retrieved from cache")
+            if fields is not None:
+                return create_json_response(data=select_fields(cached_data, fields), message="Camera list retrieved from cache")
+            return create_json_response(data=cached_data, message="Camera list retrieved from cache", cache_key=cache_key)
+        
+        if fields is not None:
+            cache_key = f"cameras:list{fields_key(fields)}"
+            cached_data = await cache.get(cache_key)
+            if cached_data is not None:
+                return create_json_response(data=cached_data, message="Camera list retrieved from cache")
         
         # Query database for camera information
         logger.info("Fetching camera list")
         
-        # Simple query to get all unique cameras from database
-        query = """
-            SELECT DISTINCT camera 
-            FROM timeline 
-            ORDER BY camera
-        """
-        
-        result = await db.fetch_all(query)
-        cameras = [row['camera'] for row in result]
+        # Total events are always needed for sorting and status
+        needed = {"total_events"}
+        if fields is None or "last_activity" in fields:
+            needed.add("last_activity")
+        if fields is None or "person_events_24h" in fields:
+            needed.add("person_count")
+        if fields is None or "phone_events_24h" in fields:
+            needed.add("phone_count")
+        
+        # Every camera with its 24h aggregates in one grouped query
+        rows = await CameraQueries.get_camera_list(
+            db=db,
+            aggregates={name: expression for name, expression in CAMERA_LIST_AGGREGATES.items() if name in needed}
+        )
         
         camera_list = []
-        for camera in cameras:
-            # Get basic info for each camera
-            info_query = """
-            SELECT 
-                COUNT(*) as total_events,
-                MAX(timestamp) as last_activity,
-                COUNT(*) FILTER (WHERE data->>'label' = 'person') as person_count,
-                COUNT(*) FILTER (WHERE data->>'label' = 'cell phone') as phone_count
-            FROM timeline
-            WHERE camera = $1
-            AND timestamp > (EXTRACT(EPOCH FROM NOW()) - 86400)
-            """
-            camera_info = await db.fetch_one(info_query, camera)
-            
+        for camera_info in rows:
             camera_data = {
-                "name": camera,
-                "total_events_24h": camera_info.get('total_events', 0) if camera_info else 0,
-                "person_events_24h": camera_info.get('person_count', 0) if camera_info else 0,
-                "phone_events_24h": camera_info.get('phone_count', 0) if camera_info else 0,
-                "last_activity": camera_info.get('last_activity') if camera_info else None,
-                "status": "active" if camera_info and camera_info.get('total_events', 0) > 0 else "inactive"
+                "name": camera_info['camera'],
+                "total_events_24h": camera_info.get('total_events') or 0,
+                "person_events_24h": camera_info.get('person_count') or 0,
+                "phone_events_24h": camera_info.get('phone_count') or 0,
+                "last_activity": camera_info.get('last_activity'),
+                "status": "active" if (camera_info.get('total_events') or 0) > 0 else "inactive"
             }
             camera_list.append(camera_data)
         
         # Sort by activity
         camera_list.sort(key=lambda x: x['total_events_24h'], reverse=True)
+        camera_list = select_fields(camera_list, fields)
         
         # Cache the results
         await cache.set(cache_key, camera_list, 300)  # 5 minute cache
@@ -12,7 +12,7 @@ from pydantic import BaseModel, Field
 from app.database import DatabaseManager, get_database
 from app.cache import CacheManager, get_cache
 from app.config import settings
-from app.utils.response_formatter import format_success_response, format_error_response
+from app.utils.response_formatter import create_json_response, format_error_response
 from app.utils.time import timestamp_to_iso
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
@@ -35,7 +35,7 @@ async def get_dashboard_summary(
         cache_key = f"dashboard_summary:{date or 'today'}"
         cached = await cache.get(cache_key)
         if cached:
-            return format_success_response(data=cached, message="Dashboard summary")
+            return create_json_response(data=cached, message="Dashboard summary")
         
         # Active employees (last 5 min)
         now = datetime.now().timestamp()
@@ -145,7 +145,7 @@ async def get_dashboard_summary(
         }
         
         await cache.set(cache_key, summary, 300)
-        return format_success_response(data=summary, message="Dashboard summary")
+        return create_json_response(data=summary, message="Dashboard summary")
         
     except Exception as e:
         return format_error_response(message=f"Error: {str(e)}", status_code=500)
@@ -9,7 +9,6 @@ This module provides comprehensive employee tracking and analytics APIs includin
 - Zone movements
 """
 
-import json
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -17,12 +16,23 @@ from pydantic import BaseModel, Field
 
 from app.database import DatabaseManager, get_database
 from app.cache import CacheManager, get_cache
-from app.config import settings
-from app.utils.response_formatter import format_success_response, format_error_response
+from app.dependencies import fields_parameter, validate_cursor_parameter, validate_media_mode_parameter, validate_url_format_parameter
+from app.utils.fields import FieldSet, fields_key, select_fields, wants
+from app.services.media_index import media_index
+from app.utils.media_urls import compact_media_urls, media_url, url_templates
+from app.utils.pagination import Cursor, keyset_condition, paginate_keyset
+from app.utils.response_formatter import create_json_response, format_error_response
+from app.utils.serialization import model_row
 from app.utils.time import timestamp_to_iso, calculate_time_duration
 
 router = APIRouter(prefix="/api/employees", tags=["employees"])
 
+# Media linked from break rows when include_snapshots is set
+BREAK_MEDIA = ("snapshot", "thumbnail", "clip")
+
+# Fields of a timeline event
+TIMELINE_FIELDS = ("time", "event_type", "zone", "camera", "additional_data")
+
 
 # Pydantic models for request/response
 class EmployeeCurrentStatus(BaseModel):
@@ -119,7 +129,7 @@ async def get_employee_current_status(
         cache_key = f"employee_status:{employee_name}"
         cached_result = await cache.get(cache_key)
         if cached_result:
-            return format_success_response(
+            return create_json_response(
                 data=cached_result,
                 message=f"Current status for {employee_name}"
             )
@@ -129,7 +139,7 @@ async def get_employee_current_status(
         SELECT 
             timestamp,
             camera,
-            data->>'zones' as zones,
+            data->'zones' as zones,
             (data->'sub_label'->>1)::float as confidence
         FROM timeline
         WHERE data->>'label' = 'person'
@@ -168,7 +178,7 @@ async def get_employee_current_status(
         # Cache for 1 minute
         await cache.set(cache_key, response_data.dict(), 60)
         
-        return format_success_response(
+        return create_json_response(
             data=response_data.dict(),
             message=f"Current status for {employee_name}"
         )
@@ -219,7 +229,7 @@ async def get_employee_work_hours(
         cache_key = f"work_hours:{employee_name}:{date or 'today'}"
         cached_result = await cache.get(cache_key)
         if cached_result:
-            return format_success_response(
+            return create_json_response(
                 data=cached_result,
                 message=f"Work hours for {employee_name} on {target_date.strftime('%Y-%m-%d')}"
             )
@@ -229,7 +239,7 @@ async def get_employee_work_hours(
         SELECT 
             timestamp,
             camera,
-            data->>'zones' as zones,
+            data->'zones' as zones,
             (data->'sub_label'->>1)::float as confidence
         FROM timeline
         WHERE data->>'label' = 'person'
@@ -326,7 +336,7 @@ async def get_employee_work_hours(
         # Cache for 5 minutes
         await cache.set(cache_key, response_data.dict(), 300)
         
-        return format_success_response(
+        return create_json_response(
             data=response_data.dict(),
             message=f"Work hours for {employee_name} on {target_date.strftime('%Y-%m-%d')}"
         )
@@ -345,6 +355,8 @@ async def get_employee_breaks(
     start_date: Optional[str] = Query(None, description="Start date in YYYY-MM-DD format"),
     end_date: Optional[str] = Query(None, description="End date in YYYY-MM-DD format"),
     include_snapshots: bool = Query(False, description="Include snapshot URLs for break periods"),
+    media: str = Depends(validate_media_mode_parameter),
+    urls: str = Depends(validate_url_format_parameter),
     db: DatabaseManager = Depends(get_database),
     cache: CacheManager = Depends(get_cache)
 ):
@@ -353,6 +365,9 @@ async def get_employee_breaks(
     
     Finds gaps in detections between 5min and 3hrs.
     Returns break details with timestamps, durations, and locations.
+    With ``media=flag`` or ``media=omit``, the snapshot, thumbnail and clip
+    URLs are checked against the media availability index. With ``urls=compact``, breaks carry only
+    the detection id and camera plus a ``url_templates`` map.
     """
     try:
         # Determine date range
@@ -373,9 +388,16 @@ async def get_employee_breaks(
         cache_key = f"breaks:{employee_name}:{date or start_date or 'today'}:{include_snapshots}"
         cached_result = await cache.get(cache_key)
         if cached_result:
-            return format_success_response(
+            if media != "all":
+                await media_index.ensure_loaded(cache)
+                cached_result = {"breaks": media_index.annotate(cached_result["breaks"], media)}
+            templates = None
+            if urls == "compact":
+                cached_result["breaks"], templates = compact_media_urls(cached_result["breaks"], BREAK_MEDIA if include_snapshots else ())
+            return create_json_response(
                 data=cached_result,
-                message=f"Break details for {employee_name}"
+                message=f"Break details for {employee_name}",
+                url_templates=templates
             )
         
         # Get all detections for employee in date range
@@ -383,7 +405,7 @@ async def get_employee_breaks(
         SELECT 
             timestamp,
             camera,
-            data->>'zones' as zones,
+            data->'zones' as zones,
             data->>'label' as label,
             source_id
         FROM timeline
@@ -415,16 +437,11 @@ async def get_employee_breaks(
                 break_duration = calculate_time_duration(start_time=current_time, end_time=next_time)
                 
                 # Get zone during break (zone before break)
-                break_zone = None
-                if detections[i].get('zones'):
-                    try:
-                        zones = json.loads(detections[i]['zones'])
-                        if zones and len(zones) > 0:
-                            break_zone = zones[0]
-                    except:
-                        break_zone = detections[i]['zones']
+                zones = detections[i].get('zones')
+                break_zone = zones[0] if zones else None
                 
-                # Generate media URLs if requested
+                # Generate media URLs if requested (compact responses carry only the id)
+                source_id = None
                 snapshot_url = None
                 thumbnail_url = None
                 video_url = None
@@ -433,35 +450,43 @@ async def get_employee_breaks(
                     camera = detections[i]['camera']
                     source_id = detections[i].get('source_id', f"{int(current_time)}-{employee_name.replace(' ', '_')[:6]}")
                     
-                    # Generate snapshot URL
-                    snapshot_url = f"{settings.video_api_base_url}/snapshot/{camera}/{source_id}"
-                    
-                    # Generate thumbnail URL
-                    thumbnail_url = f"{settings.video_api_base_url}/thumb/{source_id}"
-                    
-                    # Generate video URL (for break period)
-                    video_url = f"{settings.video_api_base_url}/clip/{source_id}"
+                    if urls == "full":
+                        snapshot_url = media_url("snapshot", source_id, camera)
+                        thumbnail_url = media_url("thumbnail", source_id)
+                        # Clip of the detection before the break
+                        video_url = media_url("clip", source_id)
                 
                 break_data = {
+                    "id": source_id,
                     "start_time": break_start,
                     "end_time": break_end,
                     "duration": break_duration,
                     "duration_seconds": int(gap),
                     "location": break_zone,
-                    "camera": detections[i].get('camera'),
-                    "snapshot_url": snapshot_url,
-                    "thumbnail_url": thumbnail_url,
-                    "video_url": video_url
+                    "camera": detections[i].get('camera')
                 }
+                if urls == "full":
+                    break_data["snapshot_url"] = snapshot_url
+                    break_data["thumbnail_url"] = thumbnail_url
+                    break_data["video_url"] = video_url
                 
                 breaks.append(break_data)
         
-        # Cache for 5 minutes
-        await cache.set(cache_key, {"breaks": breaks}, 300)
+        # Cache for 5 minutes (full rows only; compact rows are stripped from them)
+        if urls == "full":
+            await cache.set(cache_key, {"breaks": breaks}, 300)
+        
+        media_kinds = BREAK_MEDIA if include_snapshots else ()
+        if media != "all":
+            await media_index.ensure_loaded(cache)
+            breaks = media_index.annotate(breaks, media, media_kinds)
         
-        return format_success_response(
+        templates = url_templates(media_kinds) if urls == "compact" else None
+        
+        return create_json_response(
             data={"breaks": breaks},
-            message=f"Break details for {employee_name}"
+            message=f"Break details for {employee_name}",
+            url_templates=templates
         )
         
     except Exception as e:
@@ -476,6 +501,8 @@ async def get_employee_timeline(
     employee_name: str,
     date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format"),
     limit: int = Query(100, description="Maximum number of events to return"),
+    cursor: Optional[Cursor] = Depends(validate_cursor_parameter),
+    fields: FieldSet = fields_parameter(TIMELINE_FIELDS),
     db: DatabaseManager = Depends(get_database),
     cache: CacheManager = Depends(get_cache)
 ):
@@ -487,6 +514,12 @@ async def get_employee_timeline(
     - Zone changes
     - Break events
     - Violation events
+    
+    Events are paged oldest first; pass the previous page's
+    pagination.next_cursor as cursor to continue the day.
+    
+    With fields=..., the camera and zone columns are only read, and break
+    durations only computed, when a requested field needs them.
     """
     try:
         # Parse date or use today
@@ -498,35 +531,46 @@ async def get_employee_timeline(
         start_timestamp = datetime.combine(target_date, datetime.min.time()).timestamp()
         end_timestamp = datetime.combine(target_date, datetime.max.time()).timestamp()
         
-        # Check cache
-        cache_key = f"timeline:{employee_name}:{date or 'today'}:{limit}"
-        cached_result = await cache.get(cache_key)
+        # Check cache (first page only; later pages are cheap index seeks)
+        cache_key = f"timeline:{employee_name}:{date or 'today'}:{limit}{fields_key(fields)}" if cursor is None else None
+        cached_result = await cache.get(cache_key) if cache_key is not None else None
         if cached_result:
-            return format_success_response(
-                data=cached_result,
-                message=f"Activity timeline for {employee_name}"
+            return create_json_response(
+                data={"timeline": cached_result["timeline"]},
+                message=f"Activity timeline for {employee_name}",
+                pagination=cached_result.get("pagination")
             )
         
-        # Get all timeline entries for employee
-        query = """
+        # Get timeline entries for employee, one past the page to detect more;
+        # later pages also read the previous page's last row for its zone
+        cursor_filter, cursor_args = keyset_condition(cursor, 5, descending=False, inclusive=True)
+        with_zones = wants(fields, "event_type", "zone", "additional_data")
+        with_breaks = wants(fields, "additional_data")
+        columns = ["timestamp", "source_id"]
+        if wants(fields, "camera"):
+            columns.append("camera")
+        if with_zones:
+            columns.append("data->'zones' as zones")
+        query = f"""
         SELECT 
-            timestamp,
-            camera,
-            source,
-            source_id,
-            class_type,
-            data->>'zones' as zones,
-            data->>'confidence' as confidence,
-            data->>'label' as label
+            {", ".join(columns)}
         FROM timeline
         WHERE data->>'label' = $1
         AND timestamp >= $2
         AND timestamp <= $3
-        ORDER BY timestamp ASC
+        {cursor_filter}
+        ORDER BY timestamp ASC, source_id ASC
         LIMIT $4
         """
         
-        entries = await db.fetch_all(query, employee_name, start_timestamp, end_timestamp, limit)
+        fetch = limit + 2 if cursor is not None else limit + 1
+        rows = await db.fetch_all(query, employee_name, start_timestamp, end_timestamp, fetch, *cursor_args)
+        previous = None
+        if cursor is not None and rows and (rows[0]['timestamp'], rows[0]['source_id']) == cursor:
+            previous = rows[0]
+            rows = rows[1:]
+        rows = rows[:limit + 1]
+        entries, pagination = paginate_keyset(rows, limit, id_key="source_id")
         
         if not entries:
             return format_error_response(
@@ -536,17 +580,19 @@ async def get_employee_timeline(
         
         # Process entries into timeline events
         timeline_events = []
-        previous_zone = None
+        previous_zone = previous.get('zones', [None])[0] if previous and previous.get('zones') else None
+        # The lookahead row closes a break that spans into the next page
+        following = rows[limit] if pagination["has_next"] else None
         
         for i, entry in enumerate(entries):
             current_zone = entry.get('zones', [None])[0] if entry.get('zones') else None
             event_type = "detection"
             additional_data = {}
             
-            # Determine event type
-            if i == 0:
+            # Determine event type (arrival/departure only at the ends of the day)
+            if i == 0 and cursor is None:
                 event_type = "arrival"
-            elif i == len(entries) - 1:
+            elif i == len(entries) - 1 and not pagination["has_next"]:
                 event_type = "departure"
             elif current_zone != previous_zone:
                 event_type = "zone_change"
@@ -556,28 +602,33 @@ async def get_employee_timeline(
                 }
             
             # Check for break (gap > 5 minutes)
-            if i < len(entries) - 1:
-                next_entry = entries[i + 1]
+            next_entry = entries[i + 1] if i < len(entries) - 1 else following
+            if with_breaks and next_entry is not None:
                 gap = next_entry['timestamp'] - entry['timestamp']
                 if gap > 300:  # 5 minutes
                     additional_data["break_duration"] = calculate_time_duration(start_time=entry['timestamp'], end_time=next_entry['timestamp'])
             
-            timeline_events.append(ActivityEvent(
+            timeline_events.append(model_row(
+                ActivityEvent,
                 time=timestamp_to_iso(entry['timestamp']),
                 event_type=event_type,
                 zone=current_zone,
                 camera=entry.get('camera'),
                 additional_data=additional_data if additional_data else None
-            ).dict())
+            ))
             
             previous_zone = current_zone
         
+        timeline_events = select_fields(timeline_events, fields)
+        
         # Cache for 2 minutes
-        await cache.set(cache_key, {"timeline": timeline_events}, 120)
+        if cache_key is not None:
+            await cache.set(cache_key, {"timeline": timeline_events, "pagination": pagination}, 120)
         
-        return format_success_response(
+        return create_json_response(
             data={"timeline": timeline_events},
-            message=f"Activity timeline for {employee_name}"
+            message=f"Activity timeline for {employee_name}",
+            pagination=pagination
         )
         
     except Exception as e:
@@ -617,7 +668,7 @@ async def get_employee_movements(
         cache_key = f"movements:{employee_name}:{date or 'today'}"
         cached_result = await cache.get(cache_key)
         if cached_result:
-            return format_success_response(
+            return create_json_response(
                 data=cached_result,
                 message=f"Zone movements for {employee_name}"
             )
@@ -626,7 +677,7 @@ async def get_employee_movements(
         query = """
         SELECT 
             timestamp,
-            data->>'zones' as zones
+            data->'zones' as zones
         FROM timeline
         WHERE data->>'label' = $1
         AND timestamp >= $2
@@ -660,12 +711,13 @@ async def get_employee_movements(
                     # Zone change detected
                     duration = calculate_time_duration(start_time=previous_timestamp, end_time=current_timestamp)
                     
-                    movements.append(ZoneMovement(
+                    movements.append(model_row(
+                        ZoneMovement,
                         from_zone=previous_zone,
                         to_zone=current_zone,
                         timestamp=timestamp_to_iso(current_timestamp),
                         duration=duration
-                    ).dict())
+                    ))
                 
                 previous_zone = current_zone
                 previous_timestamp = current_timestamp
@@ -677,7 +729,7 @@ async def get_employee_movements(
             "total_movements": len(movements)
         }, 300)
         
-        return format_success_response(
+        return create_json_response(
             data={
                 "movements": movements,
                 "zones_visited": list(zones_visited),
@@ -772,7 +824,7 @@ async def get_employee_idle_time(
         cache_key = f"idle_time:{employee_name}:{start_dt.strftime('%Y-%m-%d')}:{end_dt.strftime('%Y-%m-%d')}"
         cached_data = await cache.get(cache_key)
         if cached_data:
-            return format_success_response(
+            return create_json_response(
                 data=cached_data,
                 message=f"Idle time for {employee_name}"
             )
@@ -786,7 +838,7 @@ async def get_employee_idle_time(
             SELECT 
                 timestamp,
                 camera,
-                data->>'zones' as zones,
+                data->'zones' as zones,
                 data->>'label' as label
             FROM timeline 
             WHERE timestamp >= $1 AND timestamp <= $2
@@ -797,7 +849,7 @@ async def get_employee_idle_time(
         detections = await db.fetch_all(detections_query, start_timestamp, end_timestamp, employee_name)
         
         if not detections:
-            return format_success_response(
+            return create_json_response(
                 data={
                     "employee": employee_name,
                     "date": start_dt.strftime('%Y-%m-%d') if start_dt == end_dt else f"{start_dt.strftime('%Y-%m-%d')} to {end_dt.strftime('%Y-%m-%d')}",
@@ -823,24 +875,17 @@ async def get_employee_idle_time(
                 end_time = datetime.fromtimestamp(next_time).strftime('%H:%M:%S')
                 
                 # Get last zone before idle period
-                last_zone = None
-                if detections[i]['zones']:
-                    try:
-                        zones = json.loads(detections[i]['zones'])
-                        if zones and len(zones) > 0:
-                            last_zone = zones[0]
-                    except:
-                        pass
+                zones = detections[i]['zones']
+                last_zone = zones[0] if zones else None
                 
-                idle_period = IdlePeriod(
+                idle_periods.append(model_row(
+                    IdlePeriod,
                     start_time=start_time,
                     end_time=end_time,
                     duration_seconds=gap_seconds,
                     duration_formatted=calculate_time_duration(gap_seconds),
                     last_zone=last_zone
-                )
-                
-                idle_periods.append(idle_period.dict())
+                ))
                 total_idle_seconds += gap_seconds
         
         # Format response
@@ -855,7 +900,7 @@ async def get_employee_idle_time(
         # Cache for 5 minutes
         await cache.set(cache_key, response_data, 300)
         
-        return format_success_response(
+        return create_json_response(
             data=response_data,
             message=f"Idle time analysis for {employee_name}"
         )
@@ -896,9 +941,10 @@ async def get_employee_timeline_segments(
         cache_key = f"timeline_segments:{employee_name}:{target_date.strftime('%Y-%m-%d')}"
         cached_data = await cache.get(cache_key)
         if cached_data:
-            return format_success_response(
+            return create_json_response(
                 data=cached_data,
-                message=f"Timeline segments for {employee_name}"
+                message=f"Timeline segments for {employee_name}",
+                cache_key=cache_key
             )
         
         # Calculate date range
@@ -910,7 +956,7 @@ async def get_employee_timeline_segments(
             SELECT 
                 timestamp,
                 camera,
-                data->>'zones' as zones,
+                data->'zones' as zones,
                 data->>'label' as label
             FROM timeline 
             WHERE timestamp >= $1 AND timestamp <= $2
@@ -921,7 +967,7 @@ async def get_employee_timeline_segments(
         detections = await db.fetch_all(detections_query, start_timestamp, end_timestamp, employee_name)
         
         if not detections:
-            return format_success_response(
+            return create_json_response(
                 data={
                     "employee": employee_name,
                     "date": target_date.strftime('%Y-%m-%d'),
@@ -975,7 +1021,8 @@ async def get_employee_timeline_segments(
             segment_start_percentage = ((current_timestamp - first_detection) / total_duration_seconds) * 100
             segment_width_percentage = (gap_seconds / total_duration_seconds) * 100
             
-            segment = TimelineSegment(
+            segments.append(model_row(
+                TimelineSegment,
                 type=segment_type,
                 start_time=datetime.fromtimestamp(current_timestamp).strftime('%H:%M:%S'),
                 end_time=datetime.fromtimestamp(next_timestamp).strftime('%H:%M:%S'),
@@ -983,9 +1030,7 @@ async def get_employee_timeline_segments(
                 start_percentage=round(segment_start_percentage, 2),
                 width_percentage=round(segment_width_percentage, 2),
                 color=color_map[segment_type]
-            )
-            
-            segments.append(segment.dict())
+            ))
         
         # Format response
         response_data = {
@@ -1000,7 +1045,7 @@ async def get_employee_timeline_segments(
         # Cache for 5 minutes
         await cache.set(cache_key, response_data, 300)
         
-        return format_success_response(
+        return create_json_response(
             data=response_data,
             message=f"Timeline segments for {employee_name}"
         )
@@ -0,0 +1,201 @@
+"""
+Server-Sent Events endpoints for the Frigate Dashboard Middleware.
+
+This module mirrors the /ws/violations and /ws/dashboard streams over
+Server-Sent Events for read-only clients (such as kiosk displays behind
+proxies that break WebSockets). Events come from the same broadcast
+pipeline as the WebSocket endpoints and can be resumed with Last-Event-ID.
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from .websocket import manager, build_violations_snapshot, build_dashboard_snapshot
+from ..config import settings
+from ..utils.serialization import dumps_text
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+def format_sse_event(message: dict) -> str:
+    """
+    Format a broadcast message as a Server-Sent Events frame.
+
+    Args:
+        message: Message with type/data and optionally seq/epoch
+
+    Returns:
+        SSE frame terminated by a blank line
+    """
+    lines = []
+
+    seq = message.get("seq")
+    if seq is None:
+        seq = message.get("data", {}).get("seq")
+    epoch = message.get("epoch") or message.get("data", {}).get("epoch")
+    if seq is not None and epoch:
+        lines.append(f"id: {epoch}:{seq}")
+
+    lines.append(f"event: {message.get('type', 'message')}")
+    lines.append(f"data: {dumps_text(message)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def parse_last_event_id(last_event_id: Optional[str]) -> Optional[Tuple[str, int]]:
+    """
+    Parse an ``epoch:seq`` event id sent back by a reconnecting client.
+
+    Args:
+        last_event_id: Last-Event-ID value
+
+    Returns:
+        Tuple of (epoch, seq), or None if missing or malformed
+    """
+    if not last_event_id:
+        return None
+
+    epoch, _, seq = last_event_id.strip().rpartition(":")
+    if not epoch or not seq.isdigit():
+        return None
+    return epoch, int(seq)
+
+
+async def _event_stream(
+    client_type: str,
+    last_event_id: Optional[str],
+    build_snapshot: Callable[[], Awaitable[dict]]
+) -> AsyncIterator[str]:
+    """Stream buffered and live events for one subscriber."""
+    # Subscribe before replaying so nothing broadcast in between is lost
+    queue = await manager.subscribe_stream(client_type)
+
+    try:
+        yield f"retry: {settings.sse_retry_ms}\n\n"
+
+        events = None
+        resume_from = parse_last_event_id(last_event_id)
+        if resume_from is not None:
+            epoch, since_seq = resume_from
+            events = manager.event_buffer.replay(
+                since_seq,
+                channels=(client_type, "all"),
+                epoch=epoch
+            )
+
+        if events is None:
+            snapshot = await build_snapshot()
+            # Events broadcast while the snapshot was built are still queued;
+            # only those the snapshot does not already cover are sent
+            last_sent_seq = snapshot.get("data", {}).get("seq", 0)
+            yield format_sse_event(snapshot)
+        else:
+            last_sent_seq = manager.event_buffer.last_seq
+            for event in events:
+                yield format_sse_event(event)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(),
+                    timeout=settings.sse_heartbeat_interval
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+
+            if event is None:
+                # Dropped for lagging; the client reconnects and resumes
+                break
+            if event["seq"] <= last_sent_seq:
+                continue
+
+            last_sent_seq = event["seq"]
+            yield format_sse_event(event)
+
+    finally:
+        manager.unsubscribe_stream(queue)
+
+
+def _streaming_response(stream: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an event stream in a response that proxies will not buffer."""
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.get(
+    "/violations",
+    summary="Stream violations",
+    description="Server-Sent Events mirror of the /ws/violations stream"
+)
+async def stream_violations(
+    camera: Optional[str] = Query(None, description="Filter initial data by specific camera"),
+    hours: int = Query(24, ge=1, le=168, description="Hours to look back for initial data"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    since: Optional[str] = Query(None, description="Resume after this event id (epoch:seq)")
+) -> StreamingResponse:
+    """
+    Stream real-time violation events over Server-Sent Events.
+
+    New clients first receive an ``initial_data`` event; reconnecting clients
+    that send Last-Event-ID (or ``since``) are sent only the events they
+    missed while the replay buffer still covers the gap. A heartbeat comment
+    is sent when the stream is otherwise idle.
+
+    Args:
+        camera: Optional camera filter for the initial data
+        hours: Hours to look back for the initial data
+        last_event_id: Id of the last event received, sent on reconnect
+        since: Query-string alternative to Last-Event-ID
+
+    Returns:
+        text/event-stream response
+    """
+    return _streaming_response(
+        _event_stream(
+            "violations",
+            last_event_id or since,
+            lambda: build_violations_snapshot(camera, hours)
+        )
+    )
+
+
+@router.get(
+    "/dashboard",
+    summary="Stream dashboard updates",
+    description="Server-Sent Events mirror of the /ws/dashboard stream"
+)
+async def stream_dashboard(
+    subscribe_to: str = Query("all", description="Subscribe to: all, violations, cameras, employees"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    since: Optional[str] = Query(None, description="Resume after this event id (epoch:seq)")
+) -> StreamingResponse:
+    """
+    Stream real-time dashboard events over Server-Sent Events.
+
+    Args:
+        subscribe_to: What to include in the initial data
+        last_event_id: Id of the last event received, sent on reconnect
+        since: Query-string alternative to Last-Event-ID
+
+    Returns:
+        text/event-stream response
+    """
+    return _streaming_response(
+        _event_stream(
+            "dashboard",
+            last_event_id or since,
+            lambda: build_dashboard_snapshot(subscribe_to)
+        )
+    )
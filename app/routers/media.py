@@ -0,0 +1,202 @@
+"""
+Media proxy endpoints for the Frigate Dashboard Middleware.
+
+This module serves Frigate thumbnails, snapshots and clips through the
+on-disk media cache, so repeated dashboard loads do not refetch media from
+the NVR. Clips honour HTTP Range requests for seeking.
+"""
+
+import logging
+import re
+from fastapi import APIRouter, Depends, Path, Query, Request
+
+from ..config import settings
+from ..services.media_cache import MediaDiskCache, get_media_cache
+from ..services.sprites import SpriteBuilder
+from ..utils.file_response import RangeFileResponse
+from ..utils.response_formatter import create_json_response, create_error_json_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/media", tags=["Media"])
+
+# Frigate ids and camera names: letters, digits, dots, dashes and underscores
+MEDIA_ID_PATTERN = r"^[\w.\-]+$"
+
+# Browsers may keep cached media for this long before revalidating
+MEDIA_CACHE_CONTROL = "public, max-age=3600"
+
+# Cache file suffix and served content type for each media kind
+MEDIA_TYPES = {
+    "thumb": (".webp", "image/webp"),
+    "snapshot": (".jpg", "image/jpeg"),
+    "clip": (".mp4", "video/mp4")
+}
+
+
+async def serve_media(
+    request: Request,
+    media_cache: MediaDiskCache,
+    kind: str,
+    key: str,
+    url: str
+) -> RangeFileResponse:
+    """Fetch a media object through the cache and stream it to the client."""
+    suffix, media_type = MEDIA_TYPES[kind]
+    file = await media_cache.open(f"{kind}/{key}", url, suffix)
+    return RangeFileResponse(
+        file,
+        media_type=media_type,
+        request_headers=request.headers,
+        method=request.method,
+        headers={"cache-control": MEDIA_CACHE_CONTROL}
+    )
+
+
+@router.api_route("/thumb/{source_id}", methods=["GET", "HEAD"])
+async def get_thumbnail(
+    request: Request,
+    source_id: str = Path(..., pattern=MEDIA_ID_PATTERN, description="Frigate event id"),
+    media_cache: MediaDiskCache = Depends(get_media_cache)
+):
+    """
+    Get an event thumbnail through the media cache.
+
+    Args:
+        source_id: Frigate event id
+        media_cache: On-disk media cache
+
+    Returns:
+        Thumbnail image
+    """
+    return await serve_media(request, media_cache, "thumb", source_id, f"/thumb/{source_id}")
+
+
+@router.api_route("/snapshot/{camera}/{source_id}", methods=["GET", "HEAD"])
+async def get_snapshot(
+    request: Request,
+    camera: str = Path(..., pattern=MEDIA_ID_PATTERN, description="Camera name"),
+    source_id: str = Path(..., pattern=MEDIA_ID_PATTERN, description="Frigate event id"),
+    media_cache: MediaDiskCache = Depends(get_media_cache)
+):
+    """
+    Get an event snapshot through the media cache.
+
+    Args:
+        camera: Camera name
+        source_id: Frigate event id
+        media_cache: On-disk media cache
+
+    Returns:
+        Snapshot image
+    """
+    return await serve_media(
+        request, media_cache, "snapshot", f"{camera}/{source_id}",
+        f"/snapshot/{camera}/{source_id}"
+    )
+
+
+@router.api_route("/clip/{source_id}", methods=["GET", "HEAD"])
+async def get_clip(
+    request: Request,
+    source_id: str = Path(..., pattern=MEDIA_ID_PATTERN, description="Frigate event id"),
+    media_cache: MediaDiskCache = Depends(get_media_cache)
+):
+    """
+    Get an event clip through the media cache.
+
+    Supports single-range ``Range`` requests so players can seek.
+
+    Args:
+        source_id: Frigate event id
+        media_cache: On-disk media cache
+
+    Returns:
+        MP4 clip (206 Partial Content for range requests)
+    """
+    return await serve_media(request, media_cache, "clip", source_id, f"/clip/{source_id}")
+
+
+@router.get("/sprite")
+async def get_thumbnail_sprite(
+    ids: str = Query(..., description="Comma-separated violation or event IDs"),
+    media_cache: MediaDiskCache = Depends(get_media_cache)
+):
+    """
+    Get a single sprite image covering the thumbnails of several violations.
+
+    Thumbnails are fetched from Frigate concurrently and stitched into one
+    JPEG, cached by the hash of the ID set.
+
+    Args:
+        ids: Comma-separated violation or event IDs
+        media_cache: On-disk media cache
+
+    Returns:
+        Sprite URL, tile size and per-ID pixel offsets into the sprite,
+        plus the IDs whose thumbnail could not be fetched
+    """
+    source_ids = [source_id.strip() for source_id in ids.split(",") if source_id.strip()]
+    if not source_ids:
+        return create_error_json_response(message="At least one ID is required", status_code=422)
+    if len(source_ids) > settings.media_cache.sprite_max_ids:
+        return create_error_json_response(
+            message=f"At most {settings.media_cache.sprite_max_ids} IDs fit in one sprite",
+            status_code=422
+        )
+    invalid = [source_id for source_id in source_ids if not re.match(MEDIA_ID_PATTERN, source_id)]
+    if invalid:
+        return create_error_json_response(
+            message="Invalid IDs",
+            status_code=422,
+            details={"invalid_ids": invalid}
+        )
+
+    layout = await SpriteBuilder(media_cache).get_layout(source_ids)
+    # The build time busts browser caches when a partial sprite is rebuilt
+    layout["sprite_url"] = f"{router.prefix}/sprite/{layout['digest']}.jpg?v={int(layout['built_at'])}"
+
+    return create_json_response(
+        data=layout,
+        message=f"Sprite covering {len(layout['ids'])} thumbnails"
+    )
+
+
+@router.api_route("/sprite/{digest}.jpg", methods=["GET", "HEAD"])
+async def get_thumbnail_sprite_image(
+    request: Request,
+    digest: str = Path(..., pattern=r"^[0-9a-f]+$", description="Sprite digest"),
+    media_cache: MediaDiskCache = Depends(get_media_cache)
+):
+    """
+    Get a sprite image built by ``GET /api/media/sprite``.
+
+    Args:
+        digest: Sprite digest from the sprite layout
+        media_cache: On-disk media cache
+
+    Returns:
+        JPEG sprite image
+    """
+    file = await SpriteBuilder(media_cache).open_image(digest)
+    return RangeFileResponse(
+        file,
+        media_type="image/jpeg",
+        request_headers=request.headers,
+        method=request.method,
+        headers={"cache-control": MEDIA_CACHE_CONTROL}
+    )
+
+
+@router.get("/cache/stats")
+async def get_media_cache_stats(media_cache: MediaDiskCache = Depends(get_media_cache)):
+    """
+    Get media proxy cache statistics.
+
+    Returns:
+        Hit/miss counters and disk usage of the media cache
+    """
+    return create_json_response(
+        data=media_cache.get_stats(),
+        message="Media cache statistics retrieved successfully"
+    )
@@ -7,12 +7,15 @@ This module provides endpoints for recent clips and recordings with working medi
 import logging
 from typing import Optional, List
 from fastapi import APIRouter, Depends, Query, HTTPException
-import requests
+import httpx
 from datetime import datetime
 
-from ..dependencies import validate_limit_parameter
+from ..dependencies import validate_limit_parameter, get_cache_manager
+from ..cache import CacheManager
 from ..utils.response_formatter import create_json_response, create_error_json_response
 from ..utils.errors import ExternalServiceError
+from ..services.frigate_client import FrigateClient, get_frigate_client
+from ..services.media_index import media_index, MEDIA_KINDS
 from ..config import settings
 
 logger = logging.getLogger(__name__)
@@ -22,7 +25,8 @@ router = APIRouter(prefix="/api/recent-media", tags=["Recent Media"])
 @router.get("/clips")
 async def get_recent_clips(
     limit: int = Depends(validate_limit_parameter),
-    camera: Optional[str] = Query(None, description="Filter by camera name")
+    camera: Optional[str] = Query(None, description="Filter by camera name"),
+    frigate: FrigateClient = Depends(get_frigate_client)
 ):
     """
     Get recent clips with working video and thumbnail URLs.
@@ -30,22 +34,18 @@ async def get_recent_clips(
     Args:
         limit: Maximum number of clips to return
         camera: Optional camera filter
+        frigate: Frigate HTTP client
         
     Returns:
         List of recent clips with working media URLs
     """
     try:
-        # Build Frigate API URL
-        url = f"{settings.video_api_base_url}/api/clips"
         params = {"limit": limit}
         if camera:
             params["camera"] = camera
             
         # Fetch clips from Frigate
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = await frigate.get_json("/api/clips", params=params)
         clips = data.get('clips', [])
         
         # Process clips to add full URLs and readable timestamps
@@ -71,7 +71,7 @@ async def get_recent_clips(
             message=f"Retrieved {len(processed_clips)} recent clips with working media URLs"
         )
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error fetching recent clips from Frigate: {e}")
         raise ExternalServiceError(
             message="Failed to fetch recent clips from Frigate",
@@ -85,7 +85,8 @@ async def get_recent_clips(
 @router.get("/recordings")
 async def get_recent_recordings(
     limit: int = Depends(validate_limit_parameter),
-    camera: Optional[str] = Query(None, description="Filter by camera name")
+    camera: Optional[str] = Query(None, description="Filter by camera name"),
+    frigate: FrigateClient = Depends(get_frigate_client)
 ):
     """
     Get recent recordings with working video URLs.
@@ -93,22 +94,18 @@ async def get_recent_recordings(
     Args:
         limit: Maximum number of recordings to return
         camera: Optional camera filter
+        frigate: Frigate HTTP client
         
     Returns:
         List of recent recordings with working video URLs
     """
     try:
-        # Build Frigate API URL
-        url = f"{settings.video_api_base_url}/api/recordings"
         params = {"limit": limit}
         if camera:
             params["camera"] = camera
             
         # Fetch recordings from Frigate
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = await frigate.get_json("/api/recordings", params=params)
         recordings = data.get('recordings', [])
         
         # Process recordings to add full URLs and readable timestamps
@@ -132,7 +129,7 @@ async def get_recent_recordings(
             message=f"Retrieved {len(processed_recordings)} recent recordings with working video URLs"
         )
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error fetching recent recordings from Frigate: {e}")
         raise ExternalServiceError(
             message="Failed to fetch recent recordings from Frigate",
@@ -146,14 +143,18 @@ async def get_recent_recordings(
 @router.get("/test-media")
 async def test_media_urls(
     clip_id: Optional[str] = Query(None, description="Test specific clip ID"),
-    recording_id: Optional[str] = Query(None, description="Test specific recording ID")
+    recording_id: Optional[str] = Query(None, description="Test specific recording ID"),
+    frigate: FrigateClient = Depends(get_frigate_client)
 ):
     """
     Test media URL accessibility for debugging.
     
+    All URLs are probed concurrently.
+    
     Args:
         clip_id: Optional clip ID to test
         recording_id: Optional recording ID to test
+        frigate: Frigate HTTP client
         
     Returns:
         Media URL test results
@@ -165,70 +166,18 @@ async def test_media_urls(
     }
     
     try:
-        # Test clip if provided
+        # (result group, media type, url) for every URL to probe
+        probes = []
         if clip_id:
-            clip_video_url = f"{settings.video_api_base_url}/clip/{clip_id}"
-            clip_thumb_url = f"{settings.video_api_base_url}/thumb/{clip_id}"
-            
-            # Test video
-            try:
-                response = requests.head(clip_video_url, timeout=5)
-                results["clip_tests"].append({
-                    "type": "video",
-                    "url": clip_video_url,
-                    "status": response.status_code,
-                    "accessible": response.status_code == 200,
-                    "size": response.headers.get('Content-Length', 'unknown')
-                })
-            except Exception as e:
-                results["clip_tests"].append({
-                    "type": "video",
-                    "url": clip_video_url,
-                    "status": "error",
-                    "accessible": False,
-                    "error": str(e)
-                })
-            
-            # Test thumbnail
-            try:
-                response = requests.head(clip_thumb_url, timeout=5)
-                results["clip_tests"].append({
-                    "type": "thumbnail",
-                    "url": clip_thumb_url,
-                    "status": response.status_code,
-                    "accessible": response.status_code == 200,
-                    "size": response.headers.get('Content-Length', 'unknown')
-                })
-            except Exception as e:
-                results["clip_tests"].append({
-                    "type": "thumbnail",
-                    "url": clip_thumb_url,
-                    "status": "error",
-                    "accessible": False,
-                    "error": str(e)
-                })
-        
-        # Test recording if provided
+            probes.append(("clip_tests", "video", f"{settings.video_api_base_url}/clip/{clip_id}"))
+            probes.append(("clip_tests", "thumbnail", f"{settings.video_api_base_url}/thumb/{clip_id}"))
         if recording_id:
-            recording_video_url = f"{settings.video_api_base_url}/video/{recording_id}"
-            
-            try:
-                response = requests.head(recording_video_url, timeout=5)
-                results["recording_tests"].append({
-                    "type": "video",
-                    "url": recording_video_url,
-                    "status": response.status_code,
-                    "accessible": response.status_code == 200,
-                    "size": response.headers.get('Content-Length', 'unknown')
-                })
-            except Exception as e:
-                results["recording_tests"].append({
-                    "type": "video",
-                    "url": recording_video_url,
-                    "status": "error",
-                    "accessible": False,
-                    "error": str(e)
-                })
+            probes.append(("recording_tests", "video", f"{settings.video_api_base_url}/video/{recording_id}"))
+        
+        probe_results = await frigate.probe_many(url for _, _, url in probes)
+        
+        for (group, media_type, _), probe_result in zip(probes, probe_results):
+            results[group].append({"type": media_type, **probe_result})
         
         # Calculate summary
         total_tests = len(results["clip_tests"]) + len(results["recording_tests"])
@@ -248,3 +197,42 @@ async def test_media_urls(
     except Exception as e:
         logger.error(f"Error in test_media_urls: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/availability")
+async def get_media_availability(
+    ids: str = Query(..., description="Comma-separated source IDs to look up"),
+    cache: CacheManager = Depends(get_cache_manager)
+):
+    """
+    Look up media availability from the media index without probing Frigate.
+    
+    Args:
+        ids: Comma-separated source IDs
+        cache: Cache manager dependency
+        
+    Returns:
+        Per-ID clip/snapshot/thumbnail availability (null when the ID is
+        outside the index window) and index statistics
+    """
+    source_ids = [source_id.strip() for source_id in ids.split(",") if source_id.strip()]
+    if len(source_ids) > 1000:
+        return create_error_json_response(
+            message="At most 1000 IDs can be looked up at once",
+            status_code=422
+        )
+    
+    await media_index.ensure_loaded(cache)
+    
+    availability = {
+        source_id: {kind: media_index.is_available(kind, source_id) for kind in MEDIA_KINDS}
+        for source_id in source_ids
+    }
+    
+    return create_json_response(
+        data={
+            "availability": availability,
+            "index": media_index.get_stats()
+        },
+        message=f"Media availability for {len(source_ids)} IDs"
+    )
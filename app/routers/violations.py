@@ -12,7 +12,7 @@ from fastapi.responses import JSONResponse
 
 from ..database import DatabaseManager
 from ..cache import CacheManager, CacheUtils
-from ..dependencies import DatabaseDep, CacheDep, CameraDep, LimitDep, HoursDep, get_database_manager, get_cache_manager
+from ..dependencies import DatabaseDep, CacheDep, CameraDep, LimitDep, HoursDep, MediaModeDep, CursorDep, UrlFormatDep, fields_parameter, get_database_manager, get_cache_manager
 from ..models import (
     LiveViolationsResponse, 
     HourlyTrendResponse,
@@ -23,10 +23,15 @@ from ..utils.response_formatter import (
     create_json_response,
     create_error_json_response,
     format_violation_data,
+    VIOLATION_FIELDS,
     format_hourly_trend_data,
     handle_api_error
 )
 from ..utils.time import timestamp_to_iso
+from ..utils.pagination import Cursor, paginate_keyset
+from ..utils.media_urls import URL_FIELD_NAMES, compact_media_urls, media_url, url_templates
+from ..utils.fields import FieldSet, fields_key, select_fields, wants
+from ..utils.serialization import FastJSONResponse
 from ..config import settings
 from ..utils.errors import (
     ValidationError,
@@ -35,6 +40,8 @@ from ..utils.errors import (
     CacheError
 )
 from ..services.queries import ViolationQueries
+from ..services.media_index import media_index
+from ..services.violation_tail import violation_tail
 from ..config import CacheKeys, settings
 from ..utils.errors import ValidationError, NotFoundError, DatabaseError, CacheError
 
@@ -42,6 +49,37 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/violations", tags=["violations"])
 
+# Media linked from live violation rows (the live query links snapshots only)
+LIVE_VIOLATION_MEDIA = ("snapshot",)
+
+# Fields returned by /{violation_id}/duration
+VIOLATION_DURATION_FIELDS = (
+    "violation_id", "start_time", "end_time", "duration_seconds", "duration_formatted",
+    "detection_count", "avg_confidence", "employee_name", "desk_zone", "camera",
+    "video_url", "thumbnail_url", "snapshot_url", "detection_timeline"
+)
+
+
+def _fields_to_build(fields: FieldSet, media: str, urls: str) -> FieldSet:
+    """Fields a live row needs for media annotation and URL templates, besides those requested."""
+    if fields is None:
+        return None
+    needed = {"id", "camera"} if media != "all" or urls == "compact" else set()
+    if media != "all":
+        needed |= URL_FIELD_NAMES
+    return fields | needed
+
+
+def _fields_to_return(fields: FieldSet, media: str, urls: str) -> FieldSet:
+    """Fields of a live row to return once it is annotated and compacted."""
+    if fields is None:
+        return None
+    kept = {"media_available"} if media != "all" else set()
+    if urls == "compact":
+        # Clients substitute these into the URL templates
+        kept |= {"id", "camera"}
+    return fields | kept
+
 
 @router.get(
     "/live",
@@ -53,6 +91,11 @@ async def get_live_violations(
     camera: Optional[str] = CameraDep,
     limit: int = LimitDep,
     hours: int = HoursDep,
+    media: str = MediaModeDep,
+    cursor: Optional[Cursor] = CursorDep,
+    since: Optional[float] = Query(None, description="Only return violations newer than this watermark"),
+    urls: str = UrlFormatDep,
+    fields: FieldSet = fields_parameter(VIOLATION_FIELDS),
     db: DatabaseManager = DatabaseDep,
     cache: CacheManager = CacheDep
 ) -> JSONResponse:
@@ -63,10 +106,29 @@ async def get_live_violations(
     with employee names identified through face recognition, and includes thumbnail,
     video, and snapshot URLs for each violation.
     
+    Results are paged newest first; pass the previous page's
+    pagination.next_cursor as cursor to fetch the next page.
+    
+    Polling clients pass since (the newest timestamp they hold, then the
+    watermark of each response) to receive only newer violations; these
+    are answered from a shared in-memory tail without a database query
+    while it is fresh.
+    
+    With urls=compact, rows carry only id and camera and the response
+    holds a url_templates map to build media URLs from.
+    
+    With fields=..., only those fields are returned; the desk attribution
+    join is skipped unless employee_name or confidence is requested.
+    
     Args:
         camera: Optional camera name filter
         limit: Maximum number of results (1-1000)
         hours: Hours to look back (1-168)
+        media: Media URL mode (all, flag or omit expired media)
+        cursor: Cursor from the previous page (omit for the first page)
+        since: Watermark for incremental polling
+        urls: Media URL format (full or compact)
+        fields: Optional sparse fieldset
         db: Database manager dependency
         cache: Cache manager dependency
         
@@ -77,35 +139,79 @@ async def get_live_violations(
         HTTPException: If database query fails
     """
     try:
-        # Generate cache key
-        cache_key = CacheKeys.live_violations(camera, limit)
+        if since is not None:
+            result = await violation_tail.since(db, since, camera=camera, limit=limit)
+            if media != "all":
+                await media_index.ensure_loaded(cache)
+                result["violations"] = media_index.annotate(result["violations"], media)
+            templates = None
+            if urls == "compact":
+                result["violations"], templates = compact_media_urls(result["violations"], LIVE_VIOLATION_MEDIA)
+            result["violations"] = select_fields(result["violations"], _fields_to_return(fields, media, urls))
+            return create_json_response(
+                data=result,
+                message=f"{len(result['violations'])} new violations",
+                url_templates=templates
+            )
+        
+        # Only the first page is cached; deeper pages are cheap index seeks
+        cache_key = CacheKeys.live_violations(camera, limit) if cursor is None else None
         
         # Try to get from cache first
-        cached_data = await cache.get(cache_key)
+        cached_data = await cache.get(cache_key) if cache_key is not None else None
         if cached_data is not None:
             logger.debug(f"Cache hit for live violations: {cache_key}")
+            _, pagination = paginate_keyset(cached_data, limit, lookahead=False)
+            if media != "all":
+                await media_index.ensure_loaded(cache)
+                cached_data = media_index.annotate(cached_data, media)
+            templates = None
+            if urls == "compact":
+                cached_data, templates = compact_media_urls(cached_data, LIVE_VIOLATION_MEDIA)
+            cached_data = select_fields(cached_data, _fields_to_return(fields, media, urls))
             return create_json_response(
                 data=cached_data,
-                message="Live violations retrieved from cache"
+                message="Live violations retrieved from cache",
+                # Annotated, compacted or projected data differs from the cached value
+                cache_key=cache_key if media == "all" and urls == "full" and fields is None else None,
+                pagination=pagination,
+                url_templates=templates
             )
         
-        # Query database
+        # Query database (one extra row tells whether another page exists)
         logger.info(f"Fetching live violations: camera={camera}, limit={limit}, hours={hours}")
         raw_violations = await ViolationQueries.get_live_violations(
             db=db,
             camera=camera,
             hours=hours,
-            limit=limit
+            limit=limit + 1,
+            cursor=cursor,
+            with_employee=wants(fields, "employee_name", "confidence")
         )
+        page, pagination = paginate_keyset(raw_violations, limit)
         
-        # Format the data
-        formatted_violations = [format_violation_data(violation) for violation in raw_violations]
+        # Format the data (only the fields needed, without URLs if compact)
+        build = _fields_to_build(fields, media, urls)
+        formatted_violations = [format_violation_data(violation, build, urls) for violation in page]
         
-        # Cache the results
-        await cache.set(cache_key, formatted_violations, settings.cache_ttl_live_violations)
-        logger.debug(f"Cached live violations: {cache_key}")
+        # Cache the results (full rows only; subsets are projected from them)
+        if cache_key is not None and fields is None and urls == "full":
+            await cache.set(cache_key, formatted_violations, settings.cache_ttl_live_violations)
+            logger.debug(f"Cached live violations: {cache_key}")
+        
+        if media != "all":
+            await media_index.ensure_loaded(cache)
+            formatted_violations = media_index.annotate(formatted_violations, media, LIVE_VIOLATION_MEDIA)
         
-        return create_json_response(data=formatted_violations, message="Live violations retrieved successfully")
+        templates = url_templates(LIVE_VIOLATION_MEDIA) if urls == "compact" else None
+        formatted_violations = select_fields(formatted_violations, _fields_to_return(fields, media, urls))
+        
+        return create_json_response(
+            data=formatted_violations,
+            message="Live violations retrieved successfully",
+            pagination=pagination,
+            url_templates=templates
+        )
         
     except Exception as e:
         logger.error(f"Error retrieving live violations: {e}")
@@ -154,7 +260,7 @@ async def get_hourly_trend(
         cached_data = await cache.get(cache_key)
         if cached_data is not None:
             logger.debug(f"Cache hit for hourly trend: {cache_key}")
-            return create_json_response(data=cached_data, message="Hourly trend retrieved from cache")
+            return create_json_response(data=cached_data, message="Hourly trend retrieved from cache", cache_key=cache_key)
         
         # Query database
         logger.info(f"Fetching hourly trend: hours={hours}")
@@ -216,7 +322,7 @@ async def get_violation_stats(
         cached_data = await cache.get(cache_key)
         if cached_data is not None:
             logger.debug(f"Cache hit for violation stats: {cache_key}")
-            return create_json_response(data=cached_data, message="Violation stats retrieved from cache")
+            return create_json_response(data=cached_data, message="Violation stats retrieved from cache", cache_key=cache_key)
         
         # Query database for statistics
         logger.info(f"Fetching violation stats: hours={hours}")
@@ -289,24 +395,13 @@ async def get_violation_stats(
         """
         peak_hours = await db.fetch_all(peak_hours_query, hours * 3600)
         
-        # Convert Decimal types to float for JSON serialization
-        def convert_decimals(obj):
-            if isinstance(obj, dict):
-                return {k: convert_decimals(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_decimals(item) for item in obj]
-            elif hasattr(obj, 'as_tuple'):  # Decimal type
-                return float(obj)
-            else:
-                return obj
-        
         # Compile statistics
         stats = {
             "total_violations": int(total_violations),
             "time_period_hours": hours,
-            "violations_by_camera": convert_decimals(camera_stats),
-            "violations_by_employee": convert_decimals(employee_stats),
-            "peak_hours": convert_decimals(peak_hours),
+            "violations_by_camera": camera_stats,
+            "violations_by_employee": employee_stats,
+            "peak_hours": peak_hours,
             "summary": {
                 "most_active_camera": camera_stats[0]['camera'] if camera_stats else None,
                 "most_violating_employee": employee_stats[0]['employee_name'] if employee_stats else None,
@@ -377,9 +472,10 @@ async def clear_violation_cache(
         )
 
 
-@router.get("/{violation_id}/duration", response_class=JSONResponse)
+@router.get("/{violation_id}/duration", response_class=FastJSONResponse)
 async def get_violation_duration(
     violation_id: str,
+    fields: FieldSet = fields_parameter(VIOLATION_DURATION_FIELDS),
     db: DatabaseManager = Depends(get_database_manager),
     cache: CacheManager = Depends(get_cache_manager)
 ) -> JSONResponse:
@@ -389,8 +485,12 @@ async def get_violation_duration(
     Analyzes consecutive cell phone detections within ±2 minute window
     to calculate actual violation duration and related data.
     
+    With fields=..., the employee lookup, confidence column and
+    detection_timeline are only computed when requested.
+    
     Args:
         violation_id: The violation ID to analyze
+        fields: Optional sparse fieldset
         db: Database manager dependency
         cache: Cache manager dependency
         
@@ -406,7 +506,7 @@ async def get_violation_duration(
     """
     try:
         # Check cache first
-        cache_key = f"violation_duration:{violation_id}"
+        cache_key = f"violation_duration:{violation_id}{fields_key(fields)}"
         cached_result = await cache.get(cache_key)
         if cached_result:
             return create_json_response(
@@ -450,11 +550,10 @@ async def get_violation_duration(
         zone = zones[0]  # Use first zone
         
         # Query timeline for consecutive cell phone detections
-        timeline_query = """
+        with_confidence = wants(fields, "avg_confidence", "detection_timeline")
+        timeline_query = f"""
         SELECT 
-            timestamp,
-            data->>'confidence' as confidence,
-            data->>'zones' as zones
+            timestamp{", data->>'confidence' as confidence" if with_confidence else ""}
         FROM timeline
         WHERE data->>'label' = 'cell phone'
         AND data->'zones' ? $1
@@ -490,13 +589,15 @@ async def get_violation_duration(
         LIMIT 1
         """
         
-        employee_result = await db.fetch_one(
-            employee_query, 
-            zone, 
-            search_start, 
-            search_end, 
-            violation_start
-        )
+        employee_result = None
+        if wants(fields, "employee_name"):
+            employee_result = await db.fetch_one(
+                employee_query, 
+                zone, 
+                search_start, 
+                search_end, 
+                violation_start
+            )
         
         employee_name = employee_result['employee_name'] if employee_result else "Unknown"
         
@@ -507,13 +608,13 @@ async def get_violation_duration(
         duration_seconds = int(actual_end - actual_start)
         
         # Calculate average confidence
-        confidences = [float(d['confidence']) for d in detections if d['confidence']]
+        confidences = [float(d['confidence']) for d in detections if d.get('confidence')]
         avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
         
         # Generate media URLs
-        video_url = f"{settings.video_api_base_url}/clip/{violation_id}"
-        thumbnail_url = f"{settings.video_api_base_url}/thumb/{violation_id}"
-        snapshot_url = f"{settings.video_api_base_url}/snapshot/{camera}/{violation_id}"
+        video_url = media_url("clip", violation_id)
+        thumbnail_url = media_url("thumbnail", violation_id)
+        snapshot_url = media_url("snapshot", violation_id, camera)
         
         # Format response
         duration_data = {
@@ -536,8 +637,9 @@ async def get_violation_duration(
                     "confidence": float(d['confidence']) if d['confidence'] else 0.0
                 }
                 for d in detections
-            ]
+            ] if wants(fields, "detection_timeline") else None
         }
+        duration_data = select_fields([duration_data], fields)[0]
         
         # Cache for 5 minutes
         await cache.set(cache_key, duration_data, 300)
@@ -8,7 +8,8 @@ and live updates to connected clients.
 import asyncio
 import json
 import logging
-from typing import Dict, List, Set
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
 from fastapi.websockets import WebSocketState
 
@@ -17,7 +18,10 @@ from ..cache import CacheManager
 from ..dependencies import DatabaseDep, CacheDep
 from ..models import ViolationData, WebSocketMessage, BroadcastRequest
 from ..utils.formatting import format_violation_data
+from ..utils import metrics
+from ..utils.serialization import dumps_text
 from ..services.queries import ViolationQueries
+from ..services.event_buffer import EventBuffer
 from ..utils.time import get_current_timestamp, get_timestamp_ago
 from ..config import settings
 
@@ -35,9 +39,19 @@ class ConnectionManager:
         self.dashboard_connections: Set[WebSocket] = set()
         self.all_connections: Set[WebSocket] = set()
         
+        # Server-Sent Events subscriber queues by client type
+        self.stream_subscribers: Dict[asyncio.Queue, str] = {}
+        
+        # Sequence-stamped history of broadcasts for reconnecting clients
+        self.event_buffer = EventBuffer(settings.websocket_replay_buffer_size)
+        
+        # In-flight initial snapshot builds, shared by clients connecting together
+        self._snapshot_builds: Dict[Hashable, asyncio.Future] = {}
+        
         # Background task for polling
         self.polling_task: asyncio.Task = None
         self.is_polling = False
+        self.last_poll_check: Optional[float] = None
         
     async def connect(self, websocket: WebSocket, client_type: str = "dashboard"):
         """Accept a WebSocket connection and add to appropriate group."""
@@ -49,6 +63,7 @@ class ConnectionManager:
             self.dashboard_connections.add(websocket)
         
         self.all_connections.add(websocket)
+        self._update_connection_metrics()
         
         logger.info(f"WebSocket connected: {client_type} (total: {len(self.all_connections)})")
         
@@ -61,66 +76,186 @@ class ConnectionManager:
         self.violation_connections.discard(websocket)
         self.dashboard_connections.discard(websocket)
         self.all_connections.discard(websocket)
+        self._update_connection_metrics()
         
         logger.info(f"WebSocket disconnected (total: {len(self.all_connections)})")
         
         # Stop polling if no connections
-        if len(self.all_connections) == 0 and self.is_polling:
+        if not self.has_clients() and self.is_polling:
+            asyncio.create_task(self.stop_polling())
+    
+    def has_clients(self) -> bool:
+        """Check whether any WebSocket or stream client is connected."""
+        return bool(self.all_connections) or bool(self.stream_subscribers)
+    
+    def _update_connection_metrics(self):
+        """Publish the connection counts per channel."""
+        metrics.set_websocket_connections("violations", len(self.violation_connections))
+        metrics.set_websocket_connections("dashboard", len(self.dashboard_connections))
+        metrics.set_websocket_connections("stream", len(self.stream_subscribers))
+    
+    async def subscribe_stream(self, client_type: str = "dashboard") -> asyncio.Queue:
+        """
+        Register a Server-Sent Events subscriber.
+        
+        Args:
+            client_type: Client type (violations or dashboard)
+            
+        Returns:
+            Queue that receives every stamped event for the client type
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.sse_queue_size)
+        self.stream_subscribers[queue] = client_type
+        self._update_connection_metrics()
+        
+        logger.info(f"Event stream connected: {client_type} (total: {len(self.stream_subscribers)})")
+        
+        if not self.is_polling:
+            await self.start_polling()
+        
+        return queue
+    
+    def unsubscribe_stream(self, queue: asyncio.Queue):
+        """Remove a Server-Sent Events subscriber."""
+        if self.stream_subscribers.pop(queue, None) is None:
+            return
+        self._update_connection_metrics()
+        
+        logger.info(f"Event stream disconnected (total: {len(self.stream_subscribers)})")
+        
+        if not self.has_clients() and self.is_polling:
             asyncio.create_task(self.stop_polling())
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """Send a message to a specific WebSocket connection."""
         try:
             if websocket.client_state == WebSocketState.CONNECTED:
-                await websocket.send_text(json.dumps(message))
+                await websocket.send_text(dumps_text(message))
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
             self.disconnect(websocket)
     
     async def broadcast_to_violations(self, message: dict):
         """Broadcast a message to all violation monitoring connections."""
-        if not self.violation_connections:
-            return
-        
-        disconnected = set()
-        for connection in self.violation_connections.copy():
-            try:
-                if connection.client_state == WebSocketState.CONNECTED:
-                    await connection.send_text(json.dumps(message))
-                else:
-                    disconnected.add(connection)
-            except Exception as e:
-                logger.error(f"Error broadcasting to violation connection: {e}")
-                disconnected.add(connection)
-        
-        # Remove disconnected connections
-        for connection in disconnected:
-            self.disconnect(connection)
+        await self._broadcast("violations", message, self.violation_connections)
     
     async def broadcast_to_dashboard(self, message: dict):
         """Broadcast a message to all dashboard connections."""
-        if not self.dashboard_connections:
+        await self._broadcast("dashboard", message, self.dashboard_connections)
+    
+    async def broadcast_to_all(self, message: dict):
+        """Broadcast a message to all connections."""
+        await self._broadcast("all", message, self.all_connections)
+    
+    async def _broadcast(self, channel: str, message: dict, connections: Set[WebSocket]):
+        """Stamp a message and fan it out to streams and WebSocket connections."""
+        started = time.perf_counter()
+        event = self.event_buffer.append(channel, message)
+        self._publish_to_streams(channel, event)
+        await self._send_to_connections(connections, event)
+        metrics.observe_broadcast(channel, time.perf_counter() - started)
+    
+    def _publish_to_streams(self, channel: str, event: dict):
+        """Queue an already stamped event for matching stream subscribers."""
+        for queue, client_type in list(self.stream_subscribers.items()):
+            if channel != "all" and channel != client_type:
+                continue
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Drop subscribers that cannot keep up; they reconnect with
+                # Last-Event-ID and resume from the replay buffer.
+                logger.warning("Dropping lagging event stream subscriber")
+                self.unsubscribe_stream(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+    
+    async def _send_to_connections(self, connections: Set[WebSocket], event: dict):
+        """Send an already stamped event to a group of connections."""
+        if not connections:
             return
         
+        payload = dumps_text(event)
         disconnected = set()
-        for connection in self.dashboard_connections.copy():
+        for connection in connections.copy():
             try:
                 if connection.client_state == WebSocketState.CONNECTED:
-                    await connection.send_text(json.dumps(message))
+                    await connection.send_text(payload)
                 else:
                     disconnected.add(connection)
             except Exception as e:
-                logger.error(f"Error broadcasting to dashboard connection: {e}")
+                logger.error(f"Error broadcasting to WebSocket connection: {e}")
                 disconnected.add(connection)
         
         # Remove disconnected connections
         for connection in disconnected:
             self.disconnect(connection)
     
-    async def broadcast_to_all(self, message: dict):
-        """Broadcast a message to all connections."""
-        await self.broadcast_to_violations(message)
-        await self.broadcast_to_dashboard(message)
+    async def replay_missed_events(
+        self,
+        websocket: WebSocket,
+        client_type: str,
+        since_seq: int,
+        epoch: Optional[str] = None
+    ) -> bool:
+        """
+        Send a reconnecting client the events it missed since ``since_seq``.
+        
+        Args:
+            websocket: WebSocket connection
+            client_type: Client type (violations or dashboard)
+            since_seq: Last sequence number the client received
+            epoch: Buffer epoch the sequence number belongs to
+            
+        Returns:
+            True if the client was resumed, False if it needs a full refresh
+        """
+        events = self.event_buffer.replay(
+            since_seq,
+            channels=(client_type, "all"),
+            epoch=epoch
+        )
+        if events is None:
+            return False
+        
+        for event in events:
+            await self.send_personal_message(event, websocket)
+        
+        resumed_message = WebSocketMessage(
+            type="resumed",
+            data={
+                "replayed": len(events),
+                "since_seq": since_seq,
+                "seq": self.event_buffer.last_seq,
+                "epoch": self.event_buffer.epoch
+            }
+        )
+        await self.send_personal_message(resumed_message.dict(), websocket)
+        return True
+    
+    async def shared_snapshot(self, key: Hashable, build: Callable[[], Awaitable[dict]]) -> dict:
+        """
+        Build an initial snapshot, sharing one build between concurrent callers.
+        
+        A reconnect storm (e.g. after a deploy) would otherwise run the same
+        snapshot queries once per client; callers asking for the same key
+        while a build is in flight wait for that build instead.
+        
+        Args:
+            key: Snapshot identity, e.g. ("violations", camera, hours)
+            build: Coroutine function building the snapshot
+            
+        Returns:
+            Snapshot message (shared between callers; do not modify)
+        """
+        build_task = self._snapshot_builds.get(key)
+        if build_task is None:
+            build_task = asyncio.ensure_future(build())
+            self._snapshot_builds[key] = build_task
+            build_task.add_done_callback(lambda _: self._snapshot_builds.pop(key, None))
+        # A caller disconnecting mid-build must not cancel it for the others
+        return await asyncio.shield(build_task)
     
     async def start_polling(self):
         """Start background polling for new violations."""
@@ -147,7 +282,9 @@ class ConnectionManager:
     
     async def _poll_violations(self):
         """Background task to poll for new violations."""
-        last_check = get_current_timestamp()
+        # Resume from where the previous polling run stopped so violations
+        # raised while nobody was connected are still broadcast (and buffered).
+        last_check = self.last_poll_check or get_current_timestamp()
         
         while self.is_polling:
             try:
@@ -208,6 +345,7 @@ class ConnectionManager:
                     await self.broadcast_to_dashboard(summary_message.dict())
                 
                 last_check = current_time
+                self.last_poll_check = current_time
                 
                 # Clean up managers
                 await db_manager.close()
@@ -225,11 +363,61 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+async def build_violations_snapshot(camera: Optional[str], hours: int) -> dict:
+    """Get the initial violations snapshot for a newly connected client."""
+    return await manager.shared_snapshot(
+        ("violations", camera, hours),
+        lambda: _build_violations_snapshot(camera, hours)
+    )
+
+
+async def _build_violations_snapshot(camera: Optional[str], hours: int) -> dict:
+    """Build the initial violations snapshot for a newly connected client."""
+    db_manager = DatabaseManager()
+    await db_manager.initialize()
+    
+    try:
+        # Get recent violations
+        violations = await ViolationQueries.get_live_violations(
+            db=db_manager,
+            camera=camera,
+            hours=hours,
+            limit=50
+        )
+    finally:
+        await db_manager.close()
+    
+    # Format violations
+    formatted_violations = [
+        format_violation_data(violation) 
+        for violation in violations
+    ]
+    
+    # The snapshot is current as of the latest buffered event, so a client
+    # can resume from this sequence number on its next reconnect.
+    initial_message = WebSocketMessage(
+        type="initial_data",
+        data={
+            "violations": formatted_violations,
+            "count": len(formatted_violations),
+            "camera_filter": camera,
+            "hours": hours,
+            "timestamp": get_current_timestamp(),
+            "seq": manager.event_buffer.last_seq,
+            "epoch": manager.event_buffer.epoch
+        }
+    )
+    
+    return initial_message.dict()
+
+
 @router.websocket("/violations")
 async def websocket_violations(
     websocket: WebSocket,
     camera: str = Query(None, description="Filter by specific camera"),
-    hours: int = Query(24, ge=1, le=168, description="Hours to look back")
+    hours: int = Query(24, ge=1, le=168, description="Hours to look back"),
+    since_seq: Optional[int] = Query(None, ge=0, description="Resume after this event sequence number"),
+    epoch: Optional[str] = Query(None, description="Event stream epoch the sequence number belongs to")
 ):
     """
     WebSocket endpoint for real-time violation monitoring.
@@ -240,53 +428,27 @@ async def websocket_violations(
     - Camera information
     - Media URLs
     
+    Reconnecting clients may pass the ``seq`` and ``epoch`` of the last event
+    they received as ``since_seq``/``epoch``; if the replay buffer still covers
+    the gap they are sent only the missed events instead of the initial data.
+    
     Args:
         websocket: WebSocket connection
         camera: Optional camera filter
         hours: Hours to look back for initial data
+        since_seq: Last event sequence number received before reconnecting
+        epoch: Event stream epoch of ``since_seq``
     """
     await manager.connect(websocket, "violations")
     
     try:
-        # Send initial data
-        db_manager = DatabaseManager()
-        cache_manager = CacheManager()
+        resumed = False
+        if since_seq is not None:
+            resumed = await manager.replay_missed_events(websocket, "violations", since_seq, epoch)
         
-        # Initialize managers
-        await db_manager.initialize()
-        await cache_manager.initialize()
-        
-        # Get recent violations
-        violations = await ViolationQueries.get_live_violations(
-            db=db_manager,
-            camera=camera,
-            hours=hours,
-            limit=50
-        )
-        
-        # Format violations
-        formatted_violations = [
-            format_violation_data(violation) 
-            for violation in violations
-        ]
-        
-        # Send initial data
-        initial_message = WebSocketMessage(
-            type="initial_data",
-            data={
-                "violations": formatted_violations,
-                "count": len(formatted_violations),
-                "camera_filter": camera,
-                "hours": hours,
-                "timestamp": get_current_timestamp()
-            }
-        )
-        
-        await manager.send_personal_message(initial_message.dict(), websocket)
-        
-        # Clean up managers
-        await db_manager.close()
-        await cache_manager.close()
+        if not resumed:
+            initial_message = await build_violations_snapshot(camera, hours)
+            await manager.send_personal_message(initial_message, websocket)
         
         # Keep connection alive and handle messages
         while True:
@@ -354,10 +516,90 @@ async def websocket_violations(
         manager.disconnect(websocket)
 
 
+async def build_dashboard_snapshot(subscribe_to: str) -> dict:
+    """Get the initial dashboard snapshot for a newly connected client."""
+    return await manager.shared_snapshot(
+        ("dashboard", subscribe_to),
+        lambda: _build_dashboard_snapshot(subscribe_to)
+    )
+
+
+async def _build_dashboard_snapshot(subscribe_to: str) -> dict:
+    """Build the initial dashboard snapshot for a newly connected client."""
+    db_manager = DatabaseManager()
+    cache_manager = CacheManager()
+    
+    # Initialize managers
+    await db_manager.initialize()
+    await cache_manager.initialize()
+    
+    # Get initial dashboard data based on subscription
+    initial_data = {}
+    
+    if subscribe_to in ["all", "violations"]:
+        # Get recent violations summary
+        violations = await ViolationQueries.get_live_violations(
+            db=db_manager,
+            hours=24,
+            limit=10
+        )
+        initial_data["violations"] = {
+            "recent": [format_violation_data(v) for v in violations[:5]],
+            "total_24h": len(violations),
+            "timestamp": get_current_timestamp()
+        }
+    
+    if subscribe_to in ["all", "cameras"]:
+        # Get camera summaries
+        from ..services.queries import CameraQueries
+        from ..utils.formatting import format_camera_summary
+        camera_summaries = []
+        try:
+            summaries = await CameraQueries.get_camera_summaries(db=db_manager, cameras=settings.CAMERAS[:5])  # Top 5 cameras
+            camera_summaries = [format_camera_summary(summary) for summary in summaries]
+        except Exception as e:
+            logger.warning(f"Failed to get camera summaries: {e}")
+    
+        initial_data["cameras"] = {
+            "summaries": camera_summaries,
+            "timestamp": get_current_timestamp()
+        }
+    
+    if subscribe_to in ["all", "employees"]:
+        # Get employee activity summary
+        from ..services.queries import EmployeeQueries
+        from ..utils.formatting import format_employee_stats
+    
+        employee_stats = await EmployeeQueries.get_employee_stats(
+            db=db_manager,
+            hours=24
+        )
+    
+        initial_data["employees"] = {
+            "stats": [format_employee_stats(stat) for stat in employee_stats[:10]],
+            "timestamp": get_current_timestamp()
+        }
+    
+    # Clean up managers
+    await db_manager.close()
+    await cache_manager.close()
+    
+    initial_data["seq"] = manager.event_buffer.last_seq
+    initial_data["epoch"] = manager.event_buffer.epoch
+    initial_message = WebSocketMessage(
+        type="dashboard_data",
+        data=initial_data
+    )
+    
+    return initial_message.dict()
+
+
 @router.websocket("/dashboard")
 async def websocket_dashboard(
     websocket: WebSocket,
-    subscribe_to: str = Query("all", description="Subscribe to: all, violations, cameras, employees")
+    subscribe_to: str = Query("all", description="Subscribe to: all, violations, cameras, employees"),
+    since_seq: Optional[int] = Query(None, ge=0, description="Resume after this event sequence number"),
+    epoch: Optional[str] = Query(None, description="Event stream epoch the sequence number belongs to")
 ):
     """
     WebSocket endpoint for dashboard updates.
@@ -368,81 +610,25 @@ async def websocket_dashboard(
     - Employee activity
     - System health
     
+    Reconnecting clients may pass ``since_seq``/``epoch`` to be sent only the
+    events they missed, as for ``/ws/violations``.
+    
     Args:
         websocket: WebSocket connection
         subscribe_to: What to subscribe to (all, violations, cameras, employees)
+        since_seq: Last event sequence number received before reconnecting
+        epoch: Event stream epoch of ``since_seq``
     """
     await manager.connect(websocket, "dashboard")
     
     try:
-        # Send initial dashboard data
-        db_manager = DatabaseManager()
-        cache_manager = CacheManager()
-        
-        # Initialize managers
-        await db_manager.initialize()
-        await cache_manager.initialize()
-        
-        # Get initial dashboard data based on subscription
-        initial_data = {}
-        
-        if subscribe_to in ["all", "violations"]:
-            # Get recent violations summary
-            violations = await ViolationQueries.get_live_violations(
-                db=db_manager,
-                hours=24,
-                limit=10
-            )
-            initial_data["violations"] = {
-                "recent": [format_violation_data(v) for v in violations[:5]],
-                "total_24h": len(violations),
-                "timestamp": get_current_timestamp()
-            }
+        resumed = False
+        if since_seq is not None:
+            resumed = await manager.replay_missed_events(websocket, "dashboard", since_seq, epoch)
         
-        if subscribe_to in ["all", "cameras"]:
-            # Get camera summaries
-            from ..services.queries import CameraQueries
-            from ..utils.formatting import format_camera_summary
-            camera_summaries = []
-            for camera in settings.CAMERAS[:5]:  # Top 5 cameras
-                try:
-                    summary = await CameraQueries.get_camera_summary(db=db_manager, camera=camera)
-                    if summary:
-                        camera_summaries.append(format_camera_summary(summary))
-                except Exception as e:
-                    logger.warning(f"Failed to get camera summary for {camera}: {e}")
-            
-            initial_data["cameras"] = {
-                "summaries": camera_summaries,
-                "timestamp": get_current_timestamp()
-            }
-        
-        if subscribe_to in ["all", "employees"]:
-            # Get employee activity summary
-            from ..services.queries import EmployeeQueries
-            from ..utils.formatting import format_employee_stats
-            
-            employee_stats = await EmployeeQueries.get_employee_stats(
-                db=db_manager,
-                hours=24
-            )
-            
-            initial_data["employees"] = {
-                "stats": [format_employee_stats(stat) for stat in employee_stats[:10]],
-                "timestamp": get_current_timestamp()
-            }
-        
-        # Send initial data
-        initial_message = WebSocketMessage(
-            type="dashboard_data",
-            data=initial_data
-        )
-        
-        await manager.send_personal_message(initial_message.dict(), websocket)
-        
-        # Clean up managers
-        await db_manager.close()
-        await cache_manager.close()
+        if not resumed:
+            initial_message = await build_dashboard_snapshot(subscribe_to)
+            await manager.send_personal_message(initial_message, websocket)
         
         # Keep connection alive
         while True:
@@ -491,8 +677,10 @@ async def get_websocket_status() -> dict:
         "total_connections": len(manager.all_connections),
         "violation_connections": len(manager.violation_connections),
         "dashboard_connections": len(manager.dashboard_connections),
+        "stream_connections": len(manager.stream_subscribers),
         "is_polling": manager.is_polling,
-        "polling_interval": settings.websocket_poll_interval
+        "polling_interval": settings.websocket_poll_interval,
+        "replay_buffer": manager.event_buffer.get_stats()
     }
 
 
@@ -15,7 +15,7 @@ from pydantic import BaseModel, Field
 from app.database import DatabaseManager, get_database
 from app.cache import CacheManager, get_cache
 from app.config import settings
-from app.utils.response_formatter import format_success_response, format_error_response
+from app.utils.response_formatter import create_json_response, format_error_response
 from app.utils.time import timestamp_to_iso
 
 router = APIRouter(prefix="/api/zones", tags=["zones"])
@@ -93,7 +93,7 @@ async def get_zone_occupancy(
         cache_key = f"zone_occupancy:{minutes_threshold}"
         cached_result = await cache.get(cache_key)
         if cached_result:
-            return format_success_response(
+            return create_json_response(
                 data=cached_result,
                 message=f"Zone occupancy (last {minutes_threshold} minutes)"
             )
@@ -180,7 +180,7 @@ async def get_zone_occupancy(
         # Cache for 1 minute
         await cache.set(cache_key, {"zones": occupancy_list}, 60)
         
-        return format_success_response(
+        return create_json_response(
             data={"zones": occupancy_list},
             message=f"Zone occupancy (last {minutes_threshold} minutes)"
         )
@@ -220,9 +220,10 @@ async def get_zone_activity_heatmap(
         cache_key = f"zone_heatmap:{date or 'today'}:{hours}"
         cached_result = await cache.get(cache_key)
         if cached_result:
-            return format_success_response(
+            return create_json_response(
                 data=cached_result,
-                message=f"Zone activity heatmap for {target_date.strftime('%Y-%m-%d')}"
+                message=f"Zone activity heatmap for {target_date.strftime('%Y-%m-%d')}",
+                cache_key=cache_key
             )
         
         # Query hourly activity per zone
@@ -307,7 +308,7 @@ async def get_zone_activity_heatmap(
         # Cache for 5 minutes
         await cache.set(cache_key, {"zones": activity_list}, 300)
         
-        return format_success_response(
+        return create_json_response(
             data={"zones": activity_list},
             message=f"Zone activity heatmap for {target_date.strftime('%Y-%m-%d')}"
         )
@@ -349,7 +350,7 @@ async def get_zone_stats(
         cache_key = f"zone_stats:{date or 'today'}"
         cached_result = await cache.get(cache_key)
         if cached_result:
-            return format_success_response(
+            return create_json_response(
                 data=cached_result,
                 message=f"Zone statistics for {target_date.strftime('%Y-%m-%d')}"
             )
@@ -447,7 +448,7 @@ async def get_zone_stats(
         # Cache for 10 minutes
         await cache.set(cache_key, stats_data, 600)
         
-        return format_success_response(
+        return create_json_response(
             data=stats_data,
             message=f"Zone statistics for {target_date.strftime('%Y-%m-%d')}"
         )
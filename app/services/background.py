@@ -3,27 +3,105 @@ Background tasks for the Frigate Dashboard Middleware.
 
 This module provides background tasks for polling the database,
 refreshing aggregated statistics, and managing cache.
+
+Every worker process starts a BackgroundTaskManager, but only the worker
+holding the Redis leader lease runs the tasks; the others are followers
+that serve requests from the caches the leader fills.
 """
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Awaitable, Callable, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
-from ..database import DatabaseManager
-from ..cache import CacheManager
-from ..services.queries import (
-    ViolationQueries,
-    EmployeeQueries,
-    CameraQueries,
-    DashboardQueries
-)
+from ..database import DatabaseManager, db_manager
+from ..cache import CacheManager, cache_manager
+from ..services.queries import ViolationQueries, DashboardQueries
+from ..services.media_index import media_index
+from ..services.frigate_client import frigate_client
+from ..services.leader import LeaderLease
+from ..services.refresh_graph import RefreshGraph, build_refresh_graph
+from ..utils import metrics
+from ..utils.response_formatter import format_violation_data
 from ..utils.time import get_current_timestamp, get_timestamp_ago
 from ..config import settings, CacheKeys
 
 logger = logging.getLogger(__name__)
 
 
+class RefreshSchedule:
+    """
+    Change-aware, adaptive schedule for one background refresh.
+    
+    Each check compares a per-camera timeline watermark (latest timestamp
+    and row count) with the one seen at the last refresh. The refresh runs
+    only if a camera has new rows, or if max_skip_interval has passed so
+    rolling-window aggregates still age out. The check interval stays at
+    the base interval while rows keep arriving and doubles, up to
+    base * backoff_factor, while they do not.
+    """
+    
+    def __init__(self, name: str, interval: float, backoff_factor: int, max_skip_interval: float):
+        self.name = name
+        self.base_interval = interval
+        self.max_interval = interval * backoff_factor
+        self.max_skip_interval = max_skip_interval
+        self.interval = interval
+        self.watermark: Optional[Dict[str, Tuple[float, int]]] = None
+        self.refreshed_at: Optional[float] = None
+        self.refreshes = 0
+        self.skips = 0
+    
+    @staticmethod
+    def _advanced(previous: Dict[str, Tuple[float, int]], current: Dict[str, Tuple[float, int]]) -> bool:
+        """Whether any camera has rows newer or more numerous than before."""
+        for camera, (last_timestamp, row_count) in current.items():
+            before = previous.get(camera)
+            # Counts that only shrink are rows ageing out of the window
+            if before is None or last_timestamp > before[0] or row_count > before[1]:
+                return True
+        return False
+    
+    def check(self, watermark: Dict[str, Tuple[float, int]]) -> bool:
+        """
+        Decide whether to refresh now and set the next interval.
+        
+        Args:
+            watermark: Current timeline watermark
+            
+        Returns:
+            Whether the refresh should run
+        """
+        now = time.monotonic()
+        changed = self.watermark is None or self._advanced(self.watermark, watermark)
+        overdue = self.refreshed_at is None or now - self.refreshed_at >= self.max_skip_interval
+        
+        self.interval = self.base_interval if changed else min(self.interval * 2, self.max_interval)
+        
+        if changed or overdue:
+            self.watermark = watermark
+            self.refreshed_at = now
+            self.refreshes += 1
+            return True
+        
+        self.skips += 1
+        return False
+    
+    def invalidate(self):
+        """Force a refresh on the next check (e.g. after a failed refresh)."""
+        self.watermark = None
+        self.interval = self.base_interval
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get schedule statistics."""
+        return {
+            "interval": self.interval,
+            "refreshes": self.refreshes,
+            "skips": self.skips
+        }
+
+
 class BackgroundTaskManager:
     """Manages background tasks for the application."""
     
@@ -32,25 +110,68 @@ class BackgroundTaskManager:
         self.is_running = False
         self.db_manager: Optional[DatabaseManager] = None
         self.cache_manager: Optional[CacheManager] = None
+        self.lease: Optional[LeaderLease] = None
+        self._election_task: Optional[asyncio.Task] = None
+        self.schedules: Dict[str, RefreshSchedule] = {}
+        self.refresh_graph: RefreshGraph = build_refresh_graph()
     
     async def start(self):
-        """Start all background tasks."""
+        """Start leader election; the tasks run only while this worker leads."""
         if self.is_running:
             logger.warning("Background tasks already running")
             return
         
         logger.info("Starting background tasks...")
         
-        # Initialize managers
-        self.db_manager = DatabaseManager()
-        self.cache_manager = CacheManager()
-        
-        await self.db_manager.initialize()
-        await self.cache_manager.initialize()
+        # Share the application's pools rather than opening more per worker
+        self.db_manager = db_manager
+        self.cache_manager = cache_manager
+        self.lease = LeaderLease(
+            self.cache_manager,
+            CacheKeys.background_leader(),
+            settings.background_tasks.leader_lease_ttl
+        )
         
         self.is_running = True
+        self._election_task = asyncio.create_task(self._leader_election_task())
         
-        # Start individual tasks
+        logger.info(f"Background leader election started as {self.lease.instance_id}")
+    
+    async def _leader_election_task(self):
+        """Hold or contend for the leader lease, starting and stopping tasks to match."""
+        while self.is_running:
+            try:
+                is_leader = await self.lease.acquire()
+            except Exception as e:
+                # Without Redis the lease cannot be guaranteed, so step down
+                logger.error(f"Error in leader election: {e}")
+                self.lease.is_leader = is_leader = False
+            
+            if is_leader and not self.tasks:
+                logger.info(f"Acquired background leader lease: {self.lease.instance_id}")
+                self._start_tasks()
+            elif not is_leader and self.tasks:
+                logger.info(f"Lost background leader lease: {self.lease.instance_id}")
+                await self._stop_tasks()
+            
+            await asyncio.sleep(self.lease.renew_interval)
+    
+    def _start_tasks(self):
+        """Start the individual background tasks."""
+        # Fresh schedules and graph, so a new leader refreshes everything once
+        self.refresh_graph = build_refresh_graph()
+        self.schedules = {
+            name: RefreshSchedule(
+                name,
+                interval,
+                settings.background_tasks.idle_backoff_factor,
+                settings.background_tasks.max_skip_interval
+            )
+            for name, interval in (
+                ("violation_polling", settings.background_poll_interval),
+                ("stats_refresh", settings.background_stats_refresh_interval)
+            )
+        }
         self.tasks["violation_polling"] = asyncio.create_task(
             self._violation_polling_task()
         )
@@ -63,19 +184,15 @@ class BackgroundTaskManager:
         self.tasks["health_check"] = asyncio.create_task(
             self._health_check_task()
         )
+        if settings.media_index.enabled:
+            self.tasks["media_index"] = asyncio.create_task(
+                self._media_index_task()
+            )
         
         logger.info("Background tasks started successfully")
     
-    async def stop(self):
-        """Stop all background tasks."""
-        if not self.is_running:
-            return
-        
-        logger.info("Stopping background tasks...")
-        
-        self.is_running = False
-        
-        # Cancel all tasks
+    async def _stop_tasks(self):
+        """Cancel the individual background tasks."""
         for task_name, task in self.tasks.items():
             if not task.done():
                 task.cancel()
@@ -85,126 +202,121 @@ class BackgroundTaskManager:
                     logger.debug(f"Task {task_name} cancelled")
         
         self.tasks.clear()
+    
+    async def stop(self):
+        """Stop all background tasks and hand the lease to another worker."""
+        if not self.is_running:
+            return
+        
+        logger.info("Stopping background tasks...")
         
-        # Close managers
-        if self.db_manager:
-            await self.db_manager.close()
-        if self.cache_manager:
-            await self.cache_manager.close()
+        self.is_running = False
+        
+        if self._election_task and not self._election_task.done():
+            self._election_task.cancel()
+            try:
+                await self._election_task
+            except asyncio.CancelledError:
+                pass
+        self._election_task = None
+        
+        await self._stop_tasks()
+        
+        # Release the lease so a follower takes over without waiting for expiry
+        if self.lease:
+            await self.lease.release()
         
         logger.info("Background tasks stopped")
     
     async def _violation_polling_task(self):
         """Poll for new violations and update cache."""
         logger.info("Started violation polling task")
-        
-        while self.is_running:
-            try:
-                # Get recent violations
-                violations = await ViolationQueries.get_live_violations(
-                    db=self.db_manager,
-                    hours=1,
-                    limit=100
-                )
-                
-                # Update violation cache
-                cache_key = CacheKeys.live_violations()
-                await self.cache_manager.set(
-                    cache_key,
-                    violations,
-                    settings.cache_ttl_live_violations
-                )
-                
-                # Update hourly trend cache
-                hourly_trend = await ViolationQueries.get_hourly_trend(
-                    db=self.db_manager,
-                    hours=24
-                )
-                trend_cache_key = CacheKeys.hourly_trend()
-                await self.cache_manager.set(
-                    trend_cache_key,
-                    hourly_trend,
-                    settings.cache_ttl_hourly_trend
-                )
-                
-                logger.debug(f"Updated violation cache: {len(violations)} violations")
-                
-            except Exception as e:
-                logger.error(f"Error in violation polling task: {e}")
-            
-            await asyncio.sleep(settings.background_poll_interval)
+        await self._run_scheduled(
+            self.schedules["violation_polling"],
+            self._refresh_violations,
+            lambda: {CacheKeys.live_violations(): settings.cache_ttl_live_violations}
+        )
     
     async def _stats_refresh_task(self):
-        """Refresh aggregated statistics."""
+        """Refresh the derived caches of the refresh graph."""
         logger.info("Started stats refresh task")
+        await self._run_scheduled(
+            self.schedules["stats_refresh"],
+            self._refresh_stats,
+            self.refresh_graph.cache_ttls
+        )
+    
+    async def _run_scheduled(
+        self,
+        schedule: "RefreshSchedule",
+        refresh: Callable[[], Awaitable[None]],
+        cache_ttls: Callable[[], Dict[str, int]]
+    ):
+        """
+        Run a refresh whenever the timeline has changed.
         
+        While nothing changes the refresh is skipped, the cached results
+        are kept alive instead, and the check interval backs off.
+        
+        Args:
+            schedule: Schedule tracking the refresh's watermark and interval
+            refresh: Coroutine function recomputing and caching the results
+            cache_ttls: Function giving the keys the refresh fills, with their TTLs
+        """
         while self.is_running:
+            started = time.perf_counter()
+            result = "refreshed"
             try:
-                # Refresh employee stats
-                employee_stats = await EmployeeQueries.get_employee_stats(
-                    db=self.db_manager,
-                    hours=24
-                )
-                cache_key = CacheKeys.employee_stats()
-                await self.cache_manager.set(
-                    cache_key,
-                    employee_stats,
-                    settings.cache_ttl_employee_stats
-                )
-                
-                # Refresh camera summaries
-                camera_summaries = []
-                for camera in settings.CAMERAS:
-                    try:
-                        summary = await CameraQueries.get_camera_summary(
-                            db=self.db_manager,
-                            camera=camera
-                        )
-                        if summary:
-                            camera_summaries.append(summary)
-                    except Exception as e:
-                        logger.warning(f"Failed to get camera summary for {camera}: {e}")
-                
-                # Cache individual camera summaries
-                for summary in camera_summaries:
-                    camera_cache_key = CacheKeys.camera_summary()
-                    await self.cache_manager.set(
-                        camera_cache_key,
-                        summary,
-                        settings.cache_ttl_camera_summary
-                    )
-                
-                # Cache all camera summaries
-                all_cameras_key = "cameras:summary:all"
-                await self.cache_manager.set(
-                    all_cameras_key,
-                    camera_summaries,
-                    settings.cache_ttl_camera_summary
-                )
-                
-                # Refresh dashboard overview
-                dashboard_overview = await DashboardQueries.get_dashboard_overview(
-                    db=self.db_manager
-                )
-                dashboard_cache_key = CacheKeys.dashboard_overview()
-                await self.cache_manager.set(
-                    dashboard_cache_key,
-                    dashboard_overview,
-                    settings.cache_ttl_dashboard_overview
-                )
-                
-                logger.debug("Refreshed aggregated statistics")
-                
+                watermark = await DashboardQueries.get_timeline_watermark(db=self.db_manager)
+                if schedule.check(watermark):
+                    await refresh()
+                else:
+                    result = "skipped"
+                    # Unchanged data: keep serving it until the next check
+                    for key, ttl in cache_ttls().items():
+                        await self.cache_manager.expire(key, max(ttl, int(schedule.interval * 2)))
+                    logger.debug(f"Skipped {schedule.name}: timeline unchanged, next check in {schedule.interval}s")
             except Exception as e:
-                logger.error(f"Error in stats refresh task: {e}")
+                result = "error"
+                schedule.invalidate()
+                logger.error(f"Error in {schedule.name} task: {e}")
+            metrics.observe_background_cycle(schedule.name, time.perf_counter() - started, result)
             
-            await asyncio.sleep(settings.background_stats_refresh_interval)
+            await asyncio.sleep(schedule.interval)
+    
+    async def _refresh_violations(self):
+        """Recompute and cache live violations."""
+        # Get recent violations
+        violations = await ViolationQueries.get_live_violations(
+            db=self.db_manager,
+            hours=1,
+            limit=100
+        )
+        
+        # Update violation cache (formatted, as the live endpoint serves it)
+        cache_key = CacheKeys.live_violations()
+        await self.cache_manager.set(
+            cache_key,
+            [format_violation_data(violation) for violation in violations],
+            settings.cache_ttl_live_violations
+        )
+        
+        logger.debug(f"Updated violation cache: {len(violations)} violations")
+    
+    async def _refresh_stats(self):
+        """Run one refresh graph cycle (trend, employee stats, summaries, overview)."""
+        outcome = await self.refresh_graph.run(self.db_manager, self.cache_manager)
+        if outcome["failed"]:
+            raise RuntimeError(f"Derived caches failed: {', '.join(outcome['failed'])}")
+        logger.debug(f"Refreshed derived caches: {', '.join(outcome['computed']) or 'none changed'}")
     
     async def _cache_cleanup_task(self):
         """Clean up expired cache entries and perform maintenance."""
         logger.info("Started cache cleanup task")
         
         while self.is_running:
+            started = time.perf_counter()
+            result = "ok"
             try:
                 # Get cache statistics
                 cache_info = await self.cache_manager.redis.info("memory")
@@ -221,7 +333,9 @@ class BackgroundTaskManager:
                 await self._cleanup_orphaned_keys()
                 
             except Exception as e:
+                result = "error"
                 logger.error(f"Error in cache cleanup task: {e}")
+            metrics.observe_background_cycle("cache_cleanup", time.perf_counter() - started, result)
             
             await asyncio.sleep(settings.background_cache_cleanup_interval)
     
@@ -230,6 +344,8 @@ class BackgroundTaskManager:
         logger.info("Started health check task")
         
         while self.is_running:
+            started = time.perf_counter()
+            result = "ok"
             try:
                 # Check database health
                 db_health = await self.db_manager.health_check()
@@ -258,10 +374,32 @@ class BackgroundTaskManager:
                 )
                 
             except Exception as e:
+                result = "error"
                 logger.error(f"Error in health check task: {e}")
+            metrics.observe_background_cycle("health_check", time.perf_counter() - started, result)
             
             await asyncio.sleep(settings.background_health_check_interval)
     
+    async def _media_index_task(self):
+        """Rebuild the media availability index."""
+        logger.info("Started media index task")
+        
+        while self.is_running:
+            started = time.perf_counter()
+            result = "ok"
+            try:
+                await media_index.refresh(
+                    db=self.db_manager,
+                    cache=self.cache_manager,
+                    frigate=frigate_client
+                )
+            except Exception as e:
+                result = "error"
+                logger.error(f"Error in media index task: {e}")
+            metrics.observe_background_cycle("media_index", time.perf_counter() - started, result)
+            
+            await asyncio.sleep(settings.media_index.refresh_interval)
+    
     async def _cleanup_orphaned_keys(self):
         """Clean up orphaned cache keys."""
         try:
@@ -290,6 +428,7 @@ class BackgroundTaskManager:
         """Get status of all background tasks."""
         status = {
             "is_running": self.is_running,
+            "leader": await self.lease.get_status() if self.lease else None,
             "tasks": {}
         }
         
@@ -299,11 +438,18 @@ class BackgroundTaskManager:
                 "cancelled": task.cancelled(),
                 "exception": str(task.exception()) if task.done() and task.exception() else None
             }
+            if task_name in self.schedules:
+                status["tasks"][task_name]["schedule"] = self.schedules[task_name].get_stats()
+        
+        if "stats_refresh" in self.tasks:
+            status["tasks"]["stats_refresh"]["derived_caches"] = self.refresh_graph.get_stats()
         
         return status
     
     async def restart_task(self, task_name: str):
         """Restart a specific background task."""
+        if self.lease and not self.lease.is_leader:
+            raise ValueError(f"Task {task_name} runs on the leader worker, not {self.lease.instance_id}")
         if task_name not in self.tasks:
             raise ValueError(f"Unknown task: {task_name}")
         
@@ -332,6 +478,10 @@ class BackgroundTaskManager:
             self.tasks[task_name] = asyncio.create_task(
                 self._health_check_task()
             )
+        elif task_name == "media_index":
+            self.tasks[task_name] = asyncio.create_task(
+                self._media_index_task()
+            )
         
         logger.info(f"Restarted task: {task_name}")
 
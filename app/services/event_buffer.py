@@ -0,0 +1,106 @@
+"""
+Replay buffer for real-time broadcast events.
+
+This module keeps a bounded, sequence-stamped history of the events pushed
+to streaming clients so that a reconnecting client can be sent only what it
+missed instead of re-querying the database.
+"""
+
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+class EventBuffer:
+    """
+    Bounded ring buffer of broadcast events with monotonic sequence numbers.
+
+    Sequence numbers are only meaningful within one buffer instance, so every
+    event is also stamped with the buffer ``epoch``. A client resuming against
+    a different process (or after a restart) presents a foreign epoch and is
+    told to fall back to a full refresh.
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self.epoch = uuid.uuid4().hex[:12]
+        self.maxlen = maxlen
+        self._events: Deque[Tuple[str, Dict[str, Any]]] = deque(maxlen=maxlen)
+        self._seq = 0
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the most recent event (0 if none yet)."""
+        return self._seq
+
+    @property
+    def oldest_seq(self) -> Optional[int]:
+        """Sequence number of the oldest event still held, if any."""
+        if not self._events:
+            return None
+        return self._events[0][1]["seq"]
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(self, channel: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stamp a message with the next sequence number and store it.
+
+        Args:
+            channel: Broadcast channel (violations, dashboard or all)
+            message: Message payload to broadcast
+
+        Returns:
+            The stamped event, as it should be sent to clients
+        """
+        self._seq += 1
+        event = dict(message)
+        event["seq"] = self._seq
+        event["epoch"] = self.epoch
+        self._events.append((channel, event))
+        return event
+
+    def replay(
+        self,
+        since_seq: int,
+        channels: Iterable[str],
+        epoch: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the events a client missed after ``since_seq``.
+
+        Args:
+            since_seq: Last sequence number the client received
+            channels: Channels the client is subscribed to
+            epoch: Buffer epoch the client's sequence number belongs to
+
+        Returns:
+            Missed events in order, or None if the buffer cannot cover the
+            gap and the client needs a full refresh
+        """
+        if epoch is not None and epoch != self.epoch:
+            return None
+        if since_seq > self._seq:
+            return None
+        if since_seq == self._seq:
+            return []
+
+        oldest = self.oldest_seq
+        if oldest is None or since_seq < oldest - 1:
+            return None
+
+        wanted = set(channels)
+        return [
+            event for channel, event in self._events
+            if event["seq"] > since_seq and channel in wanted
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer statistics."""
+        return {
+            "epoch": self.epoch,
+            "last_seq": self._seq,
+            "oldest_seq": self.oldest_seq,
+            "buffered_events": len(self._events),
+            "max_events": self.maxlen
+        }
@@ -0,0 +1,211 @@
+"""
+Async HTTP client for the Frigate API.
+
+This module provides a shared, non-blocking HTTP client for all outbound
+Frigate calls, with keep-alive connection pooling, per-host concurrency
+limits, timeouts and retries.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+import anyio
+import httpx
+
+from ..config import settings
+from ..utils import tracing
+
+logger = logging.getLogger(__name__)
+
+# Upstream statuses worth retrying for idempotent requests
+RETRY_STATUS_CODES = {502, 503, 504}
+
+
+class FrigateClient:
+    """Manages the pooled async HTTP client used to talk to Frigate."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.client: Optional[httpx.AsyncClient] = None
+        self._transport = transport
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def initialize(self) -> None:
+        """Create the pooled HTTP client."""
+        config = settings.video_api
+        self.client = httpx.AsyncClient(
+            base_url=config.base_url,
+            timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry
+            ),
+            transport=self._transport,
+            follow_redirects=True
+        )
+        logger.info(f"Frigate HTTP client initialized for {config.base_url}")
+
+    async def close(self) -> None:
+        """Close the HTTP client and its pooled connections."""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+            logger.info("Frigate HTTP client closed")
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get the concurrency limiter for the host a URL points at."""
+        host = httpx.URL(url).host or httpx.URL(settings.video_api.base_url).host
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.video_api.per_host_concurrency)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None
+    ) -> httpx.Response:
+        """
+        Send an idempotent request to Frigate with retries.
+
+        Transport errors, timeouts and 502/503/504 responses are retried
+        with exponential backoff.
+
+        Args:
+            method: HTTP method (GET or HEAD)
+            url: Absolute URL or path relative to the Frigate base URL
+            params: Optional query parameters
+            timeout: Optional per-request timeout in seconds
+            retries: Optional retry count (defaults to VIDEO_API_RETRY_ATTEMPTS)
+
+        Returns:
+            HTTP response
+
+        Raises:
+            httpx.HTTPError: If every attempt failed
+        """
+        if self.client is None:
+            await self.initialize()
+
+        if retries is None:
+            retries = settings.video_api.retry_attempts
+        request_timeout = timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+
+        attempt = 0
+        with tracing.span("frigate", f"{method} {url}"):
+            while True:
+                try:
+                    async with self._host_semaphore(url):
+                        response = await self.client.request(
+                            method, url, params=params, timeout=request_timeout
+                        )
+                    if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                        return response
+                    logger.warning(f"Frigate {method} {url} returned {response.status_code}, retrying")
+                except httpx.TransportError as e:
+                    if attempt >= retries:
+                        raise
+                    logger.warning(f"Frigate {method} {url} failed ({e!r}), retrying")
+
+                await asyncio.sleep(settings.video_api.retry_backoff * (2 ** attempt))
+                attempt += 1
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET a Frigate API path and decode the JSON body.
+
+        Raises:
+            httpx.HTTPError: On transport failure or non-2xx status
+        """
+        response = await self.request("GET", path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def download(self, url: str, destination: str) -> httpx.Response:
+        """
+        Stream a Frigate media URL into a local file.
+
+        The body is only written for 200 responses; the returned response
+        (already closed) carries the status and headers either way.
+
+        Args:
+            url: Absolute URL or path relative to the Frigate base URL
+            destination: File path to write the body to
+
+        Returns:
+            HTTP response (body consumed)
+
+        Raises:
+            httpx.HTTPError: If every attempt failed
+        """
+        if self.client is None:
+            await self.initialize()
+
+        attempt = 0
+        with tracing.span("frigate", f"GET {url}"):
+            while True:
+                try:
+                    async with self._host_semaphore(url):
+                        async with self.client.stream("GET", url) as response:
+                            if response.status_code == 200:
+                                # File I/O runs in worker threads so large clips don't block the loop
+                                async with await anyio.open_file(destination, "wb") as file:
+                                    async for chunk in response.aiter_bytes(65536):
+                                        await file.write(chunk)
+                    if response.status_code not in RETRY_STATUS_CODES or attempt >= settings.video_api.retry_attempts:
+                        return response
+                    logger.warning(f"Frigate GET {url} returned {response.status_code}, retrying")
+                except httpx.TransportError as e:
+                    if attempt >= settings.video_api.retry_attempts:
+                        raise
+                    logger.warning(f"Frigate GET {url} failed ({e!r}), retrying")
+
+                await asyncio.sleep(settings.video_api.retry_backoff * (2 ** attempt))
+                attempt += 1
+
+    async def probe(self, url: str) -> Dict[str, Any]:
+        """
+        Check whether a media URL is accessible with a HEAD request.
+
+        Args:
+            url: Media URL to check
+
+        Returns:
+            Dictionary with url, status, accessible and size (or error)
+        """
+        try:
+            response = await self.request(
+                "HEAD", url, timeout=settings.video_api.probe_timeout, retries=0
+            )
+            return {
+                "url": url,
+                "status": response.status_code,
+                "accessible": response.status_code == 200,
+                "size": response.headers.get("Content-Length", "unknown")
+            }
+        except httpx.HTTPError as e:
+            return {
+                "url": url,
+                "status": "error",
+                "accessible": False,
+                "error": str(e) or type(e).__name__
+            }
+
+    async def probe_many(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """Probe several media URLs concurrently, preserving order."""
+        return await asyncio.gather(*(self.probe(url) for url in urls))
+
+
+# Global Frigate client instance
+frigate_client = FrigateClient()
+
+
+# Frigate client dependency for FastAPI
+async def get_frigate_client() -> FrigateClient:
+    """FastAPI dependency to get the Frigate HTTP client."""
+    return frigate_client
@@ -0,0 +1,112 @@
+"""
+Redis lease leader election for the Frigate Dashboard Middleware.
+
+The app runs under several uvicorn workers, but the background refresh
+tasks only need to run once: their output goes to the shared Redis cache.
+Workers compete for a single Redis key holding a short lease. The holder
+renews it well inside its TTL and runs the background tasks; every other
+worker is a follower and only reads what the leader caches.
+
+Failover is bounded by the lease: a leader that stops cleanly deletes the
+key so a follower takes over on its next attempt, and a leader that dies
+leaves the key to expire within one TTL.
+"""
+
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Dict, Optional
+
+from ..cache import CacheManager
+
+logger = logging.getLogger(__name__)
+
+# Extend the lease only if we still hold it
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete the lease only if we still hold it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _decode(value: Any) -> Optional[str]:
+    """Decode a Redis reply (bytes with the cache's client)."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class LeaderLease:
+    """A renewable, owner-checked lease on a Redis key."""
+
+    def __init__(self, cache: CacheManager, key: str, ttl: int):
+        self.cache = cache
+        self.key = key
+        self.ttl = ttl
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+
+    @property
+    def renew_interval(self) -> float:
+        """Seconds between acquire/renew attempts (a third of the TTL)."""
+        return self.ttl / 3
+
+    async def acquire(self) -> bool:
+        """
+        Renew the lease if held, otherwise try to take it.
+
+        Returns:
+            Whether this instance is the leader until the next attempt
+        """
+        redis = self.cache.redis
+        if redis is None:
+            self.is_leader = False
+            return False
+
+        ttl_ms = int(self.ttl * 1000)
+
+        if self.is_leader:
+            if await redis.eval(_RENEW_SCRIPT, 1, self.key, self.instance_id, ttl_ms):
+                return True
+            logger.warning(f"Leader lease {self.key} was lost by {self.instance_id}")
+
+        self.is_leader = bool(await redis.set(self.key, self.instance_id, nx=True, px=ttl_ms))
+        return self.is_leader
+
+    async def release(self) -> None:
+        """Give up the lease so a follower can take over immediately."""
+        was_leader, self.is_leader = self.is_leader, False
+        if not was_leader or self.cache.redis is None:
+            return
+
+        try:
+            await self.cache.redis.eval(_RELEASE_SCRIPT, 1, self.key, self.instance_id)
+        except Exception as e:
+            logger.warning(f"Failed to release leader lease {self.key}: {e}")
+
+    async def current_leader(self) -> Optional[str]:
+        """Instance ID of the current lease holder, if any."""
+        if self.cache.redis is None:
+            return None
+
+        try:
+            return _decode(await self.cache.redis.get(self.key))
+        except Exception:
+            return None
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Get lease status for this instance."""
+        return {
+            "is_leader": self.is_leader,
+            "instance_id": self.instance_id,
+            "leader": await self.current_leader(),
+            "lease_ttl": self.ttl
+        }
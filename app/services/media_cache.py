@@ -0,0 +1,292 @@
+"""
+On-disk media cache for the Frigate Dashboard Middleware.
+
+This module backs the media proxy: thumbnails, snapshots and clips fetched
+from Frigate are stored in a size-bounded directory and evicted in
+least-recently-used order, so dashboards refreshing at once hit the disk
+instead of the NVR.
+
+File modification times double as the LRU clock (hits touch the file), so
+several workers can share one cache directory without coordination.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from ..config import settings
+from ..utils.errors import ExternalServiceError, NotFoundError
+from ..utils.time import get_current_timestamp
+from .frigate_client import FrigateClient, frigate_client
+
+logger = logging.getLogger(__name__)
+
+# Suffix for files still being downloaded; never served or counted
+PARTIAL_SUFFIX = ".part"
+
+# Fraction of the size budget eviction shrinks the cache down to
+EVICTION_TARGET = 0.9
+
+
+class MediaDiskCache:
+    """Size-bounded LRU cache of Frigate media files on local disk."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        frigate: Optional[FrigateClient] = None
+    ):
+        self.directory = directory or settings.media_cache.directory
+        self.max_bytes = max_bytes or settings.media_cache.max_size_mb * 1024 * 1024
+        self.frigate = frigate or frigate_client
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._size_estimate = 0
+        self._entries = 0
+        self._last_scan: Optional[float] = None
+        self._evict_lock = asyncio.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def path_for(self, key: str, suffix: str = "") -> str:
+        """Get the cache file path for a media key."""
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.directory, digest + suffix)
+
+    def lookup(self, key: str, suffix: str = "") -> Optional[str]:
+        """
+        Get the local path of a cached object without building it.
+
+        Returns:
+            Path to the cached file, or None on a miss
+        """
+        path = self.path_for(key, suffix)
+        try:
+            # Touching the file on a hit is what keeps it recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        self.stats["hits"] += 1
+        return path
+
+    def discard(self, key: str, suffix: str = "") -> None:
+        """Remove a cached object, if present."""
+        try:
+            os.remove(self.path_for(key, suffix))
+        except FileNotFoundError:
+            pass
+
+    async def fetch(self, key: str, url: str, suffix: str = "") -> str:
+        """
+        Get the local path of a media object, downloading it on a miss.
+
+        Concurrent misses for the same key share a single upstream fetch.
+
+        Args:
+            key: Cache key identifying the media object
+            url: Frigate URL (absolute or relative to the base URL)
+            suffix: File suffix, used to derive the served content type
+
+        Returns:
+            Path to the cached file
+
+        Raises:
+            NotFoundError: If Frigate has no such media
+            ExternalServiceError: If Frigate could not be reached
+        """
+        return await self.get_or_build(
+            key, suffix, lambda partial: self._download(key, url, partial)
+        )
+
+    async def get_or_build(
+        self,
+        key: str,
+        suffix: str,
+        build: Callable[[str], Awaitable[None]]
+    ) -> str:
+        """
+        Get the local path of a cached object, building it on a miss.
+
+        Concurrent misses for the same key share a single build.
+
+        Args:
+            key: Cache key identifying the object
+            suffix: File suffix
+            build: Coroutine function writing the object to the path it is given
+
+        Returns:
+            Path to the cached file
+        """
+        path = self.lookup(key, suffix)
+        if path is not None:
+            return path
+        path = self.path_for(key, suffix)
+
+        inflight_key = key + suffix
+        future = self._inflight.get(inflight_key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            future = asyncio.ensure_future(self._store(path, build))
+            self._inflight[inflight_key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+
+        # Shield so one cancelled client does not abort the shared build
+        return await asyncio.shield(future)
+
+    async def open(self, key: str, url: str, suffix: str = ""):
+        """
+        Fetch a media object and open it for reading.
+
+        Returns:
+            Binary file object positioned at the start
+        """
+        return await self.open_path(key, lambda: self.fetch(key, url, suffix))
+
+    async def open_path(self, key: str, get_path: Callable[[], Awaitable[str]]):
+        """
+        Open a cached file for reading.
+
+        Holding the file open keeps it readable even if a concurrent
+        eviction unlinks it; a file evicted before it could be opened is
+        fetched again once.
+
+        Args:
+            key: Cache key identifying the object (for logging)
+            get_path: Coroutine function fetching or building the object
+
+        Returns:
+            Binary file object positioned at the start
+        """
+        for attempt in range(2):
+            path = await get_path()
+            try:
+                return open(path, "rb")
+            except FileNotFoundError:
+                if attempt:
+                    raise
+                logger.debug(f"Media {key} evicted before it was opened, refetching")
+
+    async def _store(self, path: str, build: Callable[[str], Awaitable[None]]) -> str:
+        """Build an object into a temporary file and move it into place atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        partial = f"{path}.{uuid.uuid4().hex[:8]}{PARTIAL_SUFFIX}"
+
+        try:
+            await build(partial)
+            size = os.path.getsize(partial)
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+        self._size_estimate += size
+        self._entries += 1
+        await self._maybe_evict()
+        return path
+
+    async def _download(self, key: str, url: str, destination: str) -> None:
+        """Download a media object from Frigate."""
+        try:
+            response = await self.frigate.download(url, destination)
+        except httpx.HTTPError as e:
+            raise ExternalServiceError("frigate_api", f"Failed to fetch {key}: {e!r}")
+
+        if response.status_code == 404:
+            raise NotFoundError(resource="Media", identifier=key)
+        if response.status_code != 200:
+            raise ExternalServiceError(
+                "frigate_api", f"Fetching {key} returned HTTP {response.status_code}",
+                details={"status": response.status_code}
+            )
+
+    async def _maybe_evict(self) -> None:
+        """Rescan the directory when over budget or when the last scan is stale."""
+        now = get_current_timestamp()
+        scan_due = (
+            self._last_scan is None
+            or now - self._last_scan >= settings.media_cache.scan_interval
+        )
+        if self._size_estimate <= self.max_bytes and not scan_due:
+            return
+
+        if self._evict_lock.locked():
+            return
+        async with self._evict_lock:
+            self._last_scan = now
+            loop = asyncio.get_running_loop()
+            size, entries, evicted = await loop.run_in_executor(None, self._scan_and_evict)
+            self._size_estimate = size
+            self._entries = entries
+            self.stats["evictions"] += evicted
+
+    def _scan_and_evict(self) -> tuple:
+        """
+        Measure the cache directory and evict least recently used files.
+
+        Runs in a worker thread. Other workers sharing the directory may
+        add or remove files concurrently, so missing files are ignored.
+
+        Returns:
+            Tuple of (size in bytes, entry count, files evicted)
+        """
+        files = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or entry.name.endswith(PARTIAL_SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except FileNotFoundError:
+            return 0, 0, 0
+
+        evicted = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICTION_TARGET
+            files.sort()
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted += 1
+            logger.info(f"Evicted {evicted} media files from cache ({total} bytes remain)")
+
+        return total, len(files) - evicted, evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get media cache statistics."""
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups * 100, 2) if lookups else 0.0,
+            "inflight": len(self._inflight),
+            "entries": self._entries,
+            "size_bytes": self._size_estimate,
+            "max_bytes": self.max_bytes,
+            "directory": self.directory
+        }
+
+
+# Global media cache instance
+media_cache = MediaDiskCache()
+
+
+# Media cache dependency for FastAPI
+async def get_media_cache() -> MediaDiskCache:
+    """FastAPI dependency to get the on-disk media cache."""
+    return media_cache
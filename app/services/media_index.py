@@ -0,0 +1,311 @@
+"""
+Media availability index for the Frigate Dashboard Middleware.
+
+This module maintains a background-built index of which source_ids still
+have clip, snapshot and thumbnail media in Frigate, so responses can flag
+or omit dead media URLs without probing Frigate per request.
+
+The index is built from Frigate's recordings/reviewsegment retention data
+and confirmed with concurrent HEAD probes, then published to Redis as
+compact sorted arrays of 64-bit fingerprints that every worker loads.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..cache import CacheManager
+from ..database import DatabaseManager
+from ..config import settings, CacheKeys
+from ..utils.media_urls import MEDIA_URL_FIELDS, media_url
+from ..utils.time import get_current_timestamp, get_timestamp_ago
+from .frigate_client import FrigateClient
+from .queries import MediaQueries
+
+logger = logging.getLogger(__name__)
+
+# Media kinds tracked by the index
+MEDIA_KINDS = ("clip", "snapshot", "thumbnail")
+
+
+# Response modes accepted by annotate()
+MEDIA_MODES = ("all", "flag", "omit")
+
+
+def fingerprint(source_id: str) -> int:
+    """Map a source_id to a stable 64-bit fingerprint."""
+    return int.from_bytes(
+        hashlib.blake2b(source_id.encode(), digest_size=8).digest(),
+        "little"
+    )
+
+
+class CompactIdSet:
+    """
+    Read-only set of source_ids stored as a sorted array of fingerprints.
+
+    Uses 8 bytes per id and answers membership with a binary search. A
+    fingerprint collision can only make an id look present, never absent.
+    """
+
+    def __init__(self, fingerprints: Optional[array] = None):
+        self._fingerprints = fingerprints if fingerprints is not None else array("Q")
+
+    @classmethod
+    def from_ids(cls, source_ids: Iterable[str]) -> "CompactIdSet":
+        """Build a set from source_ids."""
+        return cls(array("Q", sorted({fingerprint(source_id) for source_id in source_ids})))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CompactIdSet":
+        """Load a set serialized with to_bytes()."""
+        fingerprints = array("Q")
+        fingerprints.frombytes(data)
+        return cls(fingerprints)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the set for storage."""
+        return self._fingerprints.tobytes()
+
+    def __contains__(self, source_id: str) -> bool:
+        value = fingerprint(source_id)
+        index = bisect_left(self._fingerprints, value)
+        return index < len(self._fingerprints) and self._fingerprints[index] == value
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+def source_id_from_url(url: str) -> str:
+    """Extract the source_id from a /clip, /thumb or /snapshot media URL."""
+    return url.rstrip("/").rsplit("/", 1)[-1]
+
+
+class MediaAvailabilityIndex:
+    """Builds, publishes and answers lookups against the media index."""
+
+    def __init__(self):
+        # All source_ids the index has an opinion about
+        self.covered = CompactIdSet()
+        # Source_ids with media available, per kind
+        self.available: Dict[str, CompactIdSet] = {kind: CompactIdSet() for kind in MEDIA_KINDS}
+        self.built_at: Optional[float] = None
+        self.loaded_at: Optional[float] = None
+        # Builder-side probe results, kept between refreshes: kind -> {source_id: ok}
+        self._probe_results: Dict[str, Dict[str, bool]] = {kind: {} for kind in MEDIA_KINDS}
+        self._load_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def is_available(self, kind: str, source_id: str) -> Optional[bool]:
+        """
+        Check whether media of a kind is available for a source_id.
+
+        Returns:
+            True/False if the index covers the source_id, None if unknown
+        """
+        if source_id not in self.covered:
+            return None
+        return source_id in self.available[kind]
+
+    def annotate(
+        self,
+        items: List[Dict[str, Any]],
+        mode: str = "all",
+        kinds: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Flag or omit dead media URLs in response items.
+
+        Args:
+            items: Response dictionaries carrying *_url media fields
+            mode: "all" leaves items untouched, "flag" adds a
+                ``media_available`` map, "omit" also nulls dead URLs
+            kinds: Media kinds to look up by the item's id when its URL
+                field is absent (compact rows, which only get flagged)
+
+        Returns:
+            Annotated copies of the items (the originals when mode is "all")
+        """
+        if mode == "all" or self.built_at is None:
+            return items
+
+        annotated = []
+        for item in items:
+            item = dict(item)
+            availability = {}
+            for kind, field in MEDIA_URL_FIELDS.items():
+                if field in item:
+                    url = item[field]
+                    if not url:
+                        continue
+                    source_id = source_id_from_url(url)
+                elif kind in kinds and item.get("id") and (kind != "snapshot" or item.get("camera")):
+                    source_id = item["id"]
+                else:
+                    continue
+                available = self.is_available(kind, source_id)
+                availability[kind] = available
+                if mode == "omit" and available is False and field in item:
+                    item[field] = None
+            item["media_available"] = availability
+            annotated.append(item)
+        return annotated
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            "built_at": self.built_at,
+            "loaded_at": self.loaded_at,
+            "covered": len(self.covered),
+            "available": {kind: len(ids) for kind, ids in self.available.items()}
+        }
+
+    # ------------------------------------------------------------------
+    # Loading (every worker)
+    # ------------------------------------------------------------------
+
+    async def ensure_loaded(self, cache: CacheManager) -> None:
+        """Reload the published index from Redis if the local copy is stale."""
+        now = get_current_timestamp()
+        if self.loaded_at and now - self.loaded_at < settings.media_index.reload_interval:
+            return
+
+        async with self._load_lock:
+            if self.loaded_at and get_current_timestamp() - self.loaded_at < settings.media_index.reload_interval:
+                return
+            await self.load(cache)
+
+    async def load(self, cache: CacheManager) -> bool:
+        """
+        Load the published index from Redis.
+
+        Returns:
+            True if an index was found and loaded
+        """
+        self.loaded_at = get_current_timestamp()
+        if not cache.redis:
+            return False
+
+        try:
+            keys = [CacheKeys.media_index("meta"), CacheKeys.media_index("covered")]
+            keys += [CacheKeys.media_index(kind) for kind in MEDIA_KINDS]
+            values = await cache.redis.mget(keys)
+        except Exception as e:
+            logger.error(f"Error loading media index: {e}")
+            return False
+
+        meta, covered, *available = values
+        if meta is None or covered is None:
+            return False
+
+        built_at = json.loads(meta).get("built_at")
+        if built_at == self.built_at:
+            return True
+
+        self.covered = CompactIdSet.from_bytes(covered)
+        self.available = {
+            kind: CompactIdSet.from_bytes(data or b"")
+            for kind, data in zip(MEDIA_KINDS, available)
+        }
+        self.built_at = built_at
+        logger.debug(f"Loaded media index: {self.get_stats()}")
+        return True
+
+    # ------------------------------------------------------------------
+    # Building (background task)
+    # ------------------------------------------------------------------
+
+    async def refresh(
+        self,
+        db: DatabaseManager,
+        cache: CacheManager,
+        frigate: FrigateClient
+    ) -> Dict[str, Any]:
+        """
+        Rebuild the index and publish it to Redis.
+
+        Retention data decides what can still exist: clips and snapshots
+        need a recording covering the detection, thumbnails need a review
+        segment. Media that retention says exists is then confirmed with a
+        bounded number of concurrent HEAD probes per refresh; results are
+        remembered so each URL is only probed once while it is in window.
+
+        Returns:
+            Index statistics
+        """
+        since = get_timestamp_ago(hours=settings.media_index.window_hours)
+        candidates = await MediaQueries.get_media_retention(db, since)
+
+        retained: Dict[str, Dict[str, str]] = {kind: {} for kind in MEDIA_KINDS}
+        for row in candidates:
+            source_id, camera = row["source_id"], row["camera"]
+            if row["has_recording"]:
+                retained["clip"][source_id] = media_url("clip", source_id)
+                retained["snapshot"][source_id] = media_url("snapshot", source_id, camera)
+            if row["has_review"]:
+                retained["thumbnail"][source_id] = media_url("thumbnail", source_id)
+
+        # Forget probe results for media that left the retention window
+        for kind in MEDIA_KINDS:
+            self._probe_results[kind] = {
+                source_id: ok for source_id, ok in self._probe_results[kind].items()
+                if source_id in retained[kind]
+            }
+
+        # Probe unverified media, newest first, up to the per-refresh budget
+        to_probe = [
+            (kind, source_id, url)
+            for kind in MEDIA_KINDS
+            for source_id, url in retained[kind].items()
+            if source_id not in self._probe_results[kind]
+        ][:settings.media_index.max_probes_per_refresh]
+
+        if to_probe:
+            results = await frigate.probe_many(url for _, _, url in to_probe)
+            for (kind, source_id, _), result in zip(to_probe, results):
+                # Transport errors say nothing about the media; retry next time
+                if result["status"] != "error":
+                    self._probe_results[kind][source_id] = result["accessible"]
+
+        # Unprobed retained media is assumed available until proven otherwise
+        self.covered = CompactIdSet.from_ids(row["source_id"] for row in candidates)
+        self.available = {
+            kind: CompactIdSet.from_ids(
+                source_id for source_id in retained[kind]
+                if self._probe_results[kind].get(source_id, True)
+            )
+            for kind in MEDIA_KINDS
+        }
+        self.built_at = get_current_timestamp()
+        self.loaded_at = self.built_at
+
+        await self._publish(cache)
+
+        stats = self.get_stats()
+        stats["probed"] = len(to_probe)
+        logger.debug(f"Refreshed media index: {stats}")
+        return stats
+
+    async def _publish(self, cache: CacheManager) -> None:
+        """Publish the index to Redis for the other workers."""
+        if not cache.redis:
+            return
+
+        ttl = settings.media_index.refresh_interval * 3
+        async with cache.redis.pipeline(transaction=True) as pipe:
+            pipe.set(CacheKeys.media_index("covered"), self.covered.to_bytes(), ex=ttl)
+            for kind in MEDIA_KINDS:
+                pipe.set(CacheKeys.media_index(kind), self.available[kind].to_bytes(), ex=ttl)
+            pipe.set(CacheKeys.media_index("meta"), json.dumps({"built_at": self.built_at}), ex=ttl)
+            await pipe.execute()
+
+
+# Global media availability index
+media_index = MediaAvailabilityIndex()
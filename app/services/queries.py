@@ -6,9 +6,12 @@ including violation detection, employee statistics, and camera activity queries.
 """
 
 import logging
+import math
 from typing import Any, Dict, List, Optional, Tuple
 from ..database import DatabaseManager
 from ..config import settings
+from ..utils.pagination import Cursor, keyset_condition
+from ..utils.time import get_current_timestamp
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +24,10 @@ class ViolationQueries:
         db: DatabaseManager,
         camera: Optional[str] = None,
         hours: int = 1,
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[Cursor] = None,
+        since: Optional[float] = None,
+        with_employee: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Get recent phone violations with employee identification.
@@ -30,16 +36,22 @@ class ViolationQueries:
         1. Finds recent phone detections
         2. Joins with nearby face detections to identify employees
         3. Links with review segments for thumbnails
-        4. Constructs media URLs
+        
+        Media URLs are not built here; formatters derive them from id and
+        camera (see app.utils.media_urls).
         
         Args:
             db: Database manager
             camera: Optional camera filter
             hours: Hours to look back
             limit: Maximum results
+            cursor: Only return violations after this cursor (keyset pagination)
+            since: Only return violations newer than this timestamp
+            with_employee: Attribute employees (desk join); rows omit
+                employee_name and confidence when False
             
         Returns:
-            List of violation records with employee names and media URLs
+            List of violation records with employee names
         """
         # Ensure hours is an integer (convert from Decimal if needed)
         hours = int(hours)
@@ -47,6 +59,35 @@ class ViolationQueries:
         face_window = int(settings.face_detection_window)
         
         camera_filter = f"AND camera = '{camera}'" if camera else ""
+        cursor_filter, cursor_args = keyset_condition(
+            cursor, 1, timestamp_column="p.timestamp", id_column="p.source_id"
+        )
+        since_filter = f"AND p.timestamp > {float(since)}" if since is not None else ""
+        
+        if not with_employee:
+            # Only detection fields requested: skip the desk attribution join
+            query = f"""
+            SELECT 
+                p.timestamp,
+                p.camera,
+                p.source_id as id,
+                p.data->'zones' as zones
+            FROM timeline p
+            WHERE p.data->>'label' = 'cell phone'
+            AND p.timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
+            {camera_filter}
+            {cursor_filter}
+            {since_filter}
+            ORDER BY p.timestamp DESC, p.source_id DESC
+            LIMIT {limit}
+            """
+            try:
+                results = await db.fetch_all(query, *cursor_args)
+                logger.debug(f"Retrieved {len(results)} live violations without attribution")
+                return results
+            except Exception as e:
+                logger.error(f"Error retrieving live violations: {e}")
+                raise
         
         # Query with desk-based employee identification + face verification
         query = f"""
@@ -61,6 +102,8 @@ class ViolationQueries:
             WHERE p.data->>'label' = 'cell phone'
             AND p.timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
             {camera_filter}
+            {cursor_filter}
+            {since_filter}
         ),
         desk_assignments AS (
             -- Official desk assignments (corrected)
@@ -142,10 +185,7 @@ class ViolationQueries:
                     ELSE 0.0
                 END,
                 0.0
-            ) as confidence,
-            NULL as thumbnail_url,
-            NULL as video_url,
-            CONCAT('{settings.video_api_base_url}/snapshot/', v.camera, '/', v.id) as snapshot_url
+            ) as confidence
         FROM violation_zones v
         LEFT JOIN (
             -- Find desk assignment for violation
@@ -161,28 +201,14 @@ class ViolationQueries:
             WHERE desk_list.desk_zone LIKE 'desk_%'
         ) da ON da.id = v.id
         -- Face verification removed - using ONLY desk assignments
-        ORDER BY v.timestamp DESC
+        ORDER BY v.timestamp DESC, v.id DESC
         LIMIT {limit}
         """
         
         try:
-            results = await db.fetch_all(query)
+            results = await db.fetch_all(query, *cursor_args)
             logger.debug(f"Retrieved {len(results)} live violations")
-            
-            # Convert Decimal types to appropriate types for JSON serialization
-            def convert_decimals(obj):
-                if isinstance(obj, dict):
-                    return {k: convert_decimals(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_decimals(item) for item in obj]
-                elif hasattr(obj, 'as_tuple'):  # Decimal type
-                    return float(obj)
-                else:
-                    return obj
-            
-            # Convert all Decimal values in the results
-            converted_results = [convert_decimals(result) for result in results]
-            return converted_results
+            return results
         except Exception as e:
             logger.error(f"Error retrieving live violations: {e}")
             raise
@@ -195,6 +221,10 @@ class ViolationQueries:
         """
         Get hourly violation trends with camera and employee breakdown.
         
+        Buckets the attributed phone detections in Python, exactly as the
+        background refresh graph does for the cached 24h trend, so a cache
+        miss and a graph refresh produce the same buckets and employees.
+        
         Args:
             db: Database manager
             hours: Hours to analyze
@@ -202,72 +232,136 @@ class ViolationQueries:
         Returns:
             List of hourly trend data
         """
-        # Ensure hours is an integer (convert from Decimal if needed)
         hours = int(hours)
+        detections = await ViolationQueries.get_attributed_phone_detections(db=db, hours=hours)
+        trend = bucket_hourly_trend(get_current_timestamp(), detections, hours)
+        logger.debug(f"Retrieved hourly trend for {len(trend)} hours")
+        return trend
+    
+    @staticmethod
+    async def get_attributed_phone_detections(
+        db: DatabaseManager,
+        hours: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Get raw phone detections with the nearest named person on camera.
         
-        # Calculate time values as integers
-        hours_seconds = int(hours * 3600)
+        This is the shared input of the derived violation caches (hourly
+        trend, employee stats, dashboard overview); see
+        app.services.refresh_graph.
+        
+        Args:
+            db: Database manager
+            hours: Hours to look back
+            
+        Returns:
+            Rows of timestamp, camera and employee_name (None if no named
+            person was seen within the face detection window)
+        """
+        hours_seconds = int(int(hours) * 3600)
         face_window = int(settings.face_detection_window)
         
         query = f"""
-        WITH hourly_buckets AS (
-            SELECT 
-                generate_series(
-                    EXTRACT(EPOCH FROM NOW()) - {hours_seconds}::integer,
-                    EXTRACT(EPOCH FROM NOW())::integer,
-                    3600
-                ) as hour_start
-        ),
-        hourly_violations AS (
-            SELECT 
-                FLOOR(timestamp / 3600) * 3600 as hour,
-                camera,
-                COALESCE(nf.employee_name, 'Unknown') as employee_name
-            FROM timeline p
-            LEFT JOIN (
-                SELECT DISTINCT ON (p.timestamp, p.camera)
-                    p.timestamp, 
-                    p.camera,
-                    (f.data->'sub_label'->>0) as employee_name
-                FROM timeline p
-                LEFT JOIN timeline f ON 
-                    f.camera = p.camera 
-                    AND f.source = 'tracked_object'
-                    AND f.data->'sub_label' IS NOT NULL
-                    AND f.data->'sub_label'->>0 IS NOT NULL
-                    AND ABS(f.timestamp - p.timestamp) < {face_window}
-                WHERE p.data->>'label' = 'cell phone'
-                AND p.timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
-                ORDER BY p.timestamp, p.camera, ABS(f.timestamp - p.timestamp)
-            ) nf USING (timestamp, camera)
-            WHERE p.data->>'label' = 'cell phone'
-            AND p.timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
-        )
-        SELECT 
-            hb.hour_start as hour,
-            COUNT(hv.hour) as violations,
-            ARRAY_AGG(DISTINCT hv.camera) FILTER (WHERE hv.camera IS NOT NULL) as cameras,
-            ARRAY_AGG(DISTINCT hv.employee_name) FILTER (WHERE hv.employee_name IS NOT NULL) as employees
-        FROM hourly_buckets hb
-        LEFT JOIN hourly_violations hv ON hb.hour_start = hv.hour
-        GROUP BY hb.hour_start
-        ORDER BY hb.hour_start DESC
+        SELECT DISTINCT ON (p.timestamp, p.camera)
+            p.timestamp,
+            p.camera,
+            (f.data->'sub_label'->>0) as employee_name
+        FROM timeline p
+        LEFT JOIN timeline f ON 
+            f.camera = p.camera 
+            AND f.data->>'label' = 'person'
+            AND f.data->'sub_label' IS NOT NULL
+            AND f.data->'sub_label'->>0 IS NOT NULL
+            AND ABS(f.timestamp - p.timestamp) < {face_window}
+        WHERE p.data->>'label' = 'cell phone'
+        AND p.timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
+        ORDER BY p.timestamp, p.camera, ABS(f.timestamp - p.timestamp)
         """
         
         try:
-            logger.debug(f"Executing hourly trend query with hours={hours}, hours_seconds={hours_seconds}, face_window={face_window}")
             results = await db.fetch_all(query)
-            logger.debug(f"Retrieved hourly trend for {len(results)} hours")
+            logger.debug(f"Retrieved {len(results)} attributed phone detections")
             return results
         except Exception as e:
-            logger.error(f"Error retrieving hourly trend: {e}")
-            logger.error(f"Query parameters: hours={hours}, hours_seconds={hours_seconds}, face_window={face_window}")
+            logger.error(f"Error retrieving attributed phone detections: {e}")
             raise
 
 
+def bucket_hourly_trend(now: float, phone_detections: List[Dict[str, Any]], hours: int = 24) -> List[Dict[str, Any]]:
+    """
+    Count attributed phone detections per clock hour, newest first.
+    
+    Args:
+        now: Current timestamp; its hour is the newest bucket
+        phone_detections: Rows of ViolationQueries.get_attributed_phone_detections
+        hours: Number of whole hours before the current one
+        
+    Returns:
+        Rows of hour, violations, cameras and employees for every bucket
+    """
+    current_hour = math.floor(now / 3600) * 3600
+    buckets = {current_hour - i * 3600: {"violations": 0, "cameras": set(), "employees": set()} for i in range(hours + 1)}
+    
+    for row in phone_detections:
+        bucket = buckets.get(math.floor(float(row["timestamp"]) / 3600) * 3600)
+        if bucket is not None:
+            bucket["violations"] += 1
+            bucket["cameras"].add(row["camera"])
+            bucket["employees"].add(row["employee_name"] or "Unknown")
+    
+    return [
+        {
+            "hour": hour,
+            "violations": bucket["violations"],
+            "cameras": sorted(bucket["cameras"]),
+            "employees": sorted(bucket["employees"])
+        }
+        for hour, bucket in sorted(buckets.items(), reverse=True)
+    ]
+
+
 class EmployeeQueries:
     """Queries related to employee statistics and activity."""
     
+    @staticmethod
+    async def get_person_detection_counts(
+        db: DatabaseManager,
+        hours: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Get named person detections grouped by employee and camera.
+        
+        Args:
+            db: Database manager
+            hours: Hours to look back
+            
+        Returns:
+            Rows of employee_name, camera, detections and last_seen
+        """
+        hours_seconds = int(int(hours) * 3600)
+        
+        query = f"""
+        SELECT 
+            (data->'sub_label'->>0) as employee_name,
+            camera,
+            COUNT(*) as detections,
+            MAX(timestamp) as last_seen
+        FROM timeline
+        WHERE data->>'label' = 'person'
+        AND timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
+        AND data->'sub_label' IS NOT NULL
+        AND data->'sub_label'->>0 IS NOT NULL
+        GROUP BY (data->'sub_label'->>0), camera
+        """
+        
+        try:
+            results = await db.fetch_all(query)
+            logger.debug(f"Retrieved {len(results)} person detection groups")
+            return results
+        except Exception as e:
+            logger.error(f"Error retrieving person detection counts: {e}")
+            raise
+    
     @staticmethod
     async def get_employee_stats(
         db: DatabaseManager,
@@ -405,10 +499,7 @@ class EmployeeQueries:
             ev.source_id as id,
             ev.zones,
             ev.employee_name,
-            COALESCE(ev.confidence, 0.0) as confidence,
-            CONCAT('{settings.video_api_base_url}/thumb/', ev.source_id) as thumbnail_url,
-            CONCAT('{settings.video_api_base_url}/clip/', ev.source_id) as video_url,
-            CONCAT('{settings.video_api_base_url}/snapshot/', ev.camera, '/', ev.source_id) as snapshot_url
+            COALESCE(ev.confidence, 0.0) as confidence
         FROM employee_violations ev
         ORDER BY ev.timestamp DESC
         LIMIT {limit}
@@ -441,47 +532,118 @@ class CameraQueries:
         Returns:
             Camera summary data
         """
-        query = f"""
+        summaries = await CameraQueries.get_camera_summaries(db=db, cameras=[camera])
+        return summaries[0] if summaries else {}
+    
+    @staticmethod
+    async def get_camera_summaries(
+        db: DatabaseManager,
+        cameras: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get live summaries for several cameras in one grouped pass.
+        
+        Args:
+            db: Database manager
+            cameras: Camera names
+            
+        Returns:
+            One summary per camera, in the order given
+        """
+        query = """
         WITH current_hour AS (
             SELECT EXTRACT(EPOCH FROM DATE_TRUNC('hour', NOW())) as hour_start
         ),
+        cameras AS (
+            SELECT camera, position
+            FROM unnest($1::text[]) WITH ORDINALITY AS c(camera, position)
+        ),
         camera_stats AS (
             SELECT 
+                camera,
                 COUNT(*) FILTER (WHERE data->>'label' = 'person') as active_people,
                 COUNT(*) as total_detections,
                 COUNT(*) FILTER (WHERE data->>'label' = 'cell phone') as phone_violations,
                 MAX(timestamp) as last_activity
             FROM timeline
-            WHERE camera = '{camera}'
+            WHERE camera = ANY($1::text[])
             AND timestamp > (SELECT hour_start FROM current_hour)
+            GROUP BY camera
         ),
         recording_status AS (
-            SELECT 
-                CASE 
-                    WHEN COUNT(*) > 0 THEN 'active'
-                    ELSE 'inactive'
-                END as status
+            SELECT camera, COUNT(*) as recordings
             FROM recordings
-            WHERE camera = '{camera}'
+            WHERE camera = ANY($1::text[])
             AND start_time > (SELECT hour_start FROM current_hour)
+            GROUP BY camera
         )
         SELECT 
-            '{camera}' as camera,
+            c.camera,
             COALESCE(cs.active_people, 0) as active_people,
             COALESCE(cs.total_detections, 0) as total_detections,
             COALESCE(cs.phone_violations, 0) as phone_violations,
-            COALESCE(rs.status, 'unknown') as recording_status,
+            CASE 
+                WHEN COALESCE(rs.recordings, 0) > 0 THEN 'active'
+                ELSE 'inactive'
+            END as recording_status,
             cs.last_activity
-        FROM camera_stats cs
-        CROSS JOIN recording_status rs
+        FROM cameras c
+        LEFT JOIN camera_stats cs ON cs.camera = c.camera
+        LEFT JOIN recording_status rs ON rs.camera = c.camera
+        ORDER BY c.position
         """
         
         try:
-            result = await db.fetch_one(query)
-            logger.debug(f"Retrieved camera summary for {camera}")
-            return result or {}
+            results = await db.fetch_all(query, list(cameras))
+            logger.debug(f"Retrieved camera summaries for {len(results)} cameras")
+            return results
+        except Exception as e:
+            logger.error(f"Error retrieving camera summaries: {e}")
+            raise
+    
+    @staticmethod
+    async def get_camera_list(
+        db: DatabaseManager,
+        aggregates: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get every camera with 24h aggregates in one grouped pass.
+        
+        Args:
+            db: Database manager
+            aggregates: Ordered map of output column to aggregate expression
+            
+        Returns:
+            One row per camera seen in the timeline, with the aggregates
+            (NULL for cameras without events in the last 24 hours)
+        """
+        select_list = ",\n            ".join(f"{expression} as {name}" for name, expression in aggregates.items())
+        outer_list = "".join(f",\n            s.{name}" for name in aggregates)
+        query = f"""
+        WITH cameras AS (
+            SELECT DISTINCT camera FROM timeline
+        ),
+        stats AS (
+            SELECT 
+                camera,
+                {select_list}
+            FROM timeline
+            WHERE timestamp > (EXTRACT(EPOCH FROM NOW()) - 86400)
+            GROUP BY camera
+        )
+        SELECT 
+            c.camera{outer_list}
+        FROM cameras c
+        LEFT JOIN stats s ON s.camera = c.camera
+        ORDER BY c.camera
+        """
+        
+        try:
+            results = await db.fetch_all(query)
+            logger.debug(f"Retrieved camera list with {len(results)} cameras")
+            return results
         except Exception as e:
-            logger.error(f"Error retrieving camera summary: {e}")
+            logger.error(f"Error retrieving camera list: {e}")
             raise
     
     @staticmethod
@@ -489,7 +651,8 @@ class CameraQueries:
         db: DatabaseManager,
         camera: str,
         hours: int = 24,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[Cursor] = None
     ) -> List[Dict[str, Any]]:
         """
         Get detailed activity for a specific camera.
@@ -499,6 +662,7 @@ class CameraQueries:
             camera: Camera name
             hours: Hours to look back
             limit: Maximum results
+            cursor: Only return activity after this cursor (keyset pagination)
             
         Returns:
             List of camera activities
@@ -507,11 +671,13 @@ class CameraQueries:
         hours = int(hours)
         hours_seconds = int(hours * 3600)
         face_window = int(settings.face_detection_window)
+        cursor_filter, cursor_args = keyset_condition(cursor, 1)
         
         query = f"""
         WITH camera_events AS (
             SELECT 
                 timestamp,
+                source_id,
                 data->>'label' as event_type,
                 data->>'sub_label' as employee_name,
                 data->'zones' as zones,
@@ -520,22 +686,23 @@ class CameraQueries:
             WHERE camera = '{camera}'
             AND timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
             AND data->>'label' IN ('person', 'cell phone', 'face')
+            {cursor_filter}
         )
         SELECT 
             timestamp,
+            source_id as id,
             event_type,
             employee_name,
             zones,
-            COALESCE(confidence::float, 0.0) as confidence,
-            CONCAT('{settings.video_api_base_url}/snapshot/', '{camera}', '/', timestamp, '-', 
-                   SUBSTRING(MD5(timestamp::text), 1, 6)) as snapshot_url
+            '{camera}' as camera,
+            COALESCE(confidence::float, 0.0) as confidence
         FROM camera_events
-        ORDER BY timestamp DESC
+        ORDER BY timestamp DESC, source_id DESC
         LIMIT {limit}
         """
         
         try:
-            results = await db.fetch_all(query)
+            results = await db.fetch_all(query, *cursor_args)
             logger.debug(f"Retrieved {len(results)} activities for camera {camera}")
             return results
         except Exception as e:
@@ -642,3 +809,207 @@ class DashboardQueries:
         except Exception as e:
             logger.error(f"Error retrieving dashboard overview: {e}")
             raise
+    
+    @staticmethod
+    async def get_active_cameras(
+        db: DatabaseManager,
+        hours: int = 1,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the cameras with the most people detected recently.
+        
+        Args:
+            db: Database manager
+            hours: Hours to look back
+            limit: Maximum cameras
+            
+        Returns:
+            Rows of camera, active_people and last_activity
+        """
+        hours_seconds = int(int(hours) * 3600)
+        
+        query = f"""
+        SELECT 
+            camera,
+            COUNT(*) FILTER (WHERE data->>'label' = 'person') as active_people,
+            MAX(timestamp) as last_activity
+        FROM timeline
+        WHERE timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
+        GROUP BY camera
+        ORDER BY active_people DESC
+        LIMIT {int(limit)}
+        """
+        
+        try:
+            return await db.fetch_all(query)
+        except Exception as e:
+            logger.error(f"Error retrieving active cameras: {e}")
+            raise
+    
+    @staticmethod
+    async def get_recent_events(
+        db: DatabaseManager,
+        hours: int = 1,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the most recent timeline events with a severity.
+        
+        Args:
+            db: Database manager
+            hours: Hours to look back
+            limit: Maximum events
+            
+        Returns:
+            Rows of timestamp, camera, event_type, employee_name and severity
+        """
+        hours_seconds = int(int(hours) * 3600)
+        
+        query = f"""
+        SELECT 
+            timestamp,
+            camera,
+            data->>'label' as event_type,
+            data->>'sub_label' as employee_name,
+            CASE 
+                WHEN data->>'label' = 'cell phone' THEN 'alert'
+                WHEN data->>'label' = 'person' THEN 'detection'
+                ELSE 'info'
+            END as severity
+        FROM timeline
+        WHERE timestamp > (EXTRACT(EPOCH FROM NOW()) - {hours_seconds})
+        ORDER BY timestamp DESC
+        LIMIT {int(limit)}
+        """
+        
+        try:
+            return await db.fetch_all(query)
+        except Exception as e:
+            logger.error(f"Error retrieving recent events: {e}")
+            raise
+    
+    @staticmethod
+    async def get_timeline_watermark(
+        db: DatabaseManager,
+        hours: int = 24
+    ) -> Dict[str, Tuple[float, int]]:
+        """
+        Get a cheap per-camera change marker for the timeline table.
+        
+        Background refreshes compare this against the previous value and
+        skip recomputing aggregates when no rows have been added.
+        
+        Args:
+            db: Database manager
+            hours: Window the refreshed aggregates cover
+            
+        Returns:
+            Map of camera to (latest timestamp, row count) within the window
+        """
+        query = """
+        SELECT 
+            camera,
+            MAX(timestamp) as last_timestamp,
+            COUNT(*) as row_count
+        FROM timeline
+        WHERE timestamp > (EXTRACT(EPOCH FROM NOW()) - $1)
+        GROUP BY camera
+        """
+        
+        try:
+            results = await db.fetch_all(query, hours * 3600)
+            return {
+                row['camera']: (float(row['last_timestamp']), int(row['row_count']))
+                for row in results
+            }
+        except Exception as e:
+            logger.error(f"Error retrieving timeline watermark: {e}")
+            raise
+
+
+class MediaQueries:
+    """Queries for Frigate media retention."""
+    
+    @staticmethod
+    async def get_media_retention(
+        db: DatabaseManager,
+        since: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Get linked source_ids with the retention data backing their media.
+        
+        Covers the phone detections violations link to and the named
+        detections break rows link to (the last detection of an employee
+        before a 5 minute to 3 hour gap, as /employees/{name}/breaks finds
+        them). A clip or snapshot can only exist while a recording segment
+        covers the detection; a thumbnail needs a review segment listing it.
+        
+        Args:
+            db: Database manager
+            since: Only consider detections after this timestamp
+            
+        Returns:
+            Rows of source_id, camera, timestamp, has_recording, has_review
+            ordered newest first
+        """
+        query = """
+        WITH named AS (
+            SELECT 
+                source_id,
+                camera,
+                timestamp,
+                LEAD(timestamp) OVER (
+                    PARTITION BY data->>'sub_label' ORDER BY timestamp
+                ) - timestamp as gap
+            FROM timeline
+            WHERE jsonb_typeof(data->'sub_label') = 'string'
+            AND timestamp > $1
+        ),
+        linked AS (
+            SELECT source_id, camera, timestamp
+            FROM timeline
+            WHERE data->>'label' = 'cell phone'
+            AND timestamp > $1
+            UNION ALL
+            SELECT source_id, camera, timestamp
+            FROM named
+            WHERE gap > 300 AND gap < 10800
+        ),
+        candidates AS (
+            SELECT 
+                source_id,
+                camera,
+                MAX(timestamp) as timestamp
+            FROM linked
+            WHERE source_id IS NOT NULL
+            GROUP BY source_id, camera
+        )
+        SELECT 
+            c.source_id,
+            c.camera,
+            c.timestamp,
+            EXISTS (
+                SELECT 1 FROM recordings r
+                WHERE r.camera = c.camera
+                AND r.start_time <= c.timestamp
+                AND r.end_time >= c.timestamp
+            ) as has_recording,
+            EXISTS (
+                SELECT 1 FROM reviewsegment rs
+                WHERE rs.camera = c.camera
+                AND rs.start_time <= c.timestamp
+                AND (rs.end_time IS NULL OR rs.end_time >= c.timestamp)
+                AND rs.data->'detections' ? c.source_id
+            ) as has_review
+        FROM candidates c
+        ORDER BY c.timestamp DESC
+        """
+        
+        try:
+            results = await db.fetch_all(query, since)
+            logger.debug(f"Retrieved media retention for {len(results)} source ids")
+            return results
+        except Exception as e:
+            logger.error(f"Error retrieving media retention: {e}")
+            raise
@@ -0,0 +1,294 @@
+"""
+Dependency-graph refresh of derived caches.
+
+The hourly trend, employee stats, camera summaries and dashboard overview
+used to be rebuilt independently, each re-running its own attribution join
+over the raw timeline. They are now nodes of a small DAG:
+
+- a base dataset is one query against the timeline (e.g. the last 24h of
+  phone detections with their attributed employee); each base is loaded
+  once per cycle, concurrently, and shared by every node that reads it
+- a derived node declares the bases it depends on and computes its cache
+  entries from them in Python; it is only recomputed when the fingerprint
+  of one of its inputs changed since its last run, or when its clock
+  period rolled over (hour buckets, the day boundary)
+
+Nodes whose inputs are unchanged keep their cached entries alive instead.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from ..cache import CacheManager
+from ..config import CacheKeys, settings
+from ..database import DatabaseManager
+from ..utils.formatting import format_camera_summary
+from ..utils.response_formatter import format_hourly_trend_data
+from ..utils.serialization import dumps
+from ..utils.time import get_today_start_timestamp
+from .queries import CameraQueries, DashboardQueries, EmployeeQueries, ViolationQueries, bucket_hourly_trend
+
+logger = logging.getLogger(__name__)
+
+Rows = List[Dict[str, Any]]
+
+
+class BaseDataset:
+    """A dataset loaded from the database once per refresh cycle."""
+
+    def __init__(self, name: str, load: Callable[[DatabaseManager], Awaitable[Rows]]):
+        self.name = name
+        self.load = load
+
+
+class DerivedCache:
+    """A set of cache entries computed from one or more base datasets."""
+
+    def __init__(
+        self,
+        name: str,
+        inputs: Iterable[str],
+        compute: Callable[..., Dict[str, Any]],
+        ttl: int,
+        period: Optional[int] = None
+    ):
+        """
+        Args:
+            name: Node name
+            inputs: Names of the base datasets ``compute`` takes, in order
+            compute: Function of (now, *input rows) returning cache key -> value
+            ttl: TTL of the cache entries
+            period: Recompute at least once per this many seconds (aligned)
+        """
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.compute = compute
+        self.ttl = ttl
+        self.period = period
+
+
+def _fingerprint(rows: Rows) -> str:
+    """Content hash of a base dataset."""
+    return hashlib.blake2b(dumps(rows), digest_size=16).hexdigest()
+
+
+class RefreshGraph:
+    """Loads base datasets and recomputes the derived caches that depend on changes."""
+
+    def __init__(self, bases: Iterable[BaseDataset], nodes: Iterable[DerivedCache]):
+        self.bases = {base.name: base for base in bases}
+        self.nodes = list(nodes)
+        for node in self.nodes:
+            missing = set(node.inputs) - set(self.bases)
+            if missing:
+                raise ValueError(f"Node {node.name} depends on unknown datasets: {', '.join(sorted(missing))}")
+        self._signatures: Dict[str, tuple] = {}
+        self._keys: Dict[str, List[str]] = {}
+        self._stats = {node.name: {"computed": 0, "skipped": 0} for node in self.nodes}
+
+    async def _load(self, db: DatabaseManager, names: Iterable[str]) -> Dict[str, Optional[Rows]]:
+        """Load base datasets concurrently; a failed dataset maps to None."""
+        names = list(names)
+        results = await asyncio.gather(
+            *(self.bases[name].load(db) for name in names),
+            return_exceptions=True
+        )
+        loaded = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to load base dataset {name}: {result}")
+                loaded[name] = None
+            else:
+                loaded[name] = list(result)
+        return loaded
+
+    async def run(self, db: DatabaseManager, cache: CacheManager) -> Dict[str, List[str]]:
+        """
+        Run one refresh cycle.
+
+        Args:
+            db: Database manager
+            cache: Cache manager
+
+        Returns:
+            Names of the nodes that were ``computed``, ``skipped`` or ``failed``
+        """
+        now = time.time()
+        data = await self._load(db, {name for node in self.nodes for name in node.inputs})
+        fingerprints = {name: _fingerprint(rows) for name, rows in data.items() if rows is not None}
+
+        outcome = {"computed": [], "skipped": [], "failed": []}
+        writes: Dict[int, Dict[str, Any]] = defaultdict(dict)
+
+        for node in self.nodes:
+            if any(data[name] is None for name in node.inputs):
+                self._signatures.pop(node.name, None)
+                outcome["failed"].append(node.name)
+                continue
+
+            signature = (
+                tuple(fingerprints[name] for name in node.inputs),
+                math.floor(now / node.period) if node.period else None
+            )
+            if signature == self._signatures.get(node.name):
+                # Unchanged inputs: keep serving the previous entries
+                for key in self._keys.get(node.name, []):
+                    await cache.expire(key, node.ttl)
+                self._stats[node.name]["skipped"] += 1
+                outcome["skipped"].append(node.name)
+                continue
+
+            try:
+                entries = node.compute(now, *(data[name] for name in node.inputs))
+            except Exception as e:
+                logger.error(f"Error computing derived cache {node.name}: {e}")
+                self._signatures.pop(node.name, None)
+                outcome["failed"].append(node.name)
+                continue
+
+            writes[node.ttl].update(entries)
+            self._signatures[node.name] = signature
+            self._keys[node.name] = list(entries)
+            self._stats[node.name]["computed"] += 1
+            outcome["computed"].append(node.name)
+
+        for ttl, entries in writes.items():
+            await cache.set_many(entries, ttl)
+
+        logger.debug(f"Refresh graph cycle: {outcome}")
+        return outcome
+
+    def cache_ttls(self) -> Dict[str, int]:
+        """TTL of every cache key the graph last wrote."""
+        ttls = {node.name: node.ttl for node in self.nodes}
+        return {key: ttls[name] for name, keys in self._keys.items() for key in keys}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-node compute/skip counts."""
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+# Derived node computations. Each takes the cycle time and its input rows.
+
+def compute_hourly_trend(now: float, phone_detections: Rows, hours: int = 24) -> Dict[str, Any]:
+    """Hourly violation counts with camera and employee breakdown, newest first."""
+    trend = bucket_hourly_trend(now, phone_detections, hours)
+    return {CacheKeys.hourly_trend(hours): format_hourly_trend_data(trend)}
+
+
+def compute_employee_stats(now: float, person_counts: Rows, phone_detections: Rows) -> Dict[str, Any]:
+    """Per-employee detections, cameras visited, last seen and violations."""
+    violations: Dict[str, int] = defaultdict(int)
+    for row in phone_detections:
+        violations[row["employee_name"] or "Unknown"] += 1
+
+    employees: Dict[str, Dict[str, Any]] = {}
+    for row in person_counts:
+        employee = employees.setdefault(row["employee_name"], {
+            "employee_name": row["employee_name"],
+            "detections": 0,
+            "cameras": set(),
+            "last_seen": None
+        })
+        employee["detections"] += row["detections"]
+        employee["cameras"].add(row["camera"])
+        employee["last_seen"] = max(employee["last_seen"] or row["last_seen"], row["last_seen"])
+
+    stats = [
+        {
+            "employee_name": name,
+            "detections": employee["detections"],
+            "cameras_visited": len(employee["cameras"]),
+            "last_seen": employee["last_seen"],
+            "violations_count": violations.get(name, 0)
+        }
+        for name, employee in employees.items()
+    ]
+    stats.sort(key=lambda employee: employee["detections"], reverse=True)
+    return {CacheKeys.employee_stats(): stats}
+
+
+def compute_camera_summaries(now: float, summaries: Rows) -> Dict[str, Any]:
+    """Formatted summaries for all cameras and for each camera."""
+    formatted = [format_camera_summary(summary) for summary in summaries]
+    return {
+        CacheKeys.camera_summaries(): formatted,
+        **{CacheKeys.camera_summary(summary["camera"]): summary for summary in formatted}
+    }
+
+
+def compute_dashboard_overview(
+    now: float,
+    phone_detections: Rows,
+    active_cameras: Rows,
+    recent_events: Rows
+) -> Dict[str, Any]:
+    """Today's violation total and top violators with live camera activity."""
+    day_start = get_today_start_timestamp()
+    today = [row for row in phone_detections if float(row["timestamp"]) > day_start]
+
+    violators: Dict[str, Dict[str, Any]] = {}
+    for row in today:
+        name = row["employee_name"] or "Unknown"
+        violator = violators.setdefault(name, {"employee_name": name, "violations_count": 0, "last_violation": None})
+        violator["violations_count"] += 1
+        violator["last_violation"] = max(violator["last_violation"] or row["timestamp"], row["timestamp"])
+
+    return {
+        CacheKeys.dashboard_overview(): {
+            "total_violations_today": len(today),
+            "top_violators": sorted(violators.values(), key=lambda v: v["violations_count"], reverse=True)[:5],
+            "active_cameras": active_cameras,
+            "recent_events": recent_events
+        }
+    }
+
+
+def build_refresh_graph() -> RefreshGraph:
+    """Build the graph of derived caches refreshed by the background stats task."""
+    bases = [
+        BaseDataset(
+            "phone_detections_24h",
+            lambda db: ViolationQueries.get_attributed_phone_detections(db=db, hours=24)
+        ),
+        BaseDataset(
+            "person_detections_24h",
+            lambda db: EmployeeQueries.get_person_detection_counts(db=db, hours=24)
+        ),
+        BaseDataset(
+            "camera_summaries",
+            lambda db: CameraQueries.get_camera_summaries(db=db, cameras=settings.CAMERAS)
+        ),
+        BaseDataset(
+            "active_cameras_1h",
+            lambda db: DashboardQueries.get_active_cameras(db=db, hours=1)
+        ),
+        BaseDataset(
+            "recent_events_1h",
+            lambda db: DashboardQueries.get_recent_events(db=db, hours=1)
+        )
+    ]
+    nodes = [
+        DerivedCache(
+            "hourly_trend", ["phone_detections_24h"], compute_hourly_trend,
+            settings.cache_ttl_hourly_trend, period=3600
+        ),
+        DerivedCache(
+            "employee_stats", ["person_detections_24h", "phone_detections_24h"], compute_employee_stats,
+            settings.cache_ttl_employee_stats
+        ),
+        DerivedCache(
+            "camera_summaries", ["camera_summaries"], compute_camera_summaries,
+            settings.cache_ttl_camera_summary
+        ),
+        DerivedCache(
+            "dashboard_overview", ["phone_detections_24h", "active_cameras_1h", "recent_events_1h"],
+            compute_dashboard_overview, settings.cache_ttl_dashboard_overview, period=3600
+        )
+    ]
+    return RefreshGraph(bases, nodes)
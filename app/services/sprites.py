@@ -0,0 +1,242 @@
+"""
+Thumbnail sprites for the Frigate Dashboard Middleware.
+
+This module stitches the thumbnails of a list of violations into a single
+JPEG sprite with an offset map, so a violations page loads one image
+instead of one request per thumbnail.
+
+Sprites are cached in the media disk cache under the hash of their sorted
+ID set: the layout (a small JSON file that also records the IDs) and the
+image are separate entries, and an evicted image is rebuilt from its
+layout on demand. A sprite with missing thumbnails (Frigate down or the
+media gone) expires after PARTIAL_SPRITE_TTL and is rebuilt on the next
+request, so blank tiles fill in once Frigate is back.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from ..config import settings
+from ..utils.errors import NotFoundError
+from ..utils.time import get_current_timestamp
+from .media_cache import MediaDiskCache
+
+logger = logging.getLogger(__name__)
+
+# Background colour for tiles whose thumbnail is missing
+PLACEHOLDER_COLOR = (32, 32, 32)
+
+# Seconds a sprite with missing thumbnails is served before it is rebuilt
+PARTIAL_SPRITE_TTL = 60
+
+
+def sprite_digest(source_ids: List[str]) -> str:
+    """Hash an ID set into a stable sprite identifier."""
+    return hashlib.sha1(",".join(sorted(set(source_ids))).encode()).hexdigest()[:20]
+
+
+def sprite_key(digest: str) -> str:
+    """Media cache key for a sprite."""
+    return f"sprite/{digest}"
+
+
+def is_expired(layout: Dict[str, Any]) -> bool:
+    """Check whether a layout has missing tiles worth fetching again."""
+    return bool(layout["missing"]) and get_current_timestamp() - layout.get("built_at", 0) >= PARTIAL_SPRITE_TTL
+
+
+def compose_sprite(
+    thumbnails: List[Optional[str]],
+    destination: str,
+    tile_width: int,
+    tile_height: int,
+    columns: int,
+    quality: int
+) -> None:
+    """
+    Paste thumbnails into a grid and save it as a JPEG.
+
+    Each thumbnail is scaled to fit its tile and centred; missing
+    thumbnails (None) leave a placeholder tile. Runs in a worker thread.
+
+    Args:
+        thumbnails: Thumbnail file paths in tile order
+        destination: Output JPEG path
+        tile_width: Tile width in pixels
+        tile_height: Tile height in pixels
+        columns: Tiles per row
+        quality: JPEG quality
+    """
+    columns = max(1, min(columns, len(thumbnails)))
+    rows = math.ceil(len(thumbnails) / columns)
+    sprite = Image.new("RGB", (columns * tile_width, rows * tile_height), PLACEHOLDER_COLOR)
+
+    for index, path in enumerate(thumbnails):
+        if path is None:
+            continue
+        try:
+            with Image.open(path) as image:
+                image = image.convert("RGB")
+                image.thumbnail((tile_width, tile_height))
+                x = (index % columns) * tile_width + (tile_width - image.width) // 2
+                y = (index // columns) * tile_height + (tile_height - image.height) // 2
+                sprite.paste(image, (x, y))
+        except OSError as e:
+            logger.warning(f"Skipping unreadable thumbnail {path}: {e}")
+
+    sprite.save(destination, format="JPEG", quality=quality, optimize=True)
+
+
+def build_layout(source_ids: List[str], missing: List[str]) -> Dict[str, Any]:
+    """Compute tile offsets for a sorted ID list."""
+    config = settings.media_cache
+    columns = max(1, min(config.sprite_columns, len(source_ids)))
+    offsets = {
+        source_id: {
+            "x": (index % columns) * config.sprite_tile_width,
+            "y": (index // columns) * config.sprite_tile_height,
+            "width": config.sprite_tile_width,
+            "height": config.sprite_tile_height
+        }
+        for index, source_id in enumerate(source_ids)
+    }
+    return {
+        "ids": source_ids,
+        "columns": columns,
+        "tile": {"width": config.sprite_tile_width, "height": config.sprite_tile_height},
+        "offsets": offsets,
+        "missing": missing,
+        "built_at": get_current_timestamp()
+    }
+
+
+class SpriteBuilder:
+    """Builds and caches thumbnail sprites on top of the media disk cache."""
+
+    def __init__(self, media_cache: MediaDiskCache):
+        self.media_cache = media_cache
+
+    async def get_layout(self, source_ids: List[str]) -> Dict[str, Any]:
+        """
+        Get the layout of the sprite for an ID set, building the sprite on a miss.
+
+        Args:
+            source_ids: Violation/event IDs (order and duplicates ignored)
+
+        Returns:
+            Layout with digest, tile size, columns, per-ID offsets and the
+            IDs whose thumbnail could not be fetched
+        """
+        digest = sprite_digest(source_ids)
+        source_ids = sorted(set(source_ids))
+
+        built = False
+
+        async def build_layout_file(destination: str) -> None:
+            nonlocal built
+            built = True
+            thumbnails, missing = await self._fetch_thumbnails(source_ids)
+            # An image left from an earlier build may not match the new missing list
+            self.media_cache.discard(sprite_key(digest), ".jpg")
+            await self.media_cache.get_or_build(
+                sprite_key(digest), ".jpg", self._image_builder(thumbnails)
+            )
+            with open(destination, "w") as file:
+                json.dump(build_layout(source_ids, missing), file)
+
+        for attempt in range(2):
+            path = await self.media_cache.get_or_build(sprite_key(digest), ".json", build_layout_file)
+            with open(path) as file:
+                layout = json.load(file)
+            if built or attempt or not is_expired(layout):
+                break
+            self.media_cache.discard(sprite_key(digest), ".json")
+        layout["digest"] = digest
+        return layout
+
+    async def get_image(self, digest: str) -> str:
+        """
+        Get the path of a sprite image, rebuilding it if it was evicted or expired.
+
+        Raises:
+            NotFoundError: If the sprite's layout is no longer cached either
+        """
+        path = self.media_cache.lookup(sprite_key(digest), ".jpg")
+        layout = self._read_layout(digest)
+        if layout is None:
+            if path is None:
+                raise NotFoundError(resource="Sprite", identifier=digest)
+            return path
+        if path is not None and not is_expired(layout):
+            return path
+
+        # Rebuild the layout with the image so both agree on the missing tiles
+        self.media_cache.discard(sprite_key(digest), ".json")
+        await self.get_layout(layout["ids"])
+        return self.media_cache.path_for(sprite_key(digest), ".jpg")
+
+    async def open_image(self, digest: str):
+        """
+        Open a sprite image for reading, rebuilding it if it is evicted first.
+
+        Returns:
+            Binary file object positioned at the start
+
+        Raises:
+            NotFoundError: If the sprite's layout is no longer cached either
+        """
+        return await self.media_cache.open_path(sprite_key(digest), lambda: self.get_image(digest))
+
+    def _read_layout(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Read a cached sprite layout, or None if it is not cached."""
+        path = self.media_cache.lookup(sprite_key(digest), ".json")
+        if path is None:
+            return None
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    async def _fetch_thumbnails(self, source_ids: List[str]) -> Tuple[List[Optional[str]], List[str]]:
+        """
+        Fetch thumbnails concurrently through the media cache.
+
+        Returns:
+            Tuple of (thumbnail paths with None for failures, failed IDs)
+        """
+        results = await asyncio.gather(*(
+            self.media_cache.fetch(f"thumb/{source_id}", f"/thumb/{source_id}", ".webp")
+            for source_id in source_ids
+        ), return_exceptions=True)
+
+        thumbnails = []
+        missing = []
+        for source_id, result in zip(source_ids, results):
+            if isinstance(result, BaseException):
+                logger.debug(f"Thumbnail for {source_id} unavailable: {result}")
+                thumbnails.append(None)
+                missing.append(source_id)
+            else:
+                thumbnails.append(result)
+        return thumbnails, missing
+
+    def _image_builder(self, thumbnails: List[Optional[str]]):
+        """Create a media cache builder composing the given thumbnails."""
+        config = settings.media_cache
+
+        async def build_image_file(destination: str) -> None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None, compose_sprite, thumbnails, destination,
+                config.sprite_tile_width, config.sprite_tile_height,
+                config.sprite_columns, config.sprite_quality
+            )
+
+        return build_image_file
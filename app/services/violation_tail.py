@@ -0,0 +1,229 @@
+"""
+In-memory tail of recent violations for incremental polling.
+
+Frontends that cannot hold a WebSocket poll /api/violations/live with the
+watermark from their previous response (``?since=``). Those requests are
+answered from a bounded, shared tail of formatted violations instead of
+re-running the employee attribution query for the full window:
+
+- while the tail is fresh (checked within the refresh interval) a poll
+  costs no database round trip at all
+- when it is stale, one request refreshes it with a query restricted to
+  rows newer than the tail's watermark less the face detection window, so
+  attribution only runs for that short overlap; concurrent pollers wait
+  for that refresh instead of issuing their own
+
+The overlap picks up rows that were committed after a newer row from
+another camera had already advanced the watermark, and re-formats rows
+whose employee attribution changed as faces inside the window arrived.
+
+A ``since`` older than the span the tail is known to cover falls back to a
+direct, ``since``-bounded database query.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+from ..config import settings
+from ..database import DatabaseManager
+from ..utils.response_formatter import format_violation_data
+from .queries import ViolationQueries
+
+logger = logging.getLogger(__name__)
+
+# Fields that change when a violation is attributed to another employee
+ATTRIBUTION_FIELDS = ("employee_name", "confidence")
+
+
+def _hours_since(timestamp: float) -> int:
+    """Whole hours between a timestamp and now, for the query window."""
+    return max(1, math.ceil((time.time() - timestamp) / 3600) + 1)
+
+
+def _tail_order(violation: Dict[str, Any]) -> Tuple[float, str]:
+    """Sort key keeping the tail oldest first."""
+    return violation["timestamp"], violation["id"]
+
+
+class ViolationTail:
+    """
+    Bounded, time-ordered tail of the most recent formatted violations.
+
+    The tail is complete for every violation newer than ``covered_from``;
+    anything older may have been evicted (or never loaded) and is served
+    from the database instead.
+    """
+
+    def __init__(self, maxlen: int = 1000, refresh_interval: float = 2.0):
+        self.maxlen = maxlen
+        self.refresh_interval = refresh_interval
+        self._items: Deque[Dict[str, Any]] = deque()
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._covered_from: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._memory_hits = 0
+        self._refreshes = 0
+        self._fallbacks = 0
+
+    @property
+    def watermark(self) -> Optional[float]:
+        """Timestamp of the newest violation held, if any."""
+        if not self._items:
+            return self._covered_from
+        return self._items[-1]["timestamp"]
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the tail was checked against the database recently."""
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.refresh_interval
+        )
+
+    def covers(self, since: float) -> bool:
+        """Whether every violation newer than ``since`` is in the tail."""
+        return self._covered_from is not None and since >= self._covered_from
+
+    def observe(self, violations: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add formatted violations that were just read from the database.
+
+        Violations already held are replaced in place when their
+        attribution changed.
+
+        Args:
+            violations: Formatted violations, in any order
+
+        Returns:
+            Number of violations that were new to the tail or re-attributed
+        """
+        fresh: Dict[str, Dict[str, Any]] = {}
+        revised = 0
+        for violation in violations:
+            held = self._by_id.get(violation.get("id"))
+            if held is None:
+                fresh[violation["id"]] = violation
+            elif any(held.get(field) != violation.get(field) for field in ATTRIBUTION_FIELDS):
+                held.update(violation)
+                revised += 1
+
+        ordered = sorted(fresh.values(), key=_tail_order)
+        late = bool(ordered and self._items and _tail_order(ordered[0]) < _tail_order(self._items[-1]))
+        for violation in ordered:
+            self._items.append(violation)
+            self._by_id[violation["id"]] = violation
+        if late:
+            # Rows from the overlap window that committed behind the watermark
+            self._items = deque(sorted(self._items, key=_tail_order))
+
+        while len(self._items) > self.maxlen:
+            evicted = self._items.popleft()
+            self._by_id.pop(evicted["id"], None)
+            self._covered_from = max(self._covered_from or evicted["timestamp"], evicted["timestamp"])
+
+        self._checked_at = time.monotonic()
+        return len(fresh) + revised
+
+    async def refresh(self, db: DatabaseManager) -> None:
+        """Load violations from the overlap window before the watermark onwards."""
+        since = self.watermark
+        if since is not None:
+            since -= settings.face_detection_window
+            if self._covered_from is not None:
+                since = max(since, self._covered_from)
+        now = time.time()
+        hours = _hours_since(since) if since is not None else 1
+        rows = await ViolationQueries.get_live_violations(
+            db=db, hours=hours, limit=self.maxlen, since=since
+        )
+        self._refreshes += 1
+
+        if len(rows) >= self.maxlen:
+            # More new rows than fit: restart the tail from this batch
+            self._items.clear()
+            self._by_id.clear()
+            self._covered_from = min(row["timestamp"] for row in rows)
+        elif since is None:
+            self._covered_from = now - hours * 3600
+
+        added = self.observe(format_violation_data(row) for row in rows)
+        logger.debug(f"Violation tail refreshed: {added} new or re-attributed, watermark={self.watermark}")
+
+    async def ensure_fresh(self, db: DatabaseManager) -> None:
+        """Refresh the tail unless it is fresh; concurrent callers share one refresh."""
+        if self.is_fresh:
+            return
+        async with self._lock:
+            if not self.is_fresh:
+                await self.refresh(db)
+
+    async def since(
+        self,
+        db: DatabaseManager,
+        since: float,
+        camera: Optional[str] = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Get violations newer than a watermark.
+
+        Args:
+            db: Database manager
+            since: Watermark from the client's previous response
+            camera: Optional camera filter
+            limit: Maximum violations to return
+
+        Returns:
+            Dict with the newest ``violations`` (newest first), the new
+            ``watermark`` and ``truncated``, set when more than ``limit``
+            violations arrived and the client should reload the full list
+        """
+        await self.ensure_fresh(db)
+
+        if self.covers(since):
+            self._memory_hits += 1
+            newer = [
+                v for v in reversed(self._items)
+                if v["timestamp"] > since and (camera is None or v.get("camera") == camera)
+            ]
+            # Advance past violations from other cameras as well
+            watermark = max(since, self.watermark or since)
+        else:
+            self._fallbacks += 1
+            newer = [
+                format_violation_data(row)
+                for row in await ViolationQueries.get_live_violations(
+                    db=db, camera=camera, hours=_hours_since(since), limit=limit + 1, since=since
+                )
+            ]
+            watermark = newer[0]["timestamp"] if newer else since
+
+        return {
+            "violations": newer[:limit],
+            "watermark": watermark,
+            "truncated": len(newer) > limit
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tail statistics."""
+        return {
+            "violations": len(self._items),
+            "max_violations": self.maxlen,
+            "watermark": self.watermark,
+            "covered_from": self._covered_from,
+            "memory_hits": self._memory_hits,
+            "refreshes": self._refreshes,
+            "fallbacks": self._fallbacks
+        }
+
+
+# Global violation tail instance
+violation_tail = ViolationTail(
+    settings.violation_tail_size,
+    settings.violation_tail_refresh_interval
+)
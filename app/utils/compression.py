@@ -0,0 +1,244 @@
+"""
+HTTP response compression for the Frigate Dashboard Middleware.
+
+This module negotiates gzip/brotli compression from Accept-Encoding and
+provides:
+- CompressionMiddleware, which compresses complete response bodies above a
+  size threshold on the fly
+- PrecompressedJSONResponse, used for responses served from the Redis
+  cache, which stores its compressed bytes next to the cached value so a
+  hot key is compressed once per TTL instead of once per request
+
+brotli is used when installed; gzip is always available.
+"""
+
+import gzip
+import hashlib
+from typing import Dict, Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..cache import cache_manager
+from ..config import settings
+from .serialization import FastJSONResponse, dumps
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli
+    brotli = None
+
+# Encodings in server preference order
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Bodies above this size are compressed in a worker thread
+THREAD_THRESHOLD = 64 * 1024
+
+# Envelope fields that change on every request; left out of variant digests
+VOLATILE_FIELDS = ("timestamp",)
+
+# Content types worth compressing; everything else passes through
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-yaml",
+    "text/",
+)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the preferred supported encoding a client accepts.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        "br", "gzip" or None for identity
+    """
+    if not accept_encoding:
+        return None
+
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    """
+    Compress a response body.
+
+    Args:
+        body: Uncompressed body
+        encoding: "br" or "gzip"
+        cached: Use the higher effort levels meant for stored variants
+
+    Returns:
+        Compressed body
+    """
+    config = settings.compression
+    if encoding == "br":
+        quality = config.cached_brotli_quality if cached else config.brotli_quality
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=quality)
+    level = config.cached_gzip_level if cached else config.gzip_level
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+async def compress_async(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    """Compress a body, off the event loop when it is large."""
+    if len(body) > THREAD_THRESHOLD:
+        return await anyio.to_thread.run_sync(compress, body, encoding, cached)
+    return compress(body, encoding, cached)
+
+
+def body_digest(body: bytes) -> bytes:
+    """Digest identifying the plain body a stored compressed variant was made from."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def is_compressible(headers: Headers) -> bool:
+    """Check whether a response may be compressed based on its headers."""
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    if content_type.startswith("text/event-stream"):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def encoded_headers(headers: MutableHeaders, encoding: str, length: int) -> None:
+    """Update response headers for a compressed body."""
+    headers["content-encoding"] = encoding
+    headers["content-length"] = str(length)
+    headers.add_vary_header("Accept-Encoding")
+
+
+class CompressionMiddleware:
+    """
+    Compress complete response bodies negotiated by Accept-Encoding.
+
+    Only single-message bodies are compressed; streamed responses (SSE,
+    media files) and responses that are already encoded pass through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.compression.minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                passthrough = True
+                if start_message is not None:
+                    await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or not is_compressible(headers)
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = await compress_async(body, encoding)
+            encoded_headers(headers, encoding, len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class PrecompressedJSONResponse(FastJSONResponse):
+    """
+    JSON response for a cached value that reuses stored compressed bodies.
+
+    On the first compressed request for a cache key the body is compressed
+    at the cached effort level and stored next to the key in Redis with the
+    same expiry; later requests for the same key and encoding send the
+    stored bytes as-is. Variants are tagged with a digest of the body they
+    were made from, so one stored from a value that has since been
+    refreshed is recompressed instead of served.
+
+    The digest leaves out the per-request envelope timestamp, so a stored
+    variant carries the timestamp of the request that stored it.
+    """
+
+    def __init__(self, content, cache_key: str, status_code: int = 200):
+        self.digest = b""
+        super().__init__(content=content, status_code=status_code)
+        self.cache_key = cache_key
+
+    def render(self, content) -> bytes:
+        volatile = {field: content[field] for field in VOLATILE_FIELDS if field in content}
+        stable = dumps({key: value for key, value in content.items() if key not in volatile})
+        self.digest = body_digest(stable)
+        if not volatile:
+            return stable
+        if stable == b"{}":
+            return dumps(volatile)
+        # Append the volatile fields to the object without serialising it again
+        return stable[:-1] + b"," + dumps(volatile)[1:]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if (
+            not settings.compression.enabled
+            or encoding is None
+            or len(self.body) < settings.compression.minimum_size
+        ):
+            await super().__call__(scope, receive, send)
+            return
+
+        compressed = await cache_manager.get_compressed(self.cache_key, encoding, self.digest)
+        if compressed is None:
+            compressed = await compress_async(self.body, encoding, cached=True)
+            await cache_manager.set_compressed(self.cache_key, encoding, compressed, self.digest)
+
+        self.body = compressed
+        encoded_headers(self.headers, encoding, len(compressed))
+        await super().__call__(scope, receive, send)
+
@@ -0,0 +1,96 @@
+"""
+Sparse fieldset utilities for the Frigate Dashboard Middleware.
+
+List endpoints accept ``fields=a,b,c`` to return only the named fields of
+each row. The selection is pushed down: handlers use it to drop columns
+from the SQL projection, skip joins and sub-queries that only feed
+unrequested fields, and skip per-row formatting work, instead of computing
+everything and filtering at the end.
+
+A selection of None means "all fields" everywhere in this module.
+"""
+
+from typing import AbstractSet, Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+FieldSet = Optional[AbstractSet[str]]
+
+
+def parse_fields(value: Optional[str], allowed: Iterable[str]) -> FieldSet:
+    """
+    Parse a comma-separated fields parameter.
+
+    Args:
+        value: Raw parameter value
+        allowed: Field names the endpoint returns
+
+    Returns:
+        Requested field names, or None for all fields
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not value:
+        return None
+
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Available: {', '.join(allowed)}"
+        )
+    return frozenset(requested) or None
+
+
+def wants(fields: FieldSet, *names: str) -> bool:
+    """Whether any of the named fields is requested."""
+    return fields is None or not fields.isdisjoint(names)
+
+
+def fields_key(fields: FieldSet) -> str:
+    """Cache key suffix for a field selection ("" for all fields)."""
+    return "" if fields is None else ":fields=" + ",".join(sorted(fields))
+
+
+def select_fields(rows: List[Mapping[str, Any]], fields: FieldSet) -> List[Dict[str, Any]]:
+    """Project full rows (e.g. from cache) down to the requested fields."""
+    if fields is None:
+        return rows
+    return [{name: row.get(name) for name in fields if name in row} for row in rows]
+
+
+def build_fields(
+    row: Mapping[str, Any],
+    builders: Mapping[str, Callable[[Mapping[str, Any]], Any]],
+    fields: AbstractSet[str]
+) -> Dict[str, Any]:
+    """
+    Build only the requested fields of a formatted row.
+
+    Args:
+        row: Raw row
+        builders: Map of field name to a function computing it from the row
+        fields: Requested field names
+
+    Returns:
+        Formatted row holding just the requested fields
+    """
+    return {name: builders[name](row) for name in builders if name in fields}
+
+
+def sql_projection(columns: Mapping[str, str], needed: AbstractSet[str]) -> str:
+    """
+    Build a SELECT list for the needed output columns.
+
+    Args:
+        columns: Ordered map of output column name to SQL expression
+        needed: Output columns to include
+
+    Returns:
+        Comma-separated "expression as name" list
+    """
+    return ",\n            ".join(
+        expression if expression == name else f"{expression} as {name}"
+        for name, expression in columns.items()
+        if name in needed
+    )
@@ -0,0 +1,165 @@
+"""
+File response utilities for the Frigate Dashboard Middleware.
+
+This module provides a file response with HTTP Range support for serving
+cached media, using the ASGI zero-copy send extension when the server
+offers it and chunked reads otherwise.
+"""
+
+import os
+import re
+from typing import Mapping, Optional, Tuple
+
+import anyio
+from fastapi import status
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range_header(value: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header.
+
+    Args:
+        value: Range header value (e.g. ``bytes=0-1023`` or ``bytes=-500``)
+        size: Size of the file in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions, or None to serve the whole
+        file (no header, multiple ranges or an unparseable header)
+
+    Raises:
+        ValueError: If the range cannot be satisfied
+    """
+    if not value:
+        return None
+
+    match = _RANGE_PATTERN.match(value.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(f"Range {value} not satisfiable for {size} bytes")
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(Response):
+    """
+    Serve an already-open file, honouring HTTP Range and conditional requests.
+
+    The caller opens the file so a concurrent cache eviction cannot remove it
+    between lookup and send; the response closes it once sent.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        file,
+        media_type: str,
+        request_headers: Mapping[str, str],
+        method: str = "GET",
+        headers: Optional[Mapping[str, str]] = None
+    ):
+        self.file = file
+        self.media_type = media_type
+        self.background = None
+        self.send_header_only = method.upper() == "HEAD"
+        self.init_headers(headers)
+
+        stat_result = os.fstat(file.fileno())
+        size = stat_result.st_size
+        # Cache hits touch the file's times, so the validator is built from
+        # the inode (new on every atomic replace) and size instead
+        etag = f'"{stat_result.st_ino:x}-{size:x}"'
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["etag"] = etag
+
+        self.offset = 0
+        self.count = size
+        self.status_code = status.HTTP_200_OK
+
+        if request_headers.get("if-none-match") == etag:
+            self.status_code = status.HTTP_304_NOT_MODIFIED
+            self.count = 0
+            self.send_header_only = True
+            return
+
+        try:
+            byte_range = parse_range_header(request_headers.get("range"), size)
+        except ValueError:
+            self.status_code = status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            self.count = 0
+            self.send_header_only = True
+            return
+
+        if byte_range is not None:
+            start, end = byte_range
+            self.status_code = status.HTTP_206_PARTIAL_CONTENT
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+            self.offset = start
+            self.count = end - start + 1
+
+        self.headers["content-length"] = str(self.count)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers
+            })
+
+            if self.send_header_only or self.count == 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": self.file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False
+                })
+            else:
+                await self._send_chunks(send)
+        finally:
+            self.file.close()
+
+    async def _send_chunks(self, send: Send) -> None:
+        """Send the selected byte range in chunks read off the event loop."""
+        remaining = self.count
+        await anyio.to_thread.run_sync(self.file.seek, self.offset)
+        while remaining > 0:
+            chunk = await anyio.to_thread.run_sync(
+                self.file.read, min(self.chunk_size, remaining)
+            )
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            await send({
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": remaining > 0
+            })
+        if remaining > 0:
+            # File shrank underneath us; terminate the body cleanly
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
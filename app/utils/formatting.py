@@ -12,6 +12,8 @@ from fastapi.responses import JSONResponse
 from fastapi import status
 
 from .time import timestamp_to_readable, timestamp_to_iso, get_relative_time_string
+from .serialization import FastJSONResponse
+from .media_urls import media_url
 from .errors import ErrorResponse, create_error_response, BaseAPIError
 from ..config import settings
 
@@ -89,7 +91,7 @@ def create_json_response(
         JSONResponse object
     """
     response_data = format_success_response(data, message)
-    return JSONResponse(
+    return FastJSONResponse(
         content=response_data,
         status_code=status_code
     )
@@ -112,23 +114,24 @@ def create_error_json_response(
         JSONResponse object
     """
     response_data = format_error_response(message, status_code, details)
-    return JSONResponse(
+    return FastJSONResponse(
         content=response_data,
         status_code=status_code
     )
 
 
-def format_violation_data(violation: Dict[str, Any]) -> Dict[str, Any]:
+def format_violation_data(violation: Dict[str, Any], urls: str = "full") -> Dict[str, Any]:
     """
     Format violation data for API response.
     
     Args:
         violation: Raw violation data from database
+        urls: Media URL format; "compact" leaves out the URL fields
         
     Returns:
         Formatted violation data
     """
-    return {
+    row = {
         "id": violation.get("id"),
         "timestamp": violation.get("timestamp"),
         "timestamp_iso": timestamp_to_iso(violation.get("timestamp")),
@@ -137,11 +140,13 @@ def format_violation_data(violation: Dict[str, Any]) -> Dict[str, Any]:
         "camera": violation.get("camera"),
         "employee_name": violation.get("employee_name", "Unknown"),
         "confidence": violation.get("confidence", 0.0),
-        "zones": violation.get("zones"),
-        "thumbnail_url": violation.get("thumbnail_url"),
-        "video_url": violation.get("video_url"),
-        "snapshot_url": violation.get("snapshot_url")
+        "zones": violation.get("zones")
     }
+    if urls != "compact":
+        row["thumbnail_url"] = violation.get("thumbnail_url")
+        row["video_url"] = violation.get("video_url")
+        row["snapshot_url"] = violation.get("snapshot_url") or media_url("snapshot", violation.get("id"), violation.get("camera"))
+    return row
 
 
 def format_hourly_trend_data(trend_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -154,28 +159,14 @@ def format_hourly_trend_data(trend_data: List[Dict[str, Any]]) -> List[Dict[str,
     Returns:
         Formatted trend data
     """
-    # Convert Decimal types to appropriate types for JSON serialization
-    def convert_decimals(obj):
-        if isinstance(obj, dict):
-            return {k: convert_decimals(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_decimals(item) for item in obj]
-        elif hasattr(obj, 'as_tuple'):  # Decimal type
-            return float(obj)
-        else:
-            return obj
-    
     formatted = []
     for hour_data in trend_data:
-        # Convert all Decimal values in the hour_data
-        converted_hour_data = convert_decimals(hour_data)
-        
         formatted.append({
-            "hour": converted_hour_data.get("hour"),
-            "hour_readable": timestamp_to_readable(converted_hour_data.get("hour"), format_str="%H:00"),
-            "violations": converted_hour_data.get("violations", 0),
-            "cameras": converted_hour_data.get("cameras", []),
-            "employees": converted_hour_data.get("employees", [])
+            "hour": hour_data.get("hour"),
+            "hour_readable": timestamp_to_readable(hour_data.get("hour"), format_str="%H:00"),
+            "violations": hour_data.get("violations", 0),
+            "cameras": hour_data.get("cameras", []),
+            "employees": hour_data.get("employees", [])
         })
     return formatted
 
@@ -225,19 +216,24 @@ def format_camera_data(camera: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def format_camera_activity_data(activity_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def format_camera_activity_data(
+    activity_data: List[Dict[str, Any]],
+    urls: str = "full"
+) -> List[Dict[str, Any]]:
     """
     Format camera activity data for API response.
     
     Args:
         activity_data: Raw activity data from database
+        urls: Media URL format; "compact" leaves out the URL fields
         
     Returns:
         Formatted activity data
     """
     formatted = []
     for activity in activity_data:
-        formatted.append({
+        row = {
+            "id": activity.get("id"),
             "timestamp": activity.get("timestamp"),
             "timestamp_iso": timestamp_to_iso(activity.get("timestamp")),
             "timestamp_readable": timestamp_to_readable(activity.get("timestamp")),
@@ -246,11 +242,13 @@ def format_camera_activity_data(activity_data: List[Dict[str, Any]]) -> List[Dic
             "event_type": activity.get("event_type"),
             "employee_name": activity.get("employee_name", "Unknown"),
             "confidence": activity.get("confidence", 0.0),
-            "zones": activity.get("zones"),
-            "thumbnail_url": activity.get("thumbnail_url"),
-            "video_url": activity.get("video_url"),
-            "snapshot_url": activity.get("snapshot_url")
-        })
+            "zones": activity.get("zones")
+        }
+        if urls != "compact":
+            row["thumbnail_url"] = activity.get("thumbnail_url")
+            row["video_url"] = activity.get("video_url")
+            row["snapshot_url"] = activity.get("snapshot_url") or media_url("snapshot", activity.get("id"), activity.get("camera"))
+        formatted.append(row)
     return formatted
 
 
@@ -369,19 +367,24 @@ def format_camera_summary(camera: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def format_camera_activity_data(activity_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def format_camera_activity_data(
+    activity_data: List[Dict[str, Any]],
+    urls: str = "full"
+) -> List[Dict[str, Any]]:
     """
     Format camera activity data for API response.
     
     Args:
         activity_data: Raw activity data from database
+        urls: Media URL format; "compact" leaves out the URL fields
         
     Returns:
         Formatted activity data
     """
     formatted = []
     for activity in activity_data:
-        formatted.append({
+        row = {
+            "id": activity.get("id"),
             "timestamp": activity.get("timestamp"),
             "timestamp_iso": timestamp_to_iso(activity.get("timestamp")),
             "timestamp_readable": timestamp_to_readable(activity.get("timestamp")),
@@ -390,11 +393,13 @@ def format_camera_activity_data(activity_data: List[Dict[str, Any]]) -> List[Dic
             "event_type": activity.get("event_type"),
             "employee_name": activity.get("employee_name", "Unknown"),
             "confidence": activity.get("confidence", 0.0),
-            "zones": activity.get("zones"),
-            "thumbnail_url": activity.get("thumbnail_url"),
-            "video_url": activity.get("video_url"),
-            "snapshot_url": activity.get("snapshot_url")
-        })
+            "zones": activity.get("zones")
+        }
+        if urls != "compact":
+            row["thumbnail_url"] = activity.get("thumbnail_url")
+            row["video_url"] = activity.get("video_url")
+            row["snapshot_url"] = activity.get("snapshot_url") or media_url("snapshot", activity.get("id"), activity.get("camera"))
+        formatted.append(row)
     return formatted
 
 
@@ -0,0 +1,188 @@
+"""
+Event-loop lag monitor for the Frigate Dashboard Middleware.
+
+A coroutine wakes every ``interval`` seconds and records how late it was
+scheduled: that lag is the time the loop spent running something else
+without yielding. A watchdog thread watches the coroutine's heartbeat and,
+when the loop has not come back for longer than the stall threshold,
+captures the loop thread's current stack, i.e. the blocking call itself
+(a synchronous HTTP request, a large json.dumps, ...). This works with
+both the default asyncio loop and uvloop, and costs one timer per
+interval while the loop is healthy.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from ..config import settings
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Innermost frames of the loop thread kept per stall
+_STACK_DEPTH = 15
+
+
+class LatencyWindow:
+    """Percentiles over the most recent latency samples."""
+
+    def __init__(self, size: int = 1000):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add a sample."""
+        self.samples.append(seconds)
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sample count and recent percentiles (milliseconds)."""
+        ordered = sorted(self.samples)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] * 1000, 2)
+
+        return {
+            "count": self.count,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max * 1000, 2)
+        }
+
+
+class LoopMonitor:
+    """Samples event-loop scheduling lag and captures the stacks of stalls."""
+
+    def __init__(
+        self,
+        interval: float,
+        stall_threshold_ms: float,
+        history_size: int,
+        window_size: int = 1000
+    ):
+        """
+        Args:
+            interval: Seconds between lag samples
+            stall_threshold_ms: Loop blocked at least this long counts as a stall
+            history_size: Number of stalls kept
+            window_size: Number of lag samples the percentiles cover
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold_ms / 1000
+        self.lag = LatencyWindow(window_size)
+        self.stalls: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.stall_count = 0
+        self._heartbeat = time.monotonic()
+        self._pending_stall: Optional[Dict[str, Any]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self.is_running:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (interval {self.interval}s, stall threshold {self.stall_threshold * 1000:.0f} ms)")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        self._stopping.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    async def _sample(self) -> None:
+        """Measure how late each wake-up is."""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.record_lag(max(now - expected, 0.0))
+
+    def record_lag(self, lag: float) -> None:
+        """Record one lag sample, closing the stall the watchdog saw, if any."""
+        self.lag.add(lag)
+        metrics.observe_loop_lag(lag)
+
+        stall, self._pending_stall = self._pending_stall, None
+        if stall is not None:
+            stall["blocked_ms"] = max(stall["blocked_ms"], round(lag * 1000, 1))
+            logger.warning(f"Event loop blocked for {stall['blocked_ms']:.0f} ms in {stall['location']}")
+        elif lag >= self.stall_threshold:
+            # Too short for the watchdog to catch in the act
+            self._add_stall(lag, None)
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop thread's stack while it is blocked."""
+        check_every = min(self.interval, self.stall_threshold) / 2
+        while not self._stopping.wait(check_every):
+            blocked = time.monotonic() - self._heartbeat - self.interval
+            if blocked < self.stall_threshold or self._pending_stall is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._pending_stall = self._add_stall(blocked, traceback.extract_stack(frame)[-_STACK_DEPTH:])
+
+    def _add_stall(self, blocked: float, stack: Optional[List[traceback.FrameSummary]]) -> Dict[str, Any]:
+        """Record a stall."""
+        frames = [f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in stack or []]
+        stall = {
+            "timestamp": time.time(),
+            "blocked_ms": round(blocked * 1000, 1),
+            "location": frames[-1] if frames else "unknown (shorter than the watchdog interval)",
+            "stack": frames
+        }
+        self.stalls.append(stall)
+        self.stall_count += 1
+        metrics.record_loop_stall()
+        return stall
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lag percentiles and the most recent stalls."""
+        return {
+            "running": self.is_running,
+            "interval_ms": self.interval * 1000,
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "lag": self.lag.get_stats(),
+            "stalls": self.stall_count,
+            "recent_stalls": list(self.stalls)[-10:][::-1]
+        }
+
+
+# Global loop monitor instance
+loop_monitor = LoopMonitor(
+    interval=settings.loop_monitor.interval,
+    stall_threshold_ms=settings.loop_monitor.stall_threshold_ms,
+    history_size=settings.loop_monitor.history_size
+)
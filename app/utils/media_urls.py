@@ -0,0 +1,93 @@
+"""
+Media URL building for the Frigate Dashboard Middleware.
+
+Violation, activity and break rows link to Frigate clip, snapshot and
+thumbnail media that is addressed purely by camera and source_id. This
+module is the one place those URLs are built.
+
+Responses default to spelling the URLs out per row. With ``urls=compact``
+a list response instead carries a ``url_templates`` map once, e.g.
+``{"snapshot_url": "http://frigate:5001/snapshot/{camera}/{id}"}``, and
+rows keep only their ``id`` and ``camera``; clients substitute those into
+the templates. Formatters take the URL format and skip building the URL
+fields in compact mode; rows already formatted with full URLs (e.g. from
+cache) have the fields dropped by compact_media_urls.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config import settings
+
+# Response URL field for each media kind
+MEDIA_URL_FIELDS = {
+    "clip": "video_url",
+    "snapshot": "snapshot_url",
+    "thumbnail": "thumbnail_url"
+}
+
+# Path template for each media kind, relative to the video API base URL
+MEDIA_URL_PATHS = {
+    "clip": "/clip/{id}",
+    "snapshot": "/snapshot/{camera}/{id}",
+    "thumbnail": "/thumb/{id}"
+}
+
+# All response URL fields
+URL_FIELD_NAMES = frozenset(MEDIA_URL_FIELDS.values())
+
+# URL formats accepted by list endpoints
+URL_FORMATS = ("full", "compact")
+
+
+def media_url(kind: str, source_id: Optional[str], camera: Optional[str] = None) -> Optional[str]:
+    """
+    Build a Frigate media URL.
+
+    Args:
+        kind: "clip", "snapshot" or "thumbnail"
+        source_id: Timeline source ID
+        camera: Camera name (required for snapshots)
+
+    Returns:
+        Media URL, or None if the row lacks the IDs it needs
+    """
+    if not source_id or (kind == "snapshot" and not camera):
+        return None
+    return settings.video_api_base_url + MEDIA_URL_PATHS[kind].format(id=source_id, camera=camera)
+
+
+def url_templates(kinds: Iterable[str]) -> Dict[str, str]:
+    """
+    Get the URL templates for media kinds, keyed by response URL field.
+
+    Args:
+        kinds: Media kinds present in the response rows
+
+    Returns:
+        Map of URL field to template with {id} and {camera} placeholders
+    """
+    return {
+        MEDIA_URL_FIELDS[kind]: settings.video_api_base_url + MEDIA_URL_PATHS[kind]
+        for kind in kinds
+    }
+
+
+def compact_media_urls(
+    rows: List[Dict[str, Any]],
+    kinds: Iterable[str]
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Strip spelled-out media URLs from rows in favour of URL templates.
+
+    Args:
+        rows: Response rows carrying id, camera and *_url fields
+        kinds: Media kinds the endpoint links to
+
+    Returns:
+        Tuple of (rows without URL fields, URL templates)
+    """
+    compact = [
+        {key: value for key, value in row.items() if key not in URL_FIELD_NAMES}
+        for row in rows
+    ]
+    return compact, url_templates(kinds)
@@ -0,0 +1,242 @@
+"""
+Prometheus metrics for the Frigate Dashboard Middleware.
+
+Hooks in the HTTP middleware, DatabaseManager, CacheManager, the WebSocket
+ConnectionManager and BackgroundTaskManager record into the collectors
+below; ``GET /metrics`` renders them in the Prometheus text format.
+
+prometheus_client is used when installed and METRICS_ENABLED is set;
+otherwise every hook is a no-op. Under several uvicorn workers, set
+PROMETHEUS_MULTIPROC_DIR so /metrics aggregates all worker processes; the
+pool gauges are then written by each worker as its pools are used and
+summed over live workers, instead of being read at scrape time.
+"""
+
+import os
+import re
+import weakref
+from typing import Any, Iterable, Optional, Tuple
+
+from ..config import settings
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # pragma: no cover - exercised only without prometheus_client
+    prometheus_client = None
+
+ENABLED = prometheus_client is not None and settings.metrics_enabled
+
+# Leading lowercase segments of a cache key name its family
+# ("violations:live:100:24" -> "violations:live", "cameras:employees_01:summary" -> "cameras")
+_FAMILY_SEGMENT = re.compile(r"^[a-z_]+$")
+
+# Latency buckets (seconds) for requests and queries
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Finer buckets for Redis commands and pool waits
+_FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+_ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+# Connection pool gauges, in the order _PoolCollector.values() reports them
+_POOL_GAUGES = (
+    ("db_pool_connections", "Open pool connections"),
+    ("db_pool_idle_connections", "Idle pool connections"),
+    ("db_pool_max_connections", "Pool connection limit"),
+    ("db_pool_waiting_acquires", "Queries waiting for a pool connection"),
+)
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def key_family(key: str) -> str:
+    """Cache key family used as a metric label (bounded cardinality)."""
+    segments = key.split(":")
+    family = [segments[0]]
+    if len(segments) > 1 and _FAMILY_SEGMENT.match(segments[1]):
+        family.append(segments[1])
+    return ":".join(family)
+
+
+if ENABLED:
+    HTTP_REQUEST_SECONDS = Histogram(
+        "http_request_duration_seconds", "HTTP request latency by route",
+        ["method", "route", "status"], buckets=_LATENCY_BUCKETS
+    )
+    DB_QUERY_SECONDS = Histogram(
+        "db_query_duration_seconds", "Database query latency by query",
+        ["query", "operation"], buckets=_LATENCY_BUCKETS
+    )
+    DB_QUERY_ROWS = Histogram(
+        "db_query_rows", "Rows returned by query",
+        ["query"], buckets=_ROW_BUCKETS
+    )
+    DB_QUERY_ERRORS = Counter(
+        "db_query_errors_total", "Failed database queries by query", ["query"]
+    )
+    DB_POOL_WAIT_SECONDS = Histogram(
+        "db_pool_acquire_wait_seconds", "Time waiting to acquire a pool connection",
+        buckets=_FAST_BUCKETS
+    )
+    REDIS_COMMAND_SECONDS = Histogram(
+        "redis_command_duration_seconds", "Redis command latency by command",
+        ["command"], buckets=_FAST_BUCKETS
+    )
+    CACHE_LOOKUPS = Counter(
+        "cache_lookups_total", "Cache lookups by key family and result",
+        ["family", "result"]
+    )
+    WEBSOCKET_CONNECTIONS = Gauge(
+        "websocket_connections", "Open WebSocket and event stream connections",
+        ["channel"], multiprocess_mode="livesum"
+    )
+    BROADCAST_SECONDS = Histogram(
+        "websocket_broadcast_duration_seconds", "Time to fan a broadcast out to clients",
+        ["channel"], buckets=_LATENCY_BUCKETS
+    )
+    EVENT_LOOP_LAG_SECONDS = Histogram(
+        "event_loop_lag_seconds", "Event loop scheduling lag",
+        buckets=_FAST_BUCKETS
+    )
+    EVENT_LOOP_STALLS = Counter(
+        "event_loop_stalls_total", "Times the event loop was blocked past the stall threshold"
+    )
+    BACKGROUND_CYCLE_SECONDS = Histogram(
+        "background_task_cycle_seconds", "Background task cycle time",
+        ["task", "result"], buckets=_LATENCY_BUCKETS
+    )
+
+    class _PoolCollector:
+        """Reports size and idle connections of every live asyncpg pool at scrape time."""
+
+        def __init__(self):
+            self.managers = weakref.WeakSet()
+
+        def values(self) -> Tuple[int, int, int, int]:
+            managers = list(self.managers)
+            pools = [manager.pool for manager in managers if manager.pool is not None]
+            return (
+                sum(pool.get_size() for pool in pools),
+                sum(pool.get_idle_size() for pool in pools),
+                sum(pool.get_max_size() for pool in pools),
+                sum(manager.pool_waiting for manager in managers)
+            )
+
+        def collect(self) -> Iterable[Any]:
+            families = []
+            for (name, documentation), value in zip(_POOL_GAUGES, self.values()):
+                family = GaugeMetricFamily(name, documentation)
+                family.add_metric([], value)
+                families.append(family)
+            return families
+
+    _pool_collector = _PoolCollector()
+    if MULTIPROCESS:
+        # A scrape reaches one worker; each worker writes its own pool sizes
+        _pool_gauges = tuple(
+            Gauge(name, documentation, multiprocess_mode="livesum")
+            for name, documentation in _POOL_GAUGES
+        )
+    else:
+        _pool_gauges = ()
+        prometheus_client.REGISTRY.register(_pool_collector)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    """Record an HTTP request (route is the path template, not the URL)."""
+    if ENABLED:
+        HTTP_REQUEST_SECONDS.labels(method, route, str(status)).observe(seconds)
+
+
+def observe_query(name: str, operation: str, seconds: float, rows: Optional[int] = None, failed: bool = False) -> None:
+    """Record a database query by the function that issued it."""
+    if not ENABLED:
+        return
+    DB_QUERY_SECONDS.labels(name, operation).observe(seconds)
+    if failed:
+        DB_QUERY_ERRORS.labels(name).inc()
+    elif rows is not None:
+        DB_QUERY_ROWS.labels(name).observe(rows)
+
+
+def observe_pool_wait(seconds: float) -> None:
+    """Record the time spent waiting for a pool connection."""
+    if ENABLED:
+        DB_POOL_WAIT_SECONDS.observe(seconds)
+
+
+def track_pool(manager: Any) -> None:
+    """Report a DatabaseManager's pool in the pool gauges."""
+    if ENABLED:
+        _pool_collector.managers.add(manager)
+        sample_pools()
+
+
+def sample_pools() -> None:
+    """Write this worker's pool sizes to the multiprocess pool gauges."""
+    if ENABLED and _pool_gauges:
+        for gauge, value in zip(_pool_gauges, _pool_collector.values()):
+            gauge.set(value)
+
+
+def observe_redis(command: str, seconds: float) -> None:
+    """Record a Redis command or pipeline."""
+    if ENABLED:
+        REDIS_COMMAND_SECONDS.labels(command).observe(seconds)
+
+
+def record_cache_lookup(key: str, hit: bool) -> None:
+    """Record a cache hit or miss for the key's family."""
+    if ENABLED:
+        CACHE_LOOKUPS.labels(key_family(key), "hit" if hit else "miss").inc()
+
+
+def set_websocket_connections(channel: str, count: int) -> None:
+    """Set the number of open connections on a channel."""
+    if ENABLED:
+        WEBSOCKET_CONNECTIONS.labels(channel).set(count)
+
+
+def observe_broadcast(channel: str, seconds: float) -> None:
+    """Record a broadcast fan-out."""
+    if ENABLED:
+        BROADCAST_SECONDS.labels(channel).observe(seconds)
+
+
+def observe_loop_lag(seconds: float) -> None:
+    """Record an event loop lag sample."""
+    if ENABLED:
+        EVENT_LOOP_LAG_SECONDS.observe(seconds)
+
+
+def record_loop_stall() -> None:
+    """Count an event loop stall."""
+    if ENABLED:
+        EVENT_LOOP_STALLS.inc()
+
+
+def observe_background_cycle(task: str, seconds: float, result: str = "ok") -> None:
+    """Record one cycle of a background task."""
+    if ENABLED:
+        BACKGROUND_CYCLE_SECONDS.labels(task, result).observe(seconds)
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        Tuple of (body, content type)
+    """
+    if not ENABLED:
+        return b"", "text/plain; charset=utf-8"
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        sample_pools()
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
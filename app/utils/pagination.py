@@ -0,0 +1,137 @@
+"""
+Keyset (cursor) pagination utilities for the Frigate Dashboard Middleware.
+
+List endpoints page through timeline rows ordered by (timestamp, source_id).
+Instead of OFFSET/COUNT, each page ends with an opaque cursor holding the
+sort key of its last row; the next page seeks past it with a row-value
+comparison such as ``(timestamp, source_id) < ($1, $2)``, which the
+timeline timestamp index can satisfy directly no matter how deep the page.
+
+One extra row is fetched to tell whether another page exists, so no
+COUNT(*) runs on the request path.
+"""
+
+import base64
+import binascii
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .errors import ValidationError
+from .serialization import dumps, loads
+
+
+class Cursor(NamedTuple):
+    """Sort key of the last row on a page."""
+    timestamp: float
+    id: str
+
+
+def encode_cursor(timestamp: float, row_id: str) -> str:
+    """
+    Encode a sort key as an opaque URL-safe cursor token.
+
+    Args:
+        timestamp: Row timestamp
+        row_id: Row source ID (tie-breaker for equal timestamps)
+
+    Returns:
+        Cursor token
+    """
+    raw = dumps([float(timestamp), str(row_id)])
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Decode a cursor token produced by encode_cursor.
+
+    Args:
+        token: Cursor token
+
+    Returns:
+        Decoded cursor
+
+    Raises:
+        ValidationError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        timestamp, row_id = loads(raw)
+        return Cursor(float(timestamp), str(row_id))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValidationError("Invalid pagination cursor", {"cursor": token})
+
+
+def keyset_condition(
+    cursor: Optional[Cursor],
+    first_param: int,
+    descending: bool = True,
+    timestamp_column: str = "timestamp",
+    id_column: str = "source_id",
+    inclusive: bool = False
+) -> Tuple[str, List[Any]]:
+    """
+    Build the seek predicate for the page after a cursor.
+
+    Args:
+        cursor: Cursor of the previous page, or None for the first page
+        first_param: Number of the first positional parameter to use
+        descending: Whether rows are ordered newest first
+        timestamp_column: Timestamp column expression
+        id_column: Source ID column expression
+        inclusive: Also match the cursor row itself, for handlers that need
+            the last row of the previous page as context
+
+    Returns:
+        Tuple of ("AND ..." SQL fragment, query arguments); both are empty
+        for the first page
+    """
+    if cursor is None:
+        return "", []
+
+    operator = "<" if descending else ">"
+    if inclusive:
+        operator += "="
+    condition = (
+        f"AND ({timestamp_column}, {id_column}) {operator} "
+        f"(${first_param}, ${first_param + 1})"
+    )
+    return condition, [cursor.timestamp, cursor.id]
+
+
+def paginate_keyset(
+    rows: Sequence[Dict[str, Any]],
+    limit: int,
+    lookahead: bool = True,
+    timestamp_key: str = "timestamp",
+    id_key: str = "id"
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Trim fetched rows to one page and describe the next one.
+
+    Args:
+        rows: Rows fetched with LIMIT limit + 1
+        limit: Page size
+        lookahead: Whether rows include the extra lookahead row; when False
+            (a page served from cache) a full page is assumed to continue
+        timestamp_key: Row key holding the timestamp
+        id_key: Row key holding the source ID
+
+    Returns:
+        Tuple of (page rows, pagination info)
+    """
+    page = list(rows[:limit])
+    if lookahead:
+        has_next = len(rows) > limit and bool(page)
+    else:
+        has_next = len(page) >= limit > 0
+
+    next_cursor = None
+    if has_next:
+        last = page[-1]
+        next_cursor = encode_cursor(last[timestamp_key], last[id_key])
+
+    return page, {
+        "limit": limit,
+        "has_next": has_next,
+        "next_cursor": next_cursor
+    }
@@ -0,0 +1,200 @@
+"""
+On-demand CPU and memory profiling for the Frigate Dashboard Middleware.
+
+Both profilers only run while an admin asks for them, so they cost
+nothing when idle, and the admin endpoints are disabled unless
+PROFILING_ENABLED is set.
+
+- SamplingProfiler samples the stack of the event loop thread (or every
+  thread) from a helper thread for a fixed duration and renders the
+  samples as collapsed stacks ("frame;frame;frame count" per line), the
+  input format of flamegraph.pl, speedscope and similar viewers.
+- MemoryProfiler starts tracemalloc, keeps a baseline snapshot and
+  reports the allocation sites that grew since the baseline, which point
+  at the routers, caches or buffers holding on to memory.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, Optional
+
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Allocation sites that are the profiler's own or import machinery
+_MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a CPU profile is requested while another is running."""
+
+
+def _frame_label(frame) -> str:
+    """Collapsed-stack label of a frame: function (file:line), paths relative to the app."""
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_PACKAGE_ROOT):
+        filename = "app" + filename[len(_PACKAGE_ROOT):]
+    else:
+        filename = os.path.basename(filename)
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({filename}:{frame.f_lineno})"
+
+
+class SamplingProfiler:
+    """Statistical CPU profiler that samples thread stacks at a fixed interval."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running = False
+
+    def profile(
+        self,
+        duration: float,
+        interval: float,
+        thread_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Sample stacks for ``duration`` seconds (blocking; run it in a thread).
+
+        Args:
+            duration: Seconds to sample for
+            interval: Seconds between samples
+            thread_id: Only sample this thread (all other threads if None)
+
+        Returns:
+            Dict with ``collapsed`` stacks text, ``samples`` and ``duration``
+
+        Raises:
+            ProfilerBusyError: If a profile is already running
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A CPU profile is already running")
+
+        self.running = True
+        stacks: Counter = Counter()
+        samples = 0
+        own_thread = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        started = time.monotonic()
+        try:
+            while time.monotonic() - started < duration:
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_thread or (thread_id is not None and ident != thread_id):
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    if thread_id is None:
+                        labels.append(thread_names.get(ident, f"thread-{ident}"))
+                    stacks[";".join(reversed(labels))] += 1
+                samples += 1
+                time.sleep(interval)
+        finally:
+            self.running = False
+            self._lock.release()
+
+        return {
+            "collapsed": "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()),
+            "samples": samples,
+            "duration": round(time.monotonic() - started, 3)
+        }
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots diffed against a baseline."""
+
+    def __init__(self):
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.started_at: Optional[float] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int) -> None:
+        """Start tracing allocations and take the baseline snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.baseline = self._snapshot()
+        self.started_at = time.time()
+
+    def stop(self) -> None:
+        """Stop tracing and release the snapshots."""
+        tracemalloc.stop()
+        self.baseline = None
+        self.started_at = None
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+
+    def report(self, limit: int = 25, group_by: str = "lineno", reset: bool = False) -> Dict[str, Any]:
+        """
+        Compare a new snapshot with the baseline.
+
+        Args:
+            limit: Number of allocation sites per list
+            group_by: "lineno", "filename" or "traceback"
+            reset: Make the new snapshot the baseline for the next report
+
+        Returns:
+            Traced memory totals, top sites by size and top growth since the baseline
+
+        Raises:
+            RuntimeError: If tracing was not started
+        """
+        if not tracemalloc.is_tracing() or self.baseline is None:
+            raise RuntimeError("Memory tracing is not started")
+
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        report = {
+            "tracing_since": self.started_at,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top": [self._format_stat(stat) for stat in snapshot.statistics(group_by)[:limit]],
+            "growth": [
+                self._format_stat(stat)
+                for stat in snapshot.compare_to(self.baseline, group_by)
+                if stat.size_diff > 0
+            ][:limit]
+        }
+        if reset:
+            self.baseline = snapshot
+        return report
+
+    @staticmethod
+    def _format_stat(stat: Any) -> Dict[str, Any]:
+        """JSON-friendly form of a Statistic or StatisticDiff."""
+        formatted = {
+            "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_bytes": stat.size,
+            "count": stat.count
+        }
+        if hasattr(stat, "size_diff"):
+            formatted["size_diff_bytes"] = stat.size_diff
+            formatted["count_diff"] = stat.count_diff
+        return formatted
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get tracing status."""
+        return {
+            "tracing": self.tracing,
+            "tracing_since": self.started_at,
+            "frames": tracemalloc.get_traceback_limit() if self.tracing else None
+        }
+
+
+# Global profiler instances
+cpu_profiler = SamplingProfiler()
+memory_profiler = MemoryProfiler()
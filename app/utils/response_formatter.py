@@ -12,6 +12,10 @@ from fastapi.responses import JSONResponse
 from fastapi import status
 
 from .time import timestamp_to_readable, timestamp_to_iso, get_relative_time_string
+from .serialization import FastJSONResponse
+from .compression import PrecompressedJSONResponse
+from .fields import FieldSet, build_fields
+from .media_urls import URL_FIELD_NAMES, media_url
 from .errors import ErrorResponse, create_error_response, BaseAPIError
 from ..config import settings
 
@@ -26,7 +30,9 @@ def get_current_timestamp() -> float:
 def format_success_response(
     data: Any, 
     message: str = "Success",
-    status_code: int = status.HTTP_200_OK
+    status_code: int = status.HTTP_200_OK,
+    pagination: Optional[Dict[str, Any]] = None,
+    url_templates: Optional[Dict[str, str]] = None
 ) -> Dict[str, Any]:
     """
     Format a successful API response following RORO pattern.
@@ -35,16 +41,23 @@ def format_success_response(
         data: Response data
         message: Success message
         status_code: HTTP status code
+        pagination: Cursor pagination info for list endpoints
+        url_templates: Media URL templates for compact list responses
         
     Returns:
         Formatted response dictionary
     """
-    return {
+    response = {
         "success": True,
         "message": message,
         "data": data,
         "timestamp": timestamp_to_iso(get_current_timestamp())
     }
+    if pagination is not None:
+        response["pagination"] = pagination
+    if url_templates is not None:
+        response["url_templates"] = url_templates
+    return response
 
 
 def format_error_response(
@@ -75,7 +88,10 @@ def format_error_response(
 def create_json_response(
     data: Any,
     message: str = "Success",
-    status_code: int = status.HTTP_200_OK
+    status_code: int = status.HTTP_200_OK,
+    cache_key: Optional[str] = None,
+    pagination: Optional[Dict[str, Any]] = None,
+    url_templates: Optional[Dict[str, str]] = None
 ) -> JSONResponse:
     """
     Create a JSONResponse with proper formatting.
@@ -84,12 +100,24 @@ def create_json_response(
         data: Response data
         message: Success message
         status_code: HTTP status code
+        cache_key: Cache key the data was served from; compressed bodies
+            are then stored alongside it and reused until it expires
+        pagination: Cursor pagination info for list endpoints
+        url_templates: Media URL templates for compact list responses
         
     Returns:
         JSONResponse object
     """
-    response_data = format_success_response(data, message)
-    return JSONResponse(
+    response_data = format_success_response(
+        data, message, pagination=pagination, url_templates=url_templates
+    )
+    if cache_key is not None:
+        return PrecompressedJSONResponse(
+            content=response_data,
+            cache_key=cache_key,
+            status_code=status_code
+        )
+    return FastJSONResponse(
         content=response_data,
         status_code=status_code
     )
@@ -112,22 +140,52 @@ def create_error_json_response(
         JSONResponse object
     """
     response_data = format_error_response(message, status_code, details)
-    return JSONResponse(
+    return FastJSONResponse(
         content=response_data,
         status_code=status_code
     )
 
 
-def format_violation_data(violation: Dict[str, Any]) -> Dict[str, Any]:
+# Per-field builders for violation rows, used when a fieldset is requested
+VIOLATION_FIELD_BUILDERS = {
+    "id": lambda v: v.get("id"),
+    "timestamp": lambda v: v.get("timestamp"),
+    "timestamp_iso": lambda v: timestamp_to_iso(v.get("timestamp")),
+    "timestamp_readable": lambda v: timestamp_to_readable(v.get("timestamp")),
+    "relative_time": lambda v: get_relative_time_string(v.get("timestamp")),
+    "camera": lambda v: v.get("camera"),
+    "employee_name": lambda v: v.get("employee_name", "Unknown"),
+    "confidence": lambda v: v.get("confidence", 0.0),
+    "zones": lambda v: v.get("zones"),
+    "thumbnail_url": lambda v: v.get("thumbnail_url"),
+    "video_url": lambda v: v.get("video_url"),
+    "snapshot_url": lambda v: v.get("snapshot_url") or media_url("snapshot", v.get("id"), v.get("camera"))
+}
+
+VIOLATION_FIELDS = tuple(VIOLATION_FIELD_BUILDERS)
+
+
+def format_violation_data(
+    violation: Dict[str, Any],
+    fields: FieldSet = None,
+    urls: str = "full"
+) -> Dict[str, Any]:
     """
     Format violation data for API response.
     
     Args:
         violation: Raw violation data from database
+        fields: Only build these fields (None for all)
+        urls: Media URL format; "compact" leaves out the URL fields
         
     Returns:
         Formatted violation data
     """
+    if urls == "compact":
+        fields = (fields if fields is not None else VIOLATION_FIELD_BUILDERS.keys()) - URL_FIELD_NAMES
+    if fields is not None:
+        return build_fields(violation, VIOLATION_FIELD_BUILDERS, fields)
+    
     return {
         "id": violation.get("id"),
         "timestamp": violation.get("timestamp"),
@@ -140,7 +198,7 @@ def format_violation_data(violation: Dict[str, Any]) -> Dict[str, Any]:
         "zones": violation.get("zones"),
         "thumbnail_url": violation.get("thumbnail_url"),
         "video_url": violation.get("video_url"),
-        "snapshot_url": violation.get("snapshot_url")
+        "snapshot_url": violation.get("snapshot_url") or media_url("snapshot", violation.get("id"), violation.get("camera"))
     }
 
 
@@ -154,28 +212,14 @@ def format_hourly_trend_data(trend_data: List[Dict[str, Any]]) -> List[Dict[str,
     Returns:
         Formatted trend data
     """
-    # Convert Decimal types to appropriate types for JSON serialization
-    def convert_decimals(obj):
-        if isinstance(obj, dict):
-            return {k: convert_decimals(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_decimals(item) for item in obj]
-        elif hasattr(obj, 'as_tuple'):  # Decimal type
-            return float(obj)
-        else:
-            return obj
-    
     formatted = []
     for hour_data in trend_data:
-        # Convert all Decimal values in the hour_data
-        converted_hour_data = convert_decimals(hour_data)
-        
         formatted.append({
-            "hour": converted_hour_data.get("hour"),
-            "hour_readable": timestamp_to_readable(converted_hour_data.get("hour"), format_str="%H:00"),
-            "violations": converted_hour_data.get("violations", 0),
-            "cameras": converted_hour_data.get("cameras", []),
-            "employees": converted_hour_data.get("employees", [])
+            "hour": hour_data.get("hour"),
+            "hour_readable": timestamp_to_readable(hour_data.get("hour"), format_str="%H:00"),
+            "violations": hour_data.get("violations", 0),
+            "cameras": hour_data.get("cameras", []),
+            "employees": hour_data.get("employees", [])
         })
     return formatted
 
@@ -225,19 +269,24 @@ def format_camera_data(camera: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def format_camera_activity_data(activity_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def format_camera_activity_data(
+    activity_data: List[Dict[str, Any]],
+    urls: str = "full"
+) -> List[Dict[str, Any]]:
     """
     Format camera activity data for API response.
     
     Args:
         activity_data: Raw activity data from database
+        urls: Media URL format; "compact" leaves out the URL fields
         
     Returns:
         Formatted activity data
     """
     formatted = []
     for activity in activity_data:
-        formatted.append({
+        row = {
+            "id": activity.get("id"),
             "timestamp": activity.get("timestamp"),
             "timestamp_iso": timestamp_to_iso(activity.get("timestamp")),
             "timestamp_readable": timestamp_to_readable(activity.get("timestamp")),
@@ -246,11 +295,13 @@ def format_camera_activity_data(activity_data: List[Dict[str, Any]]) -> List[Dic
             "event_type": activity.get("event_type"),
             "employee_name": activity.get("employee_name", "Unknown"),
             "confidence": activity.get("confidence", 0.0),
-            "zones": activity.get("zones"),
-            "thumbnail_url": activity.get("thumbnail_url"),
-            "video_url": activity.get("video_url"),
-            "snapshot_url": activity.get("snapshot_url")
-        })
+            "zones": activity.get("zones")
+        }
+        if urls != "compact":
+            row["thumbnail_url"] = activity.get("thumbnail_url")
+            row["video_url"] = activity.get("video_url")
+            row["snapshot_url"] = activity.get("snapshot_url") or media_url("snapshot", activity.get("id"), activity.get("camera"))
+        formatted.append(row)
     return formatted
 
 
@@ -0,0 +1,118 @@
+"""
+JSON serialization utilities for the Frigate Dashboard Middleware.
+
+This module provides the single JSON encoder used for HTTP responses,
+WebSocket/SSE messages and cached values. Decimal, datetime, UUID and
+asyncpg Record values are encoded natively in one pass, so query results
+can be returned as-is without first walking every row to convert them.
+
+orjson is used when installed; the standard library encoder is the
+fallback and produces equivalent output.
+"""
+
+import json
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Tuple, Type
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def json_default(obj: Any) -> Any:
+    """
+    Convert values the JSON encoder does not handle natively.
+
+    Args:
+        obj: Value that could not be encoded
+
+    Returns:
+        JSON-compatible replacement
+
+    Raises:
+        TypeError: If the value has no JSON representation
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Mapping):
+        # asyncpg Records are mappings but not dicts
+        return dict(obj.items())
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize an object to JSON bytes."""
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(obj: Any) -> bytes:
+        """Serialize an object to JSON bytes."""
+        return json.dumps(
+            obj, default=json_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    loads = json.loads
+
+
+def dumps_text(obj: Any) -> str:
+    """Serialize an object to a JSON string (for text frames and SSE)."""
+    return dumps(obj).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the shared one-pass encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def _model_fields(model: Type[Any]) -> Tuple[Tuple[str, Any, Any], ...]:
+    """(name, default, default_factory) for each field of a Pydantic model."""
+    return tuple(
+        (name, None if field.is_required() else field.default, field.default_factory)
+        for name, field in model.model_fields.items()
+    )
+
+
+def model_row(model: Type[Any], **values: Any) -> Dict[str, Any]:
+    """
+    Build the dict ``model(**values).dict()`` would give, without validation.
+
+    Per-row response models are built from values the handler has already
+    computed from trusted database rows, then immediately dumped to a dict.
+    Running full validation and a copy for each of thousands of rows is
+    pure overhead there; this lays the values out in the model's field
+    order and fills defaults instead, so the model still defines the shape.
+    Use the model constructor for anything derived from client input.
+
+    Args:
+        model: Pydantic model class describing the row
+        **values: Field values
+
+    Returns:
+        Row dict with every model field, in declaration order
+    """
+    return {
+        name: values[name] if name in values else (factory() if factory else default)
+        for name, default, factory in _model_fields(model)
+    }
@@ -0,0 +1,187 @@
+"""
+Slow-query log for the Frigate Dashboard Middleware.
+
+DatabaseManager times every query. Those over the configured threshold
+are kept in a bounded ring buffer with their normalised SQL, a summary of
+the parameters and the duration, so the admin endpoint can show which of
+the inline queries is slow without turning on server-side statement logs.
+
+For a sampled subset of read-only slow queries, the plan is captured with
+EXPLAIN (ANALYZE, BUFFERS) on an idle pool connection, inside a read-only
+transaction with a statement timeout. ANALYZE runs the query again, so the
+sample rate is 0 (off) by default and at most one capture runs at a time.
+
+The log is per worker process.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+# Numeric literals, but not placeholders ($1) or digits inside identifiers (employees_01)
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_READ_ONLY = re.compile(r"^(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE|ALTER|DROP|CREATE)\b", re.IGNORECASE)
+
+# Parameter summaries are cut down to keep entries small
+_MAX_PARAM_LENGTH = 200
+_MAX_PARAM_ITEMS = 10
+
+
+def normalize_sql(query: str) -> str:
+    """Strip comments and literals and collapse whitespace."""
+    query = _BLOCK_COMMENT.sub(" ", _LINE_COMMENT.sub(" ", query))
+    query = _NUMBER_LITERAL.sub("?", _STRING_LITERAL.sub("?", query))
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def summarize_param(value: Any) -> Any:
+    """JSON-friendly, size-bounded form of a query parameter."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        items = [summarize_param(item) for item in value[:_MAX_PARAM_ITEMS]]
+        if len(value) > _MAX_PARAM_ITEMS:
+            items.append(f"... ({len(value)} items)")
+        return items
+    text = str(value)
+    if len(text) > _MAX_PARAM_LENGTH:
+        return text[:_MAX_PARAM_LENGTH] + "..."
+    return text
+
+
+def is_read_only(query: str) -> bool:
+    """Whether a query can safely be re-run under EXPLAIN ANALYZE."""
+    normalized = normalize_sql(query)
+    return bool(_READ_ONLY.match(normalized)) and not _WRITES.search(normalized)
+
+
+class SlowQueryLog:
+    """Ring buffer of queries that exceeded the slow-query threshold."""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        size: int,
+        explain_sample_rate: float = 0.0,
+        explain_timeout_ms: int = 10000
+    ):
+        """
+        Args:
+            threshold_ms: Queries taking at least this long are recorded
+            size: Number of entries kept
+            explain_sample_rate: Fraction of read-only slow queries to EXPLAIN
+            explain_timeout_ms: Statement timeout of the EXPLAIN run
+        """
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self.recorded = 0
+        self.explained = 0
+        self._explaining: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        name: str,
+        operation: str,
+        query: str,
+        args: Sequence[Any],
+        seconds: float,
+        rows: Optional[int] = None,
+        failed: bool = False,
+        pool: Any = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record a query if it was slow.
+
+        Args:
+            name: Function that issued the query
+            operation: DatabaseManager method (fetch_all, execute, ...)
+            query: SQL as executed
+            args: Query parameters
+            seconds: Query duration
+            rows: Rows returned, if known
+            failed: Whether the query raised
+            pool: Pool to take an idle connection from for EXPLAIN
+
+        Returns:
+            The recorded entry, or None if the query was not slow
+        """
+        if seconds < self.threshold:
+            return None
+
+        entry = {
+            "query_name": name,
+            "operation": operation,
+            "sql": normalize_sql(query),
+            "params": [summarize_param(arg) for arg in args],
+            "duration_ms": round(seconds * 1000, 1),
+            "rows": rows,
+            "failed": failed,
+            "timestamp": time.time(),
+            "plan": None
+        }
+        self.entries.append(entry)
+        self.recorded += 1
+        logger.warning(f"Slow query {name} ({operation}) took {entry['duration_ms']:.0f} ms")
+
+        if self._should_explain(query, failed, pool):
+            self._explaining = asyncio.create_task(self._explain(entry, query, args, pool))
+        return entry
+
+    def _should_explain(self, query: str, failed: bool, pool: Any) -> bool:
+        """Sample read-only queries while a spare connection is idle."""
+        if failed or pool is None or self.explain_sample_rate <= 0:
+            return False
+        if self._explaining is not None and not self._explaining.done():
+            return False
+        if random.random() >= self.explain_sample_rate:
+            return False
+        return pool.get_idle_size() > 0 and is_read_only(query)
+
+    async def _explain(self, entry: Dict[str, Any], query: str, args: Sequence[Any], pool: Any) -> None:
+        """Capture the plan of a recorded query."""
+        try:
+            async with pool.acquire(timeout=1) as conn:
+                async with conn.transaction(readonly=True):
+                    await conn.execute(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+                    plan = await conn.fetchval(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", *args)
+            entry["plan"] = plan[0] if isinstance(plan, list) else plan
+            self.explained += 1
+        except Exception as e:
+            logger.debug(f"Failed to capture plan for {entry['query_name']}: {e}")
+            entry["plan"] = {"error": str(e)}
+
+    def get_entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recorded entries, slowest first."""
+        entries = sorted(self.entries, key=lambda entry: entry["duration_ms"], reverse=True)
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        """Drop all recorded entries."""
+        self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get slow-query log statistics."""
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "buffered": len(self.entries),
+            "capacity": self.entries.maxlen,
+            "recorded": self.recorded,
+            "explained": self.explained,
+            "explain_sample_rate": self.explain_sample_rate
+        }
@@ -0,0 +1,126 @@
+"""
+Per-request timing breakdown for the Frigate Dashboard Middleware.
+
+The request timing middleware opens a RequestTrace in a context variable;
+DatabaseManager queries, Redis commands and outbound Frigate calls made
+while handling the request record spans into it. The trace is rendered as
+a ``Server-Timing`` header (db, cache, frigate and the remaining render
+time), which browser devtools show per request, and as a JSON breakdown
+for ``?debug=timing``.
+
+Outside a request (background tasks, startup) there is no trace and
+recording is a no-op. Tasks spawned during a request inherit the trace,
+so concurrent queries are recorded too; each category's time is the
+union of its spans, so overlapping queries are not double counted.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Categories reported in Server-Timing, in order; "render" is the rest of the request
+CATEGORIES = ("db", "cache", "frigate")
+
+# Spans kept per request for the JSON breakdown
+_MAX_SPANS = 500
+
+
+class RequestTrace:
+    """Spans recorded while handling one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, str, float, float]] = []
+        self.dropped = 0
+
+    def record(self, category: str, name: str, started: float, ended: float) -> None:
+        """Record a span given its perf_counter start and end."""
+        if len(self.spans) >= _MAX_SPANS:
+            self.dropped += 1
+            return
+        self.spans.append((category, name, started, ended))
+
+    def category_times(self) -> Dict[str, float]:
+        """Wall time (seconds) covered by the spans of each category."""
+        intervals: Dict[str, List[Tuple[float, float]]] = {category: [] for category in CATEGORIES}
+        for category, _, started, ended in self.spans:
+            intervals.setdefault(category, []).append((started, ended))
+
+        times = {}
+        for category, spans in intervals.items():
+            total, covered_until = 0.0, float("-inf")
+            for started, ended in sorted(spans):
+                if ended > covered_until:
+                    total += ended - max(started, covered_until)
+                    covered_until = ended
+            times[category] = total
+        return times
+
+    def server_timing(self, total: float) -> str:
+        """Render a Server-Timing header value."""
+        times = self.category_times()
+        counts = {category: 0 for category in times}
+        for category, *_ in self.spans:
+            counts[category] += 1
+
+        entries = [
+            f'{category};dur={seconds * 1000:.1f};desc="{counts[category]} calls"'
+            for category, seconds in times.items()
+        ]
+        render = max(total - sum(times.values()), 0.0)
+        entries.append(f"render;dur={render * 1000:.1f}")
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+    def breakdown(self, total: float) -> Dict[str, Any]:
+        """JSON-friendly breakdown of the request (times in milliseconds)."""
+        times = self.category_times()
+        return {
+            "total_ms": round(total * 1000, 2),
+            "categories": {
+                **{category: round(seconds * 1000, 2) for category, seconds in times.items()},
+                "render": round(max(total - sum(times.values()), 0.0) * 1000, 2)
+            },
+            "spans": [
+                {
+                    "category": category,
+                    "name": name,
+                    "start_ms": round((started - self.started) * 1000, 2),
+                    "duration_ms": round((ended - started) * 1000, 2)
+                }
+                for category, name, started, ended in self.spans
+            ],
+            "dropped_spans": self.dropped
+        }
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def start_trace() -> Tuple[RequestTrace, Token]:
+    """Open a trace for the current request."""
+    trace = RequestTrace()
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token: Token) -> None:
+    """Close the trace opened with ``start_trace``."""
+    _current_trace.reset(token)
+
+
+def record_span(category: str, name: str, started: float, ended: Optional[float] = None) -> None:
+    """Record a span in the current request's trace, if any."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.record(category, name, started, ended if ended is not None else time.perf_counter())
+
+
+@contextmanager
+def span(category: str, name: str) -> Iterator[None]:
+    """Time a block as a span of the current request's trace."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(category, name, started)
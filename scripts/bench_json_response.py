@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+JSON response micro-benchmark for the Frigate Dashboard Middleware.
+
+Compares the previous response path (walk every row converting Decimal
+values, then render with the standard library JSONResponse) against
+FastJSONResponse, which encodes database types natively in one pass.
+
+Payloads are synthetic but shaped like our largest responses:
+    live_violations  /api/violations/live at the maximum limit
+    hourly_trend     /api/violations/hourly-trend over a week
+    violation_stats  /api/violations/stats with many employees
+
+    python scripts/bench_json_response.py
+    python scripts/bench_json_response.py --rows 5000 --iterations 50 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.utils.response_formatter import format_success_response  # noqa: E402
+from app.utils.serialization import FastJSONResponse  # noqa: E402
+
+
+def convert_decimals(obj: Any) -> Any:
+    """The recursive pre-walk the response paths used to run."""
+    if isinstance(obj, dict):
+        return {k: convert_decimals(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_decimals(item) for item in obj]
+    elif hasattr(obj, 'as_tuple'):
+        return float(obj)
+    return obj
+
+
+def make_live_violations(rows: int) -> List[Dict[str, Any]]:
+    """Rows shaped like ViolationQueries.get_live_violations output."""
+    now = time.time()
+    violations = []
+    for i in range(rows):
+        source_id = f"{now - i * 7:.6f}-{random.randrange(16 ** 6):06x}"
+        violations.append({
+            "id": source_id,
+            "timestamp": Decimal(f"{now - i * 7:.6f}"),
+            "camera": f"employees_{i % 12 + 1:02d}",
+            "zones": [f"desk_{i % 60 + 1:02d}", "office"],
+            "confidence": Decimal(f"0.{random.randrange(500, 999)}"),
+            "employee_name": f"Employee {i % 60 + 1}",
+            "video_url": f"http://10.0.20.6:5001/clip/{source_id}",
+            "thumbnail_url": f"http://10.0.20.6:5001/thumb/{source_id}",
+            "snapshot_url": f"http://10.0.20.6:5001/snapshot/employees_01/{source_id}",
+        })
+    return violations
+
+
+def make_hourly_trend(hours: int) -> List[Dict[str, Any]]:
+    """Rows shaped like ViolationQueries.get_hourly_trend output."""
+    start = int(time.time()) // 3600 * 3600
+    return [
+        {
+            "hour": Decimal(start - h * 3600),
+            "violations": random.randrange(40),
+            "cameras": [f"employees_{c:02d}" for c in range(1, random.randrange(2, 12))],
+            "employees": [f"Employee {e}" for e in range(random.randrange(1, 30))],
+        }
+        for h in range(hours)
+    ]
+
+
+def make_violation_stats(employees: int) -> Dict[str, Any]:
+    """Payload shaped like /api/violations/stats."""
+    return {
+        "total_violations": employees * 17,
+        "time_period_hours": 24,
+        "violations_by_camera": [
+            {"camera": f"employees_{c:02d}", "violations": random.randrange(200),
+             "avg_confidence": Decimal(f"0.{random.randrange(500, 999)}")}
+            for c in range(1, 13)
+        ],
+        "violations_by_employee": [
+            {"employee_name": f"Employee {e}", "violations": random.randrange(50),
+             "avg_confidence": Decimal(f"0.{random.randrange(500, 999)}")}
+            for e in range(employees)
+        ],
+        "peak_hours": [
+            {"hour": Decimal(h), "violations": random.randrange(300)} for h in range(5)
+        ],
+    }
+
+
+def render_baseline(data: Any) -> bytes:
+    return JSONResponse(format_success_response(convert_decimals(data), "Success")).body
+
+
+def render_fast(data: Any) -> bytes:
+    return FastJSONResponse(format_success_response(data, "Success")).body
+
+
+def bench(render: Callable[[Any], bytes], data: Any, iterations: int) -> Dict[str, float]:
+    """Time a renderer and report throughput."""
+    size = len(render(data))
+    started = time.perf_counter()
+    for _ in range(iterations):
+        render(data)
+    elapsed = time.perf_counter() - started
+    return {
+        "bytes": size,
+        "ms_per_response": elapsed / iterations * 1000,
+        "mb_per_sec": size * iterations / elapsed / 1_000_000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Live violation rows (default: API max limit)")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    random.seed(0)
+    payloads = {
+        "live_violations": make_live_violations(args.rows),
+        "hourly_trend": make_hourly_trend(24 * 7),
+        "violation_stats": make_violation_stats(args.rows // 4),
+    }
+
+    results = {}
+    for name, data in payloads.items():
+        baseline = bench(render_baseline, data, args.iterations)
+        fast = bench(render_fast, data, args.iterations)
+        results[name] = {
+            "baseline": baseline,
+            "fast": fast,
+            "speedup": baseline["ms_per_response"] / fast["ms_per_response"],
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'payload':<18}{'bytes':>10}{'baseline MB/s':>16}{'fast MB/s':>12}{'speedup':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<18}{result['fast']['bytes']:>10}"
+            f"{result['baseline']['mb_per_sec']:>16.1f}"
+            f"{result['fast']['mb_per_sec']:>12.1f}"
+            f"{result['speedup']:>9.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
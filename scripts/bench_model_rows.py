@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Per-row response model micro-benchmark for the Frigate Dashboard Middleware.
+
+Compares the ways a handler can turn already-computed row values into the
+dicts it returns:
+    validated   Model(**values).dict()                 (previous path)
+    construct   Model.model_construct(**values).dict() (skips validation only)
+    model_row   app.utils.serialization.model_row      (no model instance)
+
+Rows are shaped like the timeline, timeline-segment and idle-period rows
+built by the employee endpoints over a multi-day range.
+
+    python scripts/bench_model_rows.py
+    python scripts/bench_model_rows.py --rows 20000 --iterations 10 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Type
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.routers.employees import ActivityEvent, IdlePeriod, TimelineSegment  # noqa: E402
+from app.utils.serialization import model_row  # noqa: E402
+
+
+def make_activity_events(rows: int) -> List[Dict[str, Any]]:
+    """Values shaped like get_employee_timeline events."""
+    return [
+        {
+            "time": f"2024-01-15T{9 + i // 3600 % 10:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+            "event_type": random.choice(["detection", "zone_change"]),
+            "zone": f"desk_{i % 60 + 1:02d}",
+            "camera": f"employees_{i % 12 + 1:02d}",
+            "additional_data": {"from_zone": "desk_01", "to_zone": "desk_02"} if i % 5 == 0 else None,
+        }
+        for i in range(rows)
+    ]
+
+
+def make_timeline_segments(rows: int) -> List[Dict[str, Any]]:
+    """Values shaped like get_employee_timeline_segments segments."""
+    return [
+        {
+            "type": random.choice(["work", "break", "phone", "idle"]),
+            "start_time": "09:00:00",
+            "end_time": "09:01:00",
+            "duration_seconds": random.randrange(600),
+            "start_percentage": round(random.random() * 100, 2),
+            "width_percentage": round(random.random(), 2),
+            "color": "#10b981",
+        }
+        for _ in range(rows)
+    ]
+
+
+def make_idle_periods(rows: int) -> List[Dict[str, Any]]:
+    """Values shaped like get_employee_idle_time periods."""
+    return [
+        {
+            "start_time": "10:00:00",
+            "end_time": "10:03:00",
+            "duration_seconds": 180,
+            "duration_formatted": "3m",
+            "last_zone": f"desk_{i % 60 + 1:02d}",
+        }
+        for i in range(rows)
+    ]
+
+
+BUILDERS: Dict[str, Callable[[Type[Any], Dict[str, Any]], Dict[str, Any]]] = {
+    "validated": lambda model, values: model(**values).dict(),
+    "construct": lambda model, values: model.model_construct(**values).dict(),
+    "model_row": lambda model, values: model_row(model, **values),
+}
+
+
+def bench(build: Callable, model: Type[Any], rows: List[Dict[str, Any]], iterations: int) -> float:
+    """Milliseconds to build every row once."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for values in rows:
+            build(model, values)
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per model (about a week of timeline)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    random.seed(0)
+    payloads = {
+        "ActivityEvent": (ActivityEvent, make_activity_events(args.rows)),
+        "TimelineSegment": (TimelineSegment, make_timeline_segments(args.rows)),
+        "IdlePeriod": (IdlePeriod, make_idle_periods(args.rows)),
+    }
+
+    results = {}
+    for name, (model, rows) in payloads.items():
+        # Every path must produce the same rows
+        assert all(
+            BUILDERS["model_row"](model, values) == BUILDERS["validated"](model, values)
+            for values in rows[:100]
+        )
+        timings = {path: bench(build, model, rows, args.iterations) for path, build in BUILDERS.items()}
+        timings["speedup"] = timings["validated"] / timings["model_row"]
+        results[name] = timings
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'model':<18}{'validated ms':>14}{'construct ms':>14}{'model_row ms':>14}{'speedup':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<18}{result['validated']:>14.1f}{result['construct']:>14.1f}"
+            f"{result['model_row']:>14.1f}{result['speedup']:>9.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
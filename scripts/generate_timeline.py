@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Synthetic Frigate data generator for the Frigate Dashboard Middleware.
+
+Fills a Postgres database (or one schema of it) with realistic
+``timeline``, ``reviewsegment`` and ``recordings`` rows, so queries and
+routers can be profiled and benchmarked without the production NVR:
+
+    timeline        person detections every few seconds while an employee
+                    is at their desk (zones [desk_N, employee_area], some
+                    carrying a recognised face sub_label), separate face
+                    rows, passers-by on the other cameras, and cell phone
+                    detections at a configurable rate
+    reviewsegment   one alert per phone detection, listing its source id
+    recordings      contiguous fixed-length segments per camera
+
+Employees sit at desk_1..desk_N with the names of the desk roster the
+attribution SQL uses, so generated phone detections resolve to the same
+employees as in production. Presence follows working hours with a few
+breaks a day. The dataset ends at the current time, which is placed at
+``clock_hour`` (mid-afternoon) of the last working day, so the last-hour,
+today and last-24h windows the queries use all see activity whenever the
+data is generated; ``--shift`` moves an existing dataset forward to now.
+
+    python scripts/generate_timeline.py --dsn postgresql://localhost/frigate_bench --scale small
+    python scripts/generate_timeline.py --dsn ... --schema bench_medium --scale medium --replace
+    python scripts/generate_timeline.py --dsn ... --days 3 --employees 20 --phone-rate 4
+    python scripts/generate_timeline.py --dsn ... --schema bench_medium --shift
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import hashlib
+import inspect
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import asyncpg
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app.config import settings  # noqa: E402
+from app.services.queries import ViolationQueries  # noqa: E402
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS timeline (
+    timestamp DOUBLE PRECISION NOT NULL,
+    camera VARCHAR(20) NOT NULL,
+    source VARCHAR(20) NOT NULL,
+    source_id VARCHAR(30),
+    class_type VARCHAR(50) NOT NULL,
+    data JSONB
+);
+CREATE INDEX IF NOT EXISTS timeline_timestamp ON timeline (timestamp);
+CREATE INDEX IF NOT EXISTS timeline_camera_timestamp ON timeline (camera, timestamp);
+CREATE INDEX IF NOT EXISTS timeline_source_id ON timeline (source_id);
+
+CREATE TABLE IF NOT EXISTS reviewsegment (
+    id VARCHAR(30) PRIMARY KEY,
+    camera VARCHAR(20) NOT NULL,
+    start_time DOUBLE PRECISION NOT NULL,
+    end_time DOUBLE PRECISION,
+    has_been_reviewed BOOLEAN NOT NULL DEFAULT FALSE,
+    severity VARCHAR(30) NOT NULL,
+    thumb_path TEXT,
+    data JSONB
+);
+CREATE INDEX IF NOT EXISTS reviewsegment_camera_start_time ON reviewsegment (camera, start_time);
+
+CREATE TABLE IF NOT EXISTS recordings (
+    id VARCHAR(30) PRIMARY KEY,
+    camera VARCHAR(20) NOT NULL,
+    path TEXT NOT NULL,
+    start_time DOUBLE PRECISION NOT NULL,
+    end_time DOUBLE PRECISION NOT NULL,
+    duration DOUBLE PRECISION NOT NULL,
+    motion INTEGER,
+    objects INTEGER,
+    dbfs INTEGER,
+    segment_size DOUBLE PRECISION,
+    regions INTEGER
+);
+CREATE INDEX IF NOT EXISTS recordings_camera_start_time ON recordings (camera, start_time);
+CREATE INDEX IF NOT EXISTS recordings_end_time ON recordings (end_time);
+
+CREATE TABLE IF NOT EXISTS synthetic_meta (
+    fingerprint TEXT NOT NULL,
+    params JSONB NOT NULL,
+    end_time DOUBLE PRECISION NOT NULL
+);
+"""
+
+TIMELINE_COLUMNS = ["timestamp", "camera", "source", "source_id", "class_type", "data"]
+REVIEW_COLUMNS = ["id", "camera", "start_time", "end_time", "has_been_reviewed", "severity", "thumb_path", "data"]
+RECORDING_COLUMNS = ["id", "camera", "path", "start_time", "end_time", "duration", "motion", "objects",
+                     "dbfs", "segment_size", "regions"]
+
+# Named data scales used by the benchmark suite
+SCALES = {
+    "small": {"days": 1, "cameras": 4, "employees": 12},
+    "medium": {"days": 7, "cameras": 13, "employees": 40},
+    "large": {"days": 30, "cameras": 13, "employees": 66},
+}
+
+
+@dataclasses.dataclass
+class SyntheticConfig:
+    """Shape of a generated dataset."""
+
+    days: int = 1
+    cameras: int = 4
+    employees: int = 12
+    desks_per_camera: int = 8
+    phone_rate: float = 2.0          # phone detections per employee per working hour
+    person_interval: float = 30.0    # seconds between person detections of a present employee
+    face_rate: float = 0.3           # fraction of person detections with a recognised face
+    passerby_rate: float = 20.0      # person detections per hour on cameras without desks
+    work_start: int = 9
+    work_end: int = 18
+    clock_hour: float = 16.0         # hour of the synthetic day the current time falls on
+    breaks_per_day: int = 3
+    segment_seconds: int = 10
+    seed: int = 0
+
+    def fingerprint(self) -> str:
+        """Stable hash of the parameters (a dataset is reused only if it matches)."""
+        return hashlib.sha1(json.dumps(dataclasses.asdict(self), sort_keys=True).encode()).hexdigest()[:16]
+
+
+def desk_roster() -> List[Tuple[str, str]]:
+    """(desk zone, employee name) pairs of the attribution SQL, in desk order."""
+    source = inspect.getsource(ViolationQueries.get_live_violations)
+    roster = re.findall(r"\('(desk_\d+)', '([^']+)'\)", source)
+    return sorted(roster, key=lambda pair: int(pair[0].split("_")[1]))
+
+
+def build_layout(config: SyntheticConfig) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Pick the cameras and seat the employees at desks on the employee cameras."""
+    cameras = settings.CAMERAS[:config.cameras]
+    desk_cameras = [camera for camera in cameras if camera.startswith("employees_")] or cameras[:1]
+    roster = desk_roster()
+
+    employees = []
+    for index in range(config.employees):
+        desk, name = roster[index] if index < len(roster) else (f"desk_{100 + index}", f"Synthetic Employee {index + 1}")
+        camera = desk_cameras[min(index // config.desks_per_camera, len(desk_cameras) - 1)]
+        employees.append({"name": name, "desk": desk, "camera": camera})
+    return cameras, employees
+
+
+def _source_id(rng: random.Random, timestamp: float) -> str:
+    """Frigate-style event id: <epoch>.<micros>-<random>."""
+    return f"{timestamp:.6f}-{''.join(rng.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=6))}"
+
+
+def _box(rng: random.Random) -> List[float]:
+    x, y = rng.uniform(0, 0.8), rng.uniform(0, 0.6)
+    return [round(x, 4), round(y, 4), round(rng.uniform(0.05, 0.2), 4), round(rng.uniform(0.2, 0.4), 4)]
+
+
+def _presence(rng: random.Random, day_start: datetime, config: SyntheticConfig) -> List[Tuple[float, float]]:
+    """Intervals an employee is at their desk on one day, split by breaks."""
+    arrive = day_start + timedelta(hours=config.work_start, minutes=rng.uniform(-20, 30))
+    leave = day_start + timedelta(hours=config.work_end, minutes=rng.uniform(-30, 45))
+    start, end = arrive.timestamp(), leave.timestamp()
+
+    breaks = sorted(rng.uniform(start + 1800, end - 3600) for _ in range(config.breaks_per_day))
+    intervals = []
+    for break_start in breaks:
+        if break_start > start:
+            intervals.append((start, break_start))
+            start = break_start + rng.uniform(600, 2400)
+    intervals.append((start, end))
+    return [(begin, finish) for begin, finish in intervals if finish > begin]
+
+
+def generate_day(
+    rng: random.Random,
+    config: SyntheticConfig,
+    cameras: List[str],
+    employees: List[Dict[str, str]],
+    day_start: datetime,
+    end_time: float
+) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+    """Timeline, reviewsegment and recordings rows of one day (up to end_time)."""
+    timeline, reviews, recordings = [], [], []
+    desk_cameras = {employee["camera"] for employee in employees}
+
+    for employee in employees:
+        for begin, finish in _presence(rng, day_start, config):
+            finish = min(finish, end_time)
+            timestamp = begin
+            while timestamp < finish:
+                face = rng.random() < config.face_rate
+                score = round(rng.uniform(0.7, 0.98), 3)
+                timeline.append((
+                    timestamp, employee["camera"], "tracked_object", _source_id(rng, timestamp),
+                    "entered_zone" if timestamp == begin else "visible",
+                    {
+                        "label": "person",
+                        "sub_label": [employee["name"], round(rng.uniform(0.8, 0.99), 3)] if face else None,
+                        "zones": [employee["desk"], "employee_area"],
+                        "box": _box(rng),
+                        "region": [0, 0, 320, 320],
+                        "score": score
+                    }
+                ))
+                if face:
+                    timeline.append((
+                        timestamp + 0.2, employee["camera"], "face", _source_id(rng, timestamp),
+                        "visible", {"sub_label": employee["name"], "score": score}
+                    ))
+                timestamp += rng.expovariate(1 / config.person_interval)
+
+            # Phone use as a Poisson process over the presence interval
+            timestamp = begin + rng.expovariate(config.phone_rate / 3600) if config.phone_rate > 0 else finish
+            while timestamp < finish:
+                source_id = _source_id(rng, timestamp)
+                timeline.append((
+                    timestamp, employee["camera"], "tracked_object", source_id, "visible",
+                    {
+                        "label": "cell phone",
+                        "sub_label": None,
+                        "zones": [employee["desk"]],
+                        "box": _box(rng),
+                        "region": [0, 0, 320, 320],
+                        "score": round(rng.uniform(0.6, 0.95), 3)
+                    }
+                ))
+                review_start = timestamp - rng.uniform(1, 5)
+                reviews.append((
+                    source_id, employee["camera"], review_start, review_start + rng.uniform(10, 180), False, "alert",
+                    f"/media/frigate/clips/review/thumb-{employee['camera']}-{source_id}.webp",
+                    {
+                        "detections": [source_id],
+                        "objects": ["person", "cell phone"],
+                        "sub_labels": [],
+                        "zones": [employee["desk"]]
+                    }
+                ))
+                timestamp += rng.expovariate(config.phone_rate / 3600)
+
+    day_end = min((day_start + timedelta(days=1)).timestamp(), end_time)
+    for camera in cameras:
+        if camera not in desk_cameras and config.passerby_rate > 0:
+            timestamp = day_start.timestamp() + rng.expovariate(config.passerby_rate / 3600)
+            while timestamp < day_end:
+                timeline.append((
+                    timestamp, camera, "tracked_object", _source_id(rng, timestamp), "visible",
+                    {"label": "person", "sub_label": None, "zones": [], "box": _box(rng),
+                     "region": [0, 0, 320, 320], "score": round(rng.uniform(0.6, 0.95), 3)}
+                ))
+                timestamp += rng.expovariate(config.passerby_rate / 3600)
+
+        start = day_start.timestamp()
+        while start + config.segment_seconds <= day_end:
+            moment = datetime.fromtimestamp(start, day_start.tzinfo)
+            recordings.append((
+                _source_id(rng, start), camera,
+                f"/media/frigate/recordings/{moment:%Y-%m-%d/%H}/{camera}/{moment:%M.%S}.mp4",
+                start, start + config.segment_seconds, float(config.segment_seconds),
+                rng.randint(0, 50), rng.randint(0, 5), rng.randint(-60, -20),
+                round(rng.uniform(0.5, 3.0), 3), rng.randint(0, 10)
+            ))
+            start += config.segment_seconds
+
+    return timeline, reviews, recordings
+
+
+def generate(config: SyntheticConfig, end_time: float) -> Iterator[Tuple[List[tuple], List[tuple], List[tuple]]]:
+    """Rows of the whole dataset, one day at a time."""
+    rng = random.Random(config.seed)
+    cameras, employees = build_layout(config)
+    last_day = datetime.fromtimestamp(end_time - config.clock_hour * 3600, ZoneInfo(settings.timezone))
+    for offset in range(config.days - 1, -1, -1):
+        yield generate_day(rng, config, cameras, employees, last_day - timedelta(days=offset), end_time)
+
+
+def _encode_data(rows: List[tuple]) -> List[tuple]:
+    """Serialise the trailing data column for COPY into jsonb."""
+    return [(*row[:-1], json.dumps(row[-1])) for row in rows]
+
+
+async def load(conn: asyncpg.Connection, config: SyntheticConfig, schema: str, replace: bool = False) -> Dict[str, int]:
+    """
+    Create the tables in ``schema`` and fill them.
+
+    Args:
+        conn: Connection to the target database
+        config: Dataset shape
+        schema: Schema to create the tables in
+        replace: Drop the schema's existing tables first
+
+    Returns:
+        Rows inserted per table
+    """
+    if replace:
+        await conn.execute(
+            f'DROP TABLE IF EXISTS "{schema}".timeline, "{schema}".reviewsegment, '
+            f'"{schema}".recordings, "{schema}".synthetic_meta'
+        )
+    await conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+    await conn.execute(f'SET search_path TO "{schema}"')
+    await conn.execute(SCHEMA_SQL)
+
+    end_time = time.time()
+    counts = {"timeline": 0, "reviewsegment": 0, "recordings": 0}
+    for timeline, reviews, recordings in generate(config, end_time):
+        for table, rows, columns in (
+            ("timeline", _encode_data(timeline), TIMELINE_COLUMNS),
+            ("reviewsegment", _encode_data(reviews), REVIEW_COLUMNS),
+            ("recordings", recordings, RECORDING_COLUMNS),
+        ):
+            if rows:
+                await conn.copy_records_to_table(table, records=rows, columns=columns, schema_name=schema)
+                counts[table] += len(rows)
+
+    await conn.execute("DELETE FROM synthetic_meta")
+    await conn.execute(
+        "INSERT INTO synthetic_meta (fingerprint, params, end_time) VALUES ($1, $2, $3)",
+        config.fingerprint(), json.dumps(dataclasses.asdict(config)), end_time
+    )
+    await conn.execute("ANALYZE timeline; ANALYZE reviewsegment; ANALYZE recordings")
+    return counts
+
+
+async def shift_to_now(conn: asyncpg.Connection, schema: str) -> float:
+    """
+    Move a generated dataset forward so it ends at the current time.
+
+    Returns:
+        Seconds the dataset was shifted by
+    """
+    await conn.execute(f'SET search_path TO "{schema}"')
+    end_time = await conn.fetchval("SELECT end_time FROM synthetic_meta")
+    shift = time.time() - end_time
+    async with conn.transaction():
+        await conn.execute("UPDATE timeline SET timestamp = timestamp + $1", shift)
+        await conn.execute(
+            "UPDATE reviewsegment SET start_time = start_time + $1, end_time = end_time + $1", shift
+        )
+        await conn.execute(
+            "UPDATE recordings SET start_time = start_time + $1, end_time = end_time + $1", shift
+        )
+        await conn.execute("UPDATE synthetic_meta SET end_time = end_time + $1", shift)
+    return shift
+
+
+async def ensure_dataset(
+    conn: asyncpg.Connection,
+    config: SyntheticConfig,
+    schema: str,
+    max_age: float = 600
+) -> Optional[Dict[str, int]]:
+    """
+    Make ``schema`` hold a current dataset for ``config``.
+
+    A dataset generated with the same parameters is reused (shifted to the
+    current time if older than ``max_age`` seconds); anything else is
+    replaced.
+
+    Returns:
+        Rows inserted per table, or None if the existing dataset was reused
+    """
+    exists = await conn.fetchval("SELECT to_regclass($1)", f'"{schema}".synthetic_meta')
+    if exists:
+        meta = await conn.fetchrow(f'SELECT fingerprint, end_time FROM "{schema}".synthetic_meta')
+        if meta and meta["fingerprint"] == config.fingerprint():
+            if time.time() - meta["end_time"] > max_age:
+                await shift_to_now(conn, schema)
+            return None
+    return await load(conn, config, schema, replace=True)
+
+
+def config_from_args(args: argparse.Namespace) -> SyntheticConfig:
+    """Scale preset overridden by explicit options."""
+    values = dict(SCALES[args.scale]) if args.scale else {}
+    for field in dataclasses.fields(SyntheticConfig):
+        value = getattr(args, field.name, None)
+        if value is not None:
+            values[field.name] = value
+    return SyntheticConfig(**values)
+
+
+async def run(args: argparse.Namespace) -> int:
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        if args.shift:
+            shift = await shift_to_now(conn, args.schema)
+            print(f"Shifted {args.schema} forward by {shift / 3600:.1f} h")
+            return 0
+
+        config = config_from_args(args)
+        started = time.perf_counter()
+        counts = await load(conn, config, args.schema, replace=args.replace)
+        print(f"Generated into {args.schema} in {time.perf_counter() - started:.1f}s: "
+              + ", ".join(f"{table}={count}" for table, count in counts.items()))
+        return 0
+    finally:
+        await conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.environ.get("BENCH_DATABASE_URL"),
+                        help="Target database (default: BENCH_DATABASE_URL)")
+    parser.add_argument("--schema", default="public", help="Schema to create the tables in")
+    parser.add_argument("--scale", choices=sorted(SCALES), help="Preset days/cameras/employees")
+    parser.add_argument("--replace", action="store_true", help="Drop existing tables in the schema first")
+    parser.add_argument("--shift", action="store_true", help="Only move an existing dataset to end now")
+    parser.add_argument("--days", type=int)
+    parser.add_argument("--cameras", type=int)
+    parser.add_argument("--employees", type=int)
+    parser.add_argument("--desks-per-camera", dest="desks_per_camera", type=int)
+    parser.add_argument("--phone-rate", dest="phone_rate", type=float, help="Phone detections per employee-hour")
+    parser.add_argument("--person-interval", dest="person_interval", type=float,
+                        help="Seconds between person detections")
+    parser.add_argument("--face-rate", dest="face_rate", type=float)
+    parser.add_argument("--passerby-rate", dest="passerby_rate", type=float)
+    parser.add_argument("--segment-seconds", dest="segment_seconds", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("--dsn or BENCH_DATABASE_URL is required")
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Query and router benchmark runner for the Frigate Dashboard Middleware.
+
+Runs tests/benchmarks (every query in app/services/queries.py and the
+data endpoints of every router) against synthetic datasets generated by
+scripts/generate_timeline.py, at one or more data scales. Results are
+stored under .benchmarks/ by pytest-benchmark, per machine, so a run can
+be saved as a named baseline and later runs compared against it; the
+comparison fails when the mean time of any benchmark regresses by more
+than the threshold.
+
+    python scripts/run_benchmarks.py --dsn postgresql://localhost/frigate_bench
+    python scripts/run_benchmarks.py --scales small,medium,large --save-baseline main
+    python scripts/run_benchmarks.py --compare main --threshold 15
+    python scripts/run_benchmarks.py --compare main -k "live or hourly"
+"""
+
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORAGE = os.path.join(REPO_ROOT, ".benchmarks")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.environ.get("BENCH_DATABASE_URL"),
+                        help="Database the bench schemas live in (default: BENCH_DATABASE_URL)")
+    parser.add_argument("--scales", default=os.environ.get("BENCH_SCALES", "small,medium"),
+                        help="Comma-separated data scales: small, medium, large")
+    parser.add_argument("--rounds", type=int, default=int(os.environ.get("BENCH_ROUNDS", "5")),
+                        help="Timed rounds per benchmark")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Store this run as a named baseline")
+    parser.add_argument("--compare", metavar="NAME",
+                        help="Compare with a stored run (baseline name or run number)")
+    parser.add_argument("--threshold", type=float, default=15.0,
+                        help="Fail when a mean regresses by more than this percentage (with --compare)")
+    parser.add_argument("-k", dest="keyword", help="Only run benchmarks matching this pytest expression")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("--dsn or BENCH_DATABASE_URL is required")
+
+    os.environ["BENCH_DATABASE_URL"] = args.dsn
+    os.environ["BENCH_SCALES"] = args.scales
+    os.environ["BENCH_ROUNDS"] = str(args.rounds)
+
+    pytest_args = [
+        os.path.join(REPO_ROOT, "tests", "benchmarks"),
+        "-p", "no:cacheprovider",
+        f"--benchmark-storage=file://{STORAGE}",
+        "--benchmark-group-by=group",
+        "--benchmark-columns=min,mean,median,max,stddev,rounds",
+        "--benchmark-sort=name",
+    ]
+    if args.save_baseline:
+        pytest_args.append(f"--benchmark-save={args.save_baseline}")
+    if args.compare:
+        pytest_args += [
+            f"--benchmark-compare={args.compare}",
+            f"--benchmark-compare-fail=mean:{args.threshold:g}%",
+        ]
+    if args.keyword:
+        pytest_args += ["-k", args.keyword]
+
+    import pytest
+
+    os.chdir(REPO_ROOT)
+    return pytest.main(pytest_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+WebSocket load test for the Frigate Dashboard Middleware.
+
+Opens many concurrent /ws/violations and /ws/dashboard clients against a
+running instance, drives a synthetic event feed through it and reports:
+- connect time and time-to-first-message percentiles
+- end-to-end event latency percentiles
+- server memory per connection
+- server CPU time per broadcast
+
+Run the app with a single worker so the server-side numbers are per worker:
+
+    uvicorn app.main:app --port 5002 --workers 1 &
+    python scripts/ws_load_test.py --clients 2000 --server-pid $!
+
+Feeds:
+    broadcast  POST /ws/broadcast with a send timestamp. Measures fan-out only.
+    timeline   INSERT synthetic cell-phone rows into the timeline table of a
+               local Postgres. Measures the full poll -> query -> broadcast
+               pipeline, so latency includes up to WEBSOCKET_POLL_INTERVAL.
+    none       Connection scaling only.
+
+Clients are spread over several processes (--processes) so the load
+generator itself does not become the bottleneck. Raise the open file limit
+first (ulimit -n 65536) when opening thousands of clients.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httpx
+import psutil
+import websockets
+
+BENCH_SOURCE_PREFIX = "bench-"
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(values: List[float], scale: float = 1000.0) -> Dict[str, Any]:
+    """Summarize samples (seconds) as milliseconds percentiles."""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50) * scale, 2),
+        "p90_ms": round(percentile(values, 90) * scale, 2),
+        "p99_ms": round(percentile(values, 99) * scale, 2),
+        "max_ms": round(max(values) * scale, 2),
+    }
+
+
+def event_sent_times(message: Dict[str, Any], feed: str) -> List[float]:
+    """Extract the send timestamps of benchmark events from a message."""
+    data = message.get("data") or {}
+    if feed == "broadcast":
+        sent_at = data.get("bench_sent_at")
+        return [sent_at] if sent_at else []
+    if feed == "timeline" and message.get("type") == "new_violations":
+        return [
+            violation["timestamp"]
+            for violation in data.get("violations", [])
+            if str(violation.get("id", "")).startswith(BENCH_SOURCE_PREFIX)
+        ]
+    return []
+
+
+# ---------------------------------------------------------------------------
+# Client processes
+# ---------------------------------------------------------------------------
+
+async def _run_clients(worker_id: int, config: Dict[str, Any], client_count: int,
+                       status_queue, stop_event) -> None:
+    """Open this worker's share of clients and record what they receive."""
+    semaphore = asyncio.Semaphore(config["connect_concurrency"])
+    connect_times: List[float] = []
+    first_message_times: List[float] = []
+    latencies: List[float] = []
+    stats = {"failures": 0, "received": 0, "closed_early": 0}
+
+    async def open_client(index: int):
+        endpoint = config["endpoint"]
+        if endpoint == "mixed":
+            endpoint = "violations" if index % 2 == 0 else "dashboard"
+        url = f"{config['ws_url']}/ws/{endpoint}{config['query']}"
+
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                websocket = await websockets.connect(
+                    url,
+                    open_timeout=config["timeout"],
+                    ping_interval=None,
+                    max_size=None,
+                )
+                connect_times.append(time.perf_counter() - started)
+                await asyncio.wait_for(websocket.recv(), timeout=config["timeout"])
+                first_message_times.append(time.perf_counter() - started)
+                return websocket
+            except Exception:
+                stats["failures"] += 1
+                return None
+
+    async def read_events(websocket) -> None:
+        try:
+            async for raw in websocket:
+                received_at = time.time()
+                stats["received"] += 1
+                for sent_at in event_sent_times(json.loads(raw), config["feed"]):
+                    latencies.append(received_at - sent_at)
+        except websockets.ConnectionClosed:
+            stats["closed_early"] += 1
+
+    opened = await asyncio.gather(*(open_client(i) for i in range(client_count)))
+    sockets = [websocket for websocket in opened if websocket is not None]
+    readers = [asyncio.create_task(read_events(websocket)) for websocket in sockets]
+
+    status_queue.put(("connected", worker_id, {
+        "connected": len(sockets),
+        "failures": stats["failures"],
+        "connect_times": connect_times,
+        "first_message_times": first_message_times,
+    }))
+
+    while not stop_event.is_set():
+        await asyncio.sleep(0.1)
+
+    for reader in readers:
+        reader.cancel()
+    await asyncio.gather(*(websocket.close() for websocket in sockets), return_exceptions=True)
+
+    status_queue.put(("done", worker_id, {
+        "latencies": latencies,
+        "received": stats["received"],
+        "closed_early": stats["closed_early"],
+    }))
+
+
+def _client_worker(worker_id: int, config: Dict[str, Any], client_count: int,
+                   status_queue, stop_event) -> None:
+    """Process entry point for a client worker."""
+    asyncio.run(_run_clients(worker_id, config, client_count, status_queue, stop_event))
+
+
+def _collect(status_queue, kind: str, expected: int, timeout: float) -> List[Dict[str, Any]]:
+    """Wait for one status message of the given kind from every worker."""
+    results = []
+    deadline = time.monotonic() + timeout
+    while len(results) < expected:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Timed out waiting for {kind} from client workers")
+        message_kind, _, payload = status_queue.get(timeout=remaining)
+        if message_kind == kind:
+            results.append(payload)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Event feeds
+# ---------------------------------------------------------------------------
+
+async def _broadcast_feed(args) -> int:
+    """Inject events through the broadcast endpoint."""
+    sent = 0
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        for index in range(args.events):
+            await client.post("/ws/broadcast", json={
+                "message_type": "bench_event",
+                "data": {"bench_id": index, "bench_sent_at": time.time()},
+                "target": args.target,
+            })
+            sent += 1
+            await asyncio.sleep(1.0 / args.rate)
+    return sent
+
+
+def _database_dsn(args) -> str:
+    """Build the Postgres DSN from --database-url or the app's DB_* variables."""
+    if args.database_url:
+        return args.database_url
+    return "postgresql://{user}:{password}@{host}:{port}/{name}".format(
+        user=os.getenv("DB_USER", "frigate"),
+        password=os.getenv("DB_PASSWORD", ""),
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", "5432"),
+        name=os.getenv("DB_NAME", "frigate_db"),
+    )
+
+
+async def _timeline_feed(args) -> int:
+    """Insert synthetic phone detections into the timeline table."""
+    import asyncpg
+
+    run_id = uuid.uuid4().hex[:8]
+    connection = await asyncpg.connect(_database_dsn(args))
+    sent = 0
+    try:
+        for index in range(args.events):
+            camera = args.cameras[index % len(args.cameras)]
+            data = {
+                "label": "cell phone",
+                "zones": [f"desk_{index % 60 + 1}"],
+                "score": 0.9,
+            }
+            await connection.execute(
+                """
+                INSERT INTO timeline (timestamp, camera, source, source_id, class_type, data)
+                VALUES ($1, $2, 'tracked_object', $3, 'entered_zone', $4::jsonb)
+                """,
+                time.time(),
+                camera,
+                f"{BENCH_SOURCE_PREFIX}{run_id}-{index}",
+                json.dumps(data),
+            )
+            sent += 1
+            await asyncio.sleep(1.0 / args.rate)
+    finally:
+        if not args.keep_rows:
+            await connection.execute(
+                "DELETE FROM timeline WHERE source_id LIKE $1",
+                f"{BENCH_SOURCE_PREFIX}{run_id}-%",
+            )
+        await connection.close()
+    return sent
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def _server_processes(server: psutil.Process) -> List[psutil.Process]:
+    """The server process plus any worker children (uvicorn --workers)."""
+    return [server] + server.children(recursive=True)
+
+
+def _server_cpu_seconds(server: Optional[psutil.Process]) -> Optional[float]:
+    if server is None:
+        return None
+    total = 0.0
+    for process in _server_processes(server):
+        times = process.cpu_times()
+        total += times.user + times.system
+    return total
+
+
+def _server_rss(server: Optional[psutil.Process]) -> Optional[int]:
+    if server is None:
+        return None
+    return sum(process.memory_info().rss for process in _server_processes(server))
+
+
+def _resume_query(args) -> str:
+    """Build the connection query string, resuming from the current seq if asked."""
+    params = []
+    if args.resume:
+        status = httpx.get(f"{args.url}/ws/status", timeout=args.timeout).json()
+        replay = status.get("replay_buffer", {})
+        params.append(f"since_seq={replay.get('last_seq', 0)}")
+        params.append(f"epoch={replay.get('epoch', '')}")
+    return ("?" + "&".join(params)) if params else ""
+
+
+def run(args) -> Dict[str, Any]:
+    """Run the load test and return the report."""
+    server = psutil.Process(args.server_pid) if args.server_pid else None
+    ws_url = args.url.replace("https://", "wss://").replace("http://", "ws://")
+    config = {
+        "ws_url": ws_url,
+        "query": _resume_query(args),
+        "endpoint": args.endpoint,
+        "feed": args.feed,
+        "timeout": args.timeout,
+        "connect_concurrency": max(1, args.connect_concurrency // args.processes),
+    }
+
+    rss_before = _server_rss(server)
+
+    status_queue = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    shares = [args.clients // args.processes] * args.processes
+    for index in range(args.clients % args.processes):
+        shares[index] += 1
+
+    workers = [
+        multiprocessing.Process(
+            target=_client_worker,
+            args=(worker_id, config, share, status_queue, stop_event),
+            daemon=True,
+        )
+        for worker_id, share in enumerate(shares) if share
+    ]
+
+    connect_started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+
+    connected = _collect(status_queue, "connected", len(workers), args.connect_timeout)
+    connect_wall = time.perf_counter() - connect_started
+    total_connected = sum(result["connected"] for result in connected)
+
+    # Let the server settle before sampling memory
+    time.sleep(1.0)
+    rss_connected = _server_rss(server)
+
+    cpu_before = _server_cpu_seconds(server)
+    feed_started = time.perf_counter()
+    if args.feed == "broadcast":
+        events_sent = asyncio.run(_broadcast_feed(args))
+    elif args.feed == "timeline":
+        events_sent = asyncio.run(_timeline_feed(args))
+    else:
+        events_sent = 0
+        time.sleep(args.hold)
+    time.sleep(args.drain)
+    feed_wall = time.perf_counter() - feed_started
+    cpu_after = _server_cpu_seconds(server)
+
+    stop_event.set()
+    done = _collect(status_queue, "done", len(workers), args.connect_timeout)
+    for worker in workers:
+        worker.join(timeout=10)
+
+    connect_times = [t for result in connected for t in result["connect_times"]]
+    first_message_times = [t for result in connected for t in result["first_message_times"]]
+    latencies = [t for result in done for t in result["latencies"]]
+
+    report = {
+        "config": {
+            "url": args.url,
+            "endpoint": args.endpoint,
+            "clients": args.clients,
+            "processes": len(workers),
+            "feed": args.feed,
+            "events": events_sent,
+            "resume": args.resume,
+        },
+        "connections": {
+            "connected": total_connected,
+            "failed": sum(result["failures"] for result in connected),
+            "closed_early": sum(result["closed_early"] for result in done),
+            "wall_seconds": round(connect_wall, 2),
+            "connect": summarize(connect_times),
+            "first_message": summarize(first_message_times),
+        },
+        "events": {
+            "messages_received": sum(result["received"] for result in done),
+            "latency": summarize(latencies),
+            "feed_wall_seconds": round(feed_wall, 2),
+        },
+    }
+
+    if args.feed == "broadcast" and events_sent:
+        report["events"]["delivery_ratio"] = round(len(latencies) / (events_sent * total_connected), 4) \
+            if total_connected else 0.0
+
+    if server is not None:
+        report["server"] = {
+            "rss_before_mb": round(rss_before / 1024 / 1024, 1),
+            "rss_connected_mb": round(rss_connected / 1024 / 1024, 1),
+            "memory_per_connection_kb": round((rss_connected - rss_before) / 1024 / total_connected, 2)
+            if total_connected else None,
+            "cpu_seconds_during_feed": round(cpu_after - cpu_before, 3),
+            "cpu_ms_per_broadcast": round((cpu_after - cpu_before) * 1000 / events_sent, 3)
+            if events_sent else None,
+        }
+
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the report in a readable form."""
+    print("🔌 WEBSOCKET LOAD TEST")
+    print("=" * 60)
+    for section, values in report.items():
+        print(f"\n[{section}]")
+        for key, value in values.items():
+            if isinstance(value, dict):
+                value = ", ".join(f"{k}={v}" for k, v in value.items())
+            print(f"  {key:28} {value}")
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="WebSocket load test for the dashboard middleware")
+    parser.add_argument("--url", default="http://localhost:5002", help="Base URL of the app instance")
+    parser.add_argument("--clients", type=int, default=1000, help="Number of WebSocket clients")
+    parser.add_argument("--endpoint", choices=["violations", "dashboard", "mixed"], default="violations")
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Client processes to spread connections over")
+    parser.add_argument("--connect-concurrency", type=int, default=200,
+                        help="Maximum concurrent handshakes across all processes")
+    parser.add_argument("--resume", action="store_true",
+                        help="Connect with since_seq/epoch so clients skip the initial snapshot")
+    parser.add_argument("--feed", choices=["broadcast", "timeline", "none"], default="broadcast")
+    parser.add_argument("--target", choices=["all", "violations", "dashboard"], default="all",
+                        help="Broadcast target for the broadcast feed")
+    parser.add_argument("--events", type=int, default=50, help="Number of events to feed")
+    parser.add_argument("--rate", type=float, default=5.0, help="Events per second")
+    parser.add_argument("--hold", type=float, default=10.0, help="Seconds to hold connections with --feed none")
+    parser.add_argument("--drain", type=float, default=3.0, help="Seconds to wait for in-flight events")
+    parser.add_argument("--cameras", nargs="+", default=["employees_01", "employees_02", "employees_03"],
+                        help="Cameras for synthetic timeline rows")
+    parser.add_argument("--database-url", help="Postgres DSN for the timeline feed (defaults to DB_* env)")
+    parser.add_argument("--keep-rows", action="store_true", help="Keep synthetic timeline rows afterwards")
+    parser.add_argument("--server-pid", type=int, help="PID of the app worker for memory/CPU sampling")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-connection timeout in seconds")
+    parser.add_argument("--connect-timeout", type=float, default=600.0,
+                        help="Overall timeout for all clients to connect")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    args.processes = max(1, min(args.processes, args.clients))
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0 if report["connections"]["connected"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
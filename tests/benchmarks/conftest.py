@@ -0,0 +1,107 @@
+"""
+Fixtures for the query and router benchmark suite.
+
+The suite runs against a real Postgres filled by
+scripts/generate_timeline.py and is skipped unless BENCH_DATABASE_URL is
+set. Each data scale lives in its own schema (bench_small, ...), is
+generated on first use and reused afterwards (shifted to the current
+time when stale), so repeated runs time the same data.
+
+    BENCH_DATABASE_URL   Postgres DSN the bench schemas are created in
+    BENCH_SCALES         Comma-separated scales to run (default: small,medium)
+    BENCH_ROUNDS         Timed rounds per benchmark (default: 5)
+
+Use scripts/run_benchmarks.py to store baselines and compare against them.
+"""
+
+import asyncio
+import os
+import sys
+from typing import Any, Awaitable, Callable, Dict
+
+import asyncpg
+import pytest
+
+from app.config import settings
+from app.database import DatabaseManager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts"))
+
+from generate_timeline import SCALES, SyntheticConfig, build_layout, ensure_dataset  # noqa: E402
+
+BENCH_DATABASE_URL = os.environ.get("BENCH_DATABASE_URL")
+BENCH_SCALES = [scale.strip() for scale in os.environ.get("BENCH_SCALES", "small,medium").split(",") if scale.strip()]
+BENCH_ROUNDS = int(os.environ.get("BENCH_ROUNDS", "5"))
+
+
+def pytest_collection_modifyitems(config, items):
+    if BENCH_DATABASE_URL:
+        return
+    skip = pytest.mark.skip(reason="BENCH_DATABASE_URL is not set")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("/"):
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def bench_loop():
+    """Event loop the benchmarked coroutines run on (benchmark callables are sync)."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session", params=BENCH_SCALES)
+def dataset(request, bench_loop) -> Dict[str, Any]:
+    """A generated dataset at one scale, with a DatabaseManager reading it."""
+    scale = request.param
+    config = SyntheticConfig(**SCALES[scale])
+    schema = f"bench_{scale}"
+
+    async def setup() -> Dict[str, Any]:
+        conn = await asyncpg.connect(BENCH_DATABASE_URL)
+        try:
+            await ensure_dataset(conn, config, schema)
+            violation_id = await conn.fetchval(
+                f'SELECT id FROM "{schema}".reviewsegment ORDER BY start_time DESC LIMIT 1'
+            )
+        finally:
+            await conn.close()
+
+        db = DatabaseManager()
+        db.pool = await asyncpg.create_pool(
+            BENCH_DATABASE_URL,
+            min_size=2,
+            max_size=10,
+            server_settings={"search_path": schema, "timezone": settings.timezone},
+            init=DatabaseManager._init_connection
+        )
+        cameras, employees = build_layout(config)
+        return {
+            "scale": scale,
+            "db": db,
+            "cameras": cameras,
+            "camera": employees[0]["camera"],
+            "employee": employees[0]["name"],
+            "violation_id": violation_id
+        }
+
+    data = bench_loop.run_until_complete(setup())
+    yield data
+    bench_loop.run_until_complete(data["db"].pool.close())
+
+
+@pytest.fixture
+def run_benchmark(benchmark, bench_loop, dataset) -> Callable[[str, Callable[[], Awaitable[Any]]], Any]:
+    """Time a coroutine function on the bench loop, grouped by scale."""
+
+    def run(group: str, make_call: Callable[[], Awaitable[Any]]) -> Any:
+        benchmark.group = f"{group}[{dataset['scale']}]"
+        benchmark.extra_info["scale"] = dataset["scale"]
+        return benchmark.pedantic(
+            lambda: bench_loop.run_until_complete(make_call()),
+            rounds=BENCH_ROUNDS,
+            warmup_rounds=1
+        )
+
+    return run
@@ -0,0 +1,49 @@
+"""
+Benchmarks of every query in app/services/queries.py at each data scale.
+"""
+
+import time
+
+import pytest
+
+from app.routers.cameras import CAMERA_LIST_AGGREGATES
+from app.services.queries import (
+    CameraQueries,
+    DashboardQueries,
+    EmployeeQueries,
+    MediaQueries,
+    ViolationQueries
+)
+
+QUERIES = {
+    "violations.live": lambda d: ViolationQueries.get_live_violations(db=d["db"], hours=24, limit=100),
+    "violations.live_unattributed": lambda d: ViolationQueries.get_live_violations(
+        db=d["db"], hours=24, limit=100, with_employee=False
+    ),
+    "violations.hourly_trend": lambda d: ViolationQueries.get_hourly_trend(db=d["db"], hours=24),
+    "violations.attributed_phone_detections": lambda d: ViolationQueries.get_attributed_phone_detections(
+        db=d["db"], hours=24
+    ),
+    "employees.person_detection_counts": lambda d: EmployeeQueries.get_person_detection_counts(db=d["db"], hours=24),
+    "employees.stats": lambda d: EmployeeQueries.get_employee_stats(db=d["db"], hours=24),
+    "employees.violations": lambda d: EmployeeQueries.get_employee_violations(
+        db=d["db"], employee_name=d["employee"], start_time=time.time() - 7 * 86400
+    ),
+    "cameras.summary": lambda d: CameraQueries.get_camera_summary(db=d["db"], camera=d["camera"]),
+    "cameras.summaries": lambda d: CameraQueries.get_camera_summaries(db=d["db"], cameras=d["cameras"]),
+    "cameras.list": lambda d: CameraQueries.get_camera_list(db=d["db"], aggregates=CAMERA_LIST_AGGREGATES),
+    "cameras.activity": lambda d: CameraQueries.get_camera_activity(db=d["db"], camera=d["camera"], hours=24),
+    "dashboard.overview": lambda d: DashboardQueries.get_dashboard_overview(db=d["db"]),
+    "dashboard.active_cameras": lambda d: DashboardQueries.get_active_cameras(db=d["db"], hours=1),
+    "dashboard.recent_events": lambda d: DashboardQueries.get_recent_events(db=d["db"], hours=1),
+    "dashboard.timeline_watermark": lambda d: DashboardQueries.get_timeline_watermark(db=d["db"], hours=24),
+    "media.retention": lambda d: MediaQueries.get_media_retention(db=d["db"], since=time.time() - 48 * 3600),
+}
+
+
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_query(name, dataset, run_benchmark):
+    """Time one query against the generated dataset."""
+    result = run_benchmark("queries", lambda: QUERIES[name](dataset))
+
+    assert result is not None
@@ -0,0 +1,76 @@
+"""
+Benchmarks of the data endpoints of every router at each data scale.
+
+Requests go through the full ASGI app (middleware, validation and
+serialisation) with the Redis cache disconnected, so every request
+queries the database. Endpoints that proxy Frigate media or stream
+events are not included.
+"""
+
+import httpx
+import pytest
+
+from app.cache import CacheManager, get_cache
+from app.database import get_database
+from app.dependencies import get_cache_manager, get_database_manager
+from app.main import app
+
+ENDPOINTS = [
+    "/api/violations/live?hours=24&limit=100",
+    "/api/violations/hourly-trend?hours=24",
+    "/api/violations/stats",
+    "/api/violations/{violation_id}/duration",
+    "/api/employees/{employee}/current-status",
+    "/api/employees/{employee}/work-hours",
+    "/api/employees/{employee}/breaks",
+    "/api/employees/{employee}/timeline",
+    "/api/employees/{employee}/movements",
+    "/api/employees/{employee}/idle-time",
+    "/api/employees/{employee}/timeline-segments",
+    "/api/cameras/summary",
+    "/api/cameras/list",
+    "/api/cameras/{camera}/summary",
+    "/api/cameras/{camera}/activity",
+    "/api/cameras/{camera}/violations",
+    "/api/cameras/{camera}/status",
+    "/api/zones/occupancy",
+    "/api/zones/activity-heatmap",
+    "/api/zones/stats",
+    "/api/attendance/employee-status",
+    "/api/attendance/employee/{employee}/daily",
+    "/api/attendance/summary",
+    "/api/dashboard/summary",
+]
+
+
+@pytest.fixture
+def client(dataset, bench_loop):
+    """ASGI client reading the dataset with caching disconnected."""
+    cache = CacheManager()
+    overrides = {
+        get_database_manager: lambda: dataset["db"],
+        get_database: lambda: dataset["db"],
+        get_cache_manager: lambda: cache,
+        get_cache: lambda: cache,
+    }
+    app.dependency_overrides.update(overrides)
+    client = httpx.AsyncClient(
+        app=app,
+        base_url="http://localhost",
+        headers={"Accept-Encoding": "identity"},
+        timeout=120
+    )
+    yield client
+    bench_loop.run_until_complete(client.aclose())
+    for dependency in overrides:
+        app.dependency_overrides.pop(dependency, None)
+
+
+@pytest.mark.parametrize("endpoint", ENDPOINTS)
+def test_endpoint(endpoint, dataset, client, run_benchmark):
+    """Time one endpoint against the generated dataset."""
+    url = endpoint.format(**dataset)
+
+    response = run_benchmark("routers", lambda: client.get(url))
+
+    assert response.status_code == 200, response.text[:500]
@@ -0,0 +1,67 @@
+"""
+Tests for grouped camera summary and list queries.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import CacheKeys, settings
+from app.dependencies import get_cache_manager, get_database_manager
+from app.routers import cameras
+
+
+def make_summary(camera: str) -> dict:
+    return {"camera": camera, "active_people": 3, "total_detections": 40, "phone_violations": 1,
+            "recording_status": "active", "last_activity": 1700000000.0}
+
+
+class TestCameraSummaries:
+    """Test class for camera summary and list endpoints."""
+
+    @pytest.fixture
+    def cache(self):
+        return MagicMock(get=AsyncMock(return_value=None), set=AsyncMock(return_value=True),
+                         set_many=AsyncMock(return_value=True))
+
+    @pytest.fixture
+    def client(self, cache):
+        app = FastAPI()
+        app.include_router(cameras.router)
+        app.dependency_overrides[get_database_manager] = lambda: MagicMock()
+        app.dependency_overrides[get_cache_manager] = lambda: cache
+        return TestClient(app)
+
+    def test_summary_is_one_query_cached_per_camera(self, client, cache):
+        """All summaries come from one grouped query and one pipelined cache write."""
+        query = AsyncMock(return_value=[make_summary(camera) for camera in settings.CAMERAS])
+
+        with patch.object(cameras.CameraQueries, "get_camera_summaries", query):
+            response = client.get("/api/cameras/summary")
+
+        assert response.status_code == 200
+        assert query.await_count == 1
+        written = cache.set_many.await_args.args[0]
+        assert len(written[CacheKeys.camera_summaries()]) == len(settings.CAMERAS)
+        assert written[CacheKeys.camera_summary(settings.CAMERAS[0])]["camera"] == settings.CAMERAS[0]
+
+    def test_list_is_one_grouped_query(self, client):
+        """The camera list no longer queries once per camera."""
+        rows = [
+            {"camera": "employees_01", "total_events": 10, "last_activity": 1700000000.0,
+             "person_count": 8, "phone_count": 2},
+            {"camera": "employees_02", "total_events": None, "last_activity": None,
+             "person_count": None, "phone_count": None},
+        ]
+        query = AsyncMock(return_value=rows)
+
+        with patch.object(cameras.CameraQueries, "get_camera_list", query):
+            data = client.get("/api/cameras/list").json()["data"]
+            client.get("/api/cameras/list?fields=name,status")
+
+        assert query.await_count == 2
+        assert set(query.await_args.kwargs["aggregates"]) == {"total_events"}
+        assert [(c["name"], c["status"], c["phone_events_24h"]) for c in data] == [
+            ("employees_01", "active", 2), ("employees_02", "inactive", 0)
+        ]
@@ -0,0 +1,127 @@
+"""
+Tests for response compression.
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.cache import CacheManager
+from app.utils.compression import CompressionMiddleware, body_digest, compress_async, negotiate_encoding
+from app.utils.response_formatter import create_json_response
+
+ROWS = [{"camera": "employees_01", "zones": ["desk_01"], "confidence": 0.9}] * 200
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/rows")
+    async def rows():
+        return create_json_response(data=ROWS)
+
+    @app.get("/small")
+    async def small():
+        return create_json_response(data=[])
+
+    @app.get("/cached")
+    async def cached():
+        return create_json_response(data=ROWS, cache_key="violations:live:100:24")
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            yield "data: " + "x" * 1000 + "\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+class TestNegotiateEncoding:
+    """Test class for Accept-Encoding negotiation."""
+
+    def test_prefers_brotli_and_honours_q_values(self):
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+        assert negotiate_encoding("br;q=0, gzip") == "gzip"
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding(None) is None
+
+
+class TestCompressionMiddleware:
+    """Test class for CompressionMiddleware."""
+
+    def test_compresses_large_json(self, client):
+        """Large JSON bodies are gzip-encoded when the client asks for gzip."""
+        response = client.get("/rows", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json()["data"] == ROWS
+
+    def test_skips_small_and_streamed_bodies(self, client):
+        """Bodies under the threshold and event streams are sent as-is."""
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        stream = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in stream.headers
+
+
+class TestPrecompressedJSONResponse:
+    """Test class for cached compressed response variants."""
+
+    def test_compresses_once_and_reuses_stored_variant(self, client):
+        """The first request stores the compressed body; later ones reuse it."""
+        stored = {}
+
+        async def get_compressed(key, encoding, digest):
+            variant = stored.get((key, encoding))
+            return variant[1] if variant is not None and variant[0] == digest else None
+
+        async def set_compressed(key, encoding, body, digest):
+            stored[(key, encoding)] = (digest, body)
+            return True
+
+        with patch("app.utils.compression.cache_manager") as cache, \
+                patch("app.utils.compression.compress_async", wraps=compress_async) as compress:
+            cache.get_compressed = AsyncMock(side_effect=get_compressed)
+            cache.set_compressed = AsyncMock(side_effect=set_compressed)
+
+            first = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+            second = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+
+        assert first.headers["content-encoding"] == "gzip"
+        assert compress.call_count == 1
+        assert cache.get_compressed.await_count == 2
+        assert cache.set_compressed.await_count == 1
+        assert list(stored) == [("violations:live:100:24", "gzip")]
+        assert json.loads(gzip.decompress(stored[("violations:live:100:24", "gzip")][1]))["data"] == ROWS
+        assert second.json() == first.json()
+
+    @pytest.mark.asyncio
+    async def test_variant_of_a_replaced_value_is_not_served(self):
+        """A variant stored from the old value after a refresh is ignored for the new one."""
+        store = {"violations:live:100:24": b"v2"}
+
+        async def set_value(key, value, px=None):
+            store[key] = value
+
+        cache = CacheManager()
+        cache.redis = MagicMock(
+            get=AsyncMock(side_effect=store.get),
+            set=AsyncMock(side_effect=set_value),
+            pttl=AsyncMock(return_value=30000)
+        )
+
+        # A request that read v1 before the refresh stores its variant afterwards
+        await cache.set_compressed("violations:live:100:24", "gzip", b"gzip(v1)", body_digest(b"v1"))
+
+        assert await cache.get_compressed("violations:live:100:24", "gzip", body_digest(b"v2")) is None
+        assert await cache.get_compressed("violations:live:100:24", "gzip", body_digest(b"v1")) == b"gzip(v1)"
@@ -0,0 +1,37 @@
+"""
+Tests for reading nested settings from the environment.
+"""
+
+from app.config import Settings
+
+
+class TestConfig:
+    """Test class for environment configuration."""
+
+    def test_nested_settings_read_prefixed_environment(self, monkeypatch):
+        """Nested settings pick up their prefixed environment variables."""
+        environment = {
+            "VIDEO_API_PER_HOST_CONCURRENCY": "3",
+            "MEDIA_INDEX_ENABLED": "false",
+            "MEDIA_CACHE_DIR": "/x",
+            "MEDIA_CACHE_MAX_SIZE_MB": "7",
+            "COMPRESSION_ENABLED": "false",
+            "BACKGROUND_LEADER_LEASE_TTL": "99",
+            "BACKGROUND_MAX_SKIP_INTERVAL": "600",
+            "SLOW_QUERY_THRESHOLD_MS": "250",
+            "LOOP_MONITOR_ENABLED": "false",
+        }
+        for name, value in environment.items():
+            monkeypatch.setenv(name, value)
+
+        settings = Settings()
+
+        assert settings.video_api.per_host_concurrency == 3
+        assert settings.media_index.enabled is False
+        assert settings.media_cache.directory == "/x"
+        assert settings.media_cache.max_size_mb == 7
+        assert settings.compression.enabled is False
+        assert settings.background_tasks.leader_lease_ttl == 99
+        assert settings.background_tasks.max_skip_interval == 600
+        assert settings.slow_queries.threshold_ms == 250
+        assert settings.loop_monitor.enabled is False
@@ -0,0 +1,60 @@
+"""
+Tests for the WebSocket replay buffer.
+"""
+
+from app.services.event_buffer import EventBuffer
+
+
+class TestEventBuffer:
+    """Test class for EventBuffer."""
+
+    def test_append_stamps_monotonic_sequence(self):
+        """Events get increasing sequence numbers and the buffer epoch."""
+        buffer = EventBuffer(maxlen=10)
+
+        first = buffer.append("violations", {"type": "new_violations", "data": {}})
+        second = buffer.append("dashboard", {"type": "violation_summary", "data": {}})
+
+        assert first["seq"] == 1
+        assert second["seq"] == 2
+        assert first["epoch"] == buffer.epoch
+        assert buffer.last_seq == 2
+
+    def test_replay_returns_only_missed_events_for_channel(self):
+        """Replay filters by sequence number and subscribed channels."""
+        buffer = EventBuffer(maxlen=10)
+        buffer.append("violations", {"type": "a"})
+        buffer.append("dashboard", {"type": "b"})
+        buffer.append("all", {"type": "c"})
+        buffer.append("violations", {"type": "d"})
+
+        events = buffer.replay(1, channels=("violations", "all"))
+
+        assert [event["type"] for event in events] == ["c", "d"]
+
+    def test_replay_up_to_date_client_gets_nothing(self):
+        """A client that saw the latest event has nothing to replay."""
+        buffer = EventBuffer(maxlen=10)
+        buffer.append("violations", {"type": "a"})
+
+        assert buffer.replay(1, channels=("violations",)) == []
+        assert EventBuffer().replay(0, channels=("violations",)) == []
+
+    def test_replay_gap_beyond_buffer_requires_refresh(self):
+        """Events that have been evicted cannot be replayed."""
+        buffer = EventBuffer(maxlen=3)
+        for index in range(5):
+            buffer.append("violations", {"type": str(index)})
+
+        assert buffer.oldest_seq == 3
+        assert buffer.replay(1, channels=("violations",)) is None
+        assert len(buffer.replay(2, channels=("violations",))) == 3
+
+    def test_replay_rejects_foreign_epoch_and_future_sequence(self):
+        """Sequence numbers from another process or restart are rejected."""
+        buffer = EventBuffer(maxlen=10)
+        buffer.append("violations", {"type": "a"})
+
+        assert buffer.replay(0, channels=("violations",), epoch="other") is None
+        assert buffer.replay(5, channels=("violations",)) is None
+        assert buffer.replay(0, channels=("violations",), epoch=buffer.epoch) is not None
@@ -0,0 +1,145 @@
+"""
+Tests for the Server-Sent Events stream endpoints.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.routers import events
+from app.routers.events import format_sse_event, parse_last_event_id
+from app.routers.websocket import ConnectionManager
+
+
+class TestEventFormatting:
+    """Test class for SSE framing helpers."""
+
+    def test_format_event_includes_resumable_id(self):
+        """Stamped events carry an epoch:seq id usable as Last-Event-ID."""
+        frame = format_sse_event({"type": "new_violations", "data": {}, "seq": 7, "epoch": "abc"})
+
+        assert frame.startswith("id: abc:7\nevent: new_violations\ndata: ")
+        assert frame.endswith("\n\n")
+        assert json.loads(frame.split("data: ", 1)[1])["seq"] == 7
+
+    def test_format_snapshot_uses_seq_from_data(self):
+        """Initial snapshots carry their sequence number inside data."""
+        frame = format_sse_event({"type": "initial_data", "data": {"seq": 3, "epoch": "abc"}})
+
+        assert frame.startswith("id: abc:3\n")
+
+    def test_parse_last_event_id(self):
+        """Event ids round-trip and malformed ids are ignored."""
+        assert parse_last_event_id("abc:12") == ("abc", 12)
+        assert parse_last_event_id("12") is None
+        assert parse_last_event_id("abc:x") is None
+        assert parse_last_event_id(None) is None
+
+
+class TestEventStream:
+    """Test class for the SSE event generator."""
+
+    @pytest.fixture
+    def connection_manager(self):
+        """Create a connection manager that does not poll the database."""
+        connection_manager = ConnectionManager()
+        connection_manager.start_polling = AsyncMock()
+        with patch.object(events, "manager", connection_manager):
+            yield connection_manager
+
+    @pytest.mark.asyncio
+    async def test_resume_replays_missed_then_streams_live(self, connection_manager):
+        """A client resuming with Last-Event-ID skips the snapshot."""
+        connection_manager.event_buffer.append("violations", {"type": "missed", "data": {}})
+        epoch = connection_manager.event_buffer.epoch
+        snapshot = AsyncMock()
+
+        stream = events._event_stream("violations", f"{epoch}:0", snapshot)
+        assert (await stream.__anext__()).startswith("retry:")
+        assert "event: missed" in await stream.__anext__()
+
+        await connection_manager.broadcast_to_violations({"type": "live", "data": {}})
+        assert "event: live" in await stream.__anext__()
+
+        await stream.aclose()
+        snapshot.assert_not_called()
+        assert not connection_manager.stream_subscribers
+
+    @pytest.mark.asyncio
+    async def test_unknown_epoch_falls_back_to_snapshot(self, connection_manager):
+        """A client from another process gets the full snapshot."""
+        snapshot = AsyncMock(return_value={"type": "initial_data", "data": {}})
+
+        stream = events._event_stream("dashboard", "other:5", snapshot)
+        await stream.__anext__()
+        assert "event: initial_data" in await stream.__anext__()
+
+        await stream.aclose()
+        snapshot.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_events_during_snapshot_build_follow_it(self, connection_manager):
+        """Events broadcast while the snapshot builds are sent after it, in order."""
+        async def snapshot():
+            await connection_manager.broadcast_to_violations({"type": "before", "data": {}})
+            seq = connection_manager.event_buffer.last_seq
+            await connection_manager.broadcast_to_violations({"type": "during", "data": {}})
+            return {"type": "initial_data", "data": {"seq": seq, "epoch": connection_manager.event_buffer.epoch}}
+
+        stream = events._event_stream("violations", None, snapshot)
+        await stream.__anext__()
+        assert "event: initial_data" in await stream.__anext__()
+        frame = await stream.__anext__()
+
+        await stream.aclose()
+        assert "event: during" in frame
+        assert frame.startswith(f"id: {connection_manager.event_buffer.epoch}:2\n")
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_when_idle(self, connection_manager):
+        """Idle streams emit heartbeat comments."""
+        snapshot = AsyncMock(return_value={"type": "initial_data", "data": {}})
+
+        with patch.object(events.settings, "sse_heartbeat_interval", 0.01):
+            stream = events._event_stream("dashboard", None, snapshot)
+            await stream.__anext__()
+            await stream.__anext__()
+            assert await asyncio.wait_for(stream.__anext__(), 1) == ": heartbeat\n\n"
+            await stream.aclose()
+
+
+class TestSnapshotCoalescing:
+    """Test class for shared initial snapshot builds."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_clients_share_one_build(self):
+        """Clients connecting together wait on a single snapshot build."""
+        connection_manager = ConnectionManager()
+        release = asyncio.Event()
+        builds = 0
+
+        async def build():
+            nonlocal builds
+            builds += 1
+            await release.wait()
+            return {"type": "initial_data", "data": {"seq": 4}}
+
+        waiters = [
+            asyncio.ensure_future(connection_manager.shared_snapshot(("violations", None, 24), build))
+            for _ in range(5)
+        ]
+        other = asyncio.ensure_future(connection_manager.shared_snapshot(("violations", "employees_01", 24), build))
+        await asyncio.sleep(0)
+
+        # One client giving up does not cancel the build for the rest
+        waiters.pop().cancel()
+        release.set()
+        snapshots = await asyncio.gather(*waiters, other)
+
+        assert builds == 2
+        assert all(snapshot["data"]["seq"] == 4 for snapshot in snapshots)
+        assert not connection_manager._snapshot_builds
+
+        await connection_manager.shared_snapshot(("violations", None, 24), build)
+        assert builds == 3
@@ -0,0 +1,80 @@
+"""
+Tests for sparse fieldsets.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.dependencies import get_cache_manager, get_database_manager
+from app.routers import violations
+from app.utils.fields import parse_fields, select_fields, sql_projection, wants
+from app.utils.response_formatter import format_violation_data
+
+ROWS = [
+    {"id": f"1700000{i:03d}.5-abc123", "timestamp": 1700000000.5 - i, "camera": "employees_01",
+     "zones": ["desk_1"], "employee_name": "Safia Imtiaz", "confidence": 1.0}
+    for i in range(5)
+]
+
+
+class TestFieldHelpers:
+    """Test class for fieldset helpers."""
+
+    def test_parse_and_select(self):
+        """Parsed fields project rows and reject unknown names."""
+        fields = parse_fields("id, camera", ("id", "camera", "zones"))
+
+        assert fields == {"id", "camera"}
+        assert parse_fields(None, ("id",)) is None
+        assert wants(None, "zones") and not wants(fields, "zones")
+        assert select_fields([{"id": 1, "camera": "c", "zones": []}], fields) == [{"id": 1, "camera": "c"}]
+        assert sql_projection({"total": "COUNT(*)", "camera": "camera"}, {"total"}) == "COUNT(*) as total"
+        with pytest.raises(ValueError):
+            parse_fields("id,secret", ("id",))
+
+
+class TestLiveViolationFields:
+    """Test class for fields= on /api/violations/live."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(violations.router)
+        cache = MagicMock(get=AsyncMock(return_value=None), set=AsyncMock(return_value=True))
+        app.dependency_overrides[get_database_manager] = lambda: MagicMock()
+        app.dependency_overrides[get_cache_manager] = lambda: cache
+        return TestClient(app)
+
+    def test_fields_skip_employee_attribution(self, client):
+        """Requesting no employee fields skips the desk join."""
+        query = AsyncMock(return_value=ROWS)
+
+        with patch.object(violations.ViolationQueries, "get_live_violations", query):
+            response = client.get("/api/violations/live?fields=id,timestamp,camera")
+
+        assert response.status_code == 200
+        assert query.await_args.kwargs["with_employee"] is False
+        assert set(response.json()["data"][0]) == {"id", "timestamp", "camera"}
+        assert client.get("/api/violations/live?fields=id,password").status_code == 422
+
+    @pytest.mark.parametrize("cached", [False, True])
+    def test_fields_with_media_and_compact_urls(self, client, cached):
+        """Projection runs after annotation and compaction, keeping what they need."""
+        annotate = MagicMock(side_effect=lambda items, mode, kinds=(): [
+            dict(item, media_available={"snapshot": bool(item.get("id") and item.get("camera"))})
+            for item in items
+        ])
+        index = MagicMock(ensure_loaded=AsyncMock(), annotate=annotate)
+        cache = client.app.dependency_overrides[get_cache_manager]()
+        if cached:
+            cache.get.return_value = [format_violation_data(row) for row in ROWS]
+
+        with patch.object(violations.ViolationQueries, "get_live_violations", AsyncMock(return_value=ROWS)), \
+                patch.object(violations, "media_index", index):
+            body = client.get("/api/violations/live?fields=timestamp&media=flag&urls=compact").json()
+
+        assert set(body["data"][0]) == {"id", "camera", "timestamp", "media_available"}
+        assert body["data"][0]["media_available"] == {"snapshot": True}
+        assert body["url_templates"]["snapshot_url"].format(**body["data"][0]).endswith(ROWS[0]["id"])
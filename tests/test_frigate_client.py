@@ -0,0 +1,106 @@
+"""
+Tests for the pooled Frigate HTTP client.
+"""
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.services.frigate_client import FrigateClient
+
+
+def make_client(handler) -> FrigateClient:
+    """Create a client whose requests are answered by ``handler``."""
+    return FrigateClient(transport=httpx.MockTransport(handler))
+
+
+class TestFrigateClient:
+    """Test class for FrigateClient."""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self):
+        """Make retries immediate."""
+        with patch("app.services.frigate_client.settings.video_api.retry_backoff", 0):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_get_json_uses_base_url_and_params(self):
+        """Relative paths are resolved against the Frigate base URL."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.url)
+            return httpx.Response(200, json={"clips": []})
+
+        client = make_client(handler)
+        data = await client.get_json("/api/clips", params={"limit": 5})
+        await client.close()
+
+        assert data == {"clips": []}
+        assert seen[0].path == "/api/clips"
+        assert seen[0].params["limit"] == "5"
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_failures(self):
+        """Transport errors and 503s are retried before succeeding."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            if len(calls) == 2:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler)
+        assert await client.get_json("/api/recordings") == {"ok": True}
+        await client.close()
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_retry_attempts(self):
+        """Persistent failures are raised once retries are exhausted."""
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        client = make_client(handler)
+        with pytest.raises(httpx.ConnectError):
+            await client.get_json("/api/clips")
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_probe_many_preserves_order(self):
+        """Concurrent HEAD probes report per-URL accessibility in order."""
+        def handler(request):
+            if request.url.path.startswith("/clip/"):
+                return httpx.Response(200, headers={"Content-Length": "42"})
+            return httpx.Response(404)
+
+        client = make_client(handler)
+        results = await client.probe_many(["/clip/a", "/thumb/a"])
+        await client.close()
+
+        assert [result["accessible"] for result in results] == [True, False]
+        assert results[0]["size"] == "42"
+        assert results[1]["status"] == 404
+
+    @pytest.mark.asyncio
+    async def test_download_writes_body_only_for_200(self, tmp_path):
+        """Downloads stream 200 bodies to disk and leave other statuses unwritten."""
+        body = b"x" * 200000
+
+        def handler(request):
+            if request.url.path == "/clip/a":
+                return httpx.Response(200, content=body)
+            return httpx.Response(404)
+
+        client = make_client(handler)
+        found = await client.download("/clip/a", str(tmp_path / "a.mp4"))
+        missing = await client.download("/clip/b", str(tmp_path / "b.mp4"))
+        await client.close()
+
+        assert found.status_code == 200
+        assert (tmp_path / "a.mp4").read_bytes() == body
+        assert missing.status_code == 404
+        assert not (tmp_path / "b.mp4").exists()
@@ -0,0 +1,70 @@
+"""
+Tests for Redis lease leader election.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.services import leader
+from app.services.leader import LeaderLease
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for the lease: SET NX and the two scripts."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode()
+        return True
+
+    async def eval(self, script, numkeys, key, owner, *args):
+        if self.data.get(key) != owner.encode():
+            return 0
+        if script == leader._RELEASE_SCRIPT:
+            del self.data[key]
+        return 1
+
+    def expire_lease(self, key):
+        self.data.pop(key, None)
+
+
+def make_lease(redis):
+    return LeaderLease(MagicMock(redis=redis), "background:leader", ttl=15)
+
+
+class TestLeaderLease:
+    """Test class for LeaderLease."""
+
+    @pytest.mark.asyncio
+    async def test_single_leader_and_failover(self):
+        """Only one worker leads; a release or expiry lets another take over."""
+        redis = FakeRedis()
+        first, second = make_lease(redis), make_lease(redis)
+
+        assert await first.acquire() is True
+        assert await second.acquire() is False
+        assert await first.acquire() is True
+        assert await second.current_leader() == first.instance_id
+
+        await first.release()
+        assert await second.acquire() is True
+
+        redis.expire_lease("background:leader")
+        assert await first.acquire() is True
+        assert await second.acquire() is False
+        assert second.is_leader is False
+
+    @pytest.mark.asyncio
+    async def test_no_redis_means_follower(self):
+        """Without a Redis connection a worker never leads."""
+        lease = make_lease(None)
+
+        assert await lease.acquire() is False
+        assert (await lease.get_status())["leader"] is None
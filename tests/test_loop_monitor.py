@@ -0,0 +1,44 @@
+"""
+Tests for the event-loop lag monitor.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.utils.loop_monitor import LatencyWindow, LoopMonitor
+
+
+class TestLoopMonitor:
+    """Test class for LoopMonitor."""
+
+    def test_latency_window(self):
+        """Percentiles cover the recent samples; the max covers all of them."""
+        window = LatencyWindow(size=100)
+        for ms in range(1, 201):
+            window.add(ms / 1000)
+
+        stats = window.get_stats()
+        assert stats["count"] == 200
+        assert stats["p50_ms"] == 151.0
+        assert stats["max_ms"] == 200.0
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_captured(self):
+        """A blocking call shows up as a stall whose stack points at it."""
+        monitor = LoopMonitor(interval=0.02, stall_threshold_ms=50, history_size=10)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            time.sleep(0.3)
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        stats = monitor.get_stats()
+        stall = stats["recent_stalls"][0]
+        assert stats["stalls"] == 1
+        assert stall["blocked_ms"] >= 250
+        assert "test_blocking_call_is_captured" in stall["location"]
+        assert stats["lag"]["max_ms"] >= 250
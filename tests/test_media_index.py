@@ -0,0 +1,133 @@
+"""
+Tests for the media availability index.
+"""
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.cache import get_cache
+from app.database import get_database
+from app.routers import employees
+from app.services.media_index import CompactIdSet, MediaAvailabilityIndex
+
+
+class TestCompactIdSet:
+    """Test class for CompactIdSet."""
+
+    def test_membership_and_round_trip(self):
+        """Ids survive serialization and unknown ids are absent."""
+        ids = CompactIdSet.from_ids(["1700000000.1-abc", "1700000001.2-def"])
+        restored = CompactIdSet.from_bytes(ids.to_bytes())
+
+        assert len(restored) == 2
+        assert "1700000000.1-abc" in restored
+        assert "1700000002.3-ghi" not in restored
+        assert len(ids.to_bytes()) == 16
+
+
+class TestMediaAvailabilityIndex:
+    """Test class for MediaAvailabilityIndex."""
+
+    @pytest.fixture
+    def retention_rows(self):
+        """Retention rows: one with recordings and review, one expired."""
+        return [
+            {"source_id": "live-1", "camera": "employees_01", "timestamp": 2.0,
+             "has_recording": True, "has_review": True},
+            {"source_id": "gone-1", "camera": "employees_01", "timestamp": 1.0,
+             "has_recording": False, "has_review": False},
+            {"source_id": "person-1", "camera": "employees_02", "timestamp": 3.0,
+             "has_recording": True, "has_review": False},
+        ]
+
+    @pytest_asyncio.fixture
+    async def built_index(self, retention_rows):
+        """Index built from the retention rows with a failing thumbnail probe."""
+        index = MediaAvailabilityIndex()
+        frigate = MagicMock()
+
+        async def probe_many(urls):
+            return [
+                {"url": url, "status": 404 if "/thumb/" in url else 200,
+                 "accessible": "/thumb/" not in url}
+                for url in urls
+            ]
+
+        frigate.probe_many = probe_many
+        cache = MagicMock(redis=None)
+
+        with patch("app.services.media_index.MediaQueries.get_media_retention",
+                   AsyncMock(return_value=retention_rows)):
+            stats = await index.refresh(db=MagicMock(), cache=cache, frigate=frigate)
+
+        assert stats["probed"] == 5
+        return index
+
+    @pytest.mark.asyncio
+    async def test_refresh_combines_retention_and_probes(self, built_index):
+        """Retention gates availability and probe failures mark media dead."""
+        assert built_index.is_available("clip", "live-1") is True
+        assert built_index.is_available("snapshot", "live-1") is True
+        assert built_index.is_available("thumbnail", "live-1") is False
+        assert built_index.is_available("clip", "gone-1") is False
+        assert built_index.is_available("clip", "unknown") is None
+
+    @pytest.mark.asyncio
+    async def test_annotate_flags_and_omits_dead_urls(self, built_index):
+        """Flag mode reports availability; omit mode also drops dead URLs."""
+        items = [{
+            "id": "gone-1",
+            "video_url": "http://frigate/clip/gone-1",
+            "snapshot_url": "http://frigate/snapshot/employees_01/gone-1",
+            "thumbnail_url": None,
+        }]
+
+        flagged = built_index.annotate(items, "flag")
+        omitted = built_index.annotate(items, "omit")
+
+        assert flagged[0]["media_available"] == {"clip": False, "snapshot": False}
+        assert flagged[0]["video_url"] == "http://frigate/clip/gone-1"
+        assert omitted[0]["video_url"] is None
+        assert omitted[0]["snapshot_url"] is None
+        assert built_index.annotate(items, "all") is items
+
+    @pytest.mark.asyncio
+    async def test_annotate_compact_rows_by_id(self, built_index):
+        """Compact rows without URL fields are flagged by their id."""
+        items = [{"id": "live-1", "camera": "employees_01"}, {"id": "gone-1"}]
+
+        flagged = built_index.annotate(items, "omit", ("clip", "snapshot"))
+
+        assert flagged[0]["media_available"] == {"clip": True, "snapshot": True}
+        assert flagged[1]["media_available"] == {"clip": False}
+        assert "video_url" not in flagged[1]
+
+    def test_breaks_link_to_indexed_detections(self, built_index):
+        """Break rows point at named detections the index covers."""
+        detections = [
+            {"timestamp": 1700000000.0, "camera": "employees_02", "zones": ["desk_1"],
+             "label": "person", "source_id": "person-1"},
+            {"timestamp": 1700001200.0, "camera": "employees_02", "zones": ["desk_1"],
+             "label": "person", "source_id": "person-2"},
+        ]
+        app = FastAPI()
+        app.include_router(employees.router)
+        app.dependency_overrides[get_database] = lambda: MagicMock(fetch_all=AsyncMock(return_value=detections))
+        app.dependency_overrides[get_cache] = lambda: MagicMock(
+            get=AsyncMock(return_value=None), set=AsyncMock(return_value=True)
+        )
+
+        with patch.object(employees, "media_index", built_index):
+            response = TestClient(app).get(
+                "/api/employees/Alice/breaks",
+                params={"date": "2023-11-14", "include_snapshots": "true", "media": "omit"}
+            )
+
+        [row] = response.json()["data"]["breaks"]
+        assert row["id"] == "person-1"
+        assert row["media_available"] == {"clip": True, "snapshot": True, "thumbnail": False}
+        assert row["video_url"].endswith("/person-1")
+        assert row["thumbnail_url"] is None
@@ -0,0 +1,207 @@
+"""
+Tests for the caching media proxy.
+"""
+
+import asyncio
+import io
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.routers import media
+from app.services import sprites
+from app.services.frigate_client import FrigateClient
+from app.services.media_cache import MediaDiskCache, get_media_cache
+from app.utils.errors import NotFoundError
+
+CLIP_BODY = bytes(range(256)) * 4
+
+
+def make_thumbnail(color) -> bytes:
+    """Encode a small solid-colour thumbnail."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (175, 100), color).save(buffer, format="WEBP")
+    return buffer.getvalue()
+
+
+THUMB_BODY = make_thumbnail((255, 0, 0))
+
+
+class StubFrigate:
+    """Stand-in Frigate media server counting upstream fetches."""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.path)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if request.url.path.startswith("/clip/"):
+            return httpx.Response(200, content=CLIP_BODY)
+        if request.url.path.startswith("/thumb/missing"):
+            return httpx.Response(404)
+        return httpx.Response(200, content=THUMB_BODY)
+
+
+@pytest.fixture
+def stub():
+    return StubFrigate()
+
+
+@pytest.fixture
+def media_cache(tmp_path, stub):
+    """Media cache in a temp directory backed by the stub Frigate."""
+    frigate = FrigateClient(transport=httpx.MockTransport(stub))
+    return MediaDiskCache(directory=str(tmp_path), max_bytes=10_000, frigate=frigate)
+
+
+class TestMediaDiskCache:
+    """Test class for MediaDiskCache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_does_not_refetch(self, media_cache, stub):
+        """A second lookup is served from disk."""
+        first = await media_cache.fetch("thumb/a", "/thumb/a", ".webp")
+        second = await media_cache.fetch("thumb/a", "/thumb/a", ".webp")
+
+        assert first == second
+        assert open(first, "rb").read() == THUMB_BODY
+        assert stub.requests == ["/thumb/a"]
+        assert media_cache.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self, media_cache, stub):
+        """Simultaneous misses for one object trigger a single upstream request."""
+        stub.delay = 0.05
+        paths = await asyncio.gather(*(
+            media_cache.fetch("clip/b", "/clip/b", ".mp4") for _ in range(10)
+        ))
+
+        assert len(set(paths)) == 1
+        assert stub.requests == ["/clip/b"]
+        assert media_cache.stats["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_missing_media_raises_not_found(self, media_cache):
+        """Upstream 404s surface as NotFoundError and leave nothing on disk."""
+        with pytest.raises(NotFoundError):
+            await media_cache.fetch("thumb/missing", "/thumb/missing", ".webp")
+        assert os.listdir(media_cache.directory) == []
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, media_cache):
+        """Going over budget evicts the oldest files first."""
+        media_cache.max_bytes = int(len(CLIP_BODY) * 2.5)
+        first = await media_cache.fetch("clip/1", "/clip/1", ".mp4")
+        os.utime(first, (0, 0))
+        await media_cache.fetch("clip/2", "/clip/2", ".mp4")
+        await media_cache.fetch("clip/3", "/clip/3", ".mp4")
+
+        assert not os.path.exists(first)
+        assert media_cache.stats["evictions"] == 1
+
+
+class TestMediaRouter:
+    """Test class for the media proxy endpoints."""
+
+    @pytest.fixture
+    def client(self, media_cache):
+        app = FastAPI()
+        app.include_router(media.router)
+        app.dependency_overrides[get_media_cache] = lambda: media_cache
+        return TestClient(app)
+
+    def test_clip_range_request(self, client):
+        """Range requests return 206 with the requested bytes."""
+        response = client.get("/api/media/clip/abc", headers={"Range": "bytes=10-19"})
+
+        assert response.status_code == 206
+        assert response.content == CLIP_BODY[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(CLIP_BODY)}"
+        assert response.headers["content-type"] == "video/mp4"
+
+    def test_unsatisfiable_range(self, client):
+        """Ranges past the end of the file return 416."""
+        response = client.get("/api/media/clip/abc", headers={"Range": "bytes=5000-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(CLIP_BODY)}"
+
+    def test_conditional_request(self, client):
+        """A matching If-None-Match returns 304 without a body."""
+        first = client.get("/api/media/snapshot/employees_01/abc")
+        second = client.get(
+            "/api/media/snapshot/employees_01/abc",
+            headers={"If-None-Match": first.headers["etag"]}
+        )
+
+        assert first.status_code == 200
+        assert first.content == THUMB_BODY
+        assert second.status_code == 304
+
+    def test_thumbnail_sprite(self, client, stub):
+        """One sprite covers every ID, with missing thumbnails reported."""
+        response = client.get("/api/media/sprite", params={"ids": "b,missing-1,a,b"})
+        layout = response.json()["data"]
+
+        assert response.status_code == 200
+        assert layout["ids"] == ["a", "b", "missing-1"]
+        assert layout["missing"] == ["missing-1"]
+        assert layout["offsets"]["b"]["x"] == layout["tile"]["width"]
+
+        sprite = client.get(layout["sprite_url"])
+        image = Image.open(io.BytesIO(sprite.content))
+        assert sprite.headers["content-type"] == "image/jpeg"
+        assert image.size == (layout["tile"]["width"] * 3, layout["tile"]["height"])
+        # Red thumbnail in the first tile, placeholder in the missing tile
+        assert image.getpixel((layout["tile"]["width"] // 2, layout["tile"]["height"] // 2))[0] > 200
+        assert image.getpixel((layout["offsets"]["missing-1"]["x"] + 5, 5))[0] < 64
+
+        # Same ID set in another order is served from the cache
+        requests = len(stub.requests)
+        again = client.get("/api/media/sprite", params={"ids": "a,b,missing-1"})
+        assert again.json()["data"]["digest"] == layout["digest"]
+        assert len(stub.requests) == requests
+
+    def test_partial_sprite_is_rebuilt_after_expiry(self, client, stub, monkeypatch):
+        """Sprites with missing tiles expire; complete sprites stay cached."""
+        partial = client.get("/api/media/sprite", params={"ids": "a,missing-1"}).json()["data"]
+        complete = client.get("/api/media/sprite", params={"ids": "a,b"}).json()["data"]
+        monkeypatch.setattr(sprites, "PARTIAL_SPRITE_TTL", 0)
+        requests = len(stub.requests)
+
+        assert client.get("/api/media/sprite", params={"ids": "a,b"}).json()["data"] == complete
+        assert len(stub.requests) == requests
+
+        rebuilt = client.get("/api/media/sprite", params={"ids": "a,missing-1"}).json()["data"]
+        assert rebuilt["digest"] == partial["digest"]
+        assert stub.requests[requests:] == ["/thumb/missing-1"]
+        # The expired image is rebuilt too rather than served with stale tiles
+        assert client.get(rebuilt["sprite_url"]).status_code == 200
+        assert stub.requests[requests:] == ["/thumb/missing-1"] * 2
+
+    def test_sprite_image_evicted_before_open_is_rebuilt(self, client, monkeypatch):
+        """An image evicted between lookup and open is rebuilt instead of failing."""
+        layout = client.get("/api/media/sprite", params={"ids": "a,b"}).json()["data"]
+        get_image = sprites.SpriteBuilder.get_image
+        calls = []
+
+        async def evicting_get_image(self, digest):
+            path = await get_image(self, digest)
+            calls.append(path)
+            if len(calls) == 1:
+                os.remove(path)
+            return path
+
+        monkeypatch.setattr(sprites.SpriteBuilder, "get_image", evicting_get_image)
+        response = client.get(layout["sprite_url"])
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/jpeg"
+        assert len(calls) == 2
@@ -0,0 +1,87 @@
+"""
+Tests for media URL building and the compact URL-template format.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import settings
+from app.dependencies import get_cache_manager, get_database_manager
+from app.routers import violations
+from app.utils.media_urls import compact_media_urls, media_url, url_templates
+
+ROWS = [
+    {"id": f"1700000{i:03d}.5-abc123", "timestamp": 1700000000.5 - i, "camera": "employees_01",
+     "zones": ["desk_1"], "employee_name": "Safia Imtiaz", "confidence": 1.0}
+    for i in range(200)
+]
+
+
+class TestMediaUrls:
+    """Test class for media URL helpers."""
+
+    def test_templates_expand_to_full_urls(self):
+        """Substituting a row into its template gives the full URL."""
+        templates = url_templates(("snapshot", "clip"))
+        row = {"id": "1700000000.5-abc123", "camera": "employees_01"}
+
+        assert templates["snapshot_url"].format(**row) == media_url("snapshot", row["id"], row["camera"])
+        assert templates["video_url"].format(**row) == f"{settings.video_api_base_url}/clip/{row['id']}"
+        assert media_url("snapshot", row["id"]) is None
+        assert media_url("clip", None) is None
+
+    def test_compact_strips_url_fields(self):
+        """Compact rows keep every non-URL field."""
+        rows = [{"id": "a", "camera": "c", "snapshot_url": "u", "video_url": None, "zones": []}]
+
+        compact, templates = compact_media_urls(rows, ("snapshot",))
+
+        assert compact == [{"id": "a", "camera": "c", "zones": []}]
+        assert list(templates) == ["snapshot_url"]
+        assert rows[0]["snapshot_url"] == "u"
+
+
+class TestCompactLiveViolations:
+    """Test class for urls=compact on /api/violations/live."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(violations.router)
+        cache = MagicMock(get=AsyncMock(return_value=None), set=AsyncMock(return_value=True))
+        app.dependency_overrides[get_database_manager] = lambda: MagicMock()
+        app.dependency_overrides[get_cache_manager] = lambda: cache
+        return TestClient(app)
+
+    def test_compact_response_is_smaller_and_equivalent(self, client):
+        """Compact rows plus templates rebuild the full response's URLs."""
+        query = AsyncMock(return_value=ROWS)
+
+        with patch.object(violations.ViolationQueries, "get_live_violations", query):
+            full = client.get("/api/violations/live?limit=200")
+            compact = client.get("/api/violations/live?limit=200&urls=compact")
+
+        full_rows = full.json()["data"]
+        compact_body = compact.json()
+        template = compact_body["url_templates"]["snapshot_url"]
+
+        assert "url_templates" not in full.json()
+        assert "snapshot_url" not in compact_body["data"][0]
+        assert [template.format(**row) for row in compact_body["data"]] == [row["snapshot_url"] for row in full_rows]
+        assert len(compact.content) < len(full.content)
+        assert client.get("/api/violations/live?urls=short").status_code == 422
+
+    def test_compact_rows_are_not_given_urls(self, client):
+        """Compact formatting builds no URLs and leaves the full-row cache alone."""
+        query = AsyncMock(return_value=ROWS)
+        build = MagicMock(wraps=media_url)
+
+        with patch.object(violations.ViolationQueries, "get_live_violations", query), \
+                patch("app.utils.response_formatter.media_url", build):
+            response = client.get("/api/violations/live?limit=200&urls=compact")
+
+        assert response.json()["url_templates"]
+        assert build.call_count == 0
+        assert client.app.dependency_overrides[get_cache_manager]().set.await_count == 0
@@ -0,0 +1,82 @@
+"""
+Tests for Prometheus metrics hooks.
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from prometheus_client import REGISTRY, CollectorRegistry, Gauge
+from unittest.mock import AsyncMock, MagicMock
+
+from app.database import DatabaseManager
+from app.utils import metrics
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def make_manager(rows) -> DatabaseManager:
+    conn = MagicMock(fetch=AsyncMock(return_value=rows))
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    manager = DatabaseManager()
+    manager.pool = MagicMock(acquire=acquire)
+    return manager
+
+
+async def load_zone_rows(manager: DatabaseManager):
+    return await manager.fetch_all("SELECT 1")
+
+
+class TestMetrics:
+    """Test class for the metrics hooks."""
+
+    def test_key_family(self):
+        """Families keep the fixed key prefix and drop parameters."""
+        assert metrics.key_family("violations:live:100:24") == "violations:live"
+        assert metrics.key_family("cameras:employees_01:summary") == "cameras"
+        assert metrics.key_family("employees:stats") == "employees:stats"
+
+    @pytest.mark.asyncio
+    async def test_queries_are_labelled_by_caller(self):
+        """Query latency and row counts are recorded under the calling function."""
+        labels = {"query": "load_zone_rows", "operation": "fetch_all"}
+        before = sample("db_query_duration_seconds_count", **labels)
+        rows_before = sample("db_query_rows_sum", query="load_zone_rows")
+
+        await load_zone_rows(make_manager([{"id": 1}, {"id": 2}]))
+
+        assert sample("db_query_duration_seconds_count", **labels) == before + 1
+        assert sample("db_query_rows_sum", query="load_zone_rows") == rows_before + 2
+        assert b"db_query_duration_seconds_bucket" in metrics.render()[0]
+
+    def test_cache_lookups(self):
+        """Hits and misses are counted per key family."""
+        before = sample("cache_lookups_total", family="violations:live", result="hit")
+
+        metrics.record_cache_lookup("violations:live:100:24", True)
+        metrics.record_cache_lookup("violations:live:50:1", False)
+
+        assert sample("cache_lookups_total", family="violations:live", result="hit") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_pool_gauges_written_per_worker(self, monkeypatch):
+        """In multiprocess mode each worker writes its pool sizes on use."""
+        registry = CollectorRegistry()
+        gauges = tuple(Gauge(name, documentation, registry=registry) for name, documentation in metrics._POOL_GAUGES)
+        monkeypatch.setattr(metrics, "_pool_gauges", gauges)
+        manager = make_manager([])
+        manager.pool.get_size = MagicMock(return_value=4)
+        manager.pool.get_idle_size = MagicMock(return_value=3)
+        manager.pool.get_max_size = MagicMock(return_value=10)
+        metrics.track_pool(manager)
+
+        await load_zone_rows(manager)
+
+        assert registry.get_sample_value("db_pool_connections") == 4
+        assert registry.get_sample_value("db_pool_idle_connections") == 3
+        assert registry.get_sample_value("db_pool_max_connections") == 10
+        assert registry.get_sample_value("db_pool_waiting_acquires") == 0
@@ -0,0 +1,117 @@
+"""
+Tests for keyset (cursor) pagination.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.dependencies import get_cache_manager, get_database_manager
+from app.cache import get_cache
+from app.database import get_database
+from app.routers import cameras, employees
+from app.utils.errors import ValidationError
+from app.utils.pagination import Cursor, decode_cursor, encode_cursor, keyset_condition, paginate_keyset
+
+ROWS = [{"id": f"17000000{i:02d}.5-abc", "timestamp": 1700000000.5 - i} for i in range(5)]
+
+
+class TestCursorTokens:
+    """Test class for cursor encoding and seek predicates."""
+
+    def test_round_trip_and_invalid_tokens(self):
+        """Tokens are opaque, URL-safe and reject tampering."""
+        token = encode_cursor(1700000000.123456, "1700000000.123456-x1y2z3")
+
+        assert "=" not in token and "/" not in token
+        assert decode_cursor(token) == Cursor(1700000000.123456, "1700000000.123456-x1y2z3")
+        for bad in ("not-a-cursor", encode_cursor(1, "a")[:-3], "W10"):
+            with pytest.raises(ValidationError):
+                decode_cursor(bad)
+
+    def test_keyset_condition(self):
+        """The seek predicate compares the (timestamp, id) row value."""
+        assert keyset_condition(None, 1) == ("", [])
+
+        condition, args = keyset_condition(Cursor(5.0, "b"), 5, descending=False)
+        assert condition == "AND (timestamp, source_id) > ($5, $6)"
+        assert args == [5.0, "b"]
+        assert keyset_condition(Cursor(5.0, "b"), 5, descending=False, inclusive=True)[0] == \
+            "AND (timestamp, source_id) >= ($5, $6)"
+
+    def test_paginate_keyset_uses_lookahead_row(self):
+        """A lookahead row means another page; its absence ends the list."""
+        page, info = paginate_keyset(ROWS, 4)
+        assert page == ROWS[:4]
+        assert info["has_next"] is True
+        assert decode_cursor(info["next_cursor"]) == Cursor(ROWS[3]["timestamp"], ROWS[3]["id"])
+
+        page, info = paginate_keyset(ROWS, 5)
+        assert page == ROWS and info == {"limit": 5, "has_next": False, "next_cursor": None}
+
+
+class TestCameraActivityPagination:
+    """Test class for cursor pagination on the camera activity endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(cameras.router)
+        cache = MagicMock(get=AsyncMock(return_value=None), set=AsyncMock(return_value=True))
+        app.dependency_overrides[get_database_manager] = lambda: MagicMock()
+        app.dependency_overrides[get_cache_manager] = lambda: cache
+        return TestClient(app), cache
+
+    def test_pages_follow_cursor_without_count(self, client):
+        """The next cursor seeks past the last row and deep pages skip the cache."""
+        test_client, cache = client
+        query = AsyncMock(side_effect=[ROWS[:3], ROWS[2:]])
+
+        with patch.object(cameras.CameraQueries, "get_camera_activity", query):
+            first = test_client.get("/api/cameras/employees_01/activity?limit=2").json()
+            second = test_client.get(
+                f"/api/cameras/employees_01/activity?limit=2&cursor={first['pagination']['next_cursor']}"
+            ).json()
+
+        assert [a["id"] for a in first["data"]["activities"]] == [r["id"] for r in ROWS[:2]]
+        assert query.call_args_list[0].kwargs["limit"] == 3
+        assert query.call_args_list[0].kwargs["cursor"] is None
+        assert query.call_args_list[1].kwargs["cursor"] == Cursor(ROWS[1]["timestamp"], ROWS[1]["id"])
+        assert second["pagination"]["has_next"] is True
+        assert cache.set.await_count == 1
+
+        invalid = test_client.get("/api/cameras/employees_01/activity?cursor=bogus")
+        assert invalid.status_code == 422
+
+
+class TestEmployeeTimelinePagination:
+    """Test class for cursor pagination on the employee timeline."""
+
+    def test_pages_continue_zone_and_breaks_across_boundary(self):
+        """A page knows the zone before it and the break after it."""
+        timeline = [
+            {"timestamp": 1700000000.0, "source_id": "a", "camera": "employees_01", "zones": ["desk_1"]},
+            {"timestamp": 1700000060.0, "source_id": "b", "camera": "employees_01", "zones": ["desk_1"]},
+            {"timestamp": 1700000960.0, "source_id": "c", "camera": "employees_01", "zones": ["desk_1"]},
+            {"timestamp": 1700001020.0, "source_id": "d", "camera": "employees_02", "zones": ["desk_2"]},
+        ]
+        db = MagicMock(fetch_all=AsyncMock(side_effect=[timeline[:3], timeline[1:]]))
+        app = FastAPI()
+        app.include_router(employees.router)
+        app.dependency_overrides[get_database] = lambda: db
+        app.dependency_overrides[get_cache] = lambda: MagicMock(
+            get=AsyncMock(return_value=None), set=AsyncMock(return_value=True)
+        )
+        test_client = TestClient(app)
+
+        first = test_client.get("/api/employees/Safia Imtiaz/timeline?limit=2").json()
+        second = test_client.get(
+            f"/api/employees/Safia Imtiaz/timeline?limit=2&cursor={first['pagination']['next_cursor']}"
+        ).json()
+
+        assert first["data"]["timeline"][1]["additional_data"]["break_duration"]
+        assert db.fetch_all.await_args_list[1].args[4] == 4
+        assert "(timestamp, source_id) >=" in db.fetch_all.await_args_list[1].args[0]
+        assert second["data"]["timeline"][0]["event_type"] == "detection"
+        assert second["data"]["timeline"][1]["event_type"] == "departure"
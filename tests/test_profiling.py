@@ -0,0 +1,62 @@
+"""
+Tests for the on-demand profilers.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.utils.profiling import MemoryProfiler, ProfilerBusyError, SamplingProfiler
+
+
+def spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestProfiling:
+    """Test class for SamplingProfiler and MemoryProfiler."""
+
+    def test_cpu_profile_collapsed_stacks(self):
+        """Samples of the profiled thread come out as collapsed stacks."""
+        stop = threading.Event()
+        worker = threading.Thread(target=spin, args=(stop,))
+        worker.start()
+        try:
+            profile = SamplingProfiler().profile(0.2, 0.005, thread_id=worker.ident)
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = profile["collapsed"].splitlines()
+        assert profile["samples"] > 5
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any("spin (test_profiling.py:" in line for line in lines)
+
+    def test_one_cpu_profile_at_a_time(self):
+        """A second concurrent profile is rejected."""
+        profiler = SamplingProfiler()
+        runner = threading.Thread(target=profiler.profile, args=(0.2, 0.01))
+        runner.start()
+        time.sleep(0.05)
+        try:
+            with pytest.raises(ProfilerBusyError):
+                profiler.profile(0.1, 0.01)
+        finally:
+            runner.join()
+
+    def test_memory_growth_since_baseline(self):
+        """Allocations made after the baseline show up as growth."""
+        profiler = MemoryProfiler()
+        profiler.start(frames=5)
+        try:
+            retained = [bytearray(10000) for _ in range(100)]
+            report = profiler.report(limit=5)
+        finally:
+            profiler.stop()
+
+        assert retained
+        assert report["growth"][0]["size_diff_bytes"] >= 1000000
+        assert "test_profiling.py" in report["growth"][0]["location"][0]
+        assert profiler.get_status()["tracing"] is False
@@ -0,0 +1,116 @@
+"""
+Tests for the derived-cache refresh graph.
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import CacheKeys
+from app.dependencies import get_cache_manager, get_database_manager
+from app.routers import violations
+from app.services.refresh_graph import (
+    BaseDataset,
+    DerivedCache,
+    RefreshGraph,
+    compute_employee_stats,
+    compute_hourly_trend
+)
+
+
+def make_cache():
+    return MagicMock(set_many=AsyncMock(return_value=True), expire=AsyncMock(return_value=True))
+
+
+class TestRefreshGraph:
+    """Test class for RefreshGraph."""
+
+    @pytest.mark.asyncio
+    async def test_bases_are_shared_and_unchanged_nodes_skipped(self):
+        """Each base loads once per cycle; only nodes with changed inputs recompute."""
+        phones = [{"timestamp": 1.0, "camera": "employees_01", "employee_name": None}]
+        people = [{"employee_name": "Safia Imtiaz", "camera": "employees_01", "detections": 3, "last_seen": 2.0}]
+        load_phones = AsyncMock(side_effect=lambda db: list(phones))
+        load_people = AsyncMock(side_effect=lambda db: list(people))
+        graph = RefreshGraph(
+            [BaseDataset("phones", load_phones), BaseDataset("people", load_people)],
+            [
+                DerivedCache("count", ["phones"], lambda now, rows: {"count": len(rows)}, 60),
+                DerivedCache("both", ["people", "phones"], lambda now, p, v: {"both": len(p) + len(v)}, 60)
+            ]
+        )
+        cache = make_cache()
+
+        first = await graph.run(MagicMock(), cache)
+        people.append({"employee_name": "Kinza Amin", "camera": "employees_02", "detections": 1, "last_seen": 3.0})
+        second = await graph.run(MagicMock(), cache)
+
+        assert load_phones.await_count == 2
+        assert first["computed"] == ["count", "both"]
+        assert second == {"computed": ["both"], "skipped": ["count"], "failed": []}
+        assert cache.set_many.await_args.args[0] == {"both": 3}
+        cache.expire.assert_awaited_with("count", 60)
+
+    @pytest.mark.asyncio
+    async def test_failed_base_fails_only_its_nodes(self):
+        """A base that fails to load leaves independent nodes refreshing."""
+        graph = RefreshGraph(
+            [BaseDataset("ok", AsyncMock(return_value=[])), BaseDataset("broken", AsyncMock(side_effect=RuntimeError))],
+            [
+                DerivedCache("a", ["ok"], lambda now, rows: {"a": rows}, 60),
+                DerivedCache("b", ["broken"], lambda now, rows: {"b": rows}, 60)
+            ]
+        )
+
+        outcome = await graph.run(MagicMock(), make_cache())
+
+        assert outcome == {"computed": ["a"], "skipped": [], "failed": ["b"]}
+
+    def test_derived_values(self):
+        """Trend buckets and employee stats are derived from the shared rows."""
+        now = time.time() // 3600 * 3600 + 1800
+        phones = [
+            {"timestamp": now - 10, "camera": "employees_01", "employee_name": "Safia Imtiaz"},
+            {"timestamp": now - 20, "camera": "employees_02", "employee_name": None},
+        ]
+        people = [
+            {"employee_name": "Safia Imtiaz", "camera": "employees_01", "detections": 5, "last_seen": now - 5},
+            {"employee_name": "Safia Imtiaz", "camera": "employees_02", "detections": 2, "last_seen": now - 50},
+        ]
+
+        trend = compute_hourly_trend(now, phones)[CacheKeys.hourly_trend(24)]
+        stats = compute_employee_stats(now, people, phones)[CacheKeys.employee_stats()]
+
+        assert len(trend) == 25
+        assert sum(hour["violations"] for hour in trend) == 2
+        assert trend[0]["hour"] == now - 1800
+        assert trend[0]["employees"] == ["Safia Imtiaz", "Unknown"]
+        assert stats == [{"employee_name": "Safia Imtiaz", "detections": 7, "cameras_visited": 2,
+                          "last_seen": now - 5, "violations_count": 1}]
+
+    def test_hourly_trend_miss_path_matches_graph(self):
+        """The endpoint's cache-miss path and the graph produce the same trend."""
+        now = time.time() // 3600 * 3600 + 1800
+        phones = [
+            {"timestamp": now - 10, "camera": "employees_01", "employee_name": "Safia Imtiaz"},
+            {"timestamp": now - 3600, "camera": "employees_02", "employee_name": None},
+            {"timestamp": now - 5 * 3600 - 1700, "camera": "employees_03", "employee_name": "Kinza Amin"},
+        ]
+        cache = MagicMock(get=AsyncMock(return_value=None), set=AsyncMock(return_value=True))
+        app = FastAPI()
+        app.include_router(violations.router)
+        app.dependency_overrides[get_database_manager] = lambda: MagicMock()
+        app.dependency_overrides[get_cache_manager] = lambda: cache
+
+        with patch("app.services.queries.ViolationQueries.get_attributed_phone_detections",
+                   AsyncMock(return_value=phones)), \
+                patch("app.services.queries.get_current_timestamp", return_value=now):
+            response = TestClient(app).get("/api/violations/hourly-trend", params={"hours": 24})
+
+        expected = compute_hourly_trend(now, phones)[CacheKeys.hourly_trend(24)]
+        assert response.status_code == 200
+        assert response.json()["data"] == expected
+        assert cache.set.await_args.args[:2] == (CacheKeys.hourly_trend(24), expected)
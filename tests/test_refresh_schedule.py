@@ -0,0 +1,52 @@
+"""
+Tests for change-aware background refresh scheduling.
+"""
+
+from unittest.mock import patch
+
+from app.services.background import RefreshSchedule
+
+
+def make_schedule() -> RefreshSchedule:
+    return RefreshSchedule("stats_refresh", interval=30, backoff_factor=4, max_skip_interval=1800)
+
+
+class TestRefreshSchedule:
+    """Test class for RefreshSchedule."""
+
+    def test_skips_and_backs_off_while_unchanged(self):
+        """Unchanged watermarks skip the refresh and double the interval up to the cap."""
+        schedule = make_schedule()
+        watermark = {"employees_01": (1700000000.0, 120)}
+
+        assert schedule.check(watermark) is True
+        intervals = []
+        for _ in range(4):
+            assert schedule.check(dict(watermark)) is False
+            intervals.append(schedule.interval)
+
+        assert intervals == [60, 120, 120, 120]
+        assert schedule.get_stats()["skips"] == 4
+
+    def test_new_rows_refresh_and_reset_interval(self):
+        """New rows refresh at the base interval; rows ageing out do not."""
+        schedule = make_schedule()
+        schedule.check({"employees_01": (1700000000.0, 120)})
+        schedule.check({"employees_01": (1700000000.0, 120)})
+
+        assert schedule.check({"employees_01": (1700000000.0, 100)}) is False
+        assert schedule.check({"employees_01": (1700000050.0, 101)}) is True
+        assert schedule.interval == 30
+        assert schedule.check({"employees_01": (1700000050.0, 101), "employees_02": (1700000060.0, 1)}) is True
+
+    def test_refreshes_when_overdue_or_invalidated(self):
+        """A long quiet spell or a failed refresh still forces a refresh."""
+        schedule = make_schedule()
+        watermark = {"employees_01": (1700000000.0, 120)}
+        schedule.check(watermark)
+
+        with patch("app.services.background.time.monotonic", return_value=schedule.refreshed_at + 1801):
+            assert schedule.check(watermark) is True
+
+        schedule.invalidate()
+        assert schedule.check(watermark) is True
@@ -0,0 +1,58 @@
+"""
+Tests for the shared JSON encoder and response class.
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import MappingProxyType
+from uuid import UUID
+
+import pytest
+
+from app.routers.employees import ActivityEvent, TimelineSegment
+from app.utils.serialization import FastJSONResponse, dumps, dumps_text, json_default, model_row
+
+
+class TestSerialization:
+    """Test class for JSON serialization."""
+
+    def test_encodes_database_types_in_one_pass(self):
+        """Decimal, datetime, UUID and record-like mappings need no pre-walk."""
+        row = MappingProxyType({"confidence": Decimal("0.875"), "count": 3})
+        payload = {
+            "rows": [row],
+            "when": datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc),
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "zones": ("desk_01",),
+        }
+
+        decoded = json.loads(dumps(payload))
+
+        assert decoded["rows"] == [{"confidence": 0.875, "count": 3}]
+        assert decoded["when"].startswith("2024-01-15T10:30:00")
+        assert decoded["id"] == "12345678-1234-5678-1234-567812345678"
+        assert decoded["zones"] == ["desk_01"]
+
+    def test_unknown_types_are_rejected(self):
+        """Values without a JSON form still raise TypeError."""
+        with pytest.raises(TypeError):
+            json_default(object())
+
+    def test_response_renders_with_shared_encoder(self):
+        """FastJSONResponse renders Decimal without a jsonable pre-pass."""
+        response = FastJSONResponse({"value": Decimal("1.5")}, status_code=201)
+
+        assert response.status_code == 201
+        assert response.headers["content-type"] == "application/json"
+        assert json.loads(response.body) == {"value": 1.5}
+        assert dumps_text({"a": 1}) == '{"a":1}'
+
+    def test_model_row_matches_validated_dict(self):
+        """model_row gives the same dict, key order included, as Model(...).dict()."""
+        segment = dict(type="work", start_time="09:00:00", end_time="09:01:00", duration_seconds=60,
+                       start_percentage=0.0, width_percentage=1.5, color="#10b981")
+        event = dict(time="2024-01-15T09:00:00", event_type="arrival", zone="desk_01")
+
+        assert list(model_row(TimelineSegment, **segment).items()) == list(TimelineSegment(**segment).dict().items())
+        assert list(model_row(ActivityEvent, **event).items()) == list(ActivityEvent(**event).dict().items())
@@ -0,0 +1,75 @@
+"""
+Tests for the slow-query log.
+"""
+
+import asyncio
+
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from app.utils.slow_queries import SlowQueryLog, is_read_only, normalize_sql
+
+
+def make_pool(plan):
+    conn = MagicMock(execute=AsyncMock(), fetchval=AsyncMock(return_value=plan))
+
+    @asynccontextmanager
+    async def transaction(readonly=False):
+        yield
+
+    @asynccontextmanager
+    async def acquire(timeout=None):
+        yield conn
+
+    conn.transaction = transaction
+    return MagicMock(acquire=acquire, get_idle_size=MagicMock(return_value=1)), conn
+
+
+class TestSlowQueryLog:
+    """Test class for SlowQueryLog."""
+
+    def test_normalize_sql(self):
+        """Literals and comments are stripped; placeholders and identifiers kept."""
+        query = """
+            SELECT camera -- the camera
+            FROM timeline
+            WHERE camera = 'employees_01' AND timestamp > $1 - 3600
+              AND data->>'label' = 'cell phone' LIMIT 100
+        """
+
+        assert normalize_sql(query) == (
+            "SELECT camera FROM timeline WHERE camera = ? AND timestamp > $1 - ? "
+            "AND data->>? = ? LIMIT ?"
+        )
+        assert is_read_only("WITH t AS (SELECT 1) SELECT * FROM t")
+        assert not is_read_only("UPDATE timeline SET camera = 'x'")
+
+    def test_records_only_slow_queries_in_bounded_buffer(self):
+        """Fast queries are ignored and the buffer keeps the latest entries."""
+        log = SlowQueryLog(threshold_ms=100, size=2)
+
+        assert log.record("fast", "fetch_all", "SELECT 1", (), 0.05) is None
+        for i in range(3):
+            log.record(f"slow_{i}", "fetch_all", "SELECT $1", (list(range(20)),), 0.2 + i / 10)
+
+        entries = log.get_entries()
+        assert [entry["query_name"] for entry in entries] == ["slow_2", "slow_1"]
+        assert entries[0]["params"][0][-1] == "... (20 items)"
+        assert log.get_stats()["recorded"] == 3
+
+    @pytest.mark.asyncio
+    async def test_sampled_plan_capture(self):
+        """Sampled read-only queries get an EXPLAIN plan from a spare connection."""
+        pool, conn = make_pool([{"Plan": {"Node Type": "Seq Scan"}}])
+        log = SlowQueryLog(threshold_ms=100, size=10, explain_sample_rate=1.0)
+
+        entry = log.record("get_rows", "fetch_all", "SELECT * FROM timeline WHERE camera = $1", ("a",), 0.5, pool=pool)
+        skipped = log.record("set_rows", "execute", "DELETE FROM timeline", (), 0.5, pool=pool)
+        await asyncio.sleep(0)
+
+        assert entry["plan"] == {"Plan": {"Node Type": "Seq Scan"}}
+        assert skipped["plan"] is None
+        assert conn.fetchval.await_args.args == (
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT * FROM timeline WHERE camera = $1", "a"
+        )
@@ -0,0 +1,46 @@
+"""
+Tests for the synthetic Frigate data generator.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+
+from generate_timeline import SCALES, SyntheticConfig, build_layout, desk_roster, generate  # noqa: E402
+
+END_TIME = 1760000000.0
+
+
+class TestSyntheticData:
+    """Test class for the synthetic data generator."""
+
+    def test_employees_sit_at_roster_desks(self):
+        """Generated employees use the desk/name pairs of the attribution SQL."""
+        roster = desk_roster()
+        config = SyntheticConfig(**SCALES["small"])
+
+        cameras, employees = build_layout(config)
+
+        assert len(roster) >= config.employees
+        assert len(cameras) == config.cameras
+        assert [(employee["desk"], employee["name"]) for employee in employees] == roster[:config.employees]
+        assert all(employee["camera"] in cameras for employee in employees)
+
+    def test_rows_cover_the_window_up_to_now(self):
+        """Rows span the configured days, end at end_time and are deterministic."""
+        config = SyntheticConfig(**SCALES["small"])
+
+        days = list(generate(config, END_TIME))
+        timeline = [row for day in days for row in day[0]]
+        reviews = [row for day in days for row in day[1]]
+        recordings = [row for day in days for row in day[2]]
+
+        assert len(days) == config.days
+        assert timeline and reviews and recordings
+        assert all(END_TIME - config.days * 86400 <= row[0] < END_TIME for row in timeline)
+        assert max(row[0] for row in timeline) > END_TIME - 3600
+        assert all(row[4] <= END_TIME for row in recordings)
+        phones = {row[3] for row in timeline if row[5].get("label") == "cell phone"}
+        assert {row[0] for row in reviews} == phones
+        assert list(generate(config, END_TIME))[0][0] == days[0][0]
@@ -0,0 +1,84 @@
+"""
+Tests for per-request Server-Timing tracing.
+"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.main import add_process_time_header
+from app.utils import tracing
+from app.utils.tracing import RequestTrace
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.middleware("http")(add_process_time_header)
+
+    @app.get("/traced")
+    async def traced():
+        async def query(name):
+            with tracing.span("db", name):
+                await asyncio.sleep(0.02)
+
+        await asyncio.gather(query("get_a"), query("get_b"))
+        with tracing.span("cache", "get employees:stats"):
+            await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def frames():
+            yield "data: 1\n\n"
+            yield "data: 2\n\n"
+
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+class TestTracing:
+    """Test class for request tracing."""
+
+    def test_overlapping_spans_are_not_double_counted(self):
+        """A category's time is the union of its spans."""
+        trace = RequestTrace()
+        trace.record("db", "a", 1.0, 1.5)
+        trace.record("db", "b", 1.2, 1.6)
+        trace.record("db", "c", 2.0, 2.1)
+
+        assert round(trace.category_times()["db"], 3) == 0.7
+        assert 'db;dur=700.0;desc="3 calls"' in trace.server_timing(1.0)
+        assert "render;dur=300.0" in trace.server_timing(1.0)
+
+    def test_server_timing_header(self):
+        """Spans recorded while handling a request end up in Server-Timing."""
+        response = make_client().get("/traced")
+
+        timing = dict(
+            (entry.split(";")[0], float(entry.split("dur=")[1].split(";")[0]))
+            for entry in response.headers["Server-Timing"].split(", ")
+        )
+        assert response.json() == {"ok": True}
+        assert 20 <= timing["db"] < 35
+        assert timing["cache"] >= 10
+        assert timing["total"] >= timing["db"] + timing["cache"]
+
+    def test_debug_timing_breakdown(self):
+        """?debug=timing replaces the body with the span breakdown."""
+        body = make_client().get("/traced", params={"debug": "timing"}).json()
+
+        assert body["route"] == "/traced"
+        assert body["status_code"] == 200
+        assert [span["name"] for span in body["spans"]] == ["get_a", "get_b", "get employees:stats"]
+        assert set(body["categories"]) == {"db", "cache", "frigate", "render"}
+
+    def test_debug_timing_keeps_streams(self):
+        """?debug=timing on an event stream only adds the Server-Timing header."""
+        response = make_client().get("/stream", params={"debug": "timing"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == "data: 1\n\ndata: 2\n\n"
+        assert "total;dur=" in response.headers["Server-Timing"]
@@ -0,0 +1,76 @@
+"""
+Tests for the incremental violation tail.
+"""
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.config import settings
+from app.services.violation_tail import ViolationTail
+
+
+def make_row(offset: float, camera: str = "employees_01") -> dict:
+    timestamp = round(time.time() - offset, 3)
+    return {"id": f"{timestamp}-abc", "timestamp": timestamp, "camera": camera,
+            "zones": ["desk_1"], "employee_name": "Safia Imtiaz", "confidence": 1.0}
+
+
+class TestViolationTail:
+    """Test class for ViolationTail."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_tail_answers_without_database(self):
+        """Polls inside the refresh interval are served from memory."""
+        tail = ViolationTail(maxlen=10, refresh_interval=60)
+        older, newer = make_row(30), make_row(10, camera="employees_02")
+        query = AsyncMock(return_value=[newer, older])
+
+        with patch("app.services.violation_tail.ViolationQueries.get_live_violations", query):
+            first = await tail.since(MagicMock(), older["timestamp"])
+            second = await tail.since(MagicMock(), first["watermark"])
+            filtered = await tail.since(MagicMock(), older["timestamp"] - 1, camera="employees_01")
+
+        assert query.await_count == 1
+        assert [v["id"] for v in first["violations"]] == [newer["id"]]
+        assert first["watermark"] == newer["timestamp"]
+        assert second["violations"] == [] and second["watermark"] == newer["timestamp"]
+        assert [v["id"] for v in filtered["violations"]] == [older["id"]]
+
+    @pytest.mark.asyncio
+    async def test_stale_tail_fetches_only_past_watermark(self):
+        """A refresh queries from the watermark; uncovered watermarks hit the database."""
+        tail = ViolationTail(maxlen=10, refresh_interval=0)
+        first_row, second_row = make_row(20), make_row(5)
+        query = AsyncMock(side_effect=[[first_row], [second_row], [], [first_row]])
+
+        with patch("app.services.violation_tail.ViolationQueries.get_live_violations", query):
+            await tail.since(MagicMock(), first_row["timestamp"])
+            result = await tail.since(MagicMock(), first_row["timestamp"])
+            fallback = await tail.since(MagicMock(), time.time() - 7200, limit=5)
+
+        assert query.await_args_list[0].kwargs["since"] is None
+        assert query.await_args_list[1].kwargs["since"] == first_row["timestamp"] - settings.face_detection_window
+        assert [v["id"] for v in result["violations"]] == [second_row["id"]]
+        assert query.await_args_list[-1].kwargs["limit"] == 6
+        assert fallback["watermark"] == first_row["timestamp"]
+        assert tail.get_stats()["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_picks_up_late_and_reattributed_rows(self):
+        """The overlap re-scan adds rows committed behind the watermark and re-attributes held rows."""
+        tail = ViolationTail(maxlen=10, refresh_interval=0)
+        held, newest = make_row(60), make_row(5, camera="employees_02")
+        late = make_row(30, camera="employees_03")
+        reattributed = dict(held, employee_name="Nimra Ghulam Fareed", confidence=0.9)
+        query = AsyncMock(side_effect=[[newest, held], [newest, late, reattributed], []])
+
+        with patch("app.services.violation_tail.ViolationQueries.get_live_violations", query):
+            await tail.since(MagicMock(), held["timestamp"] - 1)
+            await tail.ensure_fresh(MagicMock())
+            result = await tail.since(MagicMock(), held["timestamp"] - 1)
+
+        assert [v["id"] for v in result["violations"]] == [newest["id"], late["id"], held["id"]]
+        assert result["violations"][-1]["employee_name"] == "Nimra Ghulam Fareed"
+        assert tail.get_stats()["violations"] == 3